@@ -169,13 +169,78 @@ class _Deployment(object):
         :returns: Service list
         """
         # TODO(astudenov): put this work into Credential plugins
-        services = cls.service_list(deployment)
-        users = deployment.get_credentials_for("openstack")["users"]
-        for endpoint_dict in users:
-            osclients.Clients(objects.Credential(**endpoint_dict)).keystone()
+        with osclients.deployment_capabilities(deployment, refresh=True):
+            services = cls.service_list(deployment)
+            if consts.Service.NEUTRON in services.values():
+                admin = deployment.get_credentials_for("openstack")["admin"]
+                osclients.Clients(
+                    objects.Credential(**admin)).neutron_extensions()
+            users = deployment.get_credentials_for("openstack")["users"]
+            for endpoint_dict in users:
+                osclients.Clients(
+                    objects.Credential(**endpoint_dict)).keystone()
 
         return services
 
+    @classmethod
+    def sweep(cls, deployment, resources=None, task_ids=None, delete=False):
+        """Find resources leaked by Rally in the cloud of deployment.
+
+        Resources are listed on behalf of admin and existing users of the
+        deployment.
+
+        :param deployment: Deployment object
+        :param resources: List of resource names in format <service> or
+                          <service>.<resource>, all resources by default
+        :param task_ids: List of task UUIDs to find resources of, resources
+                         of all tasks by default
+        :param delete: Delete found resources
+        :returns: dict with "resources" list of found resources and
+                  "cleanup" statistics or None if resources were not
+                  deleted. Each resource has "task_uuid" of Rally task that
+                  its name refers to, or None if there is no such task in DB.
+                  Resources of tasks which are not in a final status are
+                  never found, since such tasks may still use them
+        """
+        # TODO(astudenov): put this work into Credential plugins
+        credentials = deployment.get_credentials_for("openstack")
+        admin = None
+        users = []
+        for credential in [credentials["admin"]] + credentials["users"]:
+            if not credential:
+                continue
+            credential = objects.Credential(**credential)
+            auth_ref = osclients.Clients(credential).keystone.auth_ref
+            users.append({"id": auth_ref.user_id,
+                          "tenant_id": auth_ref.project_id,
+                          "credential": credential})
+            if admin is None and credentials["admin"]:
+                admin = {"credential": credential}
+
+        tasks = objects.Task.list()
+        active_tasks = [task["uuid"] for task in tasks
+                        if task["status"] not in objects.Task.FINAL_STATUSES]
+        if active_tasks:
+            LOG.warning(_LW("Resources of tasks %s are skipped, since these "
+                            "tasks are not finished yet.")
+                        % ", ".join(active_tasks))
+
+        # the core API must not depend on OpenStack plugins on import
+        from rally.plugins.openstack.cleanup import manager as cleanup_manager
+
+        sweeper, leaked, stats = cleanup_manager.sweep(
+            names=resources, admin=admin, users=users, task_ids=task_ids,
+            exclude_task_ids=active_tasks, delete=delete)
+
+        task_uuids = {}
+        for task in tasks:
+            for task_id_part in sweeper.matcher.get_task_id_parts(
+                    task["uuid"]):
+                task_uuids.setdefault(task_id_part, task["uuid"])
+        for resource in leaked:
+            resource["task_uuid"] = task_uuids.get(resource["task_id_part"])
+        return {"resources": leaked, "cleanup": stats}
+
 
 class _Task(object):
 
@@ -189,6 +254,33 @@ class _Task(object):
     def get(task_id):
         return objects.Task.get(task_id)
 
+    @staticmethod
+    def list_trend_points(config_hash=None, since=None, until=None):
+        """List trends points of finished workloads.
+
+        :param config_hash: hash of workload configuration
+        :param since: float timestamp, list points of workloads started
+                      at or after it
+        :param until: float timestamp, list points of workloads started
+                      before it
+        :returns: list of dicts ordered by start time of workloads
+        """
+        return objects.Workload.list_trend_points(
+            config_hash=config_hash, since=since, until=until)
+
+    @staticmethod
+    def list_progress(task_id, since_id=None, latest=False):
+        """List progress records of workloads of task.
+
+        :param task_id: UUID of task
+        :param since_id: list only records created after the record with
+                         this id
+        :param latest: list only the latest record of each workload
+        :returns: list of dicts ordered by id
+        """
+        return objects.Workload.list_progress(task_id, since_id=since_id,
+                                              latest=latest)
+
     @staticmethod
     def get_detailed(task_id, extended_results=False):
         """Get detailed task data.
@@ -321,7 +413,8 @@ class _Task(object):
             deployment_uuid=deployment["uuid"], temporary=True)
         benchmark_engine = engine.TaskEngine(config, task, deployment)
 
-        benchmark_engine.validate()
+        with osclients.deployment_capabilities(deployment):
+            benchmark_engine.validate()
 
     @classmethod
     def start(cls, deployment, config, task=None, abort_on_sla_failure=False):
@@ -352,7 +445,8 @@ class _Task(object):
             abort_on_sla_failure=abort_on_sla_failure)
 
         try:
-            benchmark_engine.run()
+            with osclients.deployment_capabilities(deployment):
+                benchmark_engine.run()
         except Exception:
             deployment.update_status(consts.DeployStatus.DEPLOY_INCONSISTENT)
             raise
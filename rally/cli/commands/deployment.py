@@ -260,6 +260,71 @@ class DeploymentCommands(object):
                 "service (execute `rally plugin show api_versions` for more "
                 "details)."))
 
+    @cliutils.args("--deployment", dest="deployment", type=str,
+                   metavar="<uuid>", required=False,
+                   help="UUID or name of the deployment.")
+    @cliutils.args("--resource", dest="resources", type=str, nargs="+",
+                   metavar="<name>", required=False,
+                   help="Names of resource types to look for in format "
+                        "<service> or <service>.<resource>. All resource "
+                        "types are used by default.")
+    @cliutils.args("--task", dest="task_ids", type=str, nargs="+",
+                   metavar="<uuid>", required=False,
+                   help="UUIDs of tasks to look for resources of. "
+                        "Resources of all tasks are found by default. "
+                        "Resources of tasks which are not finished yet are "
+                        "always skipped.")
+    @cliutils.args("--delete", dest="delete", action="store_true",
+                   help="Delete found resources. By default they are only "
+                        "reported.")
+    @envutils.with_default_deployment()
+    @plugins.ensure_plugins_are_loaded
+    def sweep(self, api, deployment=None, resources=None, task_ids=None,
+              delete=False):
+        """Find resources leaked by Rally in the cloud and delete them.
+
+        Resources are listed on behalf of admin and existing users of the
+        deployment. Resources with names generated by Rally are reported
+        grouped by tasks, e.g. after crashed or aborted tasks. Resources of
+        tasks which are not finished yet are skipped, since they may still
+        be in use.
+
+        :param deployment: UUID or name of the deployment
+        :param resources: names of resource types to look for
+        :param task_ids: UUIDs of tasks to look for resources of
+        :param delete: delete found resources
+        """
+        deployment = api.deployment.get(deployment)
+        result = api.deployment.sweep(deployment, resources=resources,
+                                      task_ids=task_ids, delete=delete)
+
+        if not result["resources"]:
+            print(_("There are no resources leaked by Rally."))
+            return
+
+        groups = {}
+        for resource in result["resources"]:
+            task = resource["task_uuid"] or _("unknown task (%s)") % (
+                resource["task_id_part"])
+            groups.setdefault(task, []).append(resource)
+
+        headers = ["resource", "id", "name"]
+        for task, task_resources in sorted(groups.items()):
+            print(_("\nTask %(task)s: %(count)d resources")
+                  % {"task": task, "count": len(task_resources)})
+            cliutils.print_list(
+                [utils.Struct(**r) for r in task_resources], headers)
+
+        if result["cleanup"] is None:
+            print(_("\nResources were not deleted. Use --delete argument to "
+                    "delete them."))
+        else:
+            print(_("\nCleanup of %(count)d resources took %(duration).2f "
+                    "sec and %(api_calls)d API calls.")
+                  % {"count": len(result["resources"]),
+                     "duration": result["cleanup"]["duration"],
+                     "api_calls": result["cleanup"]["api_calls"]})
+
     def _update_openrc_deployment_file(self, deployment, credential):
         openrc_path = os.path.expanduser("~/.rally/openrc-%s" % deployment)
         with open(openrc_path, "w+") as env_file:
@@ -16,13 +16,17 @@
 """Rally command: task"""
 
 from __future__ import print_function
+import calendar
+import datetime as dt
 import json
 import os
 import sys
+import time
 import traceback
 import webbrowser
 
 import jsonschema
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import six
 from six.moves.urllib import parse as urlparse
@@ -39,6 +43,7 @@ from rally.common import yamlutils as yaml
 from rally import consts
 from rally import exceptions
 from rally import plugins
+from rally.task import atomic
 from rally.task import exporter
 from rally.task.processing import plot
 from oslo_utils import importutils
@@ -259,7 +264,8 @@ class TaskCommands(object):
                      "tag": task_instance["tag"]}))
             print("Benchmarking... This can take a while...\n")
             print("To track task status use:\n")
-            print("\trally task status\n\tor\n\trally task detailed\n")
+            print("\trally task watch\n\tor\n\trally task status\n\tor\n"
+                  "\trally task detailed\n")
 
             if do_use:
                 self.use(api, task_instance["uuid"])
@@ -318,6 +324,100 @@ class TaskCommands(object):
         task = api.task.get(task_id)
         print(_("Task %(task_id)s: %(status)s")
               % {"task_id": task_id, "status": task["status"]})
+        for record in api.task.list_progress(task_id, latest=True):
+            print(self._format_progress(record["data"]))
+
+    @staticmethod
+    def _format_progress(progress):
+        def format_duration(value):
+            if value is None:
+                return "n/a"
+            return "%ss" % rutils.format_float_to_str(value)
+
+        if progress["total"] is None:
+            completed = str(progress["completed"])
+        else:
+            completed = "%(completed)s/%(total)s" % progress
+        if progress["finished"]:
+            eta = "done"
+        elif progress["eta"] is None:
+            eta = "n/a"
+        else:
+            eta = str(dt.timedelta(seconds=int(progress["eta"])))
+        return (_("%(pos)s. %(name)s: %(completed)s iterations, "
+                  "%(errors)s errors, p50 %(p50)s, p95 %(p95)s, ETA %(eta)s")
+                % {"pos": progress["pos"], "name": progress["name"],
+                   "completed": completed, "errors": progress["errors"],
+                   "p50": format_duration(progress["p50"]),
+                   "p95": format_duration(progress["p95"]), "eta": eta})
+
+    @cliutils.args("--uuid", type=str, dest="task_id", help="UUID of task")
+    @cliutils.args("--interval", type=float, default=2.0,
+                   help="Interval in seconds between checks of new progress "
+                        "records")
+    @cliutils.args("--timeout", type=float, default=None,
+                   help="Stop watching after this number of seconds even if "
+                        "the task is not finished yet")
+    @envutils.with_default_task_id
+    def watch(self, api, task_id=None, interval=2.0, timeout=None):
+        """Stream progress of workloads of a task until it finishes.
+
+        Progress is read from compact records which the running task stores
+        to DB at fixed interval (see [task_metrics]progress_interval), so
+        watchers do not affect the task. Watching stops with an error if
+        the task is in a status which never produces progress.
+
+        :param task_id: Task uuid
+        :param interval: interval in seconds between checks of new records
+        :param timeout: max time in seconds to watch the task
+        """
+        final_statuses = (consts.TaskStatus.FINISHED,
+                          consts.TaskStatus.CRASHED,
+                          consts.TaskStatus.ABORTED,
+                          consts.TaskStatus.SLA_FAILED,
+                          consts.TaskStatus.VALIDATION_FAILED)
+        running_statuses = (consts.TaskStatus.RUNNING,
+                            consts.TaskStatus.SOFT_ABORTING,
+                            consts.TaskStatus.ABORTING)
+        # task in these statuses is not started yet, it produces progress only
+        # if somebody starts it
+        pending_statuses = (consts.TaskStatus.INIT,
+                            consts.TaskStatus.VALIDATING,
+                            consts.TaskStatus.VALIDATED)
+        started_at = time.time()
+        last_id = None
+        latest_status = None
+        while True:
+            # status is fetched before records, so all records stored before
+            # task has finished are printed
+            status = api.task.get(task_id)["status"]
+            for record in api.task.list_progress(task_id, since_id=last_id):
+                last_id = record["id"]
+                print(self._format_progress(record["data"]))
+            if status in final_statuses:
+                break
+            if status not in running_statuses + pending_statuses:
+                print(_("ERROR: Task %(task_id)s is %(status)s, it does "
+                        "not produce progress.")
+                      % {"task_id": task_id, "status": status},
+                      file=sys.stderr)
+                return 1
+            if status in pending_statuses and status != latest_status:
+                print(_("Task %(task_id)s is %(status)s, progress is shown "
+                        "once it is running.")
+                      % {"task_id": task_id, "status": status},
+                      file=sys.stderr)
+            latest_status = status
+            if timeout is not None and time.time() - started_at >= timeout:
+                print(_("ERROR: Task %(task_id)s is still %(status)s after "
+                        "%(timeout)s seconds of watching.")
+                      % {"task_id": task_id, "status": status,
+                         "timeout": timeout},
+                      file=sys.stderr)
+                return 1
+            time.sleep(interval)
+        print(_("Task %(task_id)s: %(status)s")
+              % {"task_id": task_id, "status": status})
 
     @cliutils.args("--uuid", type=str, dest="task_id",
                    help=("UUID of task. If --uuid is \"last\" the results of "
@@ -387,8 +487,10 @@ class TaskCommands(object):
 
                 if iterations_data:
                     row = {"iteration": idx, "duration": itr["duration"]}
+                    durations = atomic.flatten_atomic_actions(
+                        itr["atomic_actions"], nested=True)
                     for name, action in iterations_actions:
-                        row[action] = itr["atomic_actions"].get(name, 0)
+                        row[action] = durations.get(name, 0)
                     iterations.append(row)
 
                 if "output" in itr:
@@ -574,13 +676,44 @@ class TaskCommands(object):
                    help="Open the output in a browser.")
     @cliutils.args("--tasks", dest="tasks", nargs="+",
                    help="UUIDs of tasks, or JSON files with task results")
+    @cliutils.args("--processes", dest="processes", type=int, default=1,
+                   help="Number of processes to process workloads in, "
+                        "0 means number of CPUs.")
+    @cliutils.args("--since", dest="since", type=str, required=False,
+                   help="Include workloads started at or after this "
+                        "ISO 8601 date or time, like 2017-03-01 or "
+                        "2017-03-01T12:00:00. Stored trends points are "
+                        "used, so raw results are not loaded. A point is "
+                        "stored as soon as results of its workload are "
+                        "saved, so workloads of still running tasks are "
+                        "included as well.")
+    @cliutils.args("--until", dest="until", type=str, required=False,
+                   help="Include workloads started before this ISO 8601 "
+                        "date or time.")
+    @cliutils.args("--hash", dest="config_hash", type=str, required=False,
+                   help="Include workloads with this hash of "
+                        "configuration.")
     @cliutils.suppress_warnings
     def trends(self, api, *args, **kwargs):
         """Generate workloads trends HTML report."""
         tasks = kwargs.get("tasks", []) or list(args)
-
-        if not tasks:
-            print(_("ERROR: At least one task must be specified"),
+        window = {"config_hash": kwargs.get("config_hash")}
+        for arg in "since", "until":
+            window[arg] = kwargs.get(arg)
+            if window[arg]:
+                try:
+                    window[arg] = calendar.timegm(
+                        timeutils.parse_isotime(window[arg]).utctimetuple())
+                except ValueError:
+                    print(_("ERROR: Invalid date or time passed to --%(arg)s:"
+                            " %(value)s") % {"arg": arg,
+                                             "value": window[arg]},
+                          file=sys.stderr)
+                    return 1
+
+        if not (tasks or any(window.values())):
+            print(_("ERROR: At least one task or one of --since, --until "
+                    "and --hash must be specified"),
                   file=sys.stderr)
             return 1
 
@@ -601,14 +734,17 @@ class TaskCommands(object):
                             return 1
 
             elif uuidutils.is_uuid_like(task_id):
+                # raw data is loaded only for workloads which have no persisted
+                # statistics
                 task_results = map(
                     lambda x: {"key": x["key"],
                                "sla": x["data"]["sla"],
                                "hooks": x["data"].get("hooks", []),
                                "result": x["data"]["raw"],
+                               "statistics": x["data"].get("statistics"),
                                "load_duration": x["data"]["load_duration"],
                                "full_duration": x["data"]["full_duration"]},
-                    api.task.get(task_id).get_results())
+                    api.task.get(task_id).get_statistics())
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s")
                       % task_id, file=sys.stderr)
@@ -616,7 +752,14 @@ class TaskCommands(object):
 
             results.extend(task_results)
 
-        result = plot.trends(results)
+        points = None
+        if any(window.values()):
+            # workloads of specified tasks are already in results
+            points = [point for point in api.task.list_trend_points(**window)
+                      if point["task_uuid"] not in tasks]
+
+        result = plot.trends(results, processes=kwargs.get("processes", 1),
+                             points=points)
 
         out = kwargs.get("out")
         if out:
@@ -647,10 +790,18 @@ class TaskCommands(object):
     @cliutils.args("--junit", dest="out_format",
                    action="store_const", const="junit",
                    help="Generate the report in the JUnit format.")
+    @cliutils.args("--lazy-load", dest="lazy_load", action="store_true",
+                   help="Write data of each workload of HTML report to "
+                        "separate file in <out>_data directory, the data "
+                        "is loaded when the workload is opened. Useful "
+                        "for huge tasks. Requires --out.")
+    @cliutils.args("--processes", dest="processes", type=int, default=1,
+                   help="Number of processes to process workloads of HTML "
+                        "report in, 0 means number of CPUs.")
     @envutils.default_from_global("tasks", envutils.ENV_TASK, "tasks")
     @cliutils.suppress_warnings
     def report(self, api, tasks=None, out=None, open_it=False,
-               out_format="html"):
+               out_format="html", lazy_load=False, processes=1):
         """Generate report file for specified task.
 
         :param task_id: UUID, task identifier
@@ -658,8 +809,17 @@ class TaskCommands(object):
         :param out: str, output file name
         :param open_it: bool, whether to open output file in web browser
         :param out_format: output format (junit, html or html_static)
+        :param lazy_load: bool, whether to write data of workloads of HTML
+                          report to separate files
+        :param processes: int, number of processes to process workloads
+                          of HTML report in, 0 means number of CPUs
         """
 
+        if lazy_load and not (out and out_format.startswith("html")):
+            print(_("ERROR: --lazy-load requires --out and HTML format"),
+                  file=sys.stderr)
+            return 1
+
         tasks = isinstance(tasks, list) and tasks or [tasks]
 
         results = []
@@ -706,9 +866,16 @@ class TaskCommands(object):
                     processed_names[task_result["key"]["name"]] = 0
                 results.append(task_result)
 
-        if out_format.startswith("html"):
+        if out_format.startswith("html") and lazy_load:
+            data_dir = os.path.splitext(os.path.expanduser(out))[0] + "_data"
+            result = plot.plot_lazy(
+                results, data_dir,
+                include_libs=(out_format == "html_static"),
+                processes=processes)
+        elif out_format.startswith("html"):
             result = plot.plot(results,
-                               include_libs=(out_format == "html_static"))
+                               include_libs=(out_format == "html_static"),
+                               processes=processes)
         elif out_format == "junit":
             test_suite = junit.JUnit("Rally test suite")
             for result in results:
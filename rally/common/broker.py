@@ -15,6 +15,7 @@
 
 import collections
 import threading
+import time
 
 from rally.common.i18n import _LW
 from rally.common import logging
@@ -84,3 +85,42 @@ def run(publish, consume, consumers_count=1):
 
     for consumer in consumers:
         consumer.join()
+
+
+def run_concurrently(func, items, workers=1):
+    """Call func for each item by a bounded pool of threads.
+
+    Unlike run(), failures are not swallowed. Items which are not started
+    yet when some call fails are skipped, so caller can roll back as soon
+    as possible.
+
+    :param func: Function that processes a single item
+    :param items: List of items
+    :param workers: Maximum number of concurrent calls
+    :returns: list of tuples (result, exception, duration) in order of
+              items, exception is None for succeeded calls, tuple is None
+              for skipped items
+    """
+    outcomes = [None] * len(items)
+    failed = threading.Event()
+
+    def publish(queue):
+        queue.extend(enumerate(items))
+
+    def consume(cache, args):
+        i, item = args
+        if failed.is_set():
+            return
+        started_at = time.time()
+        try:
+            outcomes[i] = (func(item), None, time.time() - started_at)
+        except Exception as e:
+            failed.set()
+            LOG.warning(_LW("Failed to process %(item)s: %(error)s")
+                        % {"item": item, "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+            outcomes[i] = (None, e, time.time() - started_at)
+
+    run(publish, consume, max(min(workers, len(items)), 1))
+    return outcomes
@@ -234,6 +234,17 @@ def task_result_get_all_by_uuid(task_uuid):
     return get_impl().task_result_get_all_by_uuid(task_uuid)
 
 
+def task_statistics_get_all_by_uuid(task_uuid):
+    """Get list of task results with statistics instead of raw data.
+
+    Raw data is loaded only for workloads which have no statistics.
+
+    :param task_uuid: string with UUID of Task instance.
+    :returns: list instances of TaskResult.
+    """
+    return get_impl().task_statistics_get_all_by_uuid(task_uuid)
+
+
 def subtask_create(task_uuid, title, description=None, context=None):
     """Create a subtask.
 
@@ -270,16 +281,92 @@ def workload_data_create(task_uuid, workload_uuid, chunk_order, data):
                                            chunk_order, data)
 
 
+def workload_data_bulk_create(task_uuid, workload_uuid, chunks):
+    """Create several workload data records in one transaction.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param workload_uuid: string with UUID of Workload instance.
+    :param chunks: list of (chunk_order, data) pairs, where data is a dict
+                   with record values on the workload data.
+    """
+    return get_impl().workload_data_bulk_create(task_uuid, workload_uuid,
+                                                chunks)
+
+
+def workload_data_iter(workload_uuid):
+    """Iterate over raw results of the workload chunk by chunk.
+
+    Chunks are fetched from DB one by one, so raw results of the workload
+    are never loaded into memory at once.
+
+    :param workload_uuid: string with UUID of Workload instance.
+    :returns: iterator over dicts with data of chunks ordered by
+              chunk_order.
+    """
+    return get_impl().workload_data_iter(workload_uuid)
+
+
 def workload_set_results(workload_uuid, data):
     """Set workload results.
 
     :param workload_uuid: string with UUID of Workload instance.
-    :param data: dict with workload results.
+    :param data: dict with workload results, optionally with
+                 "statistics" of durations.
     :returns: a dict with data on the workload.
     """
     return get_impl().workload_set_results(workload_uuid, data)
 
 
+def workload_progress_create(task_uuid, workload_uuid, data):
+    """Create a progress record of running workload.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param workload_uuid: string with UUID of Workload instance.
+    :param data: dict with progress of the workload.
+    :returns: a dict with data on the progress record.
+    """
+    return get_impl().workload_progress_create(task_uuid, workload_uuid,
+                                               data)
+
+
+def workload_progress_list(task_uuid, since_id=None, latest=False):
+    """Get a list of progress records of workloads of task ordered by id.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param since_id: integer, filter records created after the record with
+                     this id.
+    :param latest: return only the latest record of each workload.
+    :returns: a list of dicts with data on the progress records.
+    """
+    return get_impl().workload_progress_list(task_uuid, since_id=since_id,
+                                             latest=latest)
+
+
+def trend_point_create(task_uuid, workload_uuid, values):
+    """Create a trend point of finished workload.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param workload_uuid: string with UUID of Workload instance.
+    :param values: dict with record values on the trend point.
+    :returns: a dict with data on the trend point.
+    """
+    return get_impl().trend_point_create(task_uuid, workload_uuid, values)
+
+
+def trend_point_list(config_hash=None, since=None, until=None):
+    """Get a list of trend points ordered by start time of workloads.
+
+    :param config_hash: hash of workload configuration to filter by.
+    :param since: float timestamp, filter points of workloads started
+                  at or after it.
+    :param until: float timestamp, filter points of workloads started
+                  before it.
+    :returns: a list of dicts with data on the trend points.
+    """
+    return get_impl().trend_point_list(config_hash=config_hash, since=since,
+                                       until=until)
+
+
 def deployment_create(values):
     """Create a deployment from the values dictionary.
 
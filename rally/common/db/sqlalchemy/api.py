@@ -29,6 +29,7 @@ from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_utils import timeutils
+from sqlalchemy import func
 from sqlalchemy import or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
@@ -243,7 +244,8 @@ class Connection(object):
                 "load_duration": workload.load_duration,
                 "full_duration": workload.full_duration,
                 "sla": workload.sla_results["sla"],
-                "hooks": workload.hooks
+                "hooks": workload.hooks,
+                "statistics": workload.statistics
             }
         }
 
@@ -361,6 +363,12 @@ class Connection(object):
             if status is not None:
                 query = base_query.filter_by(status=status)
 
+            (self.model_query(models.TrendPoint).filter_by(task_uuid=uuid).
+             delete(synchronize_session=False))
+
+            (self.model_query(models.WorkloadProgress).
+             filter_by(task_uuid=uuid).delete(synchronize_session=False))
+
             (self.model_query(models.WorkloadData).filter_by(task_uuid=uuid).
              delete(synchronize_session=False))
 
@@ -403,6 +411,27 @@ class Connection(object):
     def task_result_get_all_by_uuid(self, uuid):
         return self._task_result_get_all_by_uuid(uuid)
 
+    # @db_api.serialize
+    def task_statistics_get_all_by_uuid(self, uuid):
+        results = []
+
+        workloads = (self.model_query(models.Workload).
+                     filter_by(task_uuid=uuid).all())
+
+        for workload in workloads:
+            # raw data is needed only by workloads which were stored without
+            # statistics by old Rally versions
+            if workload.statistics:
+                workload_data_list = []
+            else:
+                workload_data_list = self._task_workload_data_get_all(
+                    workload.uuid)
+
+            results.append(
+                self._make_old_task_result(workload, workload_data_list))
+
+        return results
+
     @db_api.serialize
     def subtask_create(self, task_uuid, title, description=None, context=None):
         subtask = models.Subtask(task_uuid=task_uuid)
@@ -432,12 +461,8 @@ class Connection(object):
         workload.save()
         return workload
 
-    @db_api.serialize
-    def workload_data_create(self, task_uuid, workload_uuid, chunk_order,
-                             data):
-        workload_data = models.WorkloadData(task_uuid=task_uuid,
-                                            workload_uuid=workload_uuid)
-
+    def _make_workload_data_values(self, task_uuid, workload_uuid,
+                                   chunk_order, data):
         raw_data = data.get("raw", [])
         iter_count = len(raw_data)
 
@@ -465,7 +490,7 @@ class Connection(object):
         if finished_at == 0:
             finished_at = now
 
-        workload_data.update({
+        return {
             "task_uuid": task_uuid,
             "workload_uuid": workload_uuid,
             "chunk_order": chunk_order,
@@ -477,10 +502,35 @@ class Connection(object):
             "compressed_chunk_size": 0,
             "started_at": dt.datetime.fromtimestamp(started_at),
             "finished_at": dt.datetime.fromtimestamp(finished_at)
-        })
+        }
+
+    @db_api.serialize
+    def workload_data_create(self, task_uuid, workload_uuid, chunk_order,
+                             data):
+        workload_data = models.WorkloadData(task_uuid=task_uuid,
+                                            workload_uuid=workload_uuid)
+        workload_data.update(self._make_workload_data_values(
+            task_uuid, workload_uuid, chunk_order, data))
         workload_data.save()
         return workload_data
 
+    def workload_data_bulk_create(self, task_uuid, workload_uuid, chunks):
+        if not chunks:
+            return
+        values = [self._make_workload_data_values(task_uuid, workload_uuid,
+                                                  chunk_order, data)
+                  for chunk_order, data in chunks]
+        # Core insert of list of values is executed as single executemany
+        # statement, without building ORM objects
+        session = get_session()
+        with session.begin():
+            session.execute(models.WorkloadData.__table__.insert(), values)
+
+    def workload_data_iter(self, workload_uuid):
+        for workload_data in self._task_workload_data_get_all(
+                workload_uuid).yield_per(1):
+            yield workload_data.chunk_data
+
     @db_api.serialize
     def workload_set_results(self, workload_uuid, data):
         workload = self.model_query(models.Workload).filter_by(
@@ -537,7 +587,7 @@ class Connection(object):
             "failed_iteration_count": failed_iter_count,
             # TODO(ikhudoshyn)
             "start_time": start,
-            "statistics": {},
+            "statistics": data.get("statistics", {}),
             "pass_sla": success
         })
 
@@ -563,6 +613,51 @@ class Connection(object):
             raise exceptions.DeploymentNotFound(deployment=deployment)
         return stored_deployment
 
+    @db_api.serialize
+    def workload_progress_create(self, task_uuid, workload_uuid, data):
+        progress = models.WorkloadProgress(task_uuid=task_uuid,
+                                           workload_uuid=workload_uuid,
+                                           data=data)
+        progress.save()
+        return progress
+
+    @db_api.serialize
+    def workload_progress_list(self, task_uuid, since_id=None, latest=False):
+        session = get_session()
+        query = self.model_query(models.WorkloadProgress,
+                                 session=session).filter_by(
+            task_uuid=task_uuid)
+        if since_id is not None:
+            query = query.filter(models.WorkloadProgress.id > since_id)
+        if latest:
+            latest_ids = (
+                session.query(func.max(models.WorkloadProgress.id)).
+                filter(models.WorkloadProgress.task_uuid == task_uuid).
+                group_by(models.WorkloadProgress.workload_uuid))
+            query = query.filter(
+                models.WorkloadProgress.id.in_(latest_ids.subquery()))
+        return query.order_by(models.WorkloadProgress.id.asc()).all()
+
+    @db_api.serialize
+    def trend_point_create(self, task_uuid, workload_uuid, values):
+        trend_point = models.TrendPoint(task_uuid=task_uuid,
+                                        workload_uuid=workload_uuid)
+        trend_point.update(values)
+        trend_point.save()
+        return trend_point
+
+    @db_api.serialize
+    def trend_point_list(self, config_hash=None, since=None, until=None):
+        query = self.model_query(models.TrendPoint)
+        if config_hash is not None:
+            query = query.filter_by(config_hash=config_hash)
+        if since is not None:
+            query = query.filter(models.TrendPoint.tstamp_start >= since)
+        if until is not None:
+            query = query.filter(models.TrendPoint.tstamp_start < until)
+        return query.order_by(models.TrendPoint.tstamp_start.asc(),
+                              models.TrendPoint.id.asc()).all()
+
     @db_api.serialize
     def deployment_create(self, values):
         deployment = models.Deployment()
@@ -0,0 +1,60 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add_deployment_capabilities
+
+Revision ID: 35fe16d4ab1c
+Revises: 7287df262dbc
+Create Date: 2017-03-20 11:05:42.581937
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "35fe16d4ab1c"
+down_revision = "7287df262dbc"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+deployments_helper = sa.Table(
+    "deployments",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column("capabilities", sa_types.MutableJSONEncodedDict)
+)
+
+
+def upgrade():
+    with op.batch_alter_table("deployments") as batch_op:
+        batch_op.add_column(
+            sa.Column("capabilities", sa_types.MutableJSONEncodedDict,
+                      default={}))
+
+    connection = op.get_bind()
+    connection.execute(deployments_helper.update().values(capabilities={}))
+
+    with op.batch_alter_table("deployments") as batch_op:
+        batch_op.alter_column("capabilities",
+                              existing_type=sa_types.MutableJSONEncodedDict,
+                              nullable=False)
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
@@ -0,0 +1,70 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add_trend_points
+
+Revision ID: 7287df262dbc
+Revises: 92aaaa2a6bb3
+Create Date: 2017-03-15 14:21:07.361203
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "7287df262dbc"
+down_revision = "92aaaa2a6bb3"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+def upgrade():
+    op.create_table(
+        "trend_points",
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("id", sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column("task_uuid", sa.String(length=36), nullable=False),
+        sa.Column("workload_uuid", sa.String(length=36), nullable=False),
+        sa.Column("config_hash", sa.String(length=32), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("config", sa.Text(), default="", nullable=False),
+        sa.Column("sla_failures", sa.Integer(), default=0, nullable=False),
+        sa.Column("tstamp_start", sa.Float(), nullable=False),
+
+        sa.Column(
+            "stat",
+            sa_types.MutableJSONEncodedDict(),
+            default={},
+            nullable=False),
+
+        sa.ForeignKeyConstraint(["task_uuid"], ["tasks.uuid"], ),
+        sa.ForeignKeyConstraint(["workload_uuid"], ["workloads.uuid"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.create_index("trend_point_config_hash_tstamp", "trend_points",
+                    ["config_hash", "tstamp_start"], unique=False)
+    op.create_index("trend_point_tstamp", "trend_points",
+                    ["tstamp_start"], unique=False)
+    op.create_index("trend_point_workload_uuid", "trend_points",
+                    ["workload_uuid"], unique=True)
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
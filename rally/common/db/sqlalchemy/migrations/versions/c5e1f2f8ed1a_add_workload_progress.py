@@ -0,0 +1,61 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""add_workload_progress
+
+Revision ID: c5e1f2f8ed1a
+Revises: 35fe16d4ab1c
+Create Date: 2017-03-22 16:37:12.904215
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c5e1f2f8ed1a"
+down_revision = "35fe16d4ab1c"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db.sqlalchemy import types as sa_types
+from rally import exceptions
+
+
+def upgrade():
+    op.create_table(
+        "workload_progress",
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("id", sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column("task_uuid", sa.String(length=36), nullable=False),
+        sa.Column("workload_uuid", sa.String(length=36), nullable=False),
+
+        sa.Column(
+            "data",
+            sa_types.MutableJSONEncodedDict(),
+            default={},
+            nullable=False),
+
+        sa.ForeignKeyConstraint(["task_uuid"], ["tasks.uuid"], ),
+        sa.ForeignKeyConstraint(["workload_uuid"], ["workloads.uuid"], ),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.create_index("workload_progress_task_uuid_id", "workload_progress",
+                    ["task_uuid", "id"], unique=False)
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
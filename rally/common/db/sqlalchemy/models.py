@@ -85,6 +85,11 @@ class Deployment(BASE, RallyBase):
     credentials = sa.Column(
         sa_types.MutableJSONEncodedDict, default={}, nullable=False)
 
+    # discovered services, API versions and extensions of the cloud, see
+    # rally.osclients.Capabilities
+    capabilities = sa.Column(
+        sa_types.MutableJSONEncodedDict, default={}, nullable=False)
+
     status = sa.Column(
         sa.Enum(*consts.DeployStatus, name="enum_deploy_status"),
         name="enum_deployments_status",
@@ -323,6 +328,65 @@ class WorkloadData(BASE, RallyBase):
         sa_types.MutableJSONEncodedDict, default={}, nullable=False)
 
 
+class TrendPoint(BASE, RallyBase):
+    """Represents statistics of finished workload for trends."""
+    __tablename__ = "trend_points"
+    __table_args__ = (
+        sa.Index("trend_point_config_hash_tstamp", "config_hash",
+                 "tstamp_start"),
+        sa.Index("trend_point_tstamp", "tstamp_start"),
+        sa.Index("trend_point_workload_uuid", "workload_uuid", unique=True),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+
+    task_uuid = sa.Column(
+        sa.String(36),
+        sa.ForeignKey(Task.uuid),
+        nullable=False,
+    )
+
+    workload_uuid = sa.Column(
+        sa.String(36),
+        sa.ForeignKey(Workload.uuid),
+        nullable=False,
+    )
+
+    config_hash = sa.Column(sa.String(32), nullable=False)
+    name = sa.Column(sa.String(64), nullable=False)
+    config = sa.Column(sa.Text, default="", nullable=False)
+    sla_failures = sa.Column(sa.Integer, default=0, nullable=False)
+    tstamp_start = sa.Column(sa.Float, nullable=False)
+
+    stat = sa.Column(
+        sa_types.MutableJSONEncodedDict, default={}, nullable=False)
+
+
+class WorkloadProgress(BASE, RallyBase):
+    """Represents compact progress record of running workload."""
+    __tablename__ = "workload_progress"
+    __table_args__ = (
+        sa.Index("workload_progress_task_uuid_id", "task_uuid", "id"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+
+    task_uuid = sa.Column(
+        sa.String(36),
+        sa.ForeignKey(Task.uuid),
+        nullable=False,
+    )
+
+    workload_uuid = sa.Column(
+        sa.String(36),
+        sa.ForeignKey(Workload.uuid),
+        nullable=False,
+    )
+
+    data = sa.Column(
+        sa_types.MutableJSONEncodedDict, default={}, nullable=False)
+
+
 class Tag(BASE, RallyBase):
     __tablename__ = "tags"
     __table_args__ = (
@@ -89,6 +89,10 @@ class MutableDict(mutable.Mutable, dict):
         dict.__delitem__(self, key)
         self.changed()
 
+    def __getstate__(self):
+        """Do not pickle weak references to parents, only items."""
+        return {}
+
 
 class MutableList(mutable.Mutable, list):
     @classmethod
@@ -123,6 +127,10 @@ class MutableList(mutable.Mutable, list):
         list.__delitem__(self, i)
         self.changed()
 
+    def __getstate__(self):
+        """Do not pickle weak references to parents, only items."""
+        return {}
+
 
 class MutableJSONEncodedList(JSONEncodedList):
     """Represent a mutable structure as a json-encoded string."""
@@ -14,10 +14,15 @@
 #    under the License.
 
 import functools
+import multiprocessing.util
+import os
+import threading
+import time
 
 from oslo_config import cfg
 from oslo_log import handlers
 from oslo_log import log as oslogging
+from six.moves import queue
 
 from rally.common.i18n import _
 
@@ -29,8 +34,33 @@ DEBUG_OPTS = [cfg.BoolOpt(
     help="Print debugging output only for Rally. "
          "Off-site components stay quiet.")]
 
+ASYNC_LOG_OPTS = [
+    cfg.BoolOpt("log_async",
+                default=False,
+                help="Hand log records to background thread of each "
+                     "process which formats and writes them, so threads "
+                     "of scenario runners are not blocked by logging"),
+    cfg.IntOpt("log_async_queue_size",
+               default=10000,
+               min=1,
+               help="Max number of log records waiting to be written in "
+                    "async mode. Records are dropped when queue is full"),
+    cfg.IntOpt("iteration_log_sampling",
+               default=1,
+               min=1,
+               help="Log start and end of each N-th iteration only. Ends "
+                    "of failed iterations are always logged"),
+    cfg.IntOpt("iteration_log_rate_limit",
+               default=0,
+               min=0,
+               help="Max number of iterations per second per process which "
+                    "start and end are logged, 0 means no limit. Ends of "
+                    "failed iterations are always logged"),
+]
+
 CONF = cfg.CONF
 CONF.register_cli_opts(DEBUG_OPTS)
+CONF.register_opts(ASYNC_LOG_OPTS)
 oslogging.register_options(CONF)
 
 log.RDEBUG = log.DEBUG + 1
@@ -57,6 +87,154 @@ def setup(product_name, version="unknown"):
         oslogging.getLogger(
             project=product_name).logger.setLevel(log.RDEBUG)
 
+    if CONF.log_async:
+        enable_async(log.getLogger(), CONF.log_async_queue_size)
+
+
+class AsyncHandler(log.Handler):
+    """Handler which hands records to background thread.
+
+    Records are formatted and written by target handlers in background
+    thread, which is started in each process on first record. Records which
+    don't fit in queue are dropped and counted.
+    """
+
+    def __init__(self, targets, queue_size=10000):
+        """Create async handler.
+
+        :param targets: list of handlers which write records
+        :param queue_size: max number of records waiting to be written
+        """
+        super(AsyncHandler, self).__init__()
+        self.targets = targets
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._register_flush()
+        multiprocessing.util.register_after_fork(
+            self, AsyncHandler._register_flush)
+
+    def _register_flush(self):
+        # multiprocessing finalizers are also called on exit of worker
+        # processes, unlike atexit callbacks
+        multiprocessing.util.Finalize(None, self.flush, exitpriority=10)
+
+    def _start(self):
+        with self.lock:
+            if self._pid != os.getpid():
+                self.dropped = 0
+                self._queue = queue.Queue(self.queue_size)
+                self._thread = threading.Thread(target=self._consume)
+                self._thread.daemon = True
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def _is_started(self):
+        return self._pid == os.getpid()
+
+    def handle(self, record):
+        # queue is thread safe, so lock of handler is not acquired
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        if not self._is_started():
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write(self, record):
+        for target in self.targets:
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    def _consume(self):
+        reported = 0
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    break
+                self._write(record)
+                if self.dropped > reported:
+                    self._write(log.makeLogRecord({
+                        "name": __name__, "levelno": WARNING,
+                        "levelname": log.getLevelName(WARNING),
+                        "msg": "%d log records were dropped since async "
+                               "log queue is full",
+                        "args": (self.dropped - reported,)}))
+                    reported = self.dropped
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Wait until queued records are written."""
+        if self._is_started() and self._thread.is_alive():
+            self._queue.join()
+        for target in self.targets:
+            target.flush()
+
+    def close(self):
+        if self._is_started() and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        for target in self.targets:
+            target.close()
+        super(AsyncHandler, self).close()
+
+
+def enable_async(logger, queue_size=10000):
+    """Replace handlers of logger with AsyncHandler which wraps them."""
+    targets = [h for h in logger.handlers
+               if not isinstance(h, AsyncHandler)]
+    if not targets:
+        return
+    for target in targets:
+        logger.removeHandler(target)
+    logger.addHandler(AsyncHandler(targets, queue_size))
+
+
+class RateLimiter(object):
+    """Allows limited number of events per second."""
+
+    def __init__(self):
+        self._second = None
+        self._count = 0
+
+    def allow(self, limit):
+        """Register event and check whether it is allowed.
+
+        :param limit: max number of events per second, 0 means no limit
+        """
+        if not limit:
+            return True
+        second = int(time.time())
+        if second != self._second:
+            self._second = second
+            self._count = 0
+        self._count += 1
+        return self._count <= limit
+
+
+_iteration_rate_limiter = RateLimiter()
+
+
+def is_iteration_logged(iteration):
+    """Check whether start and end of iteration should be logged.
+
+    :param iteration: number of iteration, starting from 1
+    """
+    sampling = CONF.iteration_log_sampling
+    if sampling > 1 and (iteration - 1) % sampling:
+        return False
+    return _iteration_rate_limiter.allow(CONF.iteration_log_rate_limit)
+
 
 class RallyContextAdapter(oslogging.KeywordArgumentAdapter):
 
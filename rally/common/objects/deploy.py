@@ -95,6 +95,9 @@ class Deployment(object):
         jsonschema.validate(credentials, CREDENTIALS_SCHEMA)
         self._update({"credentials": credentials})
 
+    def update_capabilities(self, capabilities):
+        self._update({"capabilities": capabilities})
+
     def get_credentials_for(self, namespace):
         try:
             return self.deployment["credentials"][namespace][0]
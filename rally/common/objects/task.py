@@ -21,6 +21,7 @@ from rally.common import db
 from rally.common.i18n import _LE
 from rally import consts
 from rally import exceptions
+from rally.task import atomic as atomic_utils
 from rally.task.processing import charts
 
 
@@ -177,7 +178,7 @@ TASK_RESULT_SCHEMA = {
                 "type": "object",
                 "properties": {
                     "atomic_actions": {
-                        "type": "object"
+                        "type": ["array", "object"]
                     },
                     "duration": {
                         "type": "number"
@@ -270,7 +271,7 @@ TASK_EXTENDED_RESULT_SCHEMA = {
                         "type": "number"
                     },
                     "atomic_actions": {
-                        "type": "object"
+                        "type": ["array", "object"]
                     },
                     "duration": {
                         "type": "number"
@@ -341,6 +342,13 @@ class Task(object):
     NOT_IMPLEMENTED_STAGES_FOR_ABORT = [consts.TaskStatus.VALIDATING,
                                         consts.TaskStatus.INIT]
 
+    # task in any other status may still create or use resources in the cloud
+    FINAL_STATUSES = (consts.TaskStatus.FINISHED,
+                      consts.TaskStatus.CRASHED,
+                      consts.TaskStatus.ABORTED,
+                      consts.TaskStatus.SLA_FAILED,
+                      consts.TaskStatus.VALIDATION_FAILED)
+
     def __init__(self, task=None, temporary=False, **attributes):
         """Task object init
 
@@ -413,6 +421,9 @@ class Task(object):
     def get_results(self):
         return db.task_result_get_all_by_uuid(self.task["uuid"])
 
+    def get_statistics(self):
+        return db.task_statistics_get_all_by_uuid(self.task["uuid"])
+
     @classmethod
     def extend_results(cls, results, serializable=False):
         """Modify and extend results with aggregated data.
@@ -441,6 +452,8 @@ class Task(object):
                                otherwise absent
                   info:
                       atomic - dict where key is one of atomic action names
+                               (names of nested atomic actions are joined
+                               with names of parents by " > ")
                                and value is dict {min_duration: number,
                                                   max_duration: number}
                       iterations_count - int number of iterations
@@ -461,8 +474,12 @@ class Task(object):
             atomic = collections.OrderedDict()
 
             for itr in scenario["data"]["raw"]:
-                for atomic_name, duration in itr["atomic_actions"].items():
-                    duration = duration or 0
+                itr["atomic_actions"] = (
+                    atomic_utils.convert_legacy_atomic_actions(
+                        itr["atomic_actions"]))
+                durations = atomic_utils.flatten_atomic_actions(
+                    itr["atomic_actions"], nested=True)
+                for atomic_name, duration in durations.items():
                     if atomic_name not in atomic:
                         atomic[atomic_name] = {"min_duration": duration,
                                                "max_duration": duration}
@@ -582,6 +599,8 @@ class Workload(object):
 
     def __init__(self, task_uuid, subtask_uuid, key):
         self.workload = db.workload_create(task_uuid, subtask_uuid, key)
+        self._iterations_count = 0
+        self._atomic = collections.OrderedDict()
 
     def __getitem__(self, key):
         return self.workload[key]
@@ -590,6 +609,89 @@ class Workload(object):
         db.workload_data_create(self.workload["task_uuid"],
                                 self.workload["uuid"], chunk_order,
                                 workload_data)
+        self._count_iterations(workload_data)
+
+    def add_workload_data_chunks(self, chunks):
+        """Write several chunks of workload data in one transaction.
+
+        :param chunks: list of (chunk_order, workload_data) pairs
+        """
+        db.workload_data_bulk_create(self.workload["task_uuid"],
+                                     self.workload["uuid"], chunks)
+        for chunk_order, workload_data in chunks:
+            self._count_iterations(workload_data)
+
+    def add_progress(self, data):
+        """Store compact progress record of running workload."""
+        db.workload_progress_create(self.workload["task_uuid"],
+                                    self.workload["uuid"], data)
+
+    def _count_iterations(self, workload_data):
+        # raw results are not kept in memory, only the number of iterations and
+        # names of atomic actions are counted, so computations of statistics
+        # can be sized and set up later
+        for itr in workload_data.get("raw", []):
+            self._iterations_count += 1
+            for name in atomic_utils.flatten_atomic_actions(
+                    itr["atomic_actions"], nested=True):
+                self._atomic.setdefault(name, {})
+
+    def _get_statistics(self, data):
+        durations_stat = charts.MainStatsTable(
+            {"iterations_count": self._iterations_count,
+             "atomic": self._atomic})
+        tstamp_start = 0
+        # all chunks are already written, so they are read back from DB one by
+        # one and fed to streaming computations
+        for workload_data in db.workload_data_iter(self.workload["uuid"]):
+            for itr in workload_data.get("raw", []):
+                durations_stat.add_iteration(itr)
+                if not tstamp_start or itr["timestamp"] < tstamp_start:
+                    tstamp_start = itr["timestamp"]
+        return {"durations": durations_stat.render(),
+                "tstamp_start": tstamp_start}
+
+    def _add_trend_point(self, data):
+        # plot is imported here to avoid cyclic import, since plot imports
+        # objects
+        from rally.task.processing import plot
+
+        # key should be the same as key of task results loaded from DB, so
+        # hashes of configs are the same for both
+        key = {"name": self.workload["name"],
+               "kw": {"args": self.workload["args"],
+                      "runner": self.workload["runner"],
+                      "context": self.workload["context"],
+                      "sla": self.workload["sla"],
+                      "hooks": [h["config"] for h in data.get("hooks", [])]}}
+        statistics = data["statistics"]
+        point = plot.Trends().make_point(
+            {"key": key, "sla": data.get("sla", []),
+             "info": {"stat": statistics["durations"],
+                      "tstamp_start": statistics["tstamp_start"]}})
+        db.trend_point_create(self.workload["task_uuid"],
+                              self.workload["uuid"], point)
 
     def set_results(self, data):
+        """Set results of workload.
+
+        Statistics of durations are calculated from added workload data
+        and stored too, so trends can be built without raw data. Point of
+        trends is stored as well, so trends of many tasks can be built
+        from the trend points only.
+        """
+        if "statistics" not in data:
+            data = dict(data, statistics=self._get_statistics(data))
         db.workload_set_results(self.workload["uuid"], data)
+        if data["statistics"]:
+            self._add_trend_point(data)
+
+    @staticmethod
+    def list_trend_points(config_hash=None, since=None, until=None):
+        return db.trend_point_list(config_hash=config_hash, since=since,
+                                   until=until)
+
+    @staticmethod
+    def list_progress(task_uuid, since_id=None, latest=False):
+        return db.workload_progress_list(task_uuid, since_id=since_id,
+                                         latest=latest)
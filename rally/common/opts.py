@@ -35,12 +35,15 @@ from rally.plugins.openstack.scenarios.watcher import utils as watcher_utils
 from rally.plugins.openstack.verification.tempest import config as tempest_conf
 from rally.plugins.openstack.wrappers import glance as glance_utils
 from rally.task import engine
+from rally.task import metrics
+from rally.task import utils as task_utils
 
 
 def list_opts():
     return [
         ("DEFAULT",
          itertools.chain(logging.DEBUG_OPTS,
+                         logging.ASYNC_LOG_OPTS,
                          osclients.OSCLIENTS_OPTS,
                          engine.TASK_ENGINE_OPTS)),
         ("benchmark",
@@ -57,10 +60,12 @@ def list_opts():
                          nova_utils.NOVA_BENCHMARK_OPTS,
                          sahara_utils.SAHARA_BENCHMARK_OPTS,
                          vm_utils.VM_BENCHMARK_OPTS,
-                         watcher_utils.WATCHER_BENCHMARK_OPTS)),
+                         watcher_utils.WATCHER_BENCHMARK_OPTS,
+                         task_utils.STATUS_POLLER_OPTS)),
         ("tempest",
          itertools.chain(tempest_conf.TEMPEST_OPTS)),
         ("roles_context", itertools.chain(roles.ROLES_CONTEXT_OPTS)),
         ("users_context", itertools.chain(users.USER_CONTEXT_OPTS)),
-        ("cleanup", itertools.chain(cleanup_base.CLEANUP_OPTS))
+        ("cleanup", itertools.chain(cleanup_base.CLEANUP_OPTS)),
+        ("task_metrics", itertools.chain(metrics.METRICS_OPTS))
     ]
@@ -16,6 +16,7 @@
 import imp
 import os
 import sys
+import threading
 
 from oslo_utils import importutils
 
@@ -25,6 +26,12 @@ from rally.common import logging
 
 LOG = logging.getLogger(__name__)
 
+# Modules and plugins which are imported on demand,
+# see register_lazy_plugins()
+_LAZY_MODULES = set()
+_LAZY_PLUGINS = []
+_LAZY_LOCK = threading.RLock()
+
 
 def itersubclasses(cls, seen=None):
     """Generator over all subclasses of a given class in depth first order."""
@@ -60,6 +67,57 @@ def import_modules_from_package(package):
                     module_name)
 
 
+def register_lazy_plugins(modules, plugins):
+    """Register modules which should be imported on demand.
+
+    :param modules: list of full names of modules
+    :param plugins: list of (base, namespace, name, module) entries, where
+                    base is full name of plugin base class and module is
+                    name of module where plugin is defined
+    """
+    with _LAZY_LOCK:
+        _LAZY_MODULES.update(modules)
+        _LAZY_PLUGINS.extend(tuple(p) for p in plugins)
+
+
+def import_lazy_plugins(base=None, namespace=None, name=None):
+    """Import modules registered by register_lazy_plugins().
+
+    If no arguments are specified, all registered modules are imported.
+    Otherwise only modules with plugins matching all specified arguments
+    are imported.
+
+    :param base: full name of plugin base class
+    :param namespace: plugin namespace
+    :param name: plugin name
+    """
+    if not _LAZY_MODULES:
+        return
+
+    with _LAZY_LOCK:
+        if base is None and namespace is None and name is None:
+            modules = set(_LAZY_MODULES)
+            del _LAZY_PLUGINS[:]
+        else:
+            modules = set()
+            remaining = []
+            for entry in _LAZY_PLUGINS:
+                p_base, p_namespace, p_name, module = entry
+                if ((base is None or base == p_base)
+                        and (namespace is None or namespace == p_namespace)
+                        and (name is None or name == p_name)):
+                    modules.add(module)
+                else:
+                    remaining.append(entry)
+            _LAZY_PLUGINS[:] = remaining
+        _LAZY_MODULES.difference_update(modules)
+
+        for module_name in sorted(modules):
+            if module_name not in sys.modules:
+                LOG.debug("Importing module with plugins %s", module_name)
+                importutils.import_module(module_name)
+
+
 def load_plugins(dir_or_file):
     if os.path.isdir(dir_or_file):
         directory = dir_or_file
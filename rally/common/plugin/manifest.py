@@ -0,0 +1,120 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Manifest of plugins which allows to import plugin modules lazily.
+
+Manifest is a dict with the following keys:
+
+    version:  version of manifest format
+    packages: list of packages covered by manifest
+    mtimes:   dict with modification times of all python files of packages,
+              used to check that manifest is up to date
+    modules:  list of all modules of packages
+    plugins:  list of [base, namespace, name, module] entries, where base is
+              full name of plugin base class (None for plugins without
+              base) and module is name of module where plugin is defined
+"""
+
+import json
+import os
+import tempfile
+
+import rally
+from rally.common.plugin import discover
+from rally.common.plugin import plugin
+
+VERSION = 1
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(rally.__file__)))
+
+
+def _in_packages(module, packages):
+    return any(module == p or module.startswith(p + ".") for p in packages)
+
+
+def _get_mtimes(packages):
+    mtimes = {}
+    for package in packages:
+        path = os.path.join(ROOT, *package.split("."))
+        for root, dirs, files in os.walk(path):
+            for filename in files:
+                if filename.endswith(".py"):
+                    fullpath = os.path.join(root, filename)
+                    mtimes[os.path.relpath(fullpath, ROOT)] = (
+                        os.path.getmtime(fullpath))
+    return mtimes
+
+
+def generate(packages):
+    """Import all modules of packages and generate manifest of them.
+
+    :param packages: list of full names of packages
+    """
+    packages = sorted(packages)
+    mtimes = _get_mtimes(packages)
+    for package in packages:
+        discover.import_modules_from_package(package)
+
+    modules = set()
+    for path in mtimes:
+        filename = os.path.basename(path)
+        if not filename.startswith("__"):
+            modules.add(path[:-len(".py")].replace(os.sep, "."))
+
+    plugins = []
+    for p in discover.itersubclasses(plugin.Plugin):
+        if not p._meta_is_inited(raise_exc=False):
+            continue
+        module = getattr(p, "func_ref", p).__module__
+        if not _in_packages(module, packages):
+            continue
+        plugins.append([p._get_base_name(), p.get_namespace(),
+                        p.get_name(), module])
+
+    return {"version": VERSION,
+            "packages": packages,
+            "mtimes": mtimes,
+            "modules": sorted(modules),
+            "plugins": sorted(plugins, key=lambda p: (p[3], p[2], p[1]))}
+
+
+def is_up_to_date(manifest, packages):
+    """Check that manifest describes current sources of packages."""
+    return (manifest.get("version") == VERSION
+            and manifest.get("packages") == sorted(packages)
+            and manifest.get("mtimes") == _get_mtimes(packages))
+
+
+def load(path):
+    """Returns manifest stored in file or None if it can't be read."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def save(manifest, path):
+    """Atomically store manifest to file."""
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.rename(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
@@ -175,6 +175,14 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
     def _get_base(cls):
         return getattr(cls, "base_ref", Plugin)
 
+    @classmethod
+    def _get_base_name(cls):
+        """Returns full name of plugin base or None for Plugin itself."""
+        base = cls._get_base()
+        if base is Plugin:
+            return None
+        return "%s.%s" % (base.__module__, base.__name__)
+
     @classmethod
     def _set_name_and_namespace(cls, name, namespace):
         try:
@@ -221,9 +229,11 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         :param allow_hidden: if False and found plugin is hidden then
             PluginNotFound will be raised
         """
+        discover.import_lazy_plugins(base=cls._get_base_name(),
+                                     namespace=namespace, name=name)
         potential_result = []
 
-        for p in cls.get_all(namespace=namespace, allow_hidden=True):
+        for p in cls._get_all(namespace=namespace, allow_hidden=True):
             if p.get_name() == name:
                 potential_result.append(p)
 
@@ -256,6 +266,12 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         :param namespace: return only plugins from specified namespace.
         :param allow_hidden: if False return only non hidden plugins
         """
+        discover.import_lazy_plugins(base=cls._get_base_name(),
+                                     namespace=namespace)
+        return cls._get_all(namespace=namespace, allow_hidden=allow_hidden)
+
+    @classmethod
+    def _get_all(cls, namespace=None, allow_hidden=False):
         plugins = []
 
         for p in discover.itersubclasses(cls):
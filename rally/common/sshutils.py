@@ -47,6 +47,21 @@ Upload file:
     ssh = sshclient.SSH("user", "example.com")
     ssh.run("cat > ~/upload/file.gz", stdin=open("/store/file.gz", "rb"))
 
+Reuse connections:
+
+    pool = sshclient.SSHConnectionPool()
+    for i in range(100):
+        ssh = sshclient.SSH("user", "example.com", pool=pool)
+        ssh.execute("uname")
+    pool.close()
+
+Execute command on many hosts in parallel:
+
+    fan_out = sshclient.SSHFanOut([sshclient.SSH("user", host)
+                                   for host in hosts], workers=10)
+    for result in fan_out.execute("uname -a"):
+        print(result["host"], result["exit_status"], result["stdout"])
+
 Eventlet:
 
     eventlet.monkey_patch(select=True, time=True)
@@ -60,22 +75,140 @@ Eventlet:
 import os
 import select
 import socket
+import threading
 import time
 
 import paramiko
 import six
 
+from rally.common import broker
 from rally.common import logging
 from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+# Size of chunks which are read from the channel or stdin at once
+CHUNK_SIZE = 64 * 1024
+
+
+class SSHConnectionPool(object):
+    """Pool of ssh connections shared between SSH objects.
+
+    Connections are identified by host, port, user and credentials, so all
+    SSH objects pointing to the same server with the same credentials use
+    one transport and run commands in separate channels of it.
+    """
+
+    def __init__(self, max_idle=300):
+        """Initialize connection pool.
+
+        :param max_idle: Time in seconds after which unused connection is
+                         closed
+        """
+        self.max_idle = max_idle
+        self._clients = {}
+        self._locks = {}
+        self._users = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(ssh):
+        return (ssh.host, ssh.port, ssh.user,
+                ssh.pkey.get_fingerprint() if ssh.pkey else None,
+                ssh.key_filename, ssh.password)
+
+    def _prune(self, key):
+        # lock is dropped only when nobody is going to take it
+        if not self._users.get(key) and key not in self._clients:
+            self._locks.pop(key, None)
+
+    def _close_idle(self):
+        now = time.time()
+        for key, (client, used_at) in list(self._clients.items()):
+            # clients are used from the start of get() until release(),
+            # so clients which run commands are never closed
+            if self._users.get(key) or now - used_at <= self.max_idle:
+                continue
+            self._clients.pop(key)
+            self._prune(key)
+            client.close()
+
+    def get(self, ssh):
+        """Returns connected paramiko client for the SSH object.
+
+        The client is not closed as idle until release() is called for the
+        SSH object, so each call should be followed by release().
+
+        :param ssh: SSH instance
+        """
+        key = self._key(ssh)
+        with self._lock:
+            self._close_idle()
+            lock = self._locks.setdefault(key, threading.Lock())
+            self._users[key] = self._users.get(key, 0) + 1
+
+        try:
+            with lock:
+                client = self._clients.get(key, (None, None))[0]
+                if client is not None:
+                    transport = client.get_transport()
+                    if transport is not None and transport.is_active():
+                        self._clients[key] = (client, time.time())
+                        return client
+                    client.close()
+                client = ssh._connect()
+                self._clients[key] = (client, time.time())
+                return client
+        except Exception:
+            self.release(ssh)
+            raise
+
+    def release(self, ssh):
+        """Marks client of the SSH object as not used by the caller.
+
+        :param ssh: SSH instance which was passed to get()
+        """
+        key = self._key(ssh)
+        with self._lock:
+            users = self._users.pop(key, 0) - 1
+            if users > 0:
+                self._users[key] = users
+            if key in self._clients:
+                self._clients[key] = (self._clients[key][0], time.time())
+            self._prune(key)
+
+    def discard(self, host):
+        """Close all connections to the host.
+
+        :param host: hostname or ip address of remote ssh server
+        """
+        with self._lock:
+            locks = [(k, lock) for k, lock in self._locks.items()
+                     if k[0] == host]
+        for key, lock in locks:
+            with lock:
+                client = self._clients.pop(key, (None, None))[0]
+                if client is not None:
+                    client.close()
+        with self._lock:
+            for key, lock in locks:
+                self._prune(key)
+
+    def close(self):
+        """Close all connections."""
+        with self._lock:
+            for client, used_at in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._locks.clear()
+            self._users.clear()
+
 
 class SSH(object):
     """Represent ssh connection."""
 
     def __init__(self, user, host, port=22, pkey=None,
-                 key_filename=None, password=None):
+                 key_filename=None, password=None, pool=None):
         """Initialize SSH client.
 
         :param user: ssh username
@@ -84,6 +217,7 @@ class SSH(object):
         :param pkey: RSA or DSS private key string or file object
         :param key_filename: private key filename
         :param password: password
+        :param pool: SSHConnectionPool instance to take connection from
         """
 
         self.user = user
@@ -92,6 +226,7 @@ class SSH(object):
         self.pkey = self._get_pkey(pkey) if pkey else None
         self.password = password
         self.key_filename = key_filename
+        self.pool = pool
         self._client = False
 
     def _get_pkey(self, key):
@@ -105,30 +240,39 @@ class SSH(object):
                 errors.append(e)
         raise exceptions.SSHError("Invalid pkey: %s" % (errors))
 
-    def _get_client(self):
-        if self._client:
-            return self._client
+    def _connect(self):
         try:
-            self._client = paramiko.SSHClient()
-            self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self._client.connect(self.host, username=self.user,
-                                 port=self.port, pkey=self.pkey,
-                                 key_filename=self.key_filename,
-                                 password=self.password, timeout=1)
-            return self._client
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect(self.host, username=self.user,
+                           port=self.port, pkey=self.pkey,
+                           key_filename=self.key_filename,
+                           password=self.password, timeout=1)
+            return client
         except Exception as e:
             message = ("Exception %(exception_type)s was raised "
                        "during connect to %(user)s@%(host)s:%(port)s. "
                        "Exception value is: %(exception)r")
-            self._client = False
             raise exceptions.SSHError(message % {"exception": e,
                                                  "user": self.user,
                                                  "host": self.host,
                                                  "port": self.port,
                                                  "exception_type": type(e)})
 
+    def _get_client(self):
+        if self.pool:
+            return self.pool.get(self)
+        if not self._client:
+            self._client = self._connect()
+        return self._client
+
+    def _release_client(self):
+        if self.pool:
+            self.pool.release(self)
+
     def close(self):
-        self._client.close()
+        if self._client:
+            self._client.close()
         self._client = False
 
     def run(self, cmd, stdin=None, stdout=None, stderr=None,
@@ -150,9 +294,12 @@ class SSH(object):
         if isinstance(stdin, six.string_types):
             stdin = six.moves.StringIO(stdin)
 
-        return self._run(client, cmd, stdin=stdin, stdout=stdout,
-                         stderr=stderr, raise_on_error=raise_on_error,
-                         timeout=timeout)
+        try:
+            return self._run(client, cmd, stdin=stdin, stdout=stdout,
+                             stderr=stderr, raise_on_error=raise_on_error,
+                             timeout=timeout)
+        finally:
+            self._release_client()
 
     def _run(self, client, cmd, stdin=None, stdout=None, stderr=None,
              raise_on_error=True, timeout=3600):
@@ -180,15 +327,15 @@ class SSH(object):
             r, w, e = select.select([session], writes, [session], 1)
 
             if session.recv_ready():
-                data = session.recv(4096)
-                LOG.debug("stdout: %r" % data)
+                data = session.recv(CHUNK_SIZE)
+                LOG.debug("stdout: %r", data)
                 if stdout is not None:
                     stdout.write(data.decode("utf8"))
                 continue
 
             if session.recv_stderr_ready():
-                stderr_data = session.recv_stderr(4096)
-                LOG.debug("stderr: %r" % stderr_data)
+                stderr_data = session.recv_stderr(CHUNK_SIZE)
+                LOG.debug("stderr: %r", stderr_data)
                 if stderr is not None:
                     stderr.write(stderr_data.decode("utf8"))
                 continue
@@ -196,14 +343,14 @@ class SSH(object):
             if session.send_ready():
                 if stdin is not None and not stdin.closed:
                     if not data_to_send:
-                        data_to_send = stdin.read(4096)
+                        data_to_send = stdin.read(CHUNK_SIZE)
                         if not data_to_send:
                             stdin.close()
                             session.shutdown_write()
                             writes = []
                             continue
                     sent_bytes = session.send(data_to_send)
-                    LOG.debug("sent: %s" % data_to_send[:sent_bytes])
+                    LOG.debug("sent: %d bytes", sent_bytes)
                     data_to_send = data_to_send[sent_bytes:]
 
             if session.exit_status_ready():
@@ -245,15 +392,23 @@ class SSH(object):
         stderr.seek(0)
         return (exit_status, stdout.read(), stderr.read())
 
-    def wait(self, timeout=120, interval=1):
-        """Wait for the host will be available via ssh."""
+    def wait(self, timeout=120, interval=1, max_interval=None):
+        """Wait for the host will be available via ssh.
+
+        :param timeout: Timeout in seconds
+        :param interval: Interval in seconds between checks
+        :param max_interval: If specified, interval is doubled after each
+                             failed check until it reaches max_interval
+        """
         start_time = time.time()
         while True:
             try:
                 return self.execute("uname")
             except (socket.error, exceptions.SSHError) as e:
-                LOG.debug("Ssh is still unavailable: %r" % e)
+                LOG.debug("Ssh is still unavailable: %r", e)
                 time.sleep(interval)
+                if max_interval:
+                    interval = min(interval * 2, max_interval)
             if time.time() > (start_time + timeout):
                 raise exceptions.SSHTimeout("Timeout waiting for '%s'" %
                                             self.host)
@@ -261,11 +416,14 @@ class SSH(object):
     def _put_file_sftp(self, localpath, remotepath, mode=None):
         client = self._get_client()
 
-        with client.open_sftp() as sftp:
-            sftp.put(localpath, remotepath)
-            if mode is None:
-                mode = 0o777 & os.stat(localpath).st_mode
-            sftp.chmod(remotepath, mode)
+        try:
+            with client.open_sftp() as sftp:
+                sftp.put(localpath, remotepath)
+                if mode is None:
+                    mode = 0o777 & os.stat(localpath).st_mode
+                sftp.chmod(remotepath, mode)
+        finally:
+            self._release_client()
 
     def _put_file_shell(self, localpath, remotepath, mode=None):
         cmd = ["cat > %s" % remotepath]
@@ -288,3 +446,99 @@ class SSH(object):
             self._put_file_sftp(localpath, remotepath, mode=mode)
         except (paramiko.SSHException, socket.error):
             self._put_file_shell(localpath, remotepath, mode=mode)
+
+
+class SSHFanOut(object):
+    """Run the same operation on many hosts in parallel.
+
+    Operations are executed by a bounded number of worker threads. Failure
+    on one host does not affect others: each operation returns list of
+    per-host results in the same order as ssh clients were passed.
+    """
+
+    def __init__(self, ssh_clients, workers=10):
+        """Initialize fan-out executor.
+
+        :param ssh_clients: list of SSH instances
+        :param workers: max number of hosts processed simultaneously
+        """
+        self.ssh_clients = list(ssh_clients)
+        self.workers = workers
+
+    def _run(self, func):
+        results = [None] * len(self.ssh_clients)
+
+        def publish(queue):
+            for idx, ssh in enumerate(self.ssh_clients):
+                queue.append((idx, ssh))
+
+        def consume(cache, args):
+            idx, ssh = args
+            result = {"host": ssh.host, "error": None}
+            started_at = time.time()
+            try:
+                result.update(func(ssh) or {})
+            except Exception as e:
+                LOG.debug("Operation failed on host %s: %r", ssh.host, e)
+                result["error"] = "%s: %s" % (type(e).__name__, e)
+            result["duration"] = time.time() - started_at
+            results[idx] = result
+
+        if self.ssh_clients:
+            broker.run(publish, consume,
+                       min(self.workers, len(self.ssh_clients)))
+        return results
+
+    def execute(self, cmd, stdin=None, timeout=3600):
+        """Execute the specified command on all hosts.
+
+        :param cmd: Command to be executed, can be a list.
+        :param stdin: Open file or string to be sent on process stdin. Open
+                      file is read once and its content is sent to each host.
+        :param timeout: Timeout for execution of the command on each host.
+
+        :returns: list of dicts with keys "host", "exit_status", "stdout",
+                  "stderr", "duration" and "error". "error" is None if
+                  command was executed, otherwise description of the ssh
+                  failure (in this case there is no "exit_status", "stdout"
+                  and "stderr" keys)
+        """
+        if stdin is not None and not isinstance(stdin, six.string_types):
+            stdin = stdin.read()
+
+        def execute(ssh):
+            data = stdin
+            if isinstance(data, six.binary_type):
+                data = six.BytesIO(data)
+            status, stdout, stderr = ssh.execute(cmd, stdin=data,
+                                                 timeout=timeout)
+            return {"exit_status": status, "stdout": stdout,
+                    "stderr": stderr}
+
+        return self._run(execute)
+
+    def put_file(self, localpath, remotepath, mode=None):
+        """Copy specified local file to all hosts.
+
+        :param localpath: Local filename.
+        :param remotepath: Remote filename.
+        :param mode: Permissions to set after upload
+
+        :returns: list of dicts with keys "host", "duration" and "error"
+        """
+        def put_file(ssh):
+            ssh.put_file(localpath, remotepath, mode=mode)
+
+        return self._run(put_file)
+
+    def wait(self, timeout=120, interval=1, max_interval=None):
+        """Wait for all hosts will be available via ssh.
+
+        See SSH.wait() for parameters description.
+
+        :returns: list of dicts with keys "host", "duration" and "error"
+        """
+        def wait(ssh):
+            ssh.wait(timeout, interval, max_interval=max_interval)
+
+        return self._run(wait)
@@ -265,15 +265,16 @@ class RandomNameGeneratorMixin(object):
     RESOURCE_NAME_ALLOWED_CHARACTERS = string.ascii_letters + string.digits
 
     @classmethod
-    def _generate_random_part(cls, length):
+    def _generate_random_part(cls, length, rng=random):
         """Generate a random string.
 
         :param length: The length of the random string.
+        :param rng: pRNG to use, the global one by default
         :returns: string, randomly-generated string of the specified length
                   containing only characters from
                   cls.RESOURCE_NAME_ALLOWED_CHARACTERS
         """
-        return "".join(random.choice(cls.RESOURCE_NAME_ALLOWED_CHARACTERS)
+        return "".join(rng.choice(cls.RESOURCE_NAME_ALLOWED_CHARACTERS)
                        for i in range(length))
 
     @classmethod
@@ -301,13 +302,11 @@ class RandomNameGeneratorMixin(object):
         # task portion; or the portion of the task ID that we
         # would use contains only characters in
         # resource_name_allowed_characters.
-        try:
-            # NOTE(stpierre): seed pRNG with task ID so that all random
-            # names with the same task ID have the same task ID part
-            random.seed(task_id)
-            return cls._generate_random_part(length)
-        finally:
-            random.seed()
+        # NOTE(stpierre): seed pRNG with task ID so that all random
+        # names with the same task ID have the same task ID part
+        # a separate pRNG is used, since reseeding of the global one affects
+        # names generated by other threads concurrently
+        return cls._generate_random_part(length, rng=random.Random(task_id))
 
     def generate_random_name(self):
         """Generate pseudo-random resource name for scenarios.
@@ -341,6 +340,32 @@ class RandomNameGeneratorMixin(object):
             self._generate_random_part(len(parts["rand"])),
             parts["suffix"]])
 
+    @classmethod
+    def _get_name_pattern(cls, exact=True, group=None):
+        """Returns regular expression of names generated by this class.
+
+        :param exact: If False, then additional information may follow
+                      the expected name
+        :param group: Name of a regular expression group to capture the task
+                      portion of the random name with
+        :returns: str, regular expression
+        """
+        match = cls._resource_name_placeholder_re.match(
+            cls.RESOURCE_NAME_FORMAT)
+        parts = match.groupdict()
+        subst = {
+            "prefix": re.escape(parts["prefix"]),
+            "sep": re.escape(parts["sep"]),
+            "suffix": re.escape(parts["suffix"]),
+            "chars": re.escape(cls.RESOURCE_NAME_ALLOWED_CHARACTERS),
+            "rand_length": len(parts["rand"])}
+        subst["task_id"] = "[%s]{%s}" % (subst["chars"], len(parts["task"]))
+        if group:
+            subst["task_id"] = "(?P<%s>%s)" % (group, subst["task_id"])
+        subst["extra"] = "" if exact else ".*"
+        return ("%(prefix)s%(task_id)s%(sep)s"
+                "[%(chars)s]{%(rand_length)s}%(suffix)s%(extra)s$" % subst)
+
     @classmethod
     def name_matches_object(cls, name, task_id=None, exact=True):
         """Determine if a resource name could have been created by this class.
@@ -356,26 +381,123 @@ class RandomNameGeneratorMixin(object):
                       created thusly.)
         :returns: bool
         """
-        match = cls._resource_name_placeholder_re.match(
-            cls.RESOURCE_NAME_FORMAT)
-        parts = match.groupdict()
-        subst = {
-            "prefix": re.escape(parts["prefix"]),
-            "sep": re.escape(parts["sep"]),
-            "suffix": re.escape(parts["suffix"]),
-            "chars": re.escape(cls.RESOURCE_NAME_ALLOWED_CHARACTERS),
-            "rand_length": len(parts["rand"])}
-        if task_id:
-            subst["task_id"] = cls._generate_task_id_part(task_id,
-                                                          len(parts["task"]))
-        else:
-            subst["task_id"] = "[%s]{%s}" % (subst["chars"],
-                                             len(parts["task"]))
-        subst["extra"] = "" if exact else ".*"
-        name_re = re.compile(
-            "%(prefix)s%(task_id)s%(sep)s"
-            "[%(chars)s]{%(rand_length)s}%(suffix)s%(extra)s$" % subst)
-        return bool(name_re.match(name))
+        return get_name_matcher([cls], exact=exact).match(name,
+                                                          task_id=task_id)
+
+
+class NameMatcher(object):
+    """Matcher of names generated by RandomNameGeneratorMixin objects.
+
+    Regular expressions of all unique name formats of the objects are
+    compiled once into a single one, so each name is checked against all of
+    them by one match. Expressions do not depend on the task, the task
+    portion of a matched name is compared with the one of given task
+    separately.
+    """
+
+    def __init__(self, objects, exact=True):
+        """NameMatcher constructor.
+
+        :param objects: Classes or objects to fetch random name generation
+                        parameters from.
+        :param exact: If False, then additional information may follow
+                      the expected name
+        """
+        self.objects = []
+        options = set()
+        for obj in objects:
+            # matchers are cached, so keep classes rather than instances
+            # which may refer to large contexts
+            cls = obj if inspect.isclass(obj) else type(obj)
+            key = (cls.RESOURCE_NAME_FORMAT,
+                   cls.RESOURCE_NAME_ALLOWED_CHARACTERS)
+            if key not in options:
+                options.add(key)
+                self.objects.append(cls)
+        # each format is enclosed by group "f<N>" which is closed last, so
+        # lastgroup of match points to the group "t<N>" with the task
+        # portion of the name
+        self._name_re = re.compile("|".join(
+            "(?P<f%(i)d>%(pattern)s)" % {
+                "i": i,
+                "pattern": obj._get_name_pattern(exact=exact,
+                                                 group="t%d" % i)}
+            for i, obj in enumerate(self.objects)))
+        self._object_res = [
+            re.compile(obj._get_name_pattern(exact=exact, group="task"))
+            for obj in self.objects]
+
+    def match(self, name, task_id=None):
+        """Determine if a name could have been created by any of objects.
+
+        :param name: The resource name
+        :param task_id: The task ID that must match the task portion of
+                        the random name
+        :returns: bool
+        """
+        if not self.objects or not self._name_re.match(name):
+            return False
+        if not task_id:
+            return True
+        # several formats may match the same name, so the task portion is
+        # checked against each of them
+        for obj, name_re in zip(self.objects, self._object_res):
+            match = name_re.match(name)
+            if match:
+                task_id_part = match.group("task")
+                if task_id_part == obj._generate_task_id_part(
+                        task_id, len(task_id_part)):
+                    return True
+        return False
+
+    def get_task_id_part(self, name):
+        """Returns the task portion of a name or None if name doesn't match.
+
+        :param name: The resource name
+        :returns: str or None
+        """
+        match = self.objects and self._name_re.match(name)
+        if not match:
+            return None
+        return match.group("t" + match.lastgroup[1:])
+
+    def get_task_id_parts(self, task_id):
+        """Returns task portions of names that objects generate for task.
+
+        :param task_id: The task ID
+        :returns: set of str
+        """
+        parts = set()
+        for obj in self.objects:
+            match = obj._resource_name_placeholder_re.match(
+                obj.RESOURCE_NAME_FORMAT)
+            parts.add(obj._generate_task_id_part(task_id,
+                                                 len(match.group("task"))))
+        return parts
+
+
+_name_matchers = {}
+
+
+def get_name_matcher(objects, exact=True):
+    """Returns cached NameMatcher for given objects.
+
+    Matchers do not depend on the task, so the cache is limited by the
+    name formats of the objects rather than grows with each task.
+
+    :param objects: Classes or objects that implement
+                    RandomNameGeneratorMixin
+    :param exact: If False, then additional information may follow
+                  the expected name
+    :returns: NameMatcher instance
+    """
+    key = (tuple((obj.RESOURCE_NAME_FORMAT,
+                  obj.RESOURCE_NAME_ALLOWED_CHARACTERS) for obj in objects),
+           exact)
+    # a race only makes the same matcher be built twice
+    if key not in _name_matchers:
+        _name_matchers[key] = NameMatcher(objects, exact=exact)
+    return _name_matchers[key]
 
 
 def name_matches_object(name, *objects, **kwargs):
@@ -386,7 +508,8 @@ def name_matches_object(name, *objects, **kwargs):
     It will often be more efficient to pass a list of classes to
     name_matches_object() than to perform multiple
     name_matches_object() calls, since this function will deduplicate
-    identical name generation options.
+    identical name generation options and match the name against all of
+    them at once.
 
     :param name: The resource name to check against the object's
                  RESOURCE_NAME_FORMAT.
@@ -397,13 +520,8 @@ def name_matches_object(name, *objects, **kwargs):
                      details on what args are recognized.
     :returns: bool
     """
-    unique_rng_options = {}
-    for obj in objects:
-        key = (obj.RESOURCE_NAME_FORMAT, obj.RESOURCE_NAME_ALLOWED_CHARACTERS)
-        if key not in unique_rng_options:
-            unique_rng_options[key] = obj
-    return any(obj.name_matches_object(name, **kwargs)
-               for obj in unique_rng_options.values())
+    task_id = kwargs.pop("task_id", None)
+    return get_name_matcher(objects, **kwargs).match(name, task_id=task_id)
 
 
 def merge(length, *sources):
@@ -17,7 +17,8 @@ import os
 
 import netaddr
 
-from rally.common.i18n import _
+from rally.common import broker
+from rally.common.i18n import _, _LE
 from rally.common import logging
 from rally.common import objects
 from rally.deployment import engine
@@ -27,6 +28,8 @@ from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 START_SCRIPT = "start.sh"
+# Default maximum number of hosts or containers provisioned concurrently
+DEFAULT_WORKERS = 8
 
 
 def get_script_path(name):
@@ -55,8 +58,13 @@ class LxcEngine(engine.Engine):
             "container_name_prefix": "devstack-node",
             "containers_per_host": 16,
             "start_script": "~/start.sh",
+            "workers": 8,
             "engine": { ... }
         }
+
+    Hosts are provisioned concurrently, then start script is run in all
+    containers concurrently, at most "workers" at a time. If any host or
+    container fails, all created containers are destroyed.
     """
 
     CONFIG_SCHEMA = {
@@ -72,6 +80,7 @@ class LxcEngine(engine.Engine):
                           "items": {"type": "string",
                                     "pattern": "^(\d+\.){3}\d+$"}},
             "container_name": {"type": "string"},
+            "workers": {"type": "integer", "minimum": 1},
             "provider": {"type": "object",
                          "properties": {"type": {"type": "string"}}},
         },
@@ -110,22 +119,79 @@ class LxcEngine(engine.Engine):
         return provider.ProviderFactory.get_provider(self.config["provider"],
                                                      self.deployment)
 
+    def _provision_host(self, args):
+        lxc_host, name_prefix, distribution, release = args
+        first_name = name_prefix + "-000"
+        try:
+            self._deploy_first(lxc_host, first_name, distribution, release)
+            for i in range(1, self.config["containers_per_host"]):
+                clone_name = "%s-%03d" % (name_prefix, i)
+                lxc_host.create_clone(clone_name, first_name)
+            lxc_host.start_containers()
+        except Exception:
+            # containers of failed host are not stored as resources yet, so
+            # cleanup() would not destroy them
+            try:
+                self._destroy_host(lxc_host)
+            except Exception as e:
+                LOG.exception(_LE("Failed to destroy containers of failed "
+                                  "host: %s") % e)
+            raise
+        return lxc_host
+
+    def _run_start_script(self, container):
+        container.ssh.run("/bin/sh -e", stdin=open(self._start_script, "rb"))
+
+    def _destroy_host(self, lxc_host, forwarded_ports=None):
+        if forwarded_ports is None:
+            forwarded_ports = lxc_host._port_cache.items()
+        lxc_host.destroy_containers()
+        lxc_host.destroy_ports(forwarded_ports)
+        lxc_host.delete_tunnels()
+
+    def _run_concurrently(self, func, items, what):
+        outcomes = broker.run_concurrently(
+            func, items, self.config.get("workers", DEFAULT_WORKERS))
+        errors = []
+        for i, outcome in enumerate(outcomes):
+            if outcome is None:
+                continue
+            result, error, duration = outcome
+            if error is None:
+                LOG.info("Deployment %(uuid)s: %(what)s %(index)d is ready "
+                         "in %(duration).2f sec."
+                         % {"uuid": self.deployment["uuid"], "what": what,
+                            "index": i, "duration": duration})
+            else:
+                errors.append(error)
+        return outcomes, errors
+
+    def _rollback(self, error):
+        LOG.error(_LE("Deployment %(uuid)s: %(error)s, created containers "
+                      "are destroyed.")
+                  % {"uuid": self.deployment["uuid"], "error": error})
+        try:
+            self.cleanup()
+        except Exception as e:
+            LOG.exception(_LE("Failed to destroy containers: %s") % e)
+
     @logging.log_deploy_wrapper(LOG.info, _("Create containers on host"))
     def deploy(self):
         name = self.config["container_name"]
-        start_script = self.config.get("start_script",
-                                       get_script_path(START_SCRIPT))
+        self._start_script = self.config.get("start_script",
+                                             get_script_path(START_SCRIPT))
         distribution = self.config["distribution"]
         release = self.config.get("release")
         network = self.config.get("start_lxc_network")
         if network:
             network = netaddr.IPNetwork(network)
-        else:
-            ip = "0"
 
         self.provider = self._get_provider()
 
-        for server in self.provider.create_servers():
+        servers = self.provider.create_servers()
+        configs = []
+        hosts = []
+        for server in servers:
             config = {"tunnel_to": self.config.get("tunnel_to", [])}
             if network:
                 config["network"] = str(network)
@@ -133,22 +199,39 @@ class LxcEngine(engine.Engine):
             else:
                 ip = "0"
             name_prefix = "%s-%s" % (name, ip)
-            first_name = name_prefix + "-000"
-            lxc_host = lxc.LxcHost(server, config)
-            self._deploy_first(lxc_host, first_name, distribution, release)
-            for i in range(1, self.config["containers_per_host"]):
-                clone_name = "%s-%03d" % (name_prefix, i)
-                lxc_host.create_clone(clone_name, first_name)
-            lxc_host.start_containers()
+            configs.append(config)
+            hosts.append((lxc.LxcHost(server, config), name_prefix,
+                          distribution, release))
+            if network:
+                network += 1
+
+        # containers of each host are cloned from the first one, so hosts are
+        # provisioned concurrently and start script is run when all containers
+        # are ready
+        outcomes, errors = self._run_concurrently(self._provision_host,
+                                                  hosts, "host")
+        for server, config, host, outcome in zip(servers, configs, hosts,
+                                                 outcomes):
+            if outcome is None or outcome[1] is not None:
+                continue
+            lxc_host = host[0]
             info = {"host": server.get_credentials(),
                     "containers": lxc_host.containers,
                     "forwarded_ports": lxc_host._port_cache.items(),
                     "config": config}
             self.deployment.add_resource(provider_name="LxcEngine", info=info)
-            for container in lxc_host.get_server_objects():
-                container.ssh.run("/bin/sh -e", stdin=open(start_script, "rb"))
-            if network:
-                network += 1
+        if errors:
+            self._rollback(_("%d hosts failed") % len(errors))
+            raise errors[0]
+
+        containers = [container for host in hosts
+                      for container in host[0].get_server_objects()]
+        outcomes, errors = self._run_concurrently(self._run_start_script,
+                                                  containers, "container")
+        if errors:
+            self._rollback(_("start script failed in %d containers")
+                           % len(errors))
+            raise errors[0]
 
         admin = objects.Credential("", "", "", "").to_dict(
             include_permission=True)
@@ -160,8 +243,6 @@ class LxcEngine(engine.Engine):
             server = provider.Server.from_credentials(resource.info["host"])
             lxc_host = lxc.LxcHost(server, resource.info["config"])
             lxc_host.containers = resource.info["containers"]
-            lxc_host.destroy_containers()
-            lxc_host.destroy_ports(resource.info["forwarded_ports"])
-            lxc_host.delete_tunnels()
+            self._destroy_host(lxc_host, resource.info["forwarded_ports"])
             self.deployment.delete_resource(resource.id)
         self._get_provider().destroy_servers()
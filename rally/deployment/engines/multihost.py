@@ -18,12 +18,20 @@ import six
 from six.moves.urllib import parse
 
 import rally
+from rally.common import broker
 from rally.common import db
+from rally.common.i18n import _LE
+from rally.common import logging
 from rally.common import objects
 from rally import consts
 from rally.deployment import engine
 
 
+LOG = logging.getLogger(__name__)
+# Default maximum number of nodes deployed concurrently
+DEFAULT_WORKERS = 8
+
+
 @engine.configure(name="MultihostEngine")
 class MultihostEngine(engine.Engine):
     """Deploy multihost cloud with existing engines.
@@ -44,9 +52,14 @@ class MultihostEngine(engine.Engine):
                 {"type": "Engine1", "config": "Config1"},
                 {"type": "Engine2", "config": "Config2"},
                 {"type": "Engine3", "config": "Config3"},
-            ]
+            ],
+            "workers": 8
         }
 
+    Controller is deployed first, then nodes are deployed concurrently by
+    at most "workers" threads. If controller or any node fails, all
+    sub-deployments are destroyed.
+
     If {controller_ip} is specified in configuration values, it will be
     replaced with controller address taken from credential returned by
     controller engine:
@@ -87,16 +100,52 @@ class MultihostEngine(engine.Engine):
             elif type(value) in (dict, list):
                 self._update_controller_ip(value)
 
+    def _rollback(self):
+        try:
+            self.cleanup()
+        except Exception as e:
+            LOG.exception(_LE("Deployment %(uuid)s: failed to roll back "
+                              "sub-deployments: %(error)s")
+                          % {"uuid": self.deployment["uuid"], "error": e})
+
     def deploy(self):
         self.deployment.update_status(consts._DeployStatus.DEPLOY_SUBDEPLOY)
-        self.controller, self.credentials = self._deploy_node(
-            self.config["controller"])
+        try:
+            self.controller, self.credentials = self._deploy_node(
+                self.config["controller"])
+        except Exception:
+            self._rollback()
+            raise
         credential = self.credentials[0]
         self.controller_ip = parse.urlparse(credential.auth_url).hostname
 
         for node_config in self.config["nodes"]:
             self._update_controller_ip(node_config)
-            self.nodes.append(self._deploy_node(node_config)[0])
+        outcomes = broker.run_concurrently(
+            self._deploy_node, self.config["nodes"],
+            self.config.get("workers", DEFAULT_WORKERS))
+
+        errors = []
+        for i, outcome in enumerate(outcomes):
+            if outcome is None:
+                continue
+            result, error, duration = outcome
+            if error is None:
+                LOG.info("Deployment %(uuid)s: node %(node)d is deployed in "
+                         "%(duration).2f sec."
+                         % {"uuid": self.deployment["uuid"], "node": i,
+                            "duration": duration})
+                self.nodes.append(result[0])
+            else:
+                errors.append(error)
+        if errors:
+            LOG.error(_LE("Deployment %(uuid)s: %(failed)d of %(total)d "
+                          "nodes failed, sub-deployments are rolled back.")
+                      % {"uuid": self.deployment["uuid"],
+                         "failed": len(errors),
+                         "total": len(outcomes)})
+            self._rollback()
+            raise errors[0]
         return self.credentials
 
     def cleanup(self):
@@ -20,7 +20,8 @@ import time
 import netaddr
 from six import moves
 
-from rally.common.i18n import _
+from rally.common import broker
+from rally.common.i18n import _, _LE
 from rally.common import logging
 from rally.deployment.serverprovider import provider
 from rally import exceptions
@@ -31,6 +32,8 @@ INET_ADDR_RE = re.compile(r" *inet ((\d+\.){3}\d+)\/\d+ .*")
 IPT_PORT_TEMPLATE = ("iptables -t nat -{action} PREROUTING -d {host_ip}"
                      " -p tcp --syn --dport {port}"
                      " -j DNAT --to-destination {ip}:22")
+# Default maximum number of hosts provisioned concurrently
+DEFAULT_WORKERS = 8
 
 
 def _get_script(filename):
@@ -266,12 +269,15 @@ class LxcProvider(provider.ProviderFactory):
             "tunnel_to": ["10.10.10.10"],
             "forward_ssh": false,
             "container_name_prefix": "rally-multinode-02",
+            "workers": 8,
             "host_provider": {
                 "type": "ExistingServers",
                 "credentials": [{"user": "root", "host": "host.net"}]
             }
         }
 
+    Hosts are provisioned concurrently, at most "workers" at a time. If any
+    host fails, containers of all hosts are destroyed.
     """
 
     CONFIG_SCHEMA = {
@@ -288,6 +294,7 @@ class LxcProvider(provider.ProviderFactory):
                           "items": {"type": "string",
                                     "pattern": "^(\d+\.){3}\d+$"}},
             "container_name_prefix": {"type": "string"},
+            "workers": {"type": "integer", "minimum": 1},
             "host_provider": {"type": "object",
                               "properties": {"type": {"type": "string"}}},
         },
@@ -310,10 +317,33 @@ class LxcProvider(provider.ProviderFactory):
         return provider.ProviderFactory.get_provider(
             self.config["host_provider"], self.deployment)
 
+    def _provision_host(self, args):
+        host, ip, distribution, release = args
+        name_prefix = self.config["container_name_prefix"]
+        first_name = "%s-000-%s" % (name_prefix, ip)
+        try:
+            host.prepare()
+            host.create_container(first_name, distribution, release)
+            for i in range(1, self.config.get("containers_per_host", 1)):
+                name = "%s-%03d-%s" % (name_prefix, i, ip)
+                host.create_clone(name, first_name)
+            host.start_containers()
+        except Exception:
+            # containers of failed host are not stored as resources yet, so
+            # destroy_servers() would not destroy them
+            try:
+                host.destroy_containers()
+                host.destroy_ports(host._port_cache.items())
+                host.delete_tunnels()
+            except Exception as e:
+                LOG.exception(_LE("Failed to destroy containers of failed "
+                                  "host: %s") % e)
+            raise
+        return host
+
     @logging.log_deploy_wrapper(LOG.info, _("Create containers on host"))
     def create_servers(self):
         host_provider = self.get_host_provider()
-        name_prefix = self.config["container_name_prefix"]
         hosts = []
         if "start_lxc_network" in self.config:
             network = netaddr.IPNetwork(self.config["start_lxc_network"])
@@ -327,24 +357,29 @@ class LxcProvider(provider.ProviderFactory):
                       "forward_ssh": self.config.get("forward_ssh", False)}
             if network:
                 config["network"] = str(network)
-            host = LxcHost(server, config)
-            host.prepare()
             ip = str(network.ip).replace(".", "-") if network else "0"
-            first_name = "%s-000-%s" % (name_prefix, ip)
-
-            host.create_container(first_name, distribution, release)
-            for i in range(1, self.config.get("containers_per_host", 1)):
-                name = "%s-%03d-%s" % (name_prefix, i, ip)
-                host.create_clone(name, first_name)
-            host.start_containers()
-            hosts.append(host)
+            hosts.append((LxcHost(server, config), ip, distribution,
+                          release))
 
             if network:
                 network += 1
 
-        servers = []
+        outcomes = broker.run_concurrently(
+            self._provision_host, hosts,
+            self.config.get("workers", DEFAULT_WORKERS))
 
-        for host in hosts:
+        servers = []
+        errors = []
+        for i, outcome in enumerate(outcomes):
+            if outcome is None:
+                continue
+            host, error, duration = outcome
+            if error is not None:
+                errors.append(error)
+                continue
+            LOG.info("Containers of host %(index)d are ready in "
+                     "%(duration).2f sec." % {"index": i,
+                                              "duration": duration})
             for server in host.get_server_objects():
                 servers.append(server)
             info = {"host": host.server.get_credentials(),
@@ -352,6 +387,16 @@ class LxcProvider(provider.ProviderFactory):
                     "forwarded_ports": host._port_cache.items(),
                     "container_names": host.containers}
             self.resources.create(info)
+
+        if errors:
+            LOG.error(_LE("%(failed)d of %(total)d hosts failed, containers "
+                          "of all hosts are destroyed.")
+                      % {"failed": len(errors), "total": len(hosts)})
+            try:
+                self.destroy_servers()
+            except Exception as e:
+                LOG.exception(_LE("Failed to destroy containers: %s") % e)
+            raise errors[0]
         return servers
 
     @logging.log_deploy_wrapper(LOG.info, _("Destroy host(s)"))
@@ -14,7 +14,10 @@
 #    under the License.
 
 import abc
+import contextlib
 import os
+import threading
+import time
 
 from oslo_config import cfg
 from six.moves.urllib import parse
@@ -26,6 +29,7 @@ from rally.common import objects
 from rally.common.plugin import plugin
 from rally import consts
 from rally import exceptions
+from rally.task import http_trace
 
 
 LOG = logging.getLogger(__name__)
@@ -33,13 +37,204 @@ CONF = cfg.CONF
 
 OSCLIENTS_OPTS = [
     cfg.FloatOpt("openstack_client_http_timeout", default=180.0,
-                 help="HTTP timeout for any of OpenStack service in seconds")
+                 help="HTTP timeout for any of OpenStack service in seconds"),
+    cfg.BoolOpt("openstack_client_http_trace", default=False,
+                help="Record number, errors and latency of HTTP calls made "
+                     "by OpenStack clients within scenario iterations per "
+                     "method, service, URL and atomic action and show them "
+                     "in HTML report"),
+    cfg.IntOpt("capabilities_cache_ttl", default=3600, min=0,
+               help="Time in seconds for which services, API versions and "
+                    "extensions discovered in a deployment are reused, "
+                    "0 disables the cache of capabilities. Services and "
+                    "extensions are cached per user and project, only "
+                    "those of users of the deployment are stored with it. "
+                    "Validation of tasks discovers services and "
+                    "extensions again if required ones are missing in "
+                    "the cache")
 ]
 CONF.register_opts(OSCLIENTS_OPTS)
 
 _NAMESPACE = "openstack"
 
 
+class Capabilities(object):
+    """Cache of capabilities discovered in a cloud.
+
+    Capabilities (services of catalog, API versions, extensions) are stored
+    with time of their discovery, so they can be persisted with deployment
+    and reused until they become older than ttl.
+    """
+
+    def __init__(self, data=None, ttl=None):
+        """Capabilities constructor.
+
+        :param data: dict with previously discovered capabilities
+        :param ttl: time in seconds for which capabilities are reused,
+                    [DEFAULT]capabilities_cache_ttl by default
+        """
+        self.data = dict(data or {})
+        self.ttl = CONF.capabilities_cache_ttl if ttl is None else ttl
+        self.hits = 0
+        self.discoveries = 0
+        self._lock = threading.Lock()
+
+    def _is_expired(self, item):
+        return time.time() - item["discovered_at"] >= self.ttl
+
+    def get(self, key, discover, user=None, refresh=False):
+        """Return capability, discover it if it is missing or expired.
+
+        :param key: str, name of capability
+        :param discover: callable without arguments which discovers
+                         JSON-serializable value of capability
+        :param user: str, user whose capability it is, if the capability
+                     is not shared by all users of the cloud
+        :param refresh: discover capability even if it is cached
+        """
+        with self._lock:
+            item = self.data.get(key)
+            if item and not refresh and not self._is_expired(item):
+                self.hits += 1
+                return item["value"]
+        value = discover()
+        item = {"value": value, "discovered_at": time.time()}
+        if user is not None:
+            item["user"] = user
+        with self._lock:
+            self.data[key] = item
+            self.discoveries += 1
+        return value
+
+    def to_persist(self, users):
+        """Return capabilities which are not expired yet.
+
+        :param users: users whose capabilities are returned along with
+                      capabilities shared by all users
+        """
+        with self._lock:
+            return dict((key, item) for key, item in self.data.items()
+                        if not self._is_expired(item)
+                        and ("user" not in item or item["user"] in users))
+
+
+_CAPABILITIES = {}
+
+
+def _capabilities_key(auth_url, region_name):
+    return auth_url, region_name
+
+
+def _capability_user(credential):
+    # catalog of services and extensions depend on the user and the project,
+    # so they are cached separately for each of them
+    attrs = ("user_domain_name", "username", "project_domain_name",
+             "tenant_name")
+    if isinstance(credential, dict):
+        return ":".join(credential.get(attr) or "" for attr in attrs)
+    return ":".join(getattr(credential, attr) or "" for attr in attrs)
+
+
+def get_capabilities(credential):
+    """Return cache of capabilities for credential or None."""
+    if not _CAPABILITIES:
+        return None
+    return _CAPABILITIES.get(_capabilities_key(credential.auth_url,
+                                               credential.region_name))
+
+
+def discover_capability(credential, key, discover_func, per_user=False,
+                        refresh=False):
+    """Discover capability of cloud via cache of capabilities if any.
+
+    :param credential: credential of the cloud
+    :param key: str, name of capability
+    :param discover_func: callable without arguments which discovers value
+    :param per_user: whether value depends on the user and the project of
+                     credential, so it is not shared with other credentials
+    :param refresh: discover value even if it is cached
+    """
+    capabilities = get_capabilities(credential)
+    if capabilities is None:
+        return discover_func()
+    user = None
+    if per_user:
+        user = _capability_user(credential)
+        key = "%s:%s" % (key, user)
+    return capabilities.get(key, discover_func, user=user, refresh=refresh)
+
+
+@contextlib.contextmanager
+def deployment_capabilities(deployment, refresh=False):
+    """Share cache of capabilities of deployment between clients.
+
+    While the context is active, Clients for credentials of the deployment
+    read capabilities from the cache, new discoveries are stored with the
+    deployment at exit.
+
+    :param deployment: objects.Deployment instance
+    :param refresh: discover all capabilities again
+    """
+    capabilities = Capabilities(
+        None if refresh else deployment["capabilities"])
+    keys = set()
+    users = set()
+    for creds in deployment["credentials"].get("openstack", []):
+        for credential in [creds["admin"]] + list(creds["users"]):
+            if credential:
+                keys.add(_capabilities_key(credential["auth_url"],
+                                           credential.get("region_name")))
+                users.add(_capability_user(credential))
+    previous = dict((key, _CAPABILITIES.get(key)) for key in keys)
+    _CAPABILITIES.update((key, capabilities) for key in keys)
+    try:
+        yield capabilities
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                _CAPABILITIES.pop(key, None)
+            else:
+                _CAPABILITIES[key] = value
+        if capabilities.discoveries:
+            # capabilities of temporary users created by contexts are not
+            # stored, since they are not going to be used again
+            deployment.update_capabilities(capabilities.to_persist(users))
+        LOG.info("Cache of capabilities of deployment %(uuid)s saved "
+                 "%(hits)d discovery calls, %(discoveries)d calls were made."
+                 % {"uuid": deployment["uuid"], "hits": capabilities.hits,
+                    "discoveries": capabilities.discoveries})
+
+
+def _trace_session(sess):
+    """Record HTTP calls made via keystoneauth session.
+
+    See rally.task.http_trace for details.
+    """
+    from keystoneauth1 import exceptions as ks_exceptions
+
+    request = sess.request
+
+    def traced_request(url, method, **kwargs):
+        if not http_trace.is_recording():
+            return request(url, method, **kwargs)
+        status = None
+        started_at = time.time()
+        try:
+            response = request(url, method, **kwargs)
+            status = response.status_code
+            return response
+        except ks_exceptions.HttpError as e:
+            status = e.http_status
+            raise
+        finally:
+            endpoint_filter = kwargs.get("endpoint_filter") or {}
+            http_trace.record(method, endpoint_filter.get("service_type"),
+                              url, status, started_at, time.time())
+
+    sess.request = traced_request
+    return sess
+
+
 def configure(name, default_version=None, default_service_type=None,
               supported_versions=None):
     """OpenStack client class wrapper.
@@ -260,9 +455,11 @@ class Keystone(OSClient):
                     verify=(self.credential.cacert or
                             not self.credential.insecure),
                     timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
+                version = discover_capability(
+                    self.credential, "keystone_version",
+                    lambda: str(discover.Discover(
+                        temp_session, password_args["auth_url"]
+                    ).version_data()[0]["version"][0]))
 
             if "v2.0" not in password_args["auth_url"] and (
                     version != "2"):
@@ -272,10 +469,16 @@ class Keystone(OSClient):
                     "project_domain_name": self.credential.project_domain_name,
                 })
             identity_plugin = identity.Password(**password_args)
+            if "keystone_auth_ref" in self.cache:
+                # reuse token received in advance, plugin re-authenticates by
+                # itself when the token expires
+                identity_plugin.auth_ref = self.cache["keystone_auth_ref"]
             sess = session.Session(
                 auth=identity_plugin, verify=(
                     self.credential.cacert or not self.credential.insecure),
                 timeout=CONF.openstack_client_http_timeout)
+            if CONF.openstack_client_http_trace:
+                _trace_session(sess)
             self.cache[key] = (sess, identity_plugin)
         return self.cache[key]
 
@@ -687,10 +890,20 @@ class Watcher(OSClient):
 class Clients(object):
     """This class simplify and unify work with OpenStack python clients."""
 
-    def __init__(self, credential, api_info=None):
+    def __init__(self, credential, api_info=None, auth_ref=None):
+        """Clients constructor.
+
+        :param credential: objects.Credential instance
+        :param api_info: dict with versions and service types of clients
+        :param auth_ref: keystoneauth1 AccessInfo received in advance,
+                         its token and service catalog are reused by
+                         clients
+        """
         self.credential = credential
         self.api_info = api_info or {}
         self.cache = {}
+        if auth_ref is not None:
+            self.cache["keystone_auth_ref"] = auth_ref
 
     def __getattr__(self, client_name):
         """Lazy load of clients."""
@@ -738,19 +951,40 @@ class Clients(object):
                 url=self.credential.auth_url)
         return self.keystone()
 
-    def services(self):
+    def services(self, refresh=False):
         """Return available services names and types.
 
+        :param refresh: discover services even if they are cached
         :returns: dict, {"service_type": "service_name", ...}
         """
-        if "services_data" not in self.cache:
-            services_data = {}
-            available_services = self.keystone.service_catalog.get_endpoints()
-            for stype in available_services.keys():
-                if stype in consts.ServiceType:
-                    services_data[stype] = consts.ServiceType[stype]
-                else:
-                    services_data[stype] = "__unknown__"
-            self.cache["services_data"] = services_data
+        if refresh or "services_data" not in self.cache:
+            self.cache["services_data"] = discover_capability(
+                self.credential, "services", self._discover_services,
+                per_user=True, refresh=refresh)
 
         return self.cache["services_data"]
+
+    def _discover_services(self):
+        services_data = {}
+        available_services = self.keystone.service_catalog.get_endpoints()
+        for stype in available_services.keys():
+            if stype in consts.ServiceType:
+                services_data[stype] = consts.ServiceType[stype]
+            else:
+                services_data[stype] = "__unknown__"
+        return services_data
+
+    def neutron_extensions(self, refresh=False):
+        """Return aliases of available Neutron extensions.
+
+        :param refresh: discover extensions even if they are cached
+        :returns: list of str
+        """
+        if refresh or "neutron_extensions" not in self.cache:
+            self.cache["neutron_extensions"] = discover_capability(
+                self.credential, "neutron_extensions",
+                lambda: [ext["alias"] for ext in self.neutron(
+                ).list_extensions().get("extensions", [])],
+                per_user=True, refresh=refresh)
+
+        return self.cache["neutron_extensions"]
@@ -17,27 +17,64 @@ import os
 
 import decorator
 
+from rally.common import logging
 from rally.common.plugin import discover
+from rally.common.plugin import manifest
 
 
+LOG = logging.getLogger(__name__)
+
 PLUGINS_LOADED = False
 
+PACKAGES = ["rally.deployment.engines",
+            "rally.deployment.serverprovider",
+            "rally.plugins"]
+
+MANIFEST_PATH = os.path.expanduser("~/.rally/plugins_manifest.json")
+
+
+def _load_lazily():
+    plugins_manifest = manifest.load(MANIFEST_PATH)
+    if plugins_manifest and manifest.is_up_to_date(plugins_manifest,
+                                                   PACKAGES):
+        discover.register_lazy_plugins(plugins_manifest["modules"],
+                                       plugins_manifest["plugins"])
+        return
+
+    LOG.debug("Plugins manifest %s is missing or outdated, importing all "
+              "plugins", MANIFEST_PATH)
+    plugins_manifest = manifest.generate(PACKAGES)
+    try:
+        manifest.save(plugins_manifest, MANIFEST_PATH)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to save plugins manifest %s: %s", MANIFEST_PATH, e)
+
+
+def load(lazy=False):
+    """Load Rally plugins.
 
-def load():
+    :param lazy: if True, modules with plugins are imported on first lookup
+        of plugins defined in them, using manifest stored in MANIFEST_PATH.
+        Manifest is regenerated if it is outdated.
+    """
     global PLUGINS_LOADED
 
     if not PLUGINS_LOADED:
-        discover.import_modules_from_package("rally.deployment.engines")
-        discover.import_modules_from_package("rally.deployment.serverprovider")
-        discover.import_modules_from_package("rally.plugins")
+        if lazy:
+            _load_lazily()
+        else:
+            for package in PACKAGES:
+                discover.import_modules_from_package(package)
 
         discover.load_plugins("/opt/rally/plugins/")
         discover.load_plugins(os.path.expanduser("~/.rally/plugins/"))
+    elif not lazy:
+        discover.import_lazy_plugins()
 
     PLUGINS_LOADED = True
 
 
 @decorator.decorator
 def ensure_plugins_are_loaded(f, *args, **kwargs):
-    load()
+    load(lazy=True)
     return f(*args, **kwargs)
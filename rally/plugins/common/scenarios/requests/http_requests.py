@@ -12,8 +12,11 @@
 
 import random
 
+from rally.common.i18n import _
 from rally.plugins.common.scenarios.requests import utils
+from rally.task import atomic
 from rally.task import scenario
+from rally.task import validation
 
 
 """Scenarios for HTTP requests."""
@@ -22,7 +25,7 @@ from rally.task import scenario
 @scenario.configure(name="HttpRequests.check_request")
 class HttpRequestsCheckRequest(utils.RequestScenario):
 
-    def run(self, url, method, status_code, **kwargs):
+    def run(self, url, method, status_code, keep_alive=False, **kwargs):
         """Standard way to benchmark web services.
 
         This benchmark is used to make request and check it with expected
@@ -31,16 +34,20 @@ class HttpRequestsCheckRequest(utils.RequestScenario):
         :param url: url for the Request object
         :param method: method for the Request object
         :param status_code: expected response code
+        :param keep_alive: reuse keep-alive connection between iterations
+                           of the same worker instead of opening new
+                           connection for each request
         :param kwargs: optional additional request parameters
         """
 
-        self._check_request(url, method, status_code, **kwargs)
+        self._check_request(url, method, status_code, keep_alive=keep_alive,
+                            **kwargs)
 
 
 @scenario.configure(name="HttpRequests.check_random_request")
 class HttpRequestsCheckRandomRequest(utils.RequestScenario):
 
-    def run(self, requests, status_code):
+    def run(self, requests, status_code, keep_alive=False):
         """Benchmark the list of requests
 
         This scenario takes random url from list of requests, and raises
@@ -49,8 +56,68 @@ class HttpRequestsCheckRandomRequest(utils.RequestScenario):
         :param requests: List of request dicts
         :param status_code: Expected Response Code it will
         be used only if we doesn't specified it in request proper
+        :param keep_alive: reuse keep-alive connections, it will be used
+        only if we doesn't specified it in request proper
         """
 
-        request = random.choice(requests)
+        request = dict(random.choice(requests))
         request.setdefault("status_code", status_code)
+        request.setdefault("keep_alive", keep_alive)
         self._check_request(**request)
+
+
+@validation.number("requests_count", minval=1, integer_only=True)
+@validation.number("concurrency", minval=1, integer_only=True)
+@scenario.configure(name="HttpRequests.check_request_batch")
+class HttpRequestsCheckRequestBatch(utils.RequestScenario):
+
+    def run(self, url, method, status_code, requests_count=100,
+            concurrency=10, **kwargs):
+        """Make a batch of concurrent requests in a single iteration.
+
+        Unlike HttpRequests.check_request which makes one request per
+        iteration, this scenario makes requests_count requests over
+        concurrency keep-alive connections, so high request rates can be
+        reached without a large number of runner workers.
+
+        :param url: url for the Request object
+        :param method: method for the Request object
+        :param status_code: expected response code
+        :param requests_count: number of requests made in one iteration
+        :param concurrency: number of simultaneously made requests
+        :param kwargs: optional additional request parameters
+        """
+        with atomic.ActionTimer(self, "requests.check_request_batch") as t:
+            results = self._check_request_batch(url, method, status_code,
+                                                requests_count, concurrency,
+                                                **kwargs)
+        errors = [r["error"] for r in results if r["error"]]
+        succeeded = [r for r in results if not r["error"]]
+
+        self.add_output(additive={
+            "title": "Requests",
+            "description": "Number of succeeded and failed requests",
+            "chart_plugin": "StackedArea",
+            "data": [["succeeded", len(succeeded)], ["failed", len(errors)]]})
+        if succeeded:
+            self.add_output(additive={
+                "title": "Request phases",
+                "description": "Mean durations of phases of requests",
+                "chart_plugin": "StackedArea",
+                "data": [[phase, sum(r[phase] for r in succeeded)
+                          / len(succeeded)]
+                         for phase in ("connect", "ttfb", "transfer")],
+                "label": "Seconds",
+                "axis_label": "Iteration"})
+        if t.duration():
+            self.add_output(additive={
+                "title": "Requests per second",
+                "chart_plugin": "Lines",
+                "data": [["rps", len(results) / t.duration()]],
+                "axis_label": "Iteration"})
+
+        if errors:
+            raise ValueError(_("%(failed)d of %(count)d requests failed: "
+                               "%(error)s") % {"failed": len(errors),
+                                               "count": len(results),
+                                               "error": errors[0]})
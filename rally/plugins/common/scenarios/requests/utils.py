@@ -10,30 +10,178 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
 import requests
+from requests import adapters
+from requests.packages.urllib3 import connection
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.task import atomic
 from rally.task import scenario
 
+# Keep-alive sessions of threads and durations of connect() calls
+_local = threading.local()
+
+
+class _TimedConnectionMixin(object):
+
+    def connect(self):
+        started_at = time.time()
+        try:
+            super(_TimedConnectionMixin, self).connect()
+        finally:
+            _local.connect_duration = (getattr(_local, "connect_duration", 0)
+                                       + time.time() - started_at)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, connection.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin,
+                            connection.HTTPSConnection):
+    pass
+
+
+class TimedHTTPAdapter(adapters.HTTPAdapter):
+    """HTTP adapter which measures time of establishing of connections."""
+
+    CONNECTIONS = {connection.HTTPConnection: _TimedHTTPConnection,
+                   connection.HTTPSConnection: _TimedHTTPSConnection}
+
+    def get_connection(self, url, proxies=None):
+        pool = super(TimedHTTPAdapter, self).get_connection(url, proxies)
+        pool.ConnectionCls = self.CONNECTIONS.get(pool.ConnectionCls,
+                                                  pool.ConnectionCls)
+        return pool
+
+
+def new_session(pool_size=10):
+    """Returns session which measures time of establishing of connections.
+
+    :param pool_size: max number of keep-alive connections per host
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=pool_size,
+                               pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Returns keep-alive session of the current thread."""
+    if not hasattr(_local, "session"):
+        _local.session = new_session()
+    return _local.session
+
+
+def send_request(session, method, url, **kwargs):
+    """Send request and measure duration of its phases.
+
+    :param session: requests.Session returned by new_session() or
+                    get_session()
+    :param method: Type of request method (GET | POST ..)
+    :param url: Uniform resource locator
+    :param kwargs: Optional additional request parameters
+    :returns: tuple (response, timings), where timings is a dict with
+              durations of "connect" (establishing of new connections
+              including TLS handshake, 0 if keep-alive connection is used),
+              "ttfb" (waiting for response headers) and "transfer"
+              (reading of response body)
+    """
+    kwargs["stream"] = True
+    _local.connect_duration = 0
+    started_at = time.time()
+    response = session.request(method, url, **kwargs)
+    headers_at = time.time()
+    response.content
+    finished_at = time.time()
+    connect = _local.connect_duration
+    return response, {"connect": connect,
+                      "ttfb": headers_at - started_at - connect,
+                      "transfer": finished_at - headers_at}
+
 
 class RequestScenario(scenario.Scenario):
     """Base class for Request scenarios with basic atomic actions."""
 
     @atomic.action_timer("requests.check_request")
-    def _check_request(self, url, method, status_code, **kwargs):
+    def _check_request(self, url, method, status_code, keep_alive=False,
+                       **kwargs):
         """Compare request status code with specified code
 
+        Durations of request phases are added as nested atomic actions
+        "requests.connect", "requests.ttfb" and "requests.transfer",
+        see send_request() for details.
+
         :param status_code: Expected status code of request
         :param url: Uniform resource locator
         :param method: Type of request method (GET | POST ..)
+        :param keep_alive: Whether to use keep-alive connection of the
+                           current worker instead of new connection
         :param kwargs: Optional additional request parameters
         :raises ValueError: if return http status code
                             not equal to expected status code
         """
+        if keep_alive:
+            resp, timings = send_request(get_session(), method, url,
+                                         **kwargs)
+        else:
+            with new_session() as session:
+                resp, timings = send_request(session, method, url, **kwargs)
+
+        for phase in ("connect", "ttfb", "transfer"):
+            atomic.add_atomic_action(self, "requests.%s" % phase,
+                                     timings[phase])
 
-        resp = requests.request(method, url, **kwargs)
         if status_code != resp.status_code:
             error_msg = _("Expected HTTP request code is `%s` actual `%s`")
             raise ValueError(
                 error_msg % (status_code, resp.status_code))
+
+    def _check_request_batch(self, url, method, status_code, requests_count,
+                             concurrency, **kwargs):
+        """Make many requests concurrently and check their status codes.
+
+        Requests are made by concurrency workers, each of them uses its own
+        keep-alive connection.
+
+        :param requests_count: Number of requests
+        :param concurrency: Number of simultaneously made requests
+        :returns: list of dicts with timings of requests (see send_request())
+                  and "error" key which is None for successful requests
+        """
+        results = []
+        sessions = []
+
+        def publish(queue):
+            for i in range(requests_count):
+                queue.append(i)
+
+        def consume(cache, i):
+            if "session" not in cache:
+                cache["session"] = new_session(pool_size=1)
+                sessions.append(cache["session"])
+            result = {"error": None}
+            try:
+                resp, timings = send_request(cache["session"], method, url,
+                                             **dict(kwargs))
+                result.update(timings)
+                if status_code != resp.status_code:
+                    result["error"] = (
+                        _("Expected HTTP request code is `%s` actual `%s`")
+                        % (status_code, resp.status_code))
+            except requests.RequestException as e:
+                result["error"] = "%s: %s" % (type(e).__name__, e)
+            results.append(result)
+
+        try:
+            broker.run(publish, consume, min(concurrency, requests_count))
+        finally:
+            for session in sessions:
+                session.close()
+        return results
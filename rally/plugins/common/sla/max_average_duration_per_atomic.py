@@ -24,12 +24,17 @@ import collections
 from rally.common.i18n import _
 from rally.common import streaming_algorithms
 from rally import consts
+from rally.task import atomic
 from rally.task import sla
 
 
 @sla.configure(name="max_avg_duration_per_atomic")
 class MaxAverageDurationPerAtomic(sla.SLA):
-    """Maximum average duration of one iterations atomic actions in seconds."""
+    """Maximum average duration of one iterations atomic actions in seconds.
+
+    Durations of atomic actions with the same name are summarized within
+    an iteration. Nested atomic actions are referred as "parent > child".
+    """
     CONFIG_SCHEMA = {"type": "object", "$schema": consts.JSON_SCHEMA,
                      "patternProperties": {".*": {"type": "number"}},
                      "additionalProperties": False}
@@ -43,7 +48,9 @@ class MaxAverageDurationPerAtomic(sla.SLA):
 
     def add_iteration(self, iteration):
         if not iteration.get("error"):
-            for action, value in iteration["atomic_actions"].items():
+            durations = atomic.flatten_atomic_actions(
+                iteration["atomic_actions"], nested=True)
+            for action, value in durations.items():
                 self.avg_comp_by_action[action].add(value)
                 result = self.avg_comp_by_action[action].result()
                 self.avg_by_action[action] = result
@@ -25,7 +25,10 @@ CLEANUP_OPTS = [
     cfg.IntOpt("resource_deletion_timeout", default=600,
                help="A timeout in seconds for deleting resources"),
     cfg.IntOpt("cleanup_threads", default=20,
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.IntOpt("cleanup_total_threads", default=100,
+               help="Maximum number of cleanup threads shared by all "
+                    "resource managers that are cleaned up concurrently")
 ]
 cleanup_group = cfg.OptGroup(name="cleanup", title="Cleanup Options")
 CONF.register_group(cleanup_group)
@@ -35,7 +38,8 @@ CONF.register_opts(CLEANUP_OPTS, cleanup_group)
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.cleanup.resource_deletion_timeout,
-             interval=1, threads=CONF.cleanup.cleanup_threads):
+             interval=1, threads=CONF.cleanup.cleanup_threads,
+             depends_on=None, bulk_deletion_check=False):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -55,6 +59,14 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param depends_on: List of resource names in format <service> or
+                       <service>.<resource> that should be cleaned up before
+                       this resource. "*" stands for all resources with lower
+                       order. Resources of the same service are always
+                       cleaned up one by one according to their order.
+    :param bulk_deletion_check: Confirm deletion of resources by listing all
+                                resources of a tenant at once instead of
+                                polling each resource separately
     """
 
     def inner(cls):
@@ -69,6 +81,8 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._depends_on = tuple(depends_on or ())
+        cls._bulk_deletion_check = bulk_deletion_check
 
         return cls
 
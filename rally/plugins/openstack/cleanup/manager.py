@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import time
 
+from oslo_config import cfg
+
 from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
@@ -22,8 +25,10 @@ from rally.common.plugin import discover
 from rally.common import utils as rutils
 from rally import osclients
 from rally.plugins.openstack.cleanup import base
+from rally.task import utils as task_utils
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
@@ -45,6 +50,12 @@ class SeekAndDestroy(object):
         self.admin = admin
         self.users = users or []
         self.api_versions = api_versions
+        self.api_calls = 0
+
+        self._bulk_deletion_check = getattr(manager_cls,
+                                            "_bulk_deletion_check", False)
+        self._pending = {}
+        self._lock = threading.Lock()
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -60,11 +71,19 @@ class SeekAndDestroy(object):
                 user["credential"], api_info=self.api_versions)
         return self.cache[key]
 
+    def _call(self, method, *args, **kwargs):
+        """Call resource manager method and count it as an API call."""
+        with self._lock:
+            self.api_calls += 1
+        return method(*args, **kwargs)
+
     def _delete_single_resource(self, resource):
         """Safe resource deletion with retries and timeouts.
 
         Send request to delete resource, in case of failures repeat it few
-        times. After that pull status of resource until it's deleted.
+        times. After that pull status of resource until it's deleted or, in
+        case of bulk deletion check, put it to the list of resources which
+        deletion should be confirmed by _confirm_deletions().
 
         Writes in LOG warning with UUID of resource that wasn't deleted
 
@@ -84,7 +103,7 @@ class SeekAndDestroy(object):
             msg_kw)
 
         try:
-            rutils.retry(resource._max_attempts, resource.delete)
+            rutils.retry(resource._max_attempts, self._call, resource.delete)
         except Exception as e:
             msg_kw["reason"] = e
             LOG.warning(
@@ -94,31 +113,92 @@ class SeekAndDestroy(object):
             if logging.is_debug():
                 LOG.exception(e)
         else:
-            started = time.time()
-            failures_count = 0
-            while time.time() - started < resource._timeout:
+            if self._bulk_deletion_check:
+                with self._lock:
+                    pending = self._pending.setdefault(resource.tenant_uuid,
+                                                       {})
+                    pending[msg_kw["uuid"]] = (resource, time.time())
+            else:
+                self._wait_for_deletion(resource)
+
+    def _wait_for_deletion(self, resource):
+        """Poll status of a single resource until it's deleted."""
+        started = time.time()
+        failures_count = 0
+        while time.time() - started < resource._timeout:
+            try:
+                if self._call(resource.is_deleted):
+                    return
+            except Exception as e:
+                LOG.warning(
+                    _("Seems like %s.%s.is_deleted(self) method is broken "
+                      "It shouldn't raise any exceptions.")
+                    % (resource.__module__, type(resource).__name__))
+                LOG.exception(e)
+
+                # NOTE(boris-42): Avoid LOG spamming in case of bad
+                #                 is_deleted() method
+                failures_count += 1
+                if failures_count > resource._max_attempts:
+                    break
+
+            finally:
+                rutils.interruptable_sleep(resource._interval)
+
+        self._log_deletion_timeout(resource)
+
+    def _log_deletion_timeout(self, resource):
+        LOG.warning(_("Resource deletion failed, timeout occurred for "
+                      "%(service)s.%(resource)s: %(uuid)s.")
+                    % {"service": resource._service,
+                       "resource": resource._resource,
+                       "uuid": resource.id()})
+
+    def _list_existing_ids(self, resource):
+        """Returns ids of not deleted resources of the same tenant."""
+        manager = self.manager_cls(admin=resource.admin, user=resource.user,
+                                   tenant_uuid=resource.tenant_uuid)
+        return set(self.manager_cls(resource=raw_resource).id()
+                   for raw_resource in self._call(manager.list)
+                   if task_utils.get_status(raw_resource) not in (
+                       "DELETED", "DELETE_COMPLETE"))
+
+    def _confirm_deletions(self):
+        """Wait until pending resources are deleted.
+
+        Instead of polling each resource separately, all resources of a
+        tenant are listed at once and compared with pending resources. In
+        case of list() failure, resources of the tenant are polled one by
+        one.
+        """
+        while self._pending:
+            rutils.interruptable_sleep(self.manager_cls._interval)
+            for tenant_uuid, pending in list(self._pending.items()):
+                resource = next(iter(pending.values()))[0]
                 try:
-                    if resource.is_deleted():
-                        return
+                    existing = self._list_existing_ids(resource)
                 except Exception as e:
                     LOG.warning(
-                        _("Seems like %s.%s.is_deleted(self) method is broken "
-                          "It shouldn't raise any exceptions.")
-                        % (resource.__module__, type(resource).__name__))
-                    LOG.exception(e)
-
-                    # NOTE(boris-42): Avoid LOG spamming in case of bad
-                    #                 is_deleted() method
-                    failures_count += 1
-                    if failures_count > resource._max_attempts:
-                        break
-
-                finally:
-                    rutils.interruptable_sleep(resource._interval)
-
-            LOG.warning(_("Resource deletion failed, timeout occurred for "
-                          "%(service)s.%(resource)s: %(uuid)s.")
-                        % msg_kw)
+                        _("Seems like %s.%s.list(self) method is broken. "
+                          "Falling back to checking resources one by one.")
+                        % (self.manager_cls.__module__,
+                           self.manager_cls.__name__))
+                    if logging.is_debug():
+                        LOG.exception(e)
+                    del self._pending[tenant_uuid]
+                    for resource, _deleted_at in pending.values():
+                        self._wait_for_deletion(resource)
+                    continue
+
+                now = time.time()
+                for uuid, (resource, deleted_at) in list(pending.items()):
+                    if uuid not in existing:
+                        del pending[uuid]
+                    elif now - deleted_at > resource._timeout:
+                        del pending[uuid]
+                        self._log_deletion_timeout(resource)
+                if not pending:
+                    del self._pending[tenant_uuid]
 
     def _gen_publisher(self):
         """Returns publisher for deletion jobs.
@@ -137,7 +217,8 @@ class SeekAndDestroy(object):
 
             def _publish(admin, user, manager):
                 try:
-                    for raw_resource in rutils.retry(3, manager.list):
+                    for raw_resource in rutils.retry(3, self._call,
+                                                     manager.list):
                         queue.append((admin, user, raw_resource))
                 except Exception as e:
                     LOG.warning(
@@ -187,11 +268,189 @@ class SeekAndDestroy(object):
 
         return consumer
 
-    def exterminate(self):
-        """Delete all resources for passed users, admin and resource_mgr."""
+    def list_resources(self):
+        """List resources for passed users, admin and resource_mgr.
 
-        broker.run(self._gen_publisher(), self._gen_consumer(),
-                   consumers_count=self.manager_cls._threads)
+        :returns: list of deletion jobs, tuples (admin, user, raw_resource)
+        """
+        resources = []
+        self._gen_publisher()(resources)
+        return resources
+
+    def exterminate(self, threads=None, resources=None):
+        """Delete all resources for passed users, admin and resource_mgr.
+
+        :param threads: Number of deletion threads, by default it is taken
+                        from resource manager
+        :param resources: List of deletion jobs like ones returned by
+                          list_resources(). If passed, only these resources
+                          are deleted instead of all listed ones
+        """
+        if resources is None:
+            publisher = self._gen_publisher()
+        else:
+            def publisher(queue):
+                queue.extend(resources)
+
+        broker.run(publisher, self._gen_consumer(),
+                   consumers_count=threads or self.manager_cls._threads)
+        self._confirm_deletions()
+
+
+def _resource_name(manager_cls):
+    return "%s.%s" % (manager_cls._service, manager_cls._resource)
+
+
+def get_dependencies(resource_managers, all_managers=None):
+    """Returns resource managers that should be cleaned up before each other.
+
+    Dependencies are built from all known resource managers, so transitive
+    dependencies between selected managers are kept even if intermediate
+    managers are not selected for cleanup.
+
+    :param resource_managers: List of resource managers that are going to be
+                              cleaned up
+    :param all_managers: List of all known resource managers. By default all
+                         subclasses of base.ResourceManager are used
+    :returns: dict with resource manager as a key and set of selected
+              resource managers that it depends on as a value
+    """
+    if all_managers is None:
+        discover.import_lazy_plugins()
+        all_managers = [mgr for mgr in
+                        discover.itersubclasses(base.ResourceManager)
+                        if mgr._service]
+    all_managers = sorted(set(all_managers) | set(resource_managers),
+                          key=lambda m: (m._order, m._service, m._resource))
+
+    direct = {}
+    last_in_service = {}
+    for mgr in all_managers:
+        deps = set()
+        if mgr._service in last_in_service:
+            deps.add(last_in_service[mgr._service])
+        for name in mgr._depends_on:
+            for other in all_managers:
+                # only resources with lower order can be a dependency, so
+                # the graph can't contain cycles
+                if other._order >= mgr._order:
+                    break
+                if name in ("*", other._service, _resource_name(other)):
+                    deps.add(other)
+        last_in_service[mgr._service] = mgr
+        direct[mgr] = deps
+
+    selected = set(resource_managers)
+    dependencies = {}
+    for mgr in resource_managers:
+        visited = set()
+        stack = list(direct[mgr])
+        while stack:
+            dep = stack.pop()
+            if dep not in visited:
+                visited.add(dep)
+                stack.extend(direct[dep])
+        dependencies[mgr] = visited & selected
+    return dependencies
+
+
+class CleanupScheduler(object):
+
+    def __init__(self, resource_managers, admin, users, api_versions=None,
+                 threads=None, resources=None):
+        """Runs SeekAndDestroy for independent resource managers in parallel.
+
+        Resource manager is started as soon as all resource managers that it
+        depends on are cleaned up and there are enough free threads in the
+        global budget.
+
+        :param resource_managers: List of subclasses of base.ResourceManager
+        :param admin: admin credential like in context["admin"]
+        :param users: users credentials like in context["users"]
+        :param api_versions: dict of client API versions
+        :param threads: Max number of threads used by all resource managers
+                        simultaneously
+        :param resources: dict with resource manager as a key and list of
+                          deletion jobs as a value, see
+                          SeekAndDestroy.exterminate(). If passed, only these
+                          resources are deleted instead of all listed ones
+        """
+        self.resource_managers = resource_managers
+        self.admin = admin
+        self.users = users
+        self.api_versions = api_versions
+        self.resources = resources
+        self.threads = threads or CONF.cleanup.cleanup_total_threads
+        self.dependencies = get_dependencies(resource_managers)
+        self.stats = {}
+
+        self._lock = threading.Condition()
+        self._finished = set()
+        self._busy_threads = 0
+
+    def _cleanup(self, manager_cls, threads):
+        name = _resource_name(manager_cls)
+        LOG.debug("Cleaning up %s objects" % name)
+        started_at = time.time()
+        destroyer = SeekAndDestroy(manager_cls, self.admin, self.users,
+                                   self.api_versions)
+        try:
+            if self.resources is None:
+                destroyer.exterminate(threads)
+            else:
+                destroyer.exterminate(
+                    threads, resources=self.resources.get(manager_cls, []))
+        except Exception as e:
+            LOG.warning(_("Failed to cleanup %(name)s objects: %(error)s")
+                        % {"name": name, "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+        finally:
+            with self._lock:
+                self.stats[name] = {"duration": time.time() - started_at,
+                                    "api_calls": destroyer.api_calls}
+                self._finished.add(manager_cls)
+                self._busy_threads -= threads
+                self._lock.notify_all()
+
+    def _start_ready(self, pending, workers):
+        for manager_cls in list(pending):
+            if not self.dependencies[manager_cls] <= self._finished:
+                continue
+            threads = min(manager_cls._threads, self.threads)
+            if (self._busy_threads
+                    and self._busy_threads + threads > self.threads):
+                continue
+            pending.remove(manager_cls)
+            self._busy_threads += threads
+            worker = threading.Thread(target=self._cleanup,
+                                      args=(manager_cls, threads))
+            worker.start()
+            workers.append(worker)
+
+    def run(self):
+        """Cleanup all resources and return statistics.
+
+        :returns: dict with total duration of cleanup and number of API
+                  calls, as well as durations and numbers of API calls of each
+                  resource type cleanup
+        """
+        started_at = time.time()
+        pending = list(self.resource_managers)
+        workers = []
+        with self._lock:
+            while pending:
+                self._start_ready(pending, workers)
+                if pending:
+                    self._lock.wait()
+
+        for worker in workers:
+            worker.join()
+
+        return {"duration": time.time() - started_at,
+                "api_calls": sum(stat["api_calls"]
+                                 for stat in self.stats.values()),
+                "resources": self.stats}
 
 
 def list_resource_names(admin_required=None):
@@ -203,6 +462,7 @@ def list_resource_names(admin_required=None):
                            True -> returns only admin ResourceManagers
                            False -> returns only non admin ResourceManagers
     """
+    discover.import_lazy_plugins()
     res_mgrs = discover.itersubclasses(base.ResourceManager)
     if admin_required is not None:
         res_mgrs = filter(lambda cls: cls._admin_required == admin_required,
@@ -228,6 +488,7 @@ def find_resource_managers(names=None, admin_required=None):
     names = set(names or [])
 
     resource_managers = []
+    discover.import_lazy_plugins()
     for manager in discover.itersubclasses(base.ResourceManager):
         if admin_required is not None:
             if admin_required != manager._admin_required:
@@ -259,7 +520,8 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     with _service from services or _resource from resources.
 
     Then goes through all passed users and using cleaners cleans all related
-    resources.
+    resources. Resource managers that don't depend on each other are
+    processed in parallel.
 
     :param names: Use only resource manages that has name from this list.
                   There are in as _service or
@@ -278,9 +540,162 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
                     "credential": <rally.common.objects.Credential>
 
                   }
+    :returns: dict with total duration of cleanup and number of API calls,
+              as well as durations and numbers of API calls of each resource
+              type cleanup
+    """
+    resource_managers = find_resource_managers(names, admin_required)
+    stats = CleanupScheduler(resource_managers, admin, users,
+                             api_versions).run()
+    if resource_managers:
+        LOG.info(_("Cleanup of %(count)d resource types took %(duration).2f "
+                   "sec and %(api_calls)d API calls (%(details)s)")
+                 % {"count": len(resource_managers),
+                    "duration": stats["duration"],
+                    "api_calls": stats["api_calls"],
+                    "details": ", ".join(
+                        "%s: %.2f sec, %d calls" % (
+                            name, stat["duration"], stat["api_calls"])
+                        for name, stat in sorted(stats["resources"].items()))
+                    })
+    return stats
+
+
+class Sweeper(object):
+
+    def __init__(self, resource_managers, admin, users, api_versions=None,
+                 threads=None):
+        """Finds and deletes resources leaked by Rally.
+
+        Names of resources are classified by a single matcher of all
+        RESOURCE_NAME_FORMATs of Rally plugins, so resources which are left
+        by crashed or aborted tasks can be found without any Rally context.
+
+        :param resource_managers: List of subclasses of base.ResourceManager
+        :param admin: admin credential like in context["admin"]
+        :param users: users credentials like in context["users"]
+        :param api_versions: dict of client API versions
+        :param threads: Max number of resource types which are listed or
+                        cleaned up simultaneously
+        """
+        self.resource_managers = resource_managers
+        self.admin = admin
+        self.users = users
+        self.api_versions = api_versions
+        self.threads = threads or CONF.cleanup.cleanup_total_threads
+        self.matcher = rutils.NameMatcher(
+            [rutils.RandomNameGeneratorMixin]
+            + list(discover.itersubclasses(rutils.RandomNameGeneratorMixin)))
+        self._found = {}
+
+    def _list(self, manager_cls):
+        destroyer = SeekAndDestroy(manager_cls, self.admin, self.users,
+                                   self.api_versions)
+        found = []
+        try:
+            for admin, user, raw_resource in destroyer.list_resources():
+                resource = manager_cls(
+                    resource=raw_resource,
+                    admin=destroyer._get_cached_client(admin),
+                    user=destroyer._get_cached_client(user),
+                    tenant_uuid=user and user["tenant_id"])
+                name = resource.name()
+                task_id_part = name and self.matcher.get_task_id_part(name)
+                if task_id_part:
+                    found.append((task_id_part, resource.id(), name,
+                                  (admin, user, raw_resource)))
+        except Exception as e:
+            LOG.warning(_("Failed to list %(name)s objects: %(error)s")
+                        % {"name": _resource_name(manager_cls), "error": e})
+            if logging.is_debug():
+                LOG.exception(e)
+        return found
+
+    def find(self, task_ids=None, exclude_task_ids=None):
+        """List all resource types concurrently and find leaked resources.
+
+        :param task_ids: List of task IDs to find resources of. By default
+                         resources of all tasks are found
+        :param exclude_task_ids: List of task IDs which resources are
+                                 skipped, like IDs of running tasks
+        :returns: list of dicts with "resource" type, "id", "name" and
+                  "task_id_part" of resource name
+        """
+        task_id_parts = None
+        if task_ids:
+            task_id_parts = set()
+            for task_id in task_ids:
+                task_id_parts |= self.matcher.get_task_id_parts(task_id)
+        excluded_parts = set()
+        for task_id in exclude_task_ids or []:
+            excluded_parts |= self.matcher.get_task_id_parts(task_id)
+
+        started_at = time.time()
+        outcomes = broker.run_concurrently(self._list,
+                                           self.resource_managers,
+                                           workers=self.threads)
+        self._found = {}
+        leaked = []
+        for manager_cls, (found, _error, _duration) in zip(
+                self.resource_managers, outcomes):
+            for task_id_part, uuid, name, job in found:
+                if task_id_part in excluded_parts:
+                    continue
+                if task_id_parts is None or task_id_part in task_id_parts:
+                    self._found.setdefault(manager_cls, []).append(job)
+                    leaked.append({"resource": _resource_name(manager_cls),
+                                   "id": uuid,
+                                   "name": name,
+                                   "task_id_part": task_id_part})
+        LOG.info(_("Listing of %(count)d resource types took %(duration).2f "
+                   "sec, %(leaked)d leaked resources are found")
+                 % {"count": len(self.resource_managers),
+                    "duration": time.time() - started_at,
+                    "leaked": len(leaked)})
+        return sorted(leaked, key=lambda r: (r["task_id_part"],
+                                             r["resource"], r["name"]))
+
+    def delete(self):
+        """Delete resources found by the latest find() call.
+
+        :returns: cleanup statistics, see CleanupScheduler.run()
+        """
+        resource_managers = [mgr for mgr in self.resource_managers
+                             if mgr in self._found]
+        return CleanupScheduler(resource_managers, self.admin, self.users,
+                                self.api_versions, threads=self.threads,
+                                resources=self._found).run()
+
+
+def sweep(names=None, admin=None, users=None, api_versions=None,
+          task_ids=None, exclude_task_ids=None, delete=False):
+    """Find resources leaked by Rally and optionally delete them.
+
+    :param names: Use only resource managers that has name from this list.
+                  By default all resource managers are used
+    :param admin: admin credential like in context["admin"]
+    :param users: users credentials like in context["users"], resources are
+                  listed on behalf of each of them
+    :param api_versions: dict of client API versions
+    :param task_ids: List of task IDs to find resources of. By default
+                     resources of all tasks are found
+    :param exclude_task_ids: List of task IDs which resources are never
+                             found nor deleted, like IDs of running tasks
+    :param delete: Delete found resources, otherwise they are only reported
+    :returns: tuple of Sweeper instance, list of found resources (see
+              Sweeper.find()) and cleanup statistics or None if resources
+              were not deleted
     """
-    for manager in find_resource_managers(names, admin_required):
-        LOG.debug("Cleaning up %(service)s %(resource)s objects" %
-                  {"service": manager._service,
-                   "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users, api_versions).exterminate()
+    if names:
+        resource_managers = find_resource_managers(names)
+    else:
+        discover.import_lazy_plugins()
+        resource_managers = sorted(
+            [mgr for mgr in discover.itersubclasses(base.ResourceManager)
+             if mgr._service], key=lambda m: m._order)
+    sweeper = Sweeper(resource_managers, admin, users, api_versions)
+    leaked = sweeper.find(task_ids, exclude_task_ids=exclude_task_ids)
+    stats = None
+    if delete and leaked:
+        stats = sweeper.delete()
+    return sweeper, leaked, stats
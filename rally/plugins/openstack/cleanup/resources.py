@@ -153,7 +153,8 @@ _nova_order = get_order(200)
 
 
 @base.resource("nova", "servers", order=next(_nova_order),
-               tenant_resource=True)
+               tenant_resource=True, depends_on=["magnum", "heat", "senlin"],
+               bulk_deletion_check=True)
 class NovaServer(base.ResourceManager):
     def list(self):
         """List all servers."""
@@ -267,6 +268,7 @@ class NovaNetworks(SynchronizedDeletion, base.ResourceManager):
         # parameters. so we need to check if there are nova networks
         # whose name pattern matches those of any loaded plugin that
         # implements RandomNameGeneratorMixin
+        discover.import_lazy_plugins()
         classes = list(discover.itersubclasses(utils.RandomNameGeneratorMixin))
         return [net for net in self._manager().list()
                 if utils.name_matches_object(net.label, *classes)]
@@ -297,7 +299,8 @@ class EC2Mixin(object):
         return getattr(self.user, self._service)()
 
 
-@base.resource("ec2", "servers", order=next(_ec2_order))
+@base.resource("ec2", "servers", order=next(_ec2_order),
+               depends_on=["heat"])
 class EC2Server(EC2Mixin, base.ResourceManager):
 
     def is_deleted(self):
@@ -334,10 +337,8 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
     # Neutron has the best client ever, so we need to override everything
 
     def supports_extension(self, extension):
-        exts = self._manager().list_extensions().get("extensions", [])
-        if any(ext.get("alias") == extension for ext in exts):
-            return True
-        return False
+        client = self._admin_required and self.admin or self.user
+        return extension in client.neutron_extensions()
 
     def _manager(self):
         client = self._admin_required and self.admin or self.user
@@ -370,7 +371,8 @@ class NeutronLbaasV1Mixin(NeutronMixin):
 
 
 @base.resource("neutron", "vip", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True,
+               depends_on=["nova.servers", "ec2.servers"])
 class NeutronV1Vip(NeutronLbaasV1Mixin):
     pass
 
@@ -396,7 +398,7 @@ class NeutronLbaasV2Mixin(NeutronMixin):
 
 
 @base.resource("neutron", "loadbalancer", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, bulk_deletion_check=True)
 class NeutronV2Loadbalancer(NeutronLbaasV2Mixin):
 
     def is_deleted(self):
@@ -479,7 +481,8 @@ _cinder_order = get_order(400)
 
 
 @base.resource("cinder", "backups", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, bulk_deletion_check=True,
+               depends_on=["nova.servers", "ec2.servers"])
 class CinderVolumeBackup(base.ResourceManager):
     pass
 
@@ -494,7 +497,7 @@ class CinderVolumeType(base.ResourceManager):
 
 
 @base.resource("cinder", "volume_snapshots", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, bulk_deletion_check=True)
 class CinderVolumeSnapshot(base.ResourceManager):
     pass
 
@@ -506,7 +509,7 @@ class CinderVolumeTransfer(base.ResourceManager):
 
 
 @base.resource("cinder", "volumes", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, bulk_deletion_check=True)
 class CinderVolume(base.ResourceManager):
     pass
 
@@ -523,7 +526,8 @@ _manila_order = get_order(450)
 
 
 @base.resource("manila", "shares", order=next(_manila_order),
-               tenant_resource=True)
+               tenant_resource=True,
+               depends_on=["nova.servers", "ec2.servers"])
 class ManilaShare(base.ResourceManager):
     pass
 
@@ -542,7 +546,8 @@ class ManilaSecurityService(base.ResourceManager):
 
 # GLANCE
 
-@base.resource("glance", "images", order=500, tenant_resource=True)
+@base.resource("glance", "images", order=500, tenant_resource=True,
+               depends_on=["nova.servers", "ec2.servers"])
 class GlanceImage(base.ResourceManager):
 
     def _client(self):
@@ -571,7 +576,8 @@ _sahara_order = get_order(600)
 
 
 @base.resource("sahara", "job_executions", order=next(_sahara_order),
-               tenant_resource=True)
+               tenant_resource=True,
+               depends_on=["nova.servers", "ec2.servers"])
 class SaharaJobExecution(SynchronizedDeletion, base.ResourceManager):
     pass
 
@@ -817,7 +823,8 @@ _murano_order = get_order(1200)
 
 
 @base.resource("murano", "environments", tenant_resource=True,
-               order=next(_murano_order))
+               order=next(_murano_order),
+               depends_on=["nova.servers", "ec2.servers"])
 class MuranoEnvironments(SynchronizedDeletion, base.ResourceManager):
     pass
 
@@ -836,7 +843,8 @@ _ironic_order = get_order(1300)
 
 
 @base.resource("ironic", "node", admin_required=True,
-               order=next(_ironic_order), perform_for_admin_only=True)
+               order=next(_ironic_order), perform_for_admin_only=True,
+               depends_on=["nova.servers"])
 class IronicNodes(base.ResourceManager):
 
     def id(self):
@@ -935,7 +943,8 @@ class KeystoneMixin(SynchronizedDeletion):
 
 
 @base.resource("keystone", "user", order=next(_keystone_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               depends_on=["*"])
 class KeystoneUser(KeystoneMixin, base.ResourceManager):
     pass
 
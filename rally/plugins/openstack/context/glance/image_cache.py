@@ -0,0 +1,133 @@
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import requests
+from six.moves.urllib import parse
+
+from rally.common import logging
+from rally import exceptions
+
+LOG = logging.getLogger(__name__)
+
+# Size of chunks in which image is downloaded
+CHUNK_SIZE = 1024 * 1024
+
+
+def is_remote(url):
+    """Check whether image location should be downloaded via HTTP."""
+    return parse.urlparse(url).scheme in ("http", "https")
+
+
+class ImageCache(object):
+    """Local content-addressed cache of downloaded images.
+
+    Each URL is downloaded only once. Files are named by sha256 of their
+    content, so the same image available by different URLs is stored once.
+    Index of downloaded URLs is stored in the cache directory, so persistent
+    cache is reused between runs.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, path=None):
+        """Initialize image cache.
+
+        :param path: cache directory. If not specified, temporary directory
+                     is used which is removed by cleanup()
+        """
+        self.temporary = not path
+        if self.temporary:
+            self.path = tempfile.mkdtemp(prefix="rally_images_")
+        else:
+            self.path = os.path.expanduser(path)
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+        self._index = self._load_index()
+        self._lock = threading.Lock()
+        self._url_locks = {}
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.path, self.INDEX)) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _save_index(self):
+        with open(os.path.join(self.path, self.INDEX), "w") as f:
+            json.dump(self._index, f)
+
+    def get(self, url, checksum=None):
+        """Returns path of the local copy of the image.
+
+        :param url: image URL
+        :param checksum: expected md5 checksum of the image
+        :raises ChecksumMismatch: if checksum of the image is different
+        """
+        with self._lock:
+            lock = self._url_locks.setdefault(url, threading.Lock())
+
+        with lock:
+            entry = self._index.get(url)
+            if entry:
+                path = os.path.join(self.path, entry["sha256"])
+                if os.path.isfile(path):
+                    if checksum and entry["md5"] != checksum:
+                        raise exceptions.ChecksumMismatch(url=url)
+                    LOG.debug("Image %s is found in cache: %s", url, path)
+                    return path
+
+            entry = self._download(url, checksum)
+            with self._lock:
+                self._index[url] = entry
+                self._save_index()
+            return os.path.join(self.path, entry["sha256"])
+
+    def _download(self, url, checksum=None):
+        LOG.debug("Downloading image %s to %s", url, self.path)
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                response = requests.get(url, stream=True)
+                try:
+                    response.raise_for_status()
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        md5.update(chunk)
+                        sha256.update(chunk)
+                finally:
+                    response.close()
+
+            if checksum and md5.hexdigest() != checksum:
+                raise exceptions.ChecksumMismatch(url=url)
+            os.rename(tmp_path, os.path.join(self.path, sha256.hexdigest()))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return {"sha256": sha256.hexdigest(), "md5": md5.hexdigest()}
+
+    def cleanup(self):
+        """Remove cache directory if it is temporary."""
+        if self.temporary:
+            shutil.rmtree(self.path, ignore_errors=True)
@@ -12,13 +12,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import os
+import time
+
 from oslo_config import cfg
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils as rutils
 from rally import consts
+from rally import exceptions
 from rally import osclients
+from rally.plugins.openstack.context.glance import image_cache
 from rally.plugins.openstack.wrappers import glance as glance_wrapper
 from rally.task import context
 from rally.task import utils
@@ -30,6 +37,9 @@ CONF.import_opt("glance_image_delete_timeout",
 CONF.import_opt("glance_image_delete_poll_interval",
                 "rally.plugins.openstack.scenarios.glance.utils",
                 "benchmark")
+CONF.import_opt("glance_image_cache_dir",
+                "rally.plugins.openstack.wrappers.glance",
+                "benchmark")
 
 LOG = logging.getLogger(__name__)
 
@@ -70,6 +80,25 @@ class ImageGenerator(context.Context):
             "image_args": {
                 "type": "object",
                 "additionalProperties": True
+            },
+            "image_checksum": {
+                "description": "md5 checksum of the image downloaded from "
+                               "image_url",
+                "type": "string"
+            },
+            "cache_image": {
+                "description": "Whether remote image_url is downloaded to "
+                               "Rally host once and uploaded to all tenants "
+                               "from there. By default it is downloaded "
+                               "only if image_checksum is set or Glance API "
+                               "v2 is used, since Glance API v1 copies "
+                               "image from image_url by itself",
+                "type": "boolean"
+            },
+            "upload_workers": {
+                "description": "Number of images created simultaneously",
+                "type": "integer",
+                "minimum": 1
             }
         },
         "required": ["image_url", "image_type", "image_container",
@@ -77,50 +106,123 @@ class ImageGenerator(context.Context):
         "additionalProperties": False
     }
 
+    DEFAULT_CONFIG = {
+        "upload_workers": 5
+    }
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `Images`"))
     def setup(self):
         image_url = self.config["image_url"]
+
+        cache = image_cache.ImageCache(CONF.benchmark.glance_image_cache_dir)
+        try:
+            if self._is_cache_needed(image_url):
+                LOG.info(_("Downloading image %s") % image_url)
+                image_location = cache.get(
+                    image_url, checksum=self.config.get("image_checksum"))
+            else:
+                image_location = image_url
+            self._create_images(image_location)
+        finally:
+            cache.cleanup()
+
+    def _is_cache_needed(self, image_url):
+        if not image_cache.is_remote(image_url):
+            return False
+        if self.config.get("cache_image") is not None:
+            return self.config["cache_image"]
+        if self.config.get("image_checksum"):
+            return True
+        clients = osclients.Clients(
+            self.context["users"][0]["credential"],
+            api_info=self.context["config"].get("api_versions"))
+        # Glance API v1 creates image by copy_from URL on the server side, so
+        # the image is not passed through Rally
+        return clients.glance.choose_version() != "1"
+
+    def _get_image_args(self):
+        kwargs = dict(self.config.get("image_args", {}))
+        if self.config.get("min_ram") is not None:
+            LOG.warning("The 'min_ram' argument is deprecated; specify "
+                        "arbitrary arguments with 'image_args' instead")
+            kwargs["min_ram"] = self.config["min_ram"]
+        if self.config.get("min_disk") is not None:
+            LOG.warning("The 'min_disk' argument is deprecated; specify "
+                        "arbitrary arguments with 'image_args' instead")
+            kwargs["min_disk"] = self.config["min_disk"]
+        if "is_public" in kwargs:
+            LOG.warning("The 'is_public' argument is deprecated since "
+                        "Rally 0.8.0; specify visibility arguments "
+                        "instead")
+        return kwargs
+
+    def _create_images(self, image_location):
         image_type = self.config["image_type"]
         image_container = self.config["image_container"]
         images_per_tenant = self.config["images_per_tenant"]
         image_name = self.config.get("image_name")
+        kwargs = self._get_image_args()
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            current_images = []
-            clients = osclients.Clients(
-                user["credential"],
-                api_info=self.context["config"].get("api_versions"))
-            glance_wrap = glance_wrapper.wrap(clients.glance, self)
+        image_size = None
+        if os.path.isfile(os.path.expanduser(image_location)):
+            image_size = os.path.getsize(os.path.expanduser(image_location))
+
+        images = collections.defaultdict(dict)
+        errors = []
+
+        def publish(queue):
+            for user, tenant_id in rutils.iterate_per_tenants(
+                    self.context["users"]):
+                for i in range(images_per_tenant):
+                    if image_name and i > 0:
+                        cur_name = image_name + str(i)
+                    elif image_name:
+                        cur_name = image_name
+                    else:
+                        cur_name = self.generate_random_name()
+                    queue.append((user, tenant_id, i, cur_name))
 
-            kwargs = self.config.get("image_args", {})
-            if self.config.get("min_ram") is not None:
-                LOG.warning("The 'min_ram' argument is deprecated; specify "
-                            "arbitrary arguments with 'image_args' instead")
-                kwargs["min_ram"] = self.config["min_ram"]
-            if self.config.get("min_disk") is not None:
-                LOG.warning("The 'min_disk' argument is deprecated; specify "
-                            "arbitrary arguments with 'image_args' instead")
-                kwargs["min_disk"] = self.config["min_disk"]
-            if "is_public" in kwargs:
-                LOG.warning("The 'is_public' argument is deprecated since "
-                            "Rally 0.8.0; specify visibility arguments "
-                            "instead")
-
-            for i in range(images_per_tenant):
-                if image_name and i > 0:
-                    cur_name = image_name + str(i)
-                elif image_name:
-                    cur_name = image_name
-                else:
-                    cur_name = self.generate_random_name()
-
-                image = glance_wrap.create_image(
-                    image_container, image_url, image_type,
+        def consume(cache, args):
+            user, tenant_id, i, cur_name = args
+            if tenant_id not in cache:
+                clients = osclients.Clients(
+                    user["credential"],
+                    api_info=self.context["config"].get("api_versions"))
+                cache[tenant_id] = glance_wrapper.wrap(clients.glance, self)
+
+            started_at = time.time()
+            try:
+                image = cache[tenant_id].create_image(
+                    image_container, image_location, image_type,
                     name=cur_name, **kwargs)
-                current_images.append(image.id)
+            except Exception as e:
+                errors.append(e)
+                raise
+            duration = time.time() - started_at
+            images[tenant_id][i] = image.id
+
+            if image_size is not None and duration:
+                LOG.info(_("Image %(image)s is created in tenant %(tenant)s "
+                           "in %(duration).2f sec (%(speed).2f MB/s)")
+                         % {"image": image.id, "tenant": tenant_id,
+                            "duration": duration,
+                            "speed": image_size / duration / 1024 ** 2})
+            else:
+                LOG.info(_("Image %(image)s is created in tenant %(tenant)s "
+                           "in %(duration).2f sec")
+                         % {"image": image.id, "tenant": tenant_id,
+                            "duration": duration})
+
+        broker.run(publish, consume, self.config["upload_workers"])
 
-            self.context["tenants"][tenant_id]["images"] = current_images
+        for tenant_id, tenant_images in images.items():
+            self.context["tenants"][tenant_id]["images"] = [
+                tenant_images[i] for i in sorted(tenant_images)]
+        if errors:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg=_("Failed to create %(failed)d image(s): %(error)s")
+                % {"failed": len(errors), "error": errors[0]})
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Images`"))
     def cleanup(self):
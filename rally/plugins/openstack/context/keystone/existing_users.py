@@ -13,14 +13,22 @@
 # under the License.
 
 
+import time
+
+from oslo_config import cfg
+
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import objects
+from rally import exceptions
 from rally import osclients
+from rally.plugins.openstack.context.keystone import users
 from rally.task import context
 
 
 LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
 
 
 # NOTE(boris-42): This context should be hidden for now and used only by
@@ -39,6 +47,25 @@ class ExistingUsers(context.Context):
        "existing_users" context.
     """
 
+    def _authenticate(self, credentials):
+        auth_refs = [None] * len(credentials)
+
+        def publish(queue):
+            queue.extend(enumerate(credentials))
+
+        def consume(cache, args):
+            i, credential = args
+            auth_refs[i] = osclients.Clients(credential).keystone.auth_ref
+
+        broker.run(publish, consume,
+                   CONF.users_context.resource_management_workers)
+        if None in auth_refs:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg=_("Failed to authenticate %d of existing users.")
+                % auth_refs.count(None))
+        return auth_refs
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `existing_users`"))
     def setup(self):
         super(ExistingUsers, self).setup()
@@ -46,12 +73,14 @@ class ExistingUsers(context.Context):
         self.context["tenants"] = {}
         self.context["user_choice_method"] = "random"
 
-        for user in self.config:
-            user_credential = objects.Credential(**user)
-            user_clients = osclients.Clients(user_credential)
+        credentials = [objects.Credential(**user) for user in self.config]
+        started_at = time.time()
+        auth_refs = self._authenticate(credentials)
+        duration = time.time() - started_at
 
-            user_id = user_clients.keystone.auth_ref.user_id
-            tenant_id = user_clients.keystone.auth_ref.project_id
+        for user_credential, auth_ref in zip(credentials, auth_refs):
+            user_id = auth_ref.user_id
+            tenant_id = auth_ref.project_id
 
             if tenant_id not in self.context["tenants"]:
                 self.context["tenants"][tenant_id] = {
@@ -59,12 +88,26 @@ class ExistingUsers(context.Context):
                     "name": user_credential.tenant_name
                 }
 
-            self.context["users"].append({
+            user = {
                 "credential": user_credential,
                 "id": user_id,
                 "tenant_id": tenant_id
-            })
+            }
+            if CONF.users_context.prewarm_tokens:
+                user["token"] = users.UserToken(auth_ref)
+            self.context["users"].append(user)
+
+        if CONF.users_context.prewarm_tokens:
+            LOG.info("Tokens of %(users)d users are pre-warmed in "
+                     "%(duration).3f sec." % {"users": len(auth_refs),
+                                              "duration": duration})
+            self.context["tokens_prewarm_duration"] = duration
+            self._token_refresher = users.TokenRefresher(
+                self.context["users"])
+            self._token_refresher.start()
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `existing_users`"))
     def cleanup(self):
         """These users are not managed by Rally, so don't touch them."""
+        if getattr(self, "_token_refresher", None):
+            self._token_refresher.stop()
@@ -14,6 +14,8 @@
 #    under the License.
 
 import collections
+import threading
+import time
 import uuid
 
 from oslo_config import cfg
@@ -47,6 +49,20 @@ USER_CONTEXT_OPTS = [
     cfg.StrOpt("keystone_default_role",
                default="member",
                help="The default role name of the keystone."),
+    cfg.BoolOpt("prewarm_tokens",
+                default=False,
+                help="Authenticate users concurrently during setup of users "
+                     "and existing_users contexts, so iterations reuse their "
+                     "tokens and service catalogs instead of authenticating "
+                     "in measured time."),
+    cfg.IntOpt("token_refresh_interval",
+               default=60, min=1,
+               help="How often (in seconds) pre-warmed tokens are checked "
+                    "for expiration."),
+    cfg.IntOpt("token_stale_duration",
+               default=600, min=0,
+               help="Pre-warmed tokens which expire within this number of "
+                    "seconds are refreshed in background."),
 ]
 
 CONF = cfg.CONF
@@ -55,6 +71,102 @@ CONF.register_opts(USER_CONTEXT_OPTS,
                                       title="benchmark context options"))
 
 
+class UserToken(object):
+    """Token and service catalog of user received in advance.
+
+    The same object is shared by all copies of context, so tokens refreshed
+    in background are seen by iterations and copying of context for each
+    iteration does not copy service catalogs.
+    """
+
+    def __init__(self, auth_ref):
+        self.auth_ref = auth_ref
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def prewarm_tokens(users, workers):
+    """Authenticate users concurrently and store their tokens in users.
+
+    :param users: list of users from context, "token" is added to each one
+    :param workers: number of concurrent threads
+    :returns: duration of authentication in seconds
+    """
+    def publish(queue):
+        queue.extend(users)
+
+    def consume(cache, user):
+        auth_ref = osclients.Clients(user["credential"]).keystone.auth_ref
+        user["token"] = UserToken(auth_ref)
+
+    started_at = time.time()
+    broker.run(publish, consume, workers)
+    return time.time() - started_at
+
+
+class TokenRefresher(object):
+    """Refreshes pre-warmed tokens of users in background thread."""
+
+    def __init__(self, users, interval=None, stale_duration=None):
+        self.users = users
+        self.interval = (interval or
+                         CONF.users_context.token_refresh_interval)
+        self.stale_duration = (stale_duration
+                               if stale_duration is not None else
+                               CONF.users_context.token_stale_duration)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.refresh()
+
+    def refresh(self):
+        """Refresh tokens which are about to expire."""
+        for user in self.users:
+            token = user.get("token")
+            if (token is None or
+                    not token.auth_ref.will_expire_soon(self.stale_duration)):
+                continue
+            try:
+                clients = osclients.Clients(user["credential"])
+                token.auth_ref = clients.keystone.auth_ref
+            except Exception as e:
+                LOG.warning("Failed to refresh token of user %(user)s: "
+                            "%(error)s" % {"user": user["id"], "error": e})
+
+
+def start_token_prewarming(context_obj, workers):
+    """Pre-warm tokens of context users and start refreshing them.
+
+    :param context_obj: context with "users"
+    :param workers: number of concurrent threads
+    :returns: started TokenRefresher
+    """
+    users = context_obj["users"]
+    duration = prewarm_tokens(users, workers)
+    LOG.info("Tokens of %(users)d users are pre-warmed in %(duration).3f "
+             "sec." % {"users": len(users), "duration": duration})
+    context_obj["tokens_prewarm_duration"] = duration
+
+    missed = len([u for u in users if "token" not in u])
+    if missed:
+        LOG.warning("Failed to pre-warm tokens of %d users, they will "
+                    "authenticate during iterations." % missed)
+    refresher = TokenRefresher(users)
+    refresher.start()
+    return refresher
+
+
 @context.configure(name="users", namespace="openstack", order=100)
 class UserGenerator(context.Context):
     """Context class for generating temporary users/tenants for benchmarks."""
@@ -82,7 +194,16 @@ class UserGenerator(context.Context):
                 "type": "string",
             },
             "user_choice_method": {
-                "enum": ["random", "round_robin"],
+                "enum": ["random", "round_robin", "least_recently_used",
+                         "sticky", "weighted"],
+            },
+            "tenant_weights": {
+                "type": "array",
+                "items": {"type": "integer", "minimum": 1},
+                "minItems": 1
+            },
+            "prewarm_tokens": {
+                "type": "boolean",
             },
         },
         "additionalProperties": False
@@ -94,6 +215,7 @@ class UserGenerator(context.Context):
         "resource_management_workers":
             cfg.CONF.users_context.resource_management_workers,
         "user_choice_method": "random",
+        "prewarm_tokens": cfg.CONF.users_context.prewarm_tokens,
     }
 
     def __init__(self, context):
@@ -264,6 +386,9 @@ class UserGenerator(context.Context):
         self.context["users"] = []
         self.context["tenants"] = {}
         self.context["user_choice_method"] = self.config["user_choice_method"]
+        if "tenant_weights" in self.config:
+            self.context["tenant_weights"] = list(
+                self.config["tenant_weights"])
 
         threads = self.config["resource_management_workers"]
 
@@ -288,9 +413,15 @@ class UserGenerator(context.Context):
                 ctx_name=self.get_name(),
                 msg=_("Failed to create the requested number of users."))
 
+        if self.config["prewarm_tokens"]:
+            self._token_refresher = start_token_prewarming(self.context,
+                                                           threads)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `users`"))
     def cleanup(self):
         """Delete tenants and users, using the broker pattern."""
+        if getattr(self, "_token_refresher", None):
+            self._token_refresher.stop()
         self._remove_default_security_group()
         self._delete_users()
         self._delete_tenants()
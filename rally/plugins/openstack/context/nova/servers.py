@@ -62,6 +62,11 @@ class ServerGenerator(context.Context):
                 "description": "True if NICs should be assigned.",
                 "type": "boolean",
             },
+            "bulk_boot": {
+                "description": "True if all servers of tenant should be "
+                               "booted by a single multi-create request.",
+                "type": "boolean",
+            },
             "nics": {
                 "type": "array",
                 "description": "List of networks to attach to server.",
@@ -79,7 +84,8 @@ class ServerGenerator(context.Context):
 
     DEFAULT_CONFIG = {
         "servers_per_tenant": 5,
-        "auto_assign_nic": False
+        "auto_assign_nic": False,
+        "bulk_boot": False
     }
 
     @logging.log_task_wrapper(LOG.info, _("Enter context: `Servers`"))
@@ -88,6 +94,10 @@ class ServerGenerator(context.Context):
         flavor = self.config["flavor"]
         auto_nic = self.config["auto_assign_nic"]
         servers_per_tenant = self.config["servers_per_tenant"]
+        if self.config["bulk_boot"]:
+            requests, instances_amount = 1, servers_per_tenant
+        else:
+            requests, instances_amount = servers_per_tenant, 1
         kwargs = {"nics": self.config.get("nics", [])}
 
         clients = osclients.Clients(self.context["users"][0]["credential"])
@@ -113,10 +123,10 @@ class ServerGenerator(context.Context):
                          "flavor_id": flavor_id,
                          "servers_per_tenant": servers_per_tenant})
 
-            servers = nova_scenario._boot_servers(image_id, flavor_id,
-                                                  requests=servers_per_tenant,
-                                                  auto_assign_nic=auto_nic,
-                                                  **kwargs)
+            servers = nova_scenario._boot_servers(
+                image_id, flavor_id, requests=requests,
+                instances_amount=instances_amount, auto_assign_nic=auto_nic,
+                **kwargs)
 
             current_servers = [server.id for server in servers]
 
@@ -14,10 +14,10 @@
 #    under the License.
 
 import functools
-import random
 
 from rally import osclients
 from rally.task import scenario
+from rally.task import user_selection
 
 configure = functools.partial(scenario.configure, namespace="openstack")
 
@@ -44,7 +44,11 @@ class OpenStackScenario(scenario.Scenario):
                 if "users" in context and "user" not in context:
                     self._choose_user(context)
 
-                if "user" in context:
+                if "user" in context and "token" in context["user"]:
+                    self._clients = osclients.Clients(
+                        context["user"]["credential"], api_info,
+                        auth_ref=context["user"]["token"].auth_ref)
+                elif "user" in context:
                     self._clients = osclients.Clients(
                         context["user"]["credential"], api_info)
 
@@ -57,26 +61,14 @@ class OpenStackScenario(scenario.Scenario):
     def _choose_user(self, context):
         """Choose one user from users context
 
-        We are choosing on each iteration one user
-
+        We are choosing on each iteration one user. Scenario runner puts
+        index of users to context["user_selection"], it is built here if
+        scenario is run without runner.
         """
-        if context["user_choice_method"] == "random":
-            user = random.choice(context["users"])
-            tenant = context["tenants"][user["tenant_id"]]
-        else:
-            # Second and last case - 'round_robin'.
-            tenants_amount = len(context["tenants"])
-            # NOTE(amaretskiy): iteration is subtracted by `1' because it
-            #                   starts from `1' but we count from `0'
-            iteration = context["iteration"] - 1
-            tenant_index = int(iteration % tenants_amount)
-            tenant_id = sorted(context["tenants"].keys())[tenant_index]
-            tenant = context["tenants"][tenant_id]
-            users = context["tenants"][tenant_id]["users"]
-            user_index = int((iteration / tenants_amount) % len(users))
-            user = users[user_index]
-
-        context["user"], context["tenant"] = user, tenant
+        index = context.get("user_selection")
+        if index is None:
+            index = user_selection.UserSelectionIndex(context)
+        context["user"], context["tenant"] = index.choose(context)
 
     def clients(self, client_type, version=None):
         """Returns a python openstack client of the requested type.
@@ -22,6 +22,7 @@ from rally.plugins.openstack import scenario
 from rally.plugins.openstack.scenarios.cinder import utils as cinder_utils
 from rally.plugins.openstack.scenarios.nova import utils
 from rally.plugins.openstack.wrappers import network as network_wrapper
+from rally.task import atomic
 from rally.task import types
 from rally.task import validation
 
@@ -147,6 +148,79 @@ class BootAndDeleteMultipleServers(utils.NovaScenario,
         self._delete_servers(servers, force=force_delete)
 
 
+@types.convert(image={"type": "glance_image"},
+               flavor={"type": "nova_flavor"})
+@validation.image_valid_on_flavor("flavor", "image")
+@validation.required_services(consts.Service.NOVA)
+@validation.required_openstack(users=True)
+@scenario.configure(context={"cleanup": ["nova"]},
+                    name="NovaServers.boot_servers_in_bulk")
+class BootServersInBulk(utils.NovaScenario):
+
+    def run(self, image, flavor, requests=1, instances_per_request=10,
+            auto_assign_nic=False, **kwargs):
+        """Boot servers by multi-create requests.
+
+        Statuses of all servers are checked in one loop by one list call
+        per check, servers missing in its results are got separately.
+        Statistics of times between sending of booting request and getting
+        each server in ACTIVE status are added to output of iteration.
+
+        :param image: image to be used to boot instances
+        :param flavor: flavor to be used to boot instances
+        :param requests: number of booting requests
+        :param instances_per_request: number of instances booted by each
+                                      request
+        :param auto_assign_nic: True if NICs should be assigned
+        :param kwargs: Optional additional arguments for servers creation
+        """
+        with atomic.ActionTimer(self, "nova.boot_servers"):
+            servers = self._boot_servers_in_bulk(
+                image, flavor, requests,
+                instances_amount=instances_per_request,
+                auto_assign_nic=auto_assign_nic, **kwargs)
+        self._add_boot_times_output([t for _server, t in servers])
+
+
+@types.convert(image={"type": "glance_image"},
+               flavor={"type": "nova_flavor"})
+@validation.image_valid_on_flavor("flavor", "image")
+@validation.required_services(consts.Service.NOVA)
+@validation.required_openstack(users=True)
+@scenario.configure(context={"cleanup": ["nova"]},
+                    name="NovaServers.boot_and_delete_servers_in_bulk")
+class BootAndDeleteServersInBulk(utils.NovaScenario):
+
+    def run(self, image, flavor, requests=1, instances_per_request=10,
+            auto_assign_nic=False, min_sleep=0, max_sleep=0,
+            force_delete=False, **kwargs):
+        """Boot servers by multi-create requests and delete them.
+
+        Statistics of times between sending of booting request and getting
+        each server in ACTIVE status are added to output of iteration.
+
+        :param image: image to be used to boot instances
+        :param flavor: flavor to be used to boot instances
+        :param requests: number of booting requests
+        :param instances_per_request: number of instances booted by each
+                                      request
+        :param auto_assign_nic: True if NICs should be assigned
+        :param min_sleep: Minimum sleep time in seconds (non-negative)
+        :param max_sleep: Maximum sleep time in seconds (non-negative)
+        :param force_delete: True if force_delete should be used
+        :param kwargs: Optional additional arguments for servers creation
+        """
+        with atomic.ActionTimer(self, "nova.boot_servers"):
+            servers = self._boot_servers_in_bulk(
+                image, flavor, requests,
+                instances_amount=instances_per_request,
+                auto_assign_nic=auto_assign_nic, **kwargs)
+        self._add_boot_times_output([t for _server, t in servers])
+        self.sleep_between(min_sleep, max_sleep)
+        self._delete_servers([server for server, _t in servers],
+                             force=force_delete)
+
+
 @types.convert(image={"type": "glance_image"},
                flavor={"type": "nova_flavor"})
 @validation.image_valid_on_flavor("flavor", "image", validate_disk=False)
@@ -14,9 +14,11 @@
 #    under the License.
 
 import random
+import time
 
 from oslo_config import cfg
 
+from rally.common import streaming_algorithms as streaming
 from rally import exceptions
 from rally.plugins.openstack import scenario
 from rally.plugins.openstack.wrappers import glance as glance_wrapper
@@ -585,15 +587,41 @@ class NovaScenario(scenario.OpenStackScenario):
 
         :returns: List of created server objects
         """
+        return [server for server, _boot_time in self._boot_servers_in_bulk(
+            image_id, flavor_id, requests, instances_amount=instances_amount,
+            auto_assign_nic=auto_assign_nic, **kwargs)]
+
+    def _boot_servers_in_bulk(self, image_id, flavor_id, requests,
+                              instances_amount=1, auto_assign_nic=False,
+                              **kwargs):
+        """Boot multiple servers by multi-create requests.
+
+        Statuses of all servers are checked in one loop by one list call
+        per check, so the number of polling requests doesn't depend on the
+        number of servers. Only servers missing in results of the list call
+        are got separately.
+
+        :param image_id: ID of the image to be used for server creation
+        :param flavor_id: ID of the flavor to be used for server creation
+        :param requests: Number of booting requests to perform
+        :param instances_amount: Number of instances to boot per each request
+        :param auto_assign_nic: bool, whether or not to auto assign NICs
+        :param kwargs: other optional parameters to initialize the servers
+
+        :returns: List of tuples (server, seconds between sending of booting
+                  request and the check which found server "Active")
+        """
         if auto_assign_nic and not kwargs.get("nics", False):
             nic = self._pick_random_nic()
             if nic:
                 kwargs["nics"] = nic
 
         name_prefix = self.generate_random_name()
+        requested_at = {}
         for i in range(requests):
-            self.clients("nova").servers.create("%s_%d" % (name_prefix, i),
-                                                image_id, flavor_id,
+            name = "%s_%d" % (name_prefix, i)
+            requested_at[name] = time.time()
+            self.clients("nova").servers.create(name, image_id, flavor_id,
                                                 min_count=instances_amount,
                                                 max_count=instances_amount,
                                                 **kwargs)
@@ -603,15 +631,63 @@ class NovaScenario(scenario.OpenStackScenario):
         servers = [s for s in self.clients("nova").servers.list()
                    if s.name.startswith(name_prefix)]
         self.sleep_between(CONF.benchmark.nova_server_boot_prepoll_delay)
-        servers = [utils.wait_for_status(
-            server,
+        servers = utils.wait_for_statuses(
+            servers,
             ready_statuses=["ACTIVE"],
-            update_resource=utils.
-            get_from_manager(),
+            update_resource=utils.get_from_manager(),
+            failure_statuses=["ERROR"],
             timeout=CONF.benchmark.nova_server_boot_timeout,
-            check_interval=CONF.benchmark.nova_server_boot_poll_interval
-        ) for server in servers]
-        return servers
+            check_interval=CONF.benchmark.nova_server_boot_poll_interval)
+
+        started_at = min(requested_at.values()) if requested_at else 0
+        result = []
+        for server, active_at in servers:
+            # nova appends "-<index>" or "-<uuid>" to names of servers
+            # booted by one request
+            request_started_at = next(
+                (t for name, t in requested_at.items()
+                 if server.name == name or server.name.startswith(
+                     name + "-")), started_at)
+            result.append((server, active_at - request_started_at))
+        return result
+
+    def _add_boot_times_output(self, boot_times):
+        """Add distribution of boot times of servers to output of iteration.
+
+        :param boot_times: list of seconds to boot each server
+        """
+        if not boot_times:
+            return
+        boot_times = sorted(boot_times)
+        stats = [("min", streaming.MinComputation()),
+                 ("median", streaming.PercentileComputation(
+                     0.5, len(boot_times))),
+                 ("90%ile", streaming.PercentileComputation(
+                     0.9, len(boot_times))),
+                 ("95%ile", streaming.PercentileComputation(
+                     0.95, len(boot_times))),
+                 ("max", streaming.MaxComputation()),
+                 ("avg", streaming.MeanComputation())]
+        for name, stat in stats:
+            for boot_time in boot_times:
+                stat.add(boot_time)
+        self.add_output(
+            additive={"title": "Time to ACTIVE of servers",
+                      "description": "Statistics of times between sending "
+                                     "of booting request and getting "
+                                     "server in ACTIVE status",
+                      "chart_plugin": "StatsTable",
+                      "data": [[name, stat.result()]
+                               for name, stat in stats]},
+            complete={"title": "Time to ACTIVE of servers",
+                      "description": "Times to ACTIVE of all servers of "
+                                     "the iteration in ascending order",
+                      "chart_plugin": "Lines",
+                      "data": [["time to ACTIVE",
+                                [[i + 1, boot_time] for i, boot_time
+                                 in enumerate(boot_times)]]],
+                      "label": "Seconds",
+                      "axis_label": "Servers"})
 
     @atomic.optional_action_timer("nova.associate_floating_ip")
     def _associate_floating_ip(self, server, address, fixed_address=None):
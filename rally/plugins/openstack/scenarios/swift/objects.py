@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally import consts
 from rally.plugins.openstack import scenario
 from rally.plugins.openstack.scenarios.swift import utils
@@ -32,27 +30,27 @@ from rally.task import validation
                          "_and_object_then_list_objects")
 class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024, concurrency=1,
+            **kwargs):
         """Create container and objects then list all objects.
 
         :param objects_per_container: int, number of objects to upload
-        :param object_size: int, temporary local object size
+        :param object_size: int, size of uploaded objects in bytes
+        :param concurrency: int, number of objects uploaded simultaneously
         :param kwargs: dict, optional parameters to create container
         """
         key_suffix = "object"
         if objects_per_container > 1:
             key_suffix = "%i_objects" % objects_per_container
 
-        container_name = None
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            with atomic.ActionTimer(self, "swift.create_%s" % key_suffix):
-                for i in range(objects_per_container):
-                    dummy_file.seek(0)
-                    self._upload_object(container_name, dummy_file,
-                                        atomic_action=False)
+        container_name = self._create_container(**kwargs)
+        with atomic.ActionTimer(self,
+                                "swift.create_%s" % key_suffix) as timer:
+            self._upload_objects(container_name, objects_per_container,
+                                 object_size, concurrency=concurrency)
+        self._add_throughput_output(
+            [("upload", objects_per_container * object_size,
+              timer.duration())])
         self._list_objects(container_name)
 
 
@@ -63,30 +61,28 @@ class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
                          "_and_object_then_delete_all")
 class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024, concurrency=1,
+            **kwargs):
         """Create container and objects then delete everything created.
 
         :param objects_per_container: int, number of objects to upload
-        :param object_size: int, temporary local object size
+        :param object_size: int, size of uploaded objects in bytes
+        :param concurrency: int, number of objects uploaded simultaneously
         :param kwargs: dict, optional parameters to create container
         """
         key_suffix = "object"
         if objects_per_container > 1:
             key_suffix = "%i_objects" % objects_per_container
 
-        container_name = None
-        objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            with atomic.ActionTimer(self, "swift.create_%s" % key_suffix):
-                for i in range(objects_per_container):
-                    dummy_file.seek(0)
-                    object_name = self._upload_object(container_name,
-                                                      dummy_file,
-                                                      atomic_action=False)[1]
-                    objects_list.append(object_name)
+        container_name = self._create_container(**kwargs)
+        with atomic.ActionTimer(self,
+                                "swift.create_%s" % key_suffix) as timer:
+            objects_list = self._upload_objects(
+                container_name, objects_per_container, object_size,
+                concurrency=concurrency)
+        self._add_throughput_output(
+            [("upload", objects_per_container * object_size,
+              timer.duration())])
 
         with atomic.ActionTimer(self, "swift.delete_%s" % key_suffix):
             for object_name in objects_list:
@@ -102,35 +98,39 @@ class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
                          "_and_object_then_download_object")
 class CreateContainerAndObjectThenDownloadObject(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024, concurrency=1,
+            download_chunk_size=None, **kwargs):
         """Create container and objects then download all objects.
 
         :param objects_per_container: int, number of objects to upload
-        :param object_size: int, temporary local object size
+        :param object_size: int, size of uploaded objects in bytes
+        :param concurrency: int, number of objects uploaded and downloaded
+                            simultaneously
+        :param download_chunk_size: int, stream downloaded objects by chunks
+                                    of this size instead of buffering them
         :param kwargs: dict, optional parameters to create container
         """
         key_suffix = "object"
         if objects_per_container > 1:
             key_suffix = "%i_objects" % objects_per_container
 
-        container_name = None
-        objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            with atomic.ActionTimer(self, "swift.create_%s" % key_suffix):
-                for i in range(objects_per_container):
-                    dummy_file.seek(0)
-                    object_name = self._upload_object(container_name,
-                                                      dummy_file,
-                                                      atomic_action=False)[1]
-                    objects_list.append(object_name)
-
-        with atomic.ActionTimer(self, "swift.download_%s" % key_suffix):
-            for object_name in objects_list:
-                self._download_object(container_name, object_name,
-                                      atomic_action=False)
+        container_name = self._create_container(**kwargs)
+        with atomic.ActionTimer(self,
+                                "swift.create_%s" % key_suffix) as timer:
+            objects_list = self._upload_objects(
+                container_name, objects_per_container, object_size,
+                concurrency=concurrency)
+        upload_duration = timer.duration()
+
+        with atomic.ActionTimer(self,
+                                "swift.download_%s" % key_suffix) as timer:
+            downloaded = self._download_objects(
+                [(container_name, name) for name in objects_list],
+                chunk_size=download_chunk_size, concurrency=concurrency)
+        self._add_throughput_output(
+            [("upload", objects_per_container * object_size,
+              upload_duration),
+             ("download", downloaded, timer.duration())])
 
 
 @validation.required_services(consts.Service.SWIFT)
@@ -160,8 +160,13 @@ class ListObjectsInContainers(utils.SwiftScenario):
                          "download_objects_in_containers")
 class ListAndDownloadObjectsInContainers(utils.SwiftScenario):
 
-    def run(self):
-        """List and download objects in all containers."""
+    def run(self, concurrency=1, download_chunk_size=None):
+        """List and download objects in all containers.
+
+        :param concurrency: int, number of objects downloaded simultaneously
+        :param download_chunk_size: int, stream downloaded objects by chunks
+                                    of this size instead of buffering them
+        """
 
         containers = self._list_containers()[1]
 
@@ -183,9 +188,12 @@ class ListAndDownloadObjectsInContainers(utils.SwiftScenario):
         if objects_total > 1:
             download_key_suffix = "%i_objects" % objects_total
 
-        with atomic.ActionTimer(self,
-                                "swift.download_%s" % download_key_suffix):
-            for container_name, objects in objects_dict.items():
-                for obj in objects:
-                    self._download_object(container_name, obj["name"],
-                                          atomic_action=False)
+        with atomic.ActionTimer(
+                self, "swift.download_%s" % download_key_suffix) as timer:
+            downloaded = self._download_objects(
+                [(name, obj["name"])
+                 for name, objects in objects_dict.items()
+                 for obj in objects],
+                chunk_size=download_chunk_size, concurrency=concurrency)
+        self._add_throughput_output(
+            [("download", downloaded, timer.duration())])
@@ -13,13 +13,79 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import hashlib
+import mmap
+import threading
+
+from rally import exceptions
 from rally.plugins.openstack import scenario
 from rally.task import atomic
 
 
+DOWNLOAD_CHUNK_SIZE = 65536
+
+_PAYLOAD_LOCK = threading.Lock()
+_PAYLOAD = {"buffer": None}
+
+
+class Payload(object):
+    """Read-only file-like view of shared pre-generated upload payload.
+
+    All payloads share one anonymous memory-mapped buffer filled with zeros,
+    which is allocated once and grown on demand, so uploads do not create
+    temporary files and do not copy the whole object into memory. The view
+    supports tell() and seek(), which allows swiftclient to retry uploads.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._buffer = _get_payload_buffer(size)
+        self._position = 0
+
+    def __len__(self):
+        return self.size
+
+    def read(self, size=-1):
+        end = self.size
+        if size is not None and size >= 0:
+            end = min(self._position + size, self.size)
+        data = self._buffer[self._position:end]
+        self._position = end
+        return data
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += self.size
+        self._position = min(max(offset, 0), self.size)
+
+    def reset(self):
+        self._position = 0
+
+
+def _get_payload_buffer(size):
+    with _PAYLOAD_LOCK:
+        buf = _PAYLOAD["buffer"]
+        if buf is None or len(buf) < size:
+            # anonymous mapping is backed by zero pages until written, so even
+            # large payloads cost no real memory.
+            buf = mmap.mmap(-1, max(size, 1))
+            _PAYLOAD["buffer"] = buf
+        return buf
+
+
 class SwiftScenario(scenario.OpenStackScenario):
     """Base class for Swift scenarios with basic atomic actions."""
 
+    def __init__(self, *args, **kwargs):
+        super(SwiftScenario, self).__init__(*args, **kwargs)
+        self._swift_local = threading.local()
+
     @atomic.action_timer("swift.list_containers")
     def _list_containers(self, full_listing=True, **kwargs):
         """Return list of containers.
@@ -100,27 +166,56 @@ class SwiftScenario(scenario.OpenStackScenario):
         """
         object_name = self.generate_random_name()
 
-        return (self.clients("swift").put_object(container_name, object_name,
-                                                 content, **kwargs),
+        return (self._swift().put_object(container_name, object_name,
+                                         content, **kwargs),
                 object_name)
 
     @atomic.optional_action_timer("swift.download_object")
-    def _download_object(self, container_name, object_name, **kwargs):
+    def _download_object(self, container_name, object_name, chunk_size=None,
+                         **kwargs):
         """Download object from container.
 
+        If chunk_size is set, object is streamed: its body is read by chunks,
+        which are only used to calculate checksum and then discarded, so
+        objects of any size can be downloaded without buffering them.
+
         :param container_name: str, name of the container to download object
                                from
         :param object_name: str, name of the object to download
+        :param chunk_size: int, size of chunks to stream object by
         :param atomic_action: bool, enable download object to be
                               tracked as an atomic action. added and
                               handled by the optional_action_timer()
                               decorator
         :param kwargs: dict, other optional parameters to get_object
 
-        :returns: tuple, (dict of response headers, the object's contents)
+        :returns: tuple, (dict of response headers, the object's contents
+                  or number of downloaded bytes if chunk_size is set)
+        :raises RallyException: if checksum of streamed object does not
+                                match its etag
         """
-        return self.clients("swift").get_object(container_name, object_name,
-                                                **kwargs)
+        if not chunk_size:
+            return self._swift().get_object(container_name, object_name,
+                                            **kwargs)
+
+        headers, body = self._swift().get_object(
+            container_name, object_name, resp_chunk_size=chunk_size,
+            **kwargs)
+        checksum = hashlib.md5()
+        size = 0
+        for chunk in body:
+            checksum.update(chunk)
+            size += len(chunk)
+
+        etag = headers.get("etag", "").strip("\"")
+        # etag of manifest objects is not md5 of content
+        if (etag and "x-object-manifest" not in headers
+                and "x-static-large-object" not in headers
+                and etag != checksum.hexdigest()):
+            raise exceptions.RallyException(
+                "Checksum %s of object %s/%s does not match etag %s"
+                % (checksum.hexdigest(), container_name, object_name, etag))
+        return headers, size
 
     @atomic.optional_action_timer("swift.delete_object")
     def _delete_object(self, container_name, object_name, **kwargs):
@@ -133,5 +228,102 @@ class SwiftScenario(scenario.OpenStackScenario):
                               by the optional_action_timer() decorator
         :param kwargs: dict, other optional parameters to delete_object
         """
-        self.clients("swift").delete_object(container_name, object_name,
-                                            **kwargs)
+        self._swift().delete_object(container_name, object_name, **kwargs)
+
+    def _swift(self):
+        """Return swift client of current thread.
+
+        Threads started by _run_concurrently() use their own connections,
+        because connection of swiftclient can not be shared by threads.
+        """
+        return getattr(self._swift_local, "client", None) or self.clients(
+            "swift")
+
+    def _run_concurrently(self, func, args_list, concurrency=1):
+        """Call func with each args from args_list using several threads.
+
+        :param func: callable to call
+        :param args_list: list of tuples with arguments of calls
+        :param concurrency: int, number of threads, calls are sequential
+                            if it is 1
+        :returns: list of results in order of args_list
+        :raises Exception: first error raised by calls
+        """
+        if concurrency <= 1 or len(args_list) <= 1:
+            return [func(*args) for args in args_list]
+
+        pending = collections.deque(enumerate(args_list))
+        results = [None] * len(args_list)
+        errors = []
+
+        def worker():
+            self._swift_local.client = self._clients.swift.create_client()
+            while not errors:
+                try:
+                    idx, args = pending.popleft()
+                except IndexError:
+                    return
+                try:
+                    results[idx] = func(*args)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=worker)
+                   for i in range(min(concurrency, len(args_list)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return results
+
+    def _upload_objects(self, container_name, objects_count, object_size,
+                        concurrency=1):
+        """Upload objects with shared payload to a given container.
+
+        :param container_name: str, name of the container to upload to
+        :param objects_count: int, number of objects to upload
+        :param object_size: int, size of each object in bytes
+        :param concurrency: int, number of objects uploaded simultaneously
+        :returns: list of names of uploaded objects
+        """
+        def upload():
+            return self._upload_object(container_name, Payload(object_size),
+                                       content_length=object_size,
+                                       atomic_action=False)[1]
+
+        return self._run_concurrently(upload, [()] * objects_count,
+                                      concurrency)
+
+    def _download_objects(self, objects, chunk_size=None, concurrency=1):
+        """Download objects.
+
+        :param objects: list of tuples (container name, object name)
+        :param chunk_size: int, stream objects by chunks of this size
+        :param concurrency: int, number of objects downloaded simultaneously
+        :returns: int, total number of downloaded bytes
+        """
+        def download(container_name, object_name):
+            kwargs = {"atomic_action": False}
+            if chunk_size:
+                kwargs["chunk_size"] = chunk_size
+            content = self._download_object(container_name, object_name,
+                                            **kwargs)[1]
+            return content if chunk_size else len(content)
+
+        return sum(self._run_concurrently(download, objects, concurrency))
+
+    def _add_throughput_output(self, transfers):
+        """Add bytes per second of transfers to output of iteration.
+
+        :param transfers: list of tuples (name, bytes, duration)
+        """
+        self.add_output(additive={
+            "title": "Swift throughput",
+            "description": "Bytes per second transferred by Swift objects "
+                           "operations",
+            "chart_plugin": "Lines",
+            "data": [[name, size / duration if duration else 0]
+                     for name, size, duration in transfers],
+            "label": "bytes/s"})
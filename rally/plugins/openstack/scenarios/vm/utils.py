@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import multiprocessing.util
 import os.path
 import subprocess
 import sys
@@ -37,12 +38,29 @@ VM_BENCHMARK_OPTS = [
                  help="Interval between checks when waiting for a VM to "
                  "become pingable"),
     cfg.FloatOpt("vm_ping_timeout", default=120.0,
-                 help="Time to wait for a VM to become pingable")]
+                 help="Time to wait for a VM to become pingable"),
+    cfg.FloatOpt("vm_ssh_max_poll_interval", default=8.0,
+                 help="Max interval between checks when waiting for a VM to "
+                 "become available via SSH. The interval is doubled after "
+                 "each failed check")]
 
 CONF = cfg.CONF
 benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
 CONF.register_opts(VM_BENCHMARK_OPTS, group=benchmark_group)
 
+# SSH connections shared between iterations of VM scenarios
+SSH_POOL = sshutils.SSHConnectionPool()
+
+
+def _register_ssh_pool_close(pool):
+    # iterations run in processes forked by runners, which drop finalizers
+    # of the parent, so the finalizer is registered again in each of them
+    multiprocessing.util.Finalize(pool, pool.close, exitpriority=10)
+
+
+_register_ssh_pool_close(SSH_POOL)
+multiprocessing.util.register_after_fork(SSH_POOL, _register_ssh_pool_close)
+
 
 class Host(object):
 
@@ -100,20 +118,18 @@ class VMScenario(nova_utils.NovaScenario, cinder_utils.CinderScenario):
 
     RESOURCE_NAME_PREFIX = "rally_vm_"
 
-    @atomic.action_timer("vm.run_command_over_ssh")
-    def _run_command_over_ssh(self, ssh, command):
-        """Run command inside an instance.
-
-        This is a separate function so that only script execution is timed.
+    def _get_command(self, command):
+        """Build command line and stdin from command dictionary.
 
-        :param ssh: A SSHClient instance.
         :param command: Dictionary specifying command to execute.
             See `rally info find VMTasks.boot_runcommand_delete' parameter
             `command' docstring for explanation.
 
-        :returns: tuple (exit_status, stdout, stderr)
+        :returns: tuple (cmd, stdin, upload), where upload is a tuple
+                  (local_path, remote_path) of file which should be copied
+                  to the server before execution or None
         """
-        cmd, stdin = [], None
+        cmd, stdin, upload = [], None, None
 
         interpreter = command.get("interpreter") or []
         if interpreter:
@@ -133,8 +149,7 @@ class VMScenario(nova_utils.NovaScenario, cinder_utils.CinderScenario):
                                  "or list type")
             cmd.extend(remote_path)
             if command.get("local_path"):
-                ssh.put_file(command["local_path"], remote_path[-1],
-                             mode=self.USER_RWX_OTHERS_RX_ACCESS_MODE)
+                upload = (command["local_path"], remote_path[-1])
 
         if command.get("script_file"):
             stdin = open(os.path.expanduser(command["script_file"]), "rb")
@@ -144,8 +159,68 @@ class VMScenario(nova_utils.NovaScenario, cinder_utils.CinderScenario):
 
         cmd.extend(command.get("command_args") or [])
 
+        return cmd, stdin, upload
+
+    @atomic.action_timer("vm.run_command_over_ssh")
+    def _run_command_over_ssh(self, ssh, command):
+        """Run command inside an instance.
+
+        This is a separate function so that only script execution is timed.
+
+        :param ssh: A SSHClient instance.
+        :param command: Dictionary specifying command to execute.
+            See `rally info find VMTasks.boot_runcommand_delete' parameter
+            `command' docstring for explanation.
+
+        :returns: tuple (exit_status, stdout, stderr)
+        """
+        cmd, stdin, upload = self._get_command(command)
+        if upload:
+            ssh.put_file(upload[0], upload[1],
+                         mode=self.USER_RWX_OTHERS_RX_ACCESS_MODE)
+
         return ssh.execute(cmd, stdin=stdin)
 
+    def _run_command_over_ssh_on_hosts(self, ssh_clients, command,
+                                       workers=10, timeout=3600):
+        """Run command inside many instances in parallel.
+
+        Failure on one host does not interrupt execution on others, so
+        results should be checked by the caller.
+
+        :param ssh_clients: list of SSH instances
+        :param command: Dictionary specifying command to execute.
+            See `rally info find VMTasks.boot_runcommand_delete' parameter
+            `command' docstring for explanation.
+        :param workers: max number of hosts processed simultaneously
+        :param timeout: timeout for command execution on each host
+
+        :returns: list of per-host results, see sshutils.SSHFanOut.execute
+        """
+        cmd, stdin, upload = self._get_command(command)
+        hosts = list(ssh_clients)
+        results = {}
+        if upload:
+            with atomic.ActionTimer(self, "vm.put_file_on_hosts"):
+                uploads = sshutils.SSHFanOut(hosts, workers).put_file(
+                    upload[0], upload[1],
+                    mode=self.USER_RWX_OTHERS_RX_ACCESS_MODE)
+            for ssh, result in zip(hosts, uploads):
+                if result["error"]:
+                    results[ssh] = result
+
+        ready = [ssh for ssh in hosts if ssh not in results]
+        try:
+            with atomic.ActionTimer(self, "vm.run_command_over_ssh_on_hosts"):
+                executed = sshutils.SSHFanOut(ready, workers).execute(
+                    cmd, stdin=stdin, timeout=timeout)
+        finally:
+            if stdin is not None:
+                stdin.close()
+        results.update(zip(ready, executed))
+
+        return [results[ssh] for ssh in hosts]
+
     def _boot_server_with_fip(self, image, flavor, use_floating_ip=True,
                               floating_network=None, **kwargs):
         """Boot server prepared for SSH actions."""
@@ -194,13 +269,26 @@ class VMScenario(nova_utils.NovaScenario, cinder_utils.CinderScenario):
                     fip["id"], wait=True)
 
     def _delete_server_with_fip(self, server, fip, force_delete=False):
+        SSH_POOL.discard(fip["ip"])
         if fip["is_floating"]:
             self._delete_floating_ip(server, fip)
         return self._delete_server(server, force=force_delete)
 
     @atomic.action_timer("vm.wait_for_ssh")
     def _wait_for_ssh(self, ssh, timeout=120, interval=1):
-        ssh.wait(timeout, interval)
+        ssh.wait(timeout, interval,
+                 max_interval=CONF.benchmark.vm_ssh_max_poll_interval)
+
+    @atomic.action_timer("vm.wait_for_ssh_on_hosts")
+    def _wait_for_ssh_on_hosts(self, ssh_clients, timeout=120, interval=1,
+                               workers=10):
+        """Wait for many servers to become available via SSH in parallel.
+
+        :returns: list of per-host results, see sshutils.SSHFanOut.wait
+        """
+        return sshutils.SSHFanOut(ssh_clients, workers).wait(
+            timeout, interval,
+            max_interval=CONF.benchmark.vm_ssh_max_poll_interval)
 
     @atomic.action_timer("vm.wait_for_ping")
     def _wait_for_ping(self, server_ip):
@@ -220,7 +308,8 @@ class VMScenario(nova_utils.NovaScenario, cinder_utils.CinderScenario):
         Create SSH connection for server, wait for server to become available
         (there is a delay between server being set to ACTIVE and sshd being
         available). Then call run_command_over_ssh to actually execute the
-        command.
+        command. SSH connections are taken from the shared pool, so
+        subsequent commands reuse already established connection.
 
         :param server_ip: server ip address
         :param port: ssh port for SSH connection
@@ -237,6 +326,6 @@ class VMScenario(nova_utils.NovaScenario, cinder_utils.CinderScenario):
         """
         pkey = pkey if pkey else self.context["user"]["keypair"]["private"]
         ssh = sshutils.SSH(username, server_ip, port=port,
-                           pkey=pkey, password=password)
+                           pkey=pkey, password=password, pool=SSH_POOL)
         self._wait_for_ssh(ssh, timeout, interval)
         return self._run_command_over_ssh(ssh, command)
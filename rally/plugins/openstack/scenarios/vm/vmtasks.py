@@ -219,6 +219,132 @@ class BootRuncommandDelete(vm_utils.VMScenario):
                     self.add_output(**{chart_type: chart})
 
 
+@types.convert(image={"type": "glance_image"},
+               flavor={"type": "nova_flavor"})
+@validation.image_valid_on_flavor("flavor", "image", fail_on_404_image=False)
+@validation.valid_command("command")
+@validation.number("servers_count", minval=1, integer_only=True)
+@validation.number("workers", minval=1, integer_only=True)
+@validation.number("port", minval=1, maxval=65535, nullable=True,
+                   integer_only=True)
+@validation.external_network_exists("floating_network")
+@validation.required_param_or_context(arg_name="image",
+                                      ctx_name="image_command_customizer")
+@validation.required_services(consts.Service.NOVA)
+@validation.required_openstack(users=True)
+@scenario.configure(context={"cleanup": ["nova"],
+                             "keypair": {}, "allow_ssh": None},
+                    name="VMTasks.boot_servers_runcommand_delete")
+class BootServersRuncommandDelete(vm_utils.VMScenario):
+
+    def run(self, flavor, username, command, password=None, image=None,
+            servers_count=2, workers=10, command_timeout=3600,
+            floating_network=None, port=22, use_floating_ip=True,
+            force_delete=False, max_output_length=1024, **kwargs):
+        """Boot servers, run a command on all of them in parallel, delete.
+
+        Command is executed on all servers concurrently by a bounded number
+        of workers, so slow or broken server does not delay others. Results
+        are reported per server in "Command results" table, number of
+        succeeded/failed servers and command duration statistics are
+        reported as additive charts.
+
+        :param flavor: VM flavor name
+        :param username: ssh username on servers, str
+        :param command: Command-specifying dictionary, see
+            `rally info find VMTasks.boot_runcommand_delete' parameter
+            `command' docstring for explanation
+        :param password: Password on SSH authentication
+        :param image: glance image name to use for the vms. Optional
+            in case of specified "image_command_customizer" context
+        :param servers_count: number of servers to boot
+        :param workers: max number of servers the command is executed on
+            simultaneously
+        :param command_timeout: timeout for command execution on each
+            server
+        :param floating_network: external network name, for floating ip
+        :param port: ssh port for SSH connection
+        :param use_floating_ip: bool, floating or fixed IP for SSH connection
+        :param force_delete: whether to use force_delete for servers
+        :param max_output_length: max number of characters of stdout and
+            stderr of each server displayed in "Command results" table
+        :param kwargs: extra arguments for booting the servers
+        """
+        if not image:
+            image = self.context["tenant"]["custom_image"]["id"]
+
+        servers = []
+        try:
+            for i in range(servers_count):
+                servers.append(self._boot_server_with_fip(
+                    image, flavor, use_floating_ip=use_floating_ip,
+                    floating_network=floating_network,
+                    key_name=self.context["user"]["keypair"]["name"],
+                    **kwargs))
+
+            ssh_clients = [
+                sshutils.SSH(username, fip["ip"], port=port,
+                             pkey=self.context["user"]["keypair"]["private"],
+                             password=password, pool=vm_utils.SSH_POOL)
+                for server, fip in servers]
+            waits = self._wait_for_ssh_on_hosts(ssh_clients, workers=workers)
+            for ssh, result in zip(ssh_clients, waits):
+                if result["error"]:
+                    raise exceptions.SSHTimeout(result["error"])
+
+            results = self._run_command_over_ssh_on_hosts(
+                ssh_clients, command, workers=workers,
+                timeout=command_timeout)
+        finally:
+            for server, fip in servers:
+                self._delete_server_with_fip(server, fip,
+                                             force_delete=force_delete)
+
+        self._add_hosts_output(results, max_output_length)
+
+        failed = [r["host"] for r in results
+                  if r["error"] or r["exit_status"]]
+        if failed:
+            raise exceptions.ScriptError(
+                "Command %(command)s failed on %(failed)d of %(total)d "
+                "servers: %(hosts)s" % {"command": command,
+                                        "failed": len(failed),
+                                        "total": len(results),
+                                        "hosts": ", ".join(failed)})
+
+    def _add_hosts_output(self, results, max_output_length):
+        succeeded = len([r for r in results
+                         if not r["error"] and r["exit_status"] == 0])
+        durations = [r["duration"] for r in results]
+        self.add_output(additive={
+            "title": "Servers",
+            "description": "Number of servers where command succeeded "
+                           "and failed",
+            "chart_plugin": "StackedArea",
+            "data": [["succeeded", succeeded],
+                     ["failed", len(results) - succeeded]]})
+        self.add_output(additive={
+            "title": "Command duration on servers",
+            "chart_plugin": "Lines",
+            "data": [["min", min(durations)],
+                     ["avg", sum(durations) / len(durations)],
+                     ["max", max(durations)]],
+            "label": "Seconds"})
+
+        def tail(data):
+            return (data or "")[-max_output_length:]
+
+        rows = [[r["host"], r.get("exit_status"), round(r["duration"], 3),
+                 tail(r["error"]), tail(r.get("stdout")),
+                 tail(r.get("stderr"))] for r in results]
+        self.add_output(complete={
+            "title": "Command results",
+            "chart_plugin": "Table",
+            "data": {"cols": ["Server", "Exit status", "Duration",
+                              "SSH error", "Stdout", "Stderr"],
+                     "rows": rows}})
+
+
 @scenario.configure(context={"cleanup": ["nova", "heat"],
                              "keypair": {}, "network": {}},
                     name="VMTasks.runcommand_heat")
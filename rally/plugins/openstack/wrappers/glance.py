@@ -40,7 +40,13 @@ GLANCE_BENCHMARK_OPTS = [
     cfg.FloatOpt("glance_image_create_poll_interval",
                  default=1.0,
                  help="Interval between checks when waiting for image "
-                      "creation.")
+                      "creation."),
+    cfg.StrOpt("glance_image_cache_dir",
+               default=None,
+               help="Directory where images downloaded by the images "
+                    "context are cached between task runs. If not set, "
+                    "images are downloaded to a temporary directory once "
+                    "per context.")
 ]
 
 CONF = cfg.CONF
@@ -108,7 +114,7 @@ class GlanceV1Wrapper(GlanceWrapper):
 
         try:
             if os.path.isfile(image_location):
-                kw["data"] = open(image_location)
+                kw["data"] = open(image_location, "rb")
             else:
                 kw["copy_from"] = image_location
 
@@ -183,7 +189,7 @@ class GlanceV2Wrapper(GlanceWrapper):
         response = None
         try:
             if os.path.isfile(image_location):
-                image_data = open(image_location)
+                image_data = open(image_location, "rb")
             else:
                 response = requests.get(image_location, stream=True)
                 image_data = response.raw
@@ -23,6 +23,7 @@ from rally.common import logging
 from rally.common import utils
 from rally import consts
 from rally import exceptions
+from rally import osclients
 from rally.task import utils as task_utils
 
 from neutronclient.common import exceptions as neutron_exceptions
@@ -80,6 +81,7 @@ class NetworkWrapper(object):
                        network.
         :returns: NetworkWrapper subclass instance
         """
+        self.clients = clients
         if hasattr(clients, self.SERVICE_IMPL):
             self.client = getattr(clients, self.SERVICE_IMPL)()
         else:
@@ -450,8 +452,12 @@ class NeutronWrapper(NetworkWrapper):
         :returns: result tuple
         :rtype: (bool, string)
         """
-        extensions = self.client.list_extensions().get("extensions", [])
-        if any(ext.get("alias") == extension for ext in extensions):
+        if isinstance(self.clients, osclients.Clients):
+            aliases = self.clients.neutron_extensions()
+        else:
+            aliases = [ext.get("alias") for ext in
+                       self.client.list_extensions().get("extensions", [])]
+        if extension in aliases:
             return True, ""
 
         return False, _("Neutron driver does not support %s") % (extension)
@@ -15,20 +15,61 @@
 
 import collections
 import functools
+import re
+import time
+
+import six
 
 from rally.common import utils
 
+# Separator of names of parent and child atomic actions in flat views
+NESTED_SEPARATOR = " > "
+
+_LEGACY_NAME_RE = re.compile(r"^(?P<name>.*) \((?P<idx>\d+)\)$")
+
 
 class ActionTimerMixin(object):
 
     def __init__(self):
-        self._atomic_actions = collections.OrderedDict()
+        self._atomic_actions = []
 
     def atomic_actions(self):
-        """Returns the content of each atomic action."""
+        """Returns the list of atomic actions.
+
+        Each atomic action is a dict with the following keys: "name",
+        "started_at", "finished_at" and "children" (list of nested atomic
+        actions).
+        """
         return self._atomic_actions
 
 
+def _find_parent(atomic_actions):
+    """Returns list to which new atomic action should be appended.
+
+    Atomic actions which are not finished yet are parents of new ones.
+    """
+    root = atomic_actions
+    while root and root[-1]["finished_at"] is None:
+        root = root[-1]["children"]
+    return root
+
+
+def get_running_atomic_action(atomic_actions):
+    """Returns name of the innermost running atomic action.
+
+    Names of parent atomic actions are joined by NESTED_SEPARATOR.
+
+    :param atomic_actions: list of atomic actions
+    :returns: name or None if there are no running atomic actions
+    """
+    names = []
+    root = atomic_actions
+    while root and root[-1]["finished_at"] is None:
+        names.append(root[-1]["name"])
+        root = root[-1]["children"]
+    return NESTED_SEPARATOR.join(names) or None
+
+
 class ActionTimer(utils.Timer):
     """A class to measure the duration of atomic operations
 
@@ -38,6 +79,9 @@ class ActionTimer(utils.Timer):
     for i in range(repetitions):
         with atomic.ActionTimer(instance_of_action_timer, "name_of_action"):
             self.clients(<client>).<operation>
+
+    Atomic actions which are started inside of other atomic action are
+    stored as its children.
     """
 
     def __init__(self, instance, name):
@@ -48,27 +92,110 @@ class ActionTimer(utils.Timer):
         """
         super(ActionTimer, self).__init__()
         self.instance = instance
-        self.name = self._get_atomic_action_name(instance, name)
-        self.instance._atomic_actions[self.name] = None
-
-    @classmethod
-    def _get_atomic_action_name(cls, instance, name):
-        # TODO(boris-42): It was quite bad idea to store atomic actions
-        #                 inside {}. We should refactor this in 0.2.0 release
-        #                 and store them inside array, that will allow us to
-        #                 store atomic actions with the same name
-        if name not in instance._atomic_actions:
-            return name
-
-        name_template = name + " (%i)"
-        i = 2
-        while name_template % i in instance._atomic_actions:
-            i += 1
-        return name_template % i
+        self.name = name
+        self.atomic_action = {"name": name, "started_at": None,
+                              "finished_at": None, "children": []}
+
+    def __enter__(self):
+        _find_parent(self.instance._atomic_actions).append(self.atomic_action)
+        super(ActionTimer, self).__enter__()
+        self.atomic_action["started_at"] = self.start
+        return self
 
     def __exit__(self, type_, value, tb):
         super(ActionTimer, self).__exit__(type_, value, tb)
-        self.instance._atomic_actions[self.name] = self.duration()
+        self.atomic_action["finished_at"] = self.finish
+
+
+def add_atomic_action(instance, name, duration):
+    """Add atomic action with already measured duration.
+
+    This is useful when duration is measured by other means than
+    ActionTimer, e.g. by callbacks of client library.
+
+    :param instance: instance of subclass of ActionTimerMixin
+    :param name: name of the atomic action
+    :param duration: duration of the atomic action in seconds
+    """
+    finished_at = time.time()
+    _find_parent(instance._atomic_actions).append(
+        {"name": name, "started_at": finished_at - duration,
+         "finished_at": finished_at, "children": []})
+
+
+def get_duration(atomic_action):
+    """Returns duration of atomic action in seconds."""
+    if atomic_action["finished_at"] is None:
+        return 0
+    return atomic_action["finished_at"] - atomic_action["started_at"]
+
+
+def convert_legacy_atomic_actions(atomic_actions):
+    """Convert atomic actions stored by old Rally versions.
+
+    Old Rally versions stored atomic actions as dict of durations, where
+    repeated actions got names like "name (2)". Such actions are converted
+    to list of atomic actions with the same durations, suffixes of repeated
+    actions are removed. Since timestamps were not stored, all converted
+    atomic actions are started at 0.
+
+    :param atomic_actions: list of atomic actions or legacy dict
+    :returns: list of atomic actions
+    """
+    if not isinstance(atomic_actions, dict):
+        return atomic_actions
+
+    result = []
+    for name, duration in atomic_actions.items():
+        match = _LEGACY_NAME_RE.match(name)
+        if match and match.group("name") in atomic_actions:
+            name = match.group("name")
+        result.append({"name": name, "started_at": 0,
+                       "finished_at": duration or 0, "children": []})
+    return result
+
+
+def merge_atomic_actions(atomic_actions):
+    """Aggregate atomic actions with the same names.
+
+    :param atomic_actions: list of atomic actions or legacy dict
+    :returns: OrderedDict where keys are names of atomic actions and values
+              are dicts with summary "duration", "count" of atomic actions
+              and merged "children"
+    """
+    merged = collections.OrderedDict()
+    for action in convert_legacy_atomic_actions(atomic_actions):
+        if action["name"] not in merged:
+            merged[action["name"]] = {"duration": 0, "count": 0,
+                                      "children": []}
+        entry = merged[action["name"]]
+        entry["duration"] += get_duration(action)
+        entry["count"] += 1
+        entry["children"].extend(action["children"])
+    for entry in merged.values():
+        entry["children"] = merge_atomic_actions(entry["children"])
+    return merged
+
+
+def flatten_atomic_actions(atomic_actions, nested=False):
+    """Returns summary durations of atomic actions by names.
+
+    :param atomic_actions: list of atomic actions or legacy dict
+    :param nested: whether to include nested atomic actions. Names of them
+                   are full paths joined by NESTED_SEPARATOR, like
+                   "parent > child"
+    :returns: OrderedDict where keys are names and values are durations
+    """
+    def flatten(merged, prefix=""):
+        for name, entry in six.iteritems(merged):
+            yield prefix + name, entry["duration"]
+            if nested:
+                for item in flatten(entry["children"],
+                                    prefix + name + NESTED_SEPARATOR):
+                    yield item
+
+    return collections.OrderedDict(
+        flatten(merge_atomic_actions(atomic_actions)))
 
 
 def action_timer(name):
@@ -23,6 +23,7 @@ import traceback
 import jsonschema
 from oslo_config import cfg
 import six
+from six.moves import queue as Queue
 
 from rally.common.i18n import _
 from rally.common import logging
@@ -32,6 +33,7 @@ from rally import consts
 from rally import exceptions
 from rally.task import context
 from rally.task import hook
+from rally.task import metrics
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
@@ -44,10 +46,107 @@ CONF = cfg.CONF
 TASK_ENGINE_OPTS = [
     cfg.IntOpt("raw_result_chunk_size", default=1000, min=1,
                help="Size of raw result chunk in iterations"),
+    cfg.IntOpt("raw_result_queue_size", default=16, min=1,
+               help="Maximum number of raw result chunks waiting to be "
+                    "written to DB. Consumer of results waits when the "
+                    "queue is full"),
+    cfg.IntOpt("raw_result_batch_size", default=8, min=1,
+               help="Maximum number of raw result chunks written to DB "
+                    "in one transaction"),
 ]
 CONF.register_opts(TASK_ENGINE_OPTS)
 
 
+class WorkloadDataWriter(object):
+    """Writes chunks of raw results to DB in a background thread.
+
+    Chunks waiting in the bounded queue are written in batches by bulk
+    inserts, so latency of DB stalls the producer only when the queue is
+    full. Progress records of workload are written by the same thread,
+    after chunks scheduled before them.
+    """
+
+    def __init__(self, workload, queue_size=None, batch_size=None):
+        """WorkloadDataWriter constructor.
+
+        :param workload: Instance of Workload, owner of raw results
+        :param queue_size: maximum number of chunks waiting to be written
+        :param batch_size: maximum number of chunks written in one
+                           transaction
+        """
+        self.workload = workload
+        self.queue = Queue.Queue(queue_size or CONF.raw_result_queue_size)
+        self.batch_size = batch_size or CONF.raw_result_batch_size
+        self.error = None
+        self.thread = threading.Thread(target=self._write)
+
+    def start(self):
+        self.thread.start()
+
+    def put(self, chunk_order, workload_data):
+        """Schedule writing of chunk, wait if the queue is full."""
+        self.queue.put((chunk_order, workload_data))
+
+    def put_progress(self, record):
+        """Schedule writing of progress record, wait if the queue is full."""
+        self.queue.put((None, record))
+
+    def close(self):
+        """Write all scheduled chunks and stop the writer.
+
+        :raises Exception: the first error occurred while writing chunks
+        """
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _write(self):
+        stopped = False
+        while not stopped:
+            chunks = []
+            item = self.queue.get()
+            while item is not None:
+                chunks.append(item)
+                if len(chunks) == self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except Queue.Empty:
+                    break
+            stopped = item is None
+            batch = []
+            for chunk in chunks:
+                if chunk[0] is not None:
+                    batch.append(chunk)
+                    continue
+                self._write_chunks(batch)
+                batch = []
+                self._write_progress(chunk[1])
+            self._write_chunks(batch)
+
+    def _write_chunks(self, chunks):
+        if not chunks:
+            return
+        try:
+            self.workload.add_workload_data_chunks(chunks)
+        except Exception as e:
+            LOG.exception("Failed to write %d chunks of raw results of "
+                          "workload %s" % (len(chunks),
+                                           self.workload["uuid"]))
+            if self.error is None:
+                self.error = e
+
+    def _write_progress(self, record):
+        # progress is only informational, so failure to store it doesn't
+        # fail the workload
+        try:
+            self.workload.add_progress(record)
+        except Exception as e:
+            LOG.warning("Failed to store progress of workload %s: %s"
+                        % (self.workload["uuid"], e))
+
+
 class ResultConsumer(object):
     """ResultConsumer class stores results from ScenarioRunner, checks SLA.
 
@@ -56,7 +155,7 @@ class ResultConsumer(object):
     """
 
     def __init__(self, key, task, subtask, workload, runner,
-                 abort_on_sla_failure):
+                 abort_on_sla_failure, live_metrics=None):
         """ResultConsumer constructor.
 
         :param key: Scenario identifier
@@ -67,6 +166,8 @@ class ResultConsumer(object):
                        consumed
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param live_metrics: Instance of metrics.LiveMetrics to be fed with
+                             started iterations and results, if any
         """
 
         self.key = key
@@ -81,18 +182,30 @@ class ResultConsumer(object):
         self.sla_checker = sla.SLAChecker(key["kw"])
         self.hook_executor = hook.HookExecutor(key["kw"], self.task)
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.live_metrics = live_metrics
         self.is_done = threading.Event()
         self.unexpected_failure = {}
         self.results = []
+        self.writer = WorkloadDataWriter(workload)
         self.thread = threading.Thread(target=self._consume_results)
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
-        if "hooks" in self.key["kw"]:
+        self.progress = None
+        if CONF.task_metrics.progress_interval:
+            self.progress = metrics.ProgressRecorder(
+                key, workload, write=self.writer.put_progress)
+        self.event_thread = None
+        if "hooks" in self.key["kw"] or self.live_metrics:
             self.event_thread = threading.Thread(target=self._consume_events)
 
     def __enter__(self):
+        if self.live_metrics:
+            self.live_metrics.start_workload(self.key, self.runner)
+        if self.progress:
+            self.progress.start()
+        self.writer.start()
         self.thread.start()
         self.aborting_checker.start()
-        if "hooks" in self.key["kw"]:
+        if self.event_thread:
             self.event_thread.start()
         self.start = time.time()
         return self
@@ -103,6 +216,7 @@ class ResultConsumer(object):
             if self.runner.result_queue:
                 results = self.runner.result_queue.popleft()
                 self.results.extend(results)
+                success = True
                 for r in results:
                     self.load_started_at = min(r["timestamp"],
                                                self.load_started_at)
@@ -117,28 +231,38 @@ class ResultConsumer(object):
                         self.task.update_status(
                             consts.TaskStatus.SOFT_ABORTING)
                         task_aborted = True
+                if self.live_metrics:
+                    self.live_metrics.add_results(results, success)
+                if self.progress:
+                    self.progress.add(results)
 
                 # save results chunks
                 chunk_size = CONF.raw_result_chunk_size
-                while len(self.results) >= chunk_size:
-                    results_chunk = self.results[:chunk_size]
-                    self.results = self.results[chunk_size:]
+                consumed = len(self.results) - len(self.results) % chunk_size
+                for i in range(0, consumed, chunk_size):
+                    results_chunk = self.results[i:i + chunk_size]
                     results_chunk.sort(key=lambda x: x["timestamp"])
-                    self.workload.add_workload_data(self.workload_data_count,
-                                                    {"raw": results_chunk})
+                    self.writer.put(self.workload_data_count,
+                                    {"raw": results_chunk})
                     self.workload_data_count += 1
+                del self.results[:consumed]
 
             elif self.is_done.isSet():
                 break
             else:
                 time.sleep(0.1)
+            if self.progress:
+                self.progress.record_if_due()
 
     def _consume_events(self):
         while not self.is_done.isSet() or self.runner.event_queue:
             if self.runner.event_queue:
                 event = self.runner.event_queue.popleft()
-                self.hook_executor.on_event(
-                    event_type=event["type"], value=event["value"])
+                if self.live_metrics and event["type"] == "iteration":
+                    self.live_metrics.iteration_started()
+                if "hooks" in self.key["kw"]:
+                    self.hook_executor.on_event(
+                        event_type=event["type"], value=event["value"])
             else:
                 time.sleep(0.01)
 
@@ -147,6 +271,8 @@ class ResultConsumer(object):
         self.is_done.set()
         self.aborting_checker.join()
         self.thread.join()
+        if self.progress:
+            self.progress.record(finished=True)
 
         if exc_type:
             self.sla_checker.set_unexpected_failure(exc_value)
@@ -155,6 +281,21 @@ class ResultConsumer(object):
                 self.task["uuid"]) == consts.TaskStatus.ABORTED:
             self.sla_checker.set_aborted_manually()
 
+        if self.results:
+            # NOTE(boris-42): Sort in order of starting
+            #                 instead of order of ending
+            self.results.sort(key=lambda x: x["timestamp"])
+            self.writer.put(self.workload_data_count, {"raw": self.results})
+        writer_error = None
+        try:
+            self.writer.close()
+        except Exception as e:
+            # results of workload are stored anyway, with failed SLA, since
+            # some of raw results are lost
+            writer_error = e
+            if not exc_type:
+                self.sla_checker.set_unexpected_failure(e)
+
         load_duration = max(self.load_finished_at - self.load_started_at, 0)
 
         LOG.info("Load duration is: %s" % utils.format_float_to_str(
@@ -169,18 +310,17 @@ class ResultConsumer(object):
             "full_duration": self.finish - self.start,
             "sla": self.sla_checker.results(),
         }
-        if "hooks" in self.key["kw"]:
+        if self.event_thread:
             self.event_thread.join()
+        if "hooks" in self.key["kw"]:
             results["hooks"] = self.hook_executor.results()
-
-        if self.results:
-            # NOTE(boris-42): Sort in order of starting
-            #                 instead of order of ending
-            self.results.sort(key=lambda x: x["timestamp"])
-            self.workload.add_workload_data(self.workload_data_count,
-                                            {"raw": self.results})
+        if self.live_metrics:
+            self.live_metrics.finish_workload()
 
         self.workload.set_results(results)
+        # exception raised in the context is not replaced by error of writer
+        if writer_error is not None and not exc_type:
+            raise writer_error
 
     @staticmethod
     def is_task_in_aborting_status(task_uuid, check_soft=True):
@@ -429,6 +569,20 @@ class TaskEngine(object):
         """
         self.task.update_status(consts.TaskStatus.RUNNING)
 
+        with metrics.export(self.task["uuid"]) as live_metrics:
+            if not self._run_subtasks(live_metrics):
+                return
+
+        if objects.Task.get_status(
+                self.task["uuid"]) != consts.TaskStatus.ABORTED:
+            self.task.update_status(consts.TaskStatus.FINISHED)
+
+    def _run_subtasks(self, live_metrics):
+        """Run workloads of all subtasks.
+
+        :param live_metrics: Instance of metrics.LiveMetrics or None
+        :returns: False if the task is aborted, True otherwise
+        """
         for subtask in self.config.subtasks:
             subtask_obj = self.task.add_subtask(**subtask.to_dict())
 
@@ -438,7 +592,7 @@ class TaskEngine(object):
                         self.task["uuid"]):
                     LOG.info("Received aborting signal.")
                     self.task.update_status(consts.TaskStatus.ABORTED)
-                    return
+                    return False
 
                 key = workload.make_key()
                 workload_obj = subtask_obj.add_workload(key)
@@ -450,17 +604,15 @@ class TaskEngine(object):
                 try:
                     with ResultConsumer(key, self.task,
                                         subtask_obj, workload_obj, runner_obj,
-                                        self.abort_on_sla_failure):
+                                        self.abort_on_sla_failure,
+                                        live_metrics=live_metrics):
                         with context.ContextManager(context_obj):
                             runner_obj.run(workload.name, context_obj,
                                            workload.args)
                 except Exception as e:
                     LOG.debug(traceback.format_exc())
                     LOG.exception(e)
-
-        if objects.Task.get_status(
-                self.task["uuid"]) != consts.TaskStatus.ABORTED:
-            self.task.update_status(consts.TaskStatus.FINISHED)
+        return True
 
 
 class TaskConfig(object):
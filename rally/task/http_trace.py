@@ -0,0 +1,107 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Recording of HTTP calls made during scenario iterations.
+
+Runner starts recording before each iteration and stops it after the
+iteration is finished. HTTP clients report calls via record(), each call is
+attributed to the atomic action which is running at the moment. Recording
+is thread-local, so only calls made in the thread of iteration are recorded.
+
+Calls of an iteration are aggregated by endpoint and atomic action, so the
+size of recorded data doesn't depend on the number of calls. Each record is
+a dict with the following keys:
+
+    method:        HTTP method
+    service:       service type or network location of endpoint
+    url:           URL template, path where IDs are replaced with "{id}"
+    atomic_action: name of atomic action (names of parent atomic actions
+                   are joined by atomic.NESTED_SEPARATOR), None if calls
+                   are made outside of atomic actions
+    count:         number of calls
+    errors:        number of calls which failed with HTTP status code 400
+                   or higher or without response
+    duration:      float, total latency of calls in seconds
+"""
+
+import collections
+import re
+import threading
+
+from six.moves.urllib import parse
+
+from rally.task import atomic
+
+_local = threading.local()
+
+# UUIDs, hex IDs and numbers in URL paths
+_ID_RE = re.compile(r"(?<=/)(?:[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}"
+                    r"[0-9a-fA-F]{12}|[0-9a-fA-F]{32,}|\d+)(?=/|$)")
+
+
+def start(atomic_actions):
+    """Start recording of HTTP calls in the current thread.
+
+    :param atomic_actions: list of atomic actions of the scenario, calls are
+                           attributed to atomic actions running in it
+    """
+    _local.calls = collections.OrderedDict()
+    _local.atomic_actions = atomic_actions
+
+
+def stop():
+    """Stop recording of HTTP calls in the current thread.
+
+    :returns: list of records of calls in order of first calls
+    """
+    calls = getattr(_local, "calls", None) or {}
+    _local.calls = None
+    _local.atomic_actions = None
+    return list(calls.values())
+
+
+def is_recording():
+    return getattr(_local, "calls", None) is not None
+
+
+def get_url_template(url):
+    """Returns path of URL where IDs are replaced with "{id}"."""
+    return _ID_RE.sub("{id}", parse.urlsplit(url).path) or "/"
+
+
+def record(method, service, url, status, started_at, finished_at):
+    """Record HTTP call if recording is started in the current thread.
+
+    :param method: HTTP method
+    :param service: service type, if not specified then network location
+                    of URL is used
+    :param url: absolute URL or path relative to service endpoint
+    :param status: HTTP status code or None
+    :param started_at: float UNIX timestamp
+    :param finished_at: float UNIX timestamp
+    """
+    calls = getattr(_local, "calls", None)
+    if calls is None:
+        return
+    key = (method.upper(), service or parse.urlsplit(url).netloc,
+           get_url_template(url),
+           atomic.get_running_atomic_action(_local.atomic_actions))
+    if key not in calls:
+        calls[key] = dict(zip(("method", "service", "url", "atomic_action"),
+                              key), count=0, errors=0, duration=0.0)
+    call = calls[key]
+    call["count"] += 1
+    if not status or status >= 400:
+        call["errors"] += 1
+    call["duration"] += finished_at - started_at
@@ -0,0 +1,467 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Live metrics of running task.
+
+ResultConsumer feeds LiveMetrics with started iterations and results of
+finished ones, so progress of long running tasks can be watched without
+reading DB. Metrics are exposed by local HTTP endpoint in Prometheus text
+format and appended to a file as JSON lines. Both are disabled by default.
+
+ResultConsumer also feeds ProgressRecorder which stores compact progress
+records of workloads to DB at fixed interval, by the background thread which
+writes raw results. `rally task watch` reads only these records, so any
+number of watchers costs nothing to running task.
+"""
+
+import collections
+import contextlib
+import json
+import math
+import threading
+import time
+
+from oslo_config import cfg
+import six
+from six.moves import BaseHTTPServer
+
+from rally.common import logging
+from rally.task import atomic
+
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+METRICS_OPTS = [
+    cfg.IntOpt("port", default=0, min=0, max=65535,
+               help="Port of local HTTP endpoint which exposes live metrics "
+                    "of running task in Prometheus text format. Endpoint is "
+                    "disabled if port is 0"),
+    cfg.StrOpt("host", default="127.0.0.1",
+               help="Address to bind HTTP endpoint of live metrics to"),
+    cfg.StrOpt("file",
+               help="Path to file which snapshots of live metrics of "
+                    "running task are appended to as JSON lines"),
+    cfg.FloatOpt("file_interval", default=10.0, min=0.1,
+                 help="Interval in seconds between snapshots of live "
+                      "metrics appended to file"),
+    cfg.IntOpt("window", default=1000, min=1,
+               help="Number of the latest durations of each atomic action "
+                    "used to calculate rolling percentiles"),
+    cfg.FloatOpt("progress_interval", default=5.0, min=0,
+                 help="Interval in seconds between progress records of "
+                      "running workload stored to DB, which are shown by "
+                      "`rally task watch`. Records are not stored if "
+                      "interval is 0"),
+]
+metrics_group = cfg.OptGroup(name="task_metrics",
+                             title="Live metrics of running task")
+CONF.register_opts(METRICS_OPTS, group=metrics_group)
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Name, type and help of metrics in Prometheus text format
+_METRICS = [
+    ("rally_iterations_started_total", "counter",
+     "Number of started iterations"),
+    ("rally_iterations_finished_total", "counter",
+     "Number of finished iterations"),
+    ("rally_iterations_failed_total", "counter",
+     "Number of iterations finished with errors"),
+    ("rally_requests_per_second", "gauge",
+     "Achieved rate of finished iterations"),
+    ("rally_runner_queue_depth", "gauge",
+     "Number of chunks of results waiting to be consumed"),
+    ("rally_sla_success", "gauge",
+     "1 if all SLA criteria pass, 0 otherwise"),
+    ("rally_duration_seconds", "summary",
+     "Rolling percentiles of durations of iterations and atomic actions"),
+]
+
+
+def _percentile(values, percent):
+    """Calculate percentile of sorted list of values."""
+    k = (len(values) - 1) * percent
+    f = math.floor(k)
+    c = math.ceil(k)
+    if f == c:
+        return values[int(k)]
+    return values[int(f)] * (c - k) + values[int(c)] * (k - f)
+
+
+def _format_labels(labels):
+    def escape(value):
+        return (six.text_type(value).replace("\\", "\\\\")
+                .replace("\"", "\\\"").replace("\n", "\\n"))
+
+    return ",".join("%s=\"%s\"" % (name, escape(value))
+                    for name, value in labels)
+
+
+class LiveMetrics(object):
+    """Thread-safe metrics of the workload running at the moment."""
+
+    def __init__(self, task_uuid, window=None):
+        """LiveMetrics constructor.
+
+        :param task_uuid: UUID of running task
+        :param window: number of the latest durations of each atomic action
+                       used to calculate percentiles
+        """
+        self.task_uuid = task_uuid
+        self.window = window or CONF.task_metrics.window
+        self._lock = threading.Lock()
+        self._workload = None
+
+    def start_workload(self, key, runner):
+        """Reset metrics for new workload.
+
+        :param key: key of workload, dict with "name" and "pos"
+        :param runner: ScenarioRunner instance which runs the workload
+        """
+        with self._lock:
+            self._workload = {
+                "key": key,
+                "runner": runner,
+                "started": 0,
+                "finished": 0,
+                "failed": 0,
+                "sla_success": True,
+                "load_started_at": None,
+                "load_finished_at": None,
+                "is_finished": False,
+                "durations": collections.OrderedDict(),
+                "counts": collections.defaultdict(int),
+                "sums": collections.defaultdict(float)
+            }
+
+    def finish_workload(self):
+        with self._lock:
+            if self._workload:
+                self._workload["is_finished"] = True
+
+    def iteration_started(self):
+        with self._lock:
+            if self._workload:
+                self._workload["started"] += 1
+
+    def add_results(self, results, sla_success):
+        """Process results of finished iterations.
+
+        :param results: list of results of iterations
+        :param sla_success: whether all SLA criteria pass
+        """
+        with self._lock:
+            workload = self._workload
+            if not workload:
+                return
+            for r in results:
+                workload["finished"] += 1
+                if r["error"]:
+                    workload["failed"] += 1
+                if workload["load_started_at"] is None:
+                    workload["load_started_at"] = r["timestamp"]
+                workload["load_started_at"] = min(
+                    r["timestamp"], workload["load_started_at"])
+                workload["load_finished_at"] = max(
+                    r["timestamp"] + r["duration"],
+                    workload["load_finished_at"] or 0)
+                durations = atomic.flatten_atomic_actions(
+                    r["atomic_actions"])
+                durations["total"] = r["duration"]
+                for name, duration in durations.items():
+                    if name not in workload["durations"]:
+                        workload["durations"][name] = collections.deque(
+                            maxlen=self.window)
+                    workload["durations"][name].append(duration)
+                    workload["counts"][name] += 1
+                    workload["sums"][name] += duration
+            workload["sla_success"] = sla_success
+
+    def snapshot(self):
+        """Return current values of metrics.
+
+        :returns: dict with metrics of the current workload, only "timestamp"
+                  and "task" are returned until the first workload starts
+        """
+        now = time.time()
+        result = {"timestamp": now, "task": self.task_uuid}
+        with self._lock:
+            workload = self._workload
+            if not workload:
+                return result
+
+            rps = 0
+            if workload["load_started_at"] is not None:
+                finished_at = now
+                if workload["is_finished"]:
+                    finished_at = workload["load_finished_at"]
+                load_duration = finished_at - workload["load_started_at"]
+                if load_duration > 0:
+                    rps = workload["finished"] / load_duration
+
+            durations = collections.OrderedDict()
+            for name, values in workload["durations"].items():
+                values = sorted(values)
+                durations[name] = {
+                    "percentiles": collections.OrderedDict(
+                        (str(p), _percentile(values, p))
+                        for p in PERCENTILES),
+                    "count": workload["counts"][name],
+                    "sum": workload["sums"][name]}
+
+            result.update({
+                "scenario": workload["key"]["name"],
+                "position": workload["key"]["pos"],
+                "is_finished": workload["is_finished"],
+                "iterations_started": workload["started"],
+                "iterations_finished": workload["finished"],
+                "iterations_failed": workload["failed"],
+                "rps": rps,
+                "runner_queue_depth": len(workload["runner"].result_queue),
+                "sla_success": workload["sla_success"],
+                "durations": durations})
+        return result
+
+    def render(self):
+        """Return metrics in Prometheus text format."""
+        snapshot = self.snapshot()
+        if "scenario" not in snapshot:
+            return ""
+        labels = [("task", snapshot["task"]),
+                  ("scenario", snapshot["scenario"]),
+                  ("position", snapshot["position"])]
+        values = {
+            "rally_iterations_started_total": snapshot["iterations_started"],
+            "rally_iterations_finished_total": snapshot[
+                "iterations_finished"],
+            "rally_iterations_failed_total": snapshot["iterations_failed"],
+            "rally_requests_per_second": snapshot["rps"],
+            "rally_runner_queue_depth": snapshot["runner_queue_depth"],
+            "rally_sla_success": int(snapshot["sla_success"])}
+
+        lines = []
+        for name, metric_type, help_text in _METRICS:
+            lines.append("# HELP %s %s" % (name, help_text))
+            lines.append("# TYPE %s %s" % (name, metric_type))
+            if name in values:
+                lines.append("%s{%s} %s" % (name, _format_labels(labels),
+                                            values[name]))
+                continue
+            for action, data in snapshot["durations"].items():
+                action_labels = labels + [("action", action)]
+                for quantile, value in data["percentiles"].items():
+                    lines.append("%s{%s} %s" % (
+                        name,
+                        _format_labels(action_labels
+                                       + [("quantile", quantile)]),
+                        value))
+                lines.append("%s_count{%s} %s" % (
+                    name, _format_labels(action_labels), data["count"]))
+                lines.append("%s_sum{%s} %s" % (
+                    name, _format_labels(action_labels), data["sum"]))
+        return "\n".join(lines) + "\n"
+
+
+class ProgressRecorder(object):
+    """Stores compact progress records of running workload to DB.
+
+    Record is a small dict with numbers of completed and failed iterations,
+    rolling percentiles of durations, achieved rate and estimated time left.
+    It is stored at most once per interval and only if some iterations
+    have finished since the previous record, the final one is stored when
+    workload finishes.
+    """
+
+    def __init__(self, key, workload, interval=None, window=None,
+                 write=None):
+        """ProgressRecorder constructor.
+
+        :param key: key of workload, dict with "name", "pos" and "kw"
+        :param workload: Instance of Workload to store records of
+        :param interval: interval in seconds between records
+        :param window: number of the latest durations of iterations used to
+                       calculate percentiles
+        :param write: callable which schedules writing of record, records
+                      are written by the caller's thread if not specified
+        """
+        self.key = key
+        self.workload = workload
+        self.write = write
+        if interval is None:
+            interval = CONF.task_metrics.progress_interval
+        self.interval = interval
+        runner = key["kw"].get("runner", {})
+        self.total = runner.get("times")
+        self.duration = runner.get("duration")
+        self.completed = 0
+        self.errors = 0
+        self.durations = collections.deque(
+            maxlen=window or CONF.task_metrics.window)
+        self.started_at = None
+        self.recorded_at = None
+        self._recorded = None
+
+    def start(self):
+        self.started_at = self.recorded_at = time.time()
+
+    def add(self, results):
+        """Process results of finished iterations."""
+        for r in results:
+            self.completed += 1
+            if r.get("error"):
+                self.errors += 1
+            self.durations.append(r["duration"])
+
+    def _make_record(self, now, finished):
+        elapsed = now - self.started_at
+        rps = self.completed / elapsed if elapsed > 0 else 0
+        eta = None
+        if finished:
+            eta = 0
+        elif self.total is not None:
+            if rps:
+                eta = max(self.total - self.completed, 0) / rps
+        elif self.duration is not None:
+            eta = max(self.duration - elapsed, 0)
+        durations = sorted(self.durations)
+        return {"name": self.key["name"],
+                "pos": self.key["pos"],
+                "timestamp": now,
+                "completed": self.completed,
+                "total": self.total,
+                "errors": self.errors,
+                "p50": _percentile(durations, 0.5) if durations else None,
+                "p95": _percentile(durations, 0.95) if durations else None,
+                "rps": rps,
+                "eta": eta,
+                "finished": finished}
+
+    def record(self, finished=False):
+        """Store progress record."""
+        now = time.time()
+        self.recorded_at = now
+        self._recorded = self.completed
+        record = self._make_record(now, finished)
+        if self.write:
+            self.write(record)
+            return
+        try:
+            self.workload.add_progress(record)
+        except Exception as e:
+            LOG.warning("Failed to store progress of workload %s: %s"
+                        % (self.workload["uuid"], e))
+
+    def record_if_due(self):
+        """Store progress record if interval has passed since previous one."""
+        if (self.completed != self._recorded
+                and time.time() - self.recorded_at >= self.interval):
+            self.record()
+
+
+class _MetricsHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        LOG.debug("Metrics endpoint: %s" % (format % args))
+
+
+class MetricsExporter(object):
+    """Exposes LiveMetrics by HTTP endpoint and appends them to file."""
+
+    def __init__(self, metrics, host=None, port=None, path=None,
+                 interval=None):
+        """MetricsExporter constructor.
+
+        :param metrics: LiveMetrics instance
+        :param host: address to bind HTTP endpoint to
+        :param port: port of HTTP endpoint, it is disabled if port is 0
+        :param path: path to file to append metrics to, nothing is written
+                     if it is None
+        :param interval: interval in seconds between writes to file
+        """
+        self.metrics = metrics
+        self.host = host or CONF.task_metrics.host
+        self.port = CONF.task_metrics.port if port is None else port
+        self.path = path or CONF.task_metrics.file
+        self.interval = interval or CONF.task_metrics.file_interval
+        self.server = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self.port:
+            self.server = BaseHTTPServer.HTTPServer((self.host, self.port),
+                                                    _MetricsHandler)
+            self.server.metrics = self.metrics
+            self._threads.append(
+                threading.Thread(target=self.server.serve_forever))
+            LOG.info("Live metrics of task are available at "
+                     "http://%s:%s/metrics" % self.server.server_address[:2])
+        if self.path:
+            self._threads.append(threading.Thread(target=self._write))
+            LOG.info("Live metrics of task are appended to %s" % self.path)
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def _write(self):
+        while True:
+            stopped = self._stop_event.wait(self.interval)
+            try:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(self.metrics.snapshot()) + "\n")
+            except IOError as e:
+                LOG.warning("Failed to write live metrics to %s: %s"
+                            % (self.path, e))
+            if stopped:
+                return
+
+
+@contextlib.contextmanager
+def export(task_uuid):
+    """Collect and export live metrics of task if it is configured.
+
+    :param task_uuid: UUID of running task
+    :returns: LiveMetrics instance or None if export of metrics is disabled
+    """
+    if not (CONF.task_metrics.port or CONF.task_metrics.file):
+        yield None
+        return
+
+    metrics = LiveMetrics(task_uuid)
+    exporter = MetricsExporter(metrics)
+    exporter.start()
+    try:
+        yield metrics
+    finally:
+        exporter.stop()
@@ -21,6 +21,7 @@ import six
 
 from rally.common.plugin import plugin
 from rally.common import streaming_algorithms as streaming
+from rally.task import atomic
 from rally.task.processing import utils
 
 
@@ -70,16 +71,24 @@ class Chart(plugin.Plugin):
         return [(name, points.get_zipped_graph())
                 for name, points in self._data.items()]
 
-    def _fix_atomic_actions(self, iteration):
-        """Set `0' for missed atomic actions.
+    def _get_atomic_actions(self, iteration, nested=False):
+        """Returns durations of atomic actions of iteration by names.
 
-        Since some atomic actions can absent in some iterations
-        due to failures, this method must be used in all cases
-        related to atomic actions processing.
+        Atomic actions with the same names are summarized. Since some
+        atomic actions can absent in some iterations due to failures,
+        `0' is set for missed ones, so this method must be used in all
+        cases related to atomic actions processing.
+
+        :param iteration: iteration data
+        :param nested: whether to include nested atomic actions
+        :returns: OrderedDict with durations of atomic actions
         """
+        actions = atomic.flatten_atomic_actions(iteration["atomic_actions"],
+                                                nested=nested)
         for name in self._workload_info["atomic"]:
-            iteration["atomic_actions"].setdefault(name, 0)
-        return iteration
+            if nested or atomic.NESTED_SEPARATOR not in name:
+                actions.setdefault(name, 0)
+        return actions
 
     @abc.abstractmethod
     def _map_iteration_values(self, iteration):
@@ -110,8 +119,7 @@ class AtomicStackedAreaChart(Chart):
     widget = "StackedArea"
 
     def _map_iteration_values(self, iteration):
-        iteration = self._fix_atomic_actions(iteration)
-        atomics = list(iteration["atomic_actions"].items())
+        atomics = list(self._get_atomic_actions(iteration).items())
         if self._workload_info["iterations_failed"]:
             if iteration["error"]:
                 failed_duration = (
@@ -141,8 +149,7 @@ class AvgChart(Chart):
 class AtomicAvgChart(AvgChart):
 
     def _map_iteration_values(self, iteration):
-        iteration = self._fix_atomic_actions(iteration)
-        return list(iteration["atomic_actions"].items())
+        return list(self._get_atomic_actions(iteration).items())
 
 
 class LoadProfileChart(Chart):
@@ -269,16 +276,15 @@ class AtomicHistogramChart(HistogramChart):
 
     def __init__(self, workload_info):
         super(AtomicHistogramChart, self).__init__(workload_info)
-        for i, atomic in enumerate(self._workload_info["atomic"].items()):
-            name, value = atomic
+        for i, action in enumerate(self._workload_info["atomic"].items()):
+            name, value = action
             self._data[name] = {
                 "views": self._init_views(value["min_duration"],
                                           value["max_duration"]),
                 "disabled": i}
 
     def _map_iteration_values(self, iteration):
-        iteration = self._fix_atomic_actions(iteration)
-        return list(iteration["atomic_actions"].items())
+        return list(self._get_atomic_actions(iteration, nested=True).items())
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -350,6 +356,10 @@ class Table(Chart):
 
 
 class MainStatsTable(Table):
+    """Table with statistics of atomic actions and total durations.
+
+    Nested atomic actions have their own rows named like "parent > child".
+    """
 
     columns = ["Action", "Min (sec)", "Median (sec)", "90%ile (sec)",
                "95%ile (sec)", "Max (sec)", "Avg (sec)", "Success", "Count"]
@@ -372,7 +382,9 @@ class MainStatsTable(Table):
                  lambda st, has_result: st.result()]]
 
     def _map_iteration_values(self, iteration):
-        return dict(iteration["atomic_actions"], total=iteration["duration"])
+        return dict(atomic.flatten_atomic_actions(iteration["atomic_actions"],
+                                                  nested=True),
+                    total=iteration["duration"])
 
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration).items():
@@ -385,6 +397,50 @@ class MainStatsTable(Table):
                     self._data[name][idx][0].add(value)
 
 
+class HttpCallsTable(Table):
+    """Table with latencies of HTTP calls grouped by endpoints.
+
+    HTTP calls are recorded if openstack_client_http_trace option is
+    enabled, see rally.task.http_trace for details. Like durations of
+    atomic actions in MainStatsTable, latency statistics are computed over
+    iterations, by average latency of calls made by each iteration.
+    """
+
+    columns = ["Request", "Atomic action", "Min (sec)", "Median (sec)",
+               "90%ile (sec)", "Max (sec)", "Avg (sec)", "Errors", "Count"]
+
+    def _map_iteration_values(self, iteration):
+        return iteration.get("http_calls", [])
+
+    def add_iteration(self, iteration):
+        iters_num = self._workload_info["iterations_count"]
+        for call in self._map_iteration_values(iteration):
+            key = ("%(method)s %(service)s %(url)s" % call,
+                   call["atomic_action"] or "n/a")
+            if key not in self._data:
+                self._data[key] = [
+                    [streaming.MinComputation(), None],
+                    [streaming.PercentileComputation(0.5, iters_num), None],
+                    [streaming.PercentileComputation(0.9, iters_num), None],
+                    [streaming.MaxComputation(), None],
+                    [streaming.MeanComputation(), None],
+                    [streaming.IncrementComputation(),
+                     lambda st, has_result: st.result()],
+                    [streaming.IncrementComputation(),
+                     lambda st, has_result: st.result()]]
+            for ins, fn in self._data[key][:-2]:
+                ins.add(call["duration"] / call["count"])
+            for i in range(call["errors"]):
+                self._data[key][-2][0].add()
+            for i in range(call["count"]):
+                self._data[key][-1][0].add()
+
+    def get_rows(self):
+        # names of rows are tuples of request and atomic action
+        return [list(row[0]) + row[1:]
+                for row in super(HttpCallsTable, self).get_rows()]
+
+
 class OutputChart(Chart):
     """Base class for charts related to scenario output."""
 
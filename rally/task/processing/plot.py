@@ -15,8 +15,12 @@
 
 import collections
 import datetime as dt
+import functools
 import hashlib
 import json
+import multiprocessing
+import os
+import re
 
 import six
 
@@ -90,6 +94,7 @@ def _process_scenario(data, pos):
     atomic_pie = charts.AtomicAvgChart(data["info"])
     atomic_area = charts.AtomicStackedAreaChart(data["info"])
     atomic_hist = charts.AtomicHistogramChart(data["info"])
+    http_calls = charts.HttpCallsTable(data["info"])
 
     errors = []
     output_errors = []
@@ -124,7 +129,7 @@ def _process_scenario(data, pos):
         complete_output.append(complete_charts)
 
         for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist):
+                      atomic_pie, atomic_area, atomic_hist, http_calls):
             chart.add_iteration(itr)
 
     kw = data["key"]["kw"]
@@ -151,6 +156,7 @@ def _process_scenario(data, pos):
                    "iter": atomic_area.render(),
                    "pie": atomic_pie.render()},
         "table": main_stat.render(),
+        "http_calls": http_calls.render(),
         "additive_output": additive_output,
         "complete_output": complete_output,
         "has_output": any(additive_output) or any(complete_output),
@@ -165,22 +171,83 @@ def _process_scenario(data, pos):
     }
 
 
-def _process_tasks(tasks_results):
-    tasks = []
+def _call(item):
+    func, args = item
+    return func(*args)
+
+
+def _map(func, args_list, processes=1):
+    """Call func for each args in parallel processes, keeping order."""
+    if processes == 1 or len(args_list) < 2:
+        return [func(*args) for args in args_list]
+    pool = multiprocessing.Pool(min(processes or multiprocessing.cpu_count(),
+                                    len(args_list)))
+    try:
+        return pool.map(_call, [(func, args) for args in args_list],
+                        chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _process_tasks(tasks_results, processor=None, processes=1):
+    """Process workloads and make data for report.
+
+    :param tasks_results: list of extended workloads results
+    :param processor: function which takes workload result and its
+                      position, and returns data for report, by default
+                      _process_scenario
+    :param processes: number of processes to process workloads in, None
+                      means number of CPUs
+    :returns: tuple of JSON with input configs and list of workloads data
+    """
     source_dict = collections.defaultdict(list)
     position = collections.defaultdict(lambda: -1)
 
+    args_list = []
     for scenario in tasks_results:
         name = scenario["key"]["name"]
         position[name] += 1
         source_dict[name].append(scenario["key"]["kw"])
-        tasks.append(_process_scenario(scenario, position[name]))
+        args_list.append((scenario, position[name]))
+    tasks = _map(processor or _process_scenario, args_list, processes)
 
     source = json.dumps(source_dict, indent=2, sort_keys=True)
     return source, sorted(tasks, key=lambda r: (r["cls"], r["met"],
                                                 int(r["pos"])))
 
 
+# Keys of workload data which are shown in overview of report
+_SUMMARY_KEYS = ("cls", "met", "pos", "name", "runner", "load_duration",
+                 "full_duration", "created_at", "sla_success",
+                 "iterations_count")
+
+
+def _process_scenario_to_file(data_dir, data, pos):
+    """Write data of workload for report to file.
+
+    The file is a script which passes data to rallyLoadWorkload() function
+    of report, so it can be loaded on demand even if report is opened from
+    local file system.
+
+    :returns: summary of workload with "data_file" key, which is path of
+              file relative to report
+    """
+    workload = _process_scenario(data, pos)
+    filename = "%s-%s.js" % (re.sub(r"[^\w.-]", "_", data["key"]["name"]),
+                             pos)
+    data_file = "%s/%s" % (os.path.basename(data_dir), filename)
+    with open(os.path.join(data_dir, filename), "w") as f:
+        f.write("rallyLoadWorkload(%s, %s);\n" % (json.dumps(data_file),
+                                                  json.dumps(workload)))
+
+    summary = dict((k, workload[k]) for k in _SUMMARY_KEYS)
+    summary["errors_count"] = len(workload["errors"])
+    summary["hooks_count"] = len(workload["hooks"])
+    summary["data_file"] = data_file
+    return summary
+
+
 def _extend_results(results):
     """Transform tasks results into extended format.
 
@@ -208,20 +275,98 @@ def _extend_results(results):
     return extended_results
 
 
-def plot(tasks_results, include_libs=False):
-    extended_results = _extend_results(tasks_results)
+def _extend_and_process(processor, result, pos):
+    """Extend result of workload and process it with processor.
+
+    This allows to extend results of workloads in parallel processes too.
+    """
+    return processor(_extend_results([result])[0], pos)
+
+
+def plot(tasks_results, include_libs=False, processes=1):
+    """Generate HTML report.
+
+    :param tasks_results: list of workloads results
+    :param include_libs: whether to embed JS and CSS libraries to report
+    :param processes: number of processes to process workloads in, None
+                      means number of CPUs
+    :returns: HTML of report
+    """
     template = ui_utils.get_template("task/report.html")
-    source, data = _process_tasks(extended_results)
+    source, data = _process_tasks(
+        tasks_results,
+        processor=functools.partial(_extend_and_process, _process_scenario),
+        processes=processes)
     return template.render(version=version.version_string(),
                            source=json.dumps(source),
                            data=json.dumps(data),
                            include_libs=include_libs)
 
 
-def trends(tasks_results):
+def plot_lazy(tasks_results, data_dir, include_libs=False, processes=None):
+    """Generate HTML report which loads data of workloads on demand.
+
+    Report itself contains only summaries of workloads, data of each
+    workload is written to separate file in data_dir, which should be
+    placed near the report.
+
+    :param tasks_results: list of workloads results
+    :param data_dir: path to directory for data files
+    :param include_libs: whether to embed JS and CSS libraries to report
+    :param processes: number of processes to process workloads in, None
+                      means number of CPUs
+    :returns: HTML of report
+    """
+    if not os.path.isdir(data_dir):
+        os.makedirs(data_dir)
+    template = ui_utils.get_template("task/report.html")
+    source, data = _process_tasks(
+        tasks_results,
+        processor=functools.partial(
+            _extend_and_process,
+            functools.partial(_process_scenario_to_file, data_dir)),
+        processes=processes)
+    return template.render(version=version.version_string(),
+                           source=json.dumps(source),
+                           data=json.dumps(data),
+                           include_libs=include_libs)
+
+
+def _make_trends_point(result):
+    """Make trends point of workload.
+
+    Statistics persisted with workload results are used if they are
+    present, otherwise statistics are calculated from raw iterations.
+    """
+    statistics = result.get("statistics")
+    if statistics:
+        result = {"key": result["key"], "sla": result["sla"],
+                  "info": {"stat": statistics["durations"],
+                           "tstamp_start": statistics["tstamp_start"]}}
+    else:
+        result = _extend_results([result])[0]
+    return Trends().make_point(result)
+
+
+def trends(tasks_results, processes=1, points=None):
+    """Generate HTML trends report.
+
+    Points of workloads are made in parallel processes and then are added
+    to trends in order of tasks_results, so report does not depend on
+    number of processes.
+
+    :param tasks_results: list of workloads results
+    :param processes: number of processes to process workloads in, None
+                      means number of CPUs
+    :param points: list of already made trends points, like persisted ones
+    :returns: HTML of trends report
+    """
     trends = Trends()
-    for i, scenario in enumerate(_extend_results(tasks_results), 1):
-        trends.add_result(scenario)
+    for point in points or []:
+        trends.add_point(point)
+    for point in _map(_make_trends_point,
+                      [(result,) for result in tasks_results], processes):
+        trends.add_point(point)
     template = ui_utils.get_template("task/trends.html")
     return template.render(version=version.version_string(),
                            data=json.dumps(trends.get_data()))
@@ -256,21 +401,35 @@ class Trends(object):
     def _make_hash(self, obj):
         return hashlib.md5(self._to_str(obj).encode("utf8")).hexdigest()
 
-    def add_result(self, result):
-        key = self._make_hash(result["key"]["kw"])
+    def make_point(self, result):
+        """Make point of trends from extended workload result.
+
+        :param result: extended workload result
+        :returns: dict with hash of workload config and data of workload
+                  which is needed for trends
+        """
+        return {"config_hash": self._make_hash(result["key"]["kw"]),
+                "name": result["key"]["name"],
+                "config": json.dumps(result["key"]["kw"], indent=2),
+                "sla_failures": sum(not sla["success"]
+                                    for sla in result["sla"]),
+                "stat": result["info"]["stat"],
+                "tstamp_start": result["info"]["tstamp_start"]}
+
+    def add_point(self, point):
+        key = point["config_hash"]
         if key not in self._data:
             self._data[key] = {
                 "actions": {},
                 "sla_failures": 0,
-                "name": result["key"]["name"],
-                "config": json.dumps(result["key"]["kw"], indent=2)}
+                "name": point["name"],
+                "config": point["config"]}
 
-        for sla in result["sla"]:
-            self._data[key]["sla_failures"] += not sla["success"]
+        self._data[key]["sla_failures"] += point["sla_failures"]
 
-        stat = {row[0]: dict(zip(result["info"]["stat"]["cols"], row))
-                for row in result["info"]["stat"]["rows"]}
-        ts = int(result["info"]["tstamp_start"] * 1000)
+        stat = {row[0]: dict(zip(point["stat"]["cols"], row))
+                for row in point["stat"]["rows"]}
+        ts = int(point["tstamp_start"] * 1000)
 
         for action in stat:
             # NOTE(amaretskiy): some atomic actions can be missed due to
@@ -301,6 +460,9 @@ class Trends(object):
                 self._data[key]["actions"][action]["durations"][tgt].append(
                     (ts, stat[action][src]))
 
+    def add_result(self, result):
+        self.add_point(self.make_point(result))
+
     def get_data(self):
         trends = []
 
@@ -20,18 +20,22 @@ import multiprocessing
 import time
 
 import jsonschema
+from oslo_config import cfg
 import six
 
 from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
+from rally.task import http_trace
 from rally.task.processing import charts
 from rally.task import scenario
 from rally.task import types
+from rally.task import user_selection
 from rally.task import utils
 
 
 LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
 configure = plugin.configure
 
 
@@ -40,7 +44,7 @@ def format_result_on_timeout(exc, timeout):
         "duration": timeout,
         "idle_duration": 0,
         "output": {"additive": [], "complete": []},
-        "atomic_actions": {},
+        "atomic_actions": [],
         "error": utils.format_exc(exc)
     }
 
@@ -62,11 +66,16 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
     # provide arguments isolation between iterations
     scenario_kwargs = copy.deepcopy(scenario_kwargs)
 
-    LOG.info("Task %(task)s | ITER: %(iteration)s START" %
-             {"task": context_obj["task"]["uuid"], "iteration": iteration})
+    log_iteration = logging.is_iteration_logged(iteration)
+    if log_iteration:
+        LOG.info("Task %s | ITER: %s START", context_obj["task"]["uuid"],
+                 iteration)
 
     scenario_inst = cls(context_obj)
     error = []
+    status_poller = utils.get_status_poller()
+    status_poller.pop_stats()
+    http_trace.start(scenario_inst.atomic_actions())
     try:
         with rutils.Timer() as timer:
             getattr(scenario_inst, method_name)(**scenario_kwargs)
@@ -75,17 +84,35 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
         if logging.is_debug():
             LOG.exception(e)
     finally:
-        status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
-        LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
-                 {"task": context_obj["task"]["uuid"], "iteration": iteration,
-                  "status": status})
-
-        return {"duration": timer.duration() - scenario_inst.idle_duration(),
-                "timestamp": timer.timestamp(),
-                "idle_duration": scenario_inst.idle_duration(),
-                "error": error,
-                "output": scenario_inst._output,
-                "atomic_actions": scenario_inst.atomic_actions()}
+        http_calls = http_trace.stop()
+        polling = status_poller.pop_stats()
+        # bulk waits use the poller even if it is not enabled, so the
+        # output is added if the poller is enabled or has been used
+        if (CONF.benchmark.status_poller_enabled or polling["list_calls"]
+                or polling["get_calls_saved"]):
+            scenario_inst.add_output(additive={
+                "title": "Status polling",
+                "description": "API calls made to check statuses of "
+                               "resources by shared list calls",
+                "chart_plugin": "StackedArea",
+                "data": [["list calls", polling["list_calls"]],
+                         ["get calls saved", polling["get_calls_saved"]]]})
+        if error:
+            LOG.info("Task %s | ITER: %s END: Error %s: %s",
+                     context_obj["task"]["uuid"], iteration, *error[0:2])
+        elif log_iteration:
+            LOG.info("Task %s | ITER: %s END: OK",
+                     context_obj["task"]["uuid"], iteration)
+
+        result = {"duration": timer.duration() - scenario_inst.idle_duration(),
+                  "timestamp": timer.timestamp(),
+                  "idle_duration": scenario_inst.idle_duration(),
+                  "error": error,
+                  "output": scenario_inst._output,
+                  "atomic_actions": scenario_inst.atomic_actions()}
+        if http_calls:
+            result["http_calls"] = http_calls
+        return result
 
 
 def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
@@ -168,6 +195,14 @@ class ScenarioRunner(plugin.Plugin):
             cls, method_name = (scenario_plugin._meta_get("cls_ref"),
                                 name.split(".", 1).pop())
 
+        if "users" in context and "tenants" in context:
+            # index is built once per workload and shared by contexts of all
+            # iterations
+            index = user_selection.UserSelectionIndex(
+                context, self.config.get(
+                    "concurrency", self.config.get("max_concurrency", 1)))
+            context = dict(context, user_selection=index)
+
         with rutils.Timer() as timer:
             self._run_scenario(cls, method_name, context, args)
 
@@ -234,7 +269,7 @@ class ScenarioRunner(plugin.Plugin):
     _RESULT_SCHEMA = {
         "fields": [("duration", float), ("timestamp", float),
                    ("idle_duration", float), ("output", dict),
-                   ("atomic_actions", dict), ("error", list)]
+                   ("atomic_actions", list), ("error", list)]
     }
 
     def _result_has_valid_schema(self, result):
@@ -257,15 +292,20 @@ class ScenarioRunner(plugin.Plugin):
                        "proper_type": proper_type.__name__})
                 return False
 
-        for action, value in result["atomic_actions"].items():
-            if not isinstance(value, float):
-                LOG.warning(
-                    "Task %(uuid)s | Atomic action %(action)s has wrong type "
-                    "'%(type)s', should be 'float'"
-                    % {"uuid": self.task["uuid"],
-                       "action": action,
-                       "type": type(value)})
-                return False
+        actions = list(result["atomic_actions"])
+        while actions:
+            action = actions.pop()
+            for key in ("started_at", "finished_at"):
+                if not isinstance(action.get(key), float):
+                    LOG.warning(
+                        "Task %(uuid)s | Atomic action %(action)s has wrong "
+                        "type of '%(key)s': '%(type)s', should be 'float'"
+                        % {"uuid": self.task["uuid"],
+                           "action": action.get("name"),
+                           "key": key,
+                           "type": type(action.get(key))})
+                    return False
+            actions.extend(action.get("children", []))
 
         for e in result["error"]:
             if not isinstance(e, str):
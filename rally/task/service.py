@@ -64,18 +64,18 @@ def should_be_overridden(func):
     return func
 
 
-# TODO(andreykurilin): remove _DevNullDict and _ServiceWithoutAtomic when we
+# TODO(andreykurilin): remove _DevNullList and _ServiceWithoutAtomic when we
 #   start support inner atomics
-class _DevNullDict(dict):
+class _DevNullList(list):
     """Do not keep anything."""
-    def __setitem__(self, key, value):
+    def append(self, value):
         pass
 
 
 class _ServiceWithoutAtomic(object):
     def __init__(self, service):
         self._service = service
-        self._atomic_actions = _DevNullDict()
+        self._atomic_actions = _DevNullList()
 
     def atomic_actions(self):
         return self._atomic_actions
@@ -334,6 +334,7 @@ class UnifiedService(Service):
         """
 
         # find all classes with unified implementation
+        discover.import_lazy_plugins()
         impls = {cls: cls._meta_get("impl")
                  for cls in discover.itersubclasses(self.__class__)
                  if (cls._meta_is_inited(raise_exc=False) and
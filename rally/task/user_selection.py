@@ -0,0 +1,145 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Selection of user and tenant for scenario iterations.
+
+Scenario runner builds UserSelectionIndex once per workload from "users"
+and "tenants" of context, so each iteration chooses its user without
+sorting tenants or going through all users. The index is immutable and
+is shared, not copied, by contexts of iterations.
+
+Supported values of context["user_choice_method"]:
+
+    random:              random user
+    round_robin:         tenants in turn, users of each tenant in turn
+    least_recently_used: all users in turn, interleaved by tenants, so
+                         user is reused only after all other users
+    sticky:              each of concurrently running iterations (worker)
+                         keeps using the same user
+    weighted:            tenants in proportion to context["tenant_weights"]
+                         (weights of tenants in order of their IDs, 1 by
+                         default), users of each tenant in turn
+
+All methods except random map the number of iteration to the same user on
+every run.
+"""
+
+import random
+
+from six import moves
+
+
+def _weighted_schedule(weights):
+    """Interleave indexes of items in proportion to their weights.
+
+    Smooth weighted round robin is used, e.g. weights [3, 1] give
+    [0, 0, 1, 0] rather than [0, 0, 0, 1].
+    """
+    total = sum(weights)
+    current = [0] * len(weights)
+    schedule = []
+    for _ in moves.range(total):
+        for i, weight in enumerate(weights):
+            current[i] += weight
+        chosen = current.index(max(current))
+        current[chosen] -= total
+        schedule.append(chosen)
+    return schedule
+
+
+class UserSelectionIndex(object):
+    """Immutable index of users of context to choose from.
+
+    Index keeps only positions of users in context["users"] and IDs of
+    tenants, so it is valid for any copy of context it was built from.
+    """
+
+    def __init__(self, context, concurrency=1):
+        """UserSelectionIndex constructor.
+
+        :param context: context with "users" and "tenants"
+        :param concurrency: number of concurrently running iterations, used
+                            by sticky method
+        """
+        self.method = context.get("user_choice_method", "random")
+        self.concurrency = max(concurrency or 1, 1)
+        self.tenant_ids = tuple(sorted(context["tenants"]))
+
+        positions = dict((tenant_id, i)
+                         for i, tenant_id in enumerate(self.tenant_ids))
+        tenant_users = [[] for _ in self.tenant_ids]
+        # pairs of position of user in context["users"] and index of tenant
+        users = []
+        for i, user in enumerate(context["users"]):
+            tenant_index = positions[user["tenant_id"]]
+            tenant_users[tenant_index].append(i)
+            users.append((i, tenant_index))
+        self.users = tuple(users)
+        self.tenant_users = tuple(tuple(u) for u in tenant_users)
+        # the first users of all tenants go first, then the second ones, etc.
+        self.interleaved = tuple(
+            (u[i], t)
+            for i in moves.range(max([len(u) for u in tenant_users] or [0]))
+            for t, u in enumerate(self.tenant_users) if i < len(u))
+
+        weights = list(context.get("tenant_weights") or [])
+        self.weights = tuple(
+            (weights + [1] * len(self.tenant_ids))[:len(self.tenant_ids)])
+        seen = [0] * len(self.tenant_ids)
+        # pairs of index of tenant and number of its previous choices
+        schedule = []
+        for t in _weighted_schedule(self.weights):
+            schedule.append((t, seen[t]))
+            seen[t] += 1
+        self.schedule = tuple(schedule)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _choose(self, iteration):
+        if self.method == "random":
+            return random.choice(self.users)
+        elif self.method == "least_recently_used":
+            return self.interleaved[iteration % len(self.interleaved)]
+        elif self.method == "sticky":
+            worker = iteration % self.concurrency
+            return self.interleaved[worker % len(self.interleaved)]
+        elif self.method == "weighted":
+            cycle, position = divmod(iteration, len(self.schedule))
+            tenant_index, seen = self.schedule[position]
+            users = self.tenant_users[tenant_index]
+            count = cycle * self.weights[tenant_index] + seen
+            return users[count % len(users)], tenant_index
+        # round_robin
+        tenants_amount = len(self.tenant_ids)
+        tenant_index = iteration % tenants_amount
+        users = self.tenant_users[tenant_index]
+        user_index = (iteration // tenants_amount) % len(users)
+        return users[user_index], tenant_index
+
+    def choose(self, context):
+        """Choose user and tenant for iteration.
+
+        :param context: context of iteration, a copy of context which the
+                        index was built from
+        :returns: tuple of user and tenant of the context
+        """
+        # NOTE(amaretskiy): iteration is subtracted by `1' because it
+        #   starts from `1' but we count from `0'
+        user, tenant = self._choose(context.get("iteration", 1) - 1)
+        return (context["users"][user],
+                context["tenants"][self.tenant_ids[tenant]])
@@ -13,12 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import itertools
+import os
+import threading
 import time
 import traceback
 
 import jsonschema
 from novaclient import exceptions as nova_exc
+from oslo_config import cfg
 import six
 
 from rally.common.i18n import _
@@ -29,6 +33,35 @@ from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+STATUS_POLLER_OPTS = [
+    cfg.BoolOpt("status_poller_enabled",
+                default=False,
+                help="Check statuses of resources which are waited for by "
+                     "one list call per resource type and project instead "
+                     "of getting each resource separately. Resources which "
+                     "are waited for in bulk are always checked by list "
+                     "calls. Numbers of API calls made to check statuses "
+                     "by list calls are added to output of each iteration"),
+    cfg.FloatOpt("status_poller_max_age",
+                 default=1.0,
+                 help="Time in seconds during which results of list call "
+                      "are reused by all waiting resources"),
+    cfg.FloatOpt("status_poller_backoff",
+                 default=1.2,
+                 help="Interval between status checks made by status "
+                      "poller is multiplied by this factor while status of "
+                      "resource is not changed. The interval is reset on "
+                      "status change"),
+    cfg.FloatOpt("status_poller_max_backoff",
+                 default=2.0,
+                 help="Max interval between status checks made by status "
+                      "poller as multiple of initial interval"),
+]
+
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(STATUS_POLLER_OPTS, group=benchmark_group)
+
 
 def get_status(resource, status_attr="status"):
     """Get the status of a given resource object.
@@ -68,17 +101,9 @@ class resource_is(object):
 
 def get_from_manager(error_statuses=None):
     error_statuses = error_statuses or ["ERROR"]
-    error_statuses = map(lambda str: str.upper(), error_statuses)
-
-    def _get_from_manager(resource, id_attr="id"):
-        # catch client side errors
-        try:
-            res = resource.manager.get(getattr(resource, id_attr))
-        except Exception as e:
-            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
-                raise exceptions.GetResourceNotFound(resource=resource)
-            raise exceptions.GetResourceFailure(resource=resource, err=e)
+    error_statuses = [s.upper() for s in error_statuses]
 
+    def _check_status(res):
         # catch abnormal status, such as "no valid host" for servers
         status = get_status(res)
 
@@ -91,9 +116,176 @@ def get_from_manager(error_statuses=None):
 
         return res
 
+    def _get_from_manager(resource, id_attr="id"):
+        # catch client side errors
+        try:
+            res = resource.manager.get(getattr(resource, id_attr))
+        except Exception as e:
+            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
+                raise exceptions.GetResourceNotFound(resource=resource)
+            raise exceptions.GetResourceFailure(resource=resource, err=e)
+
+        return _check_status(res)
+
+    # allows StatusPoller to check resources obtained by list calls
+    _get_from_manager.check_status = _check_status
     return _get_from_manager
 
 
+class _ListResult(object):
+    """Result of list call which is shared between waiting threads."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.resources = None
+        self.error = None
+        self._done = threading.Event()
+
+    def is_done(self):
+        return self._done.is_set()
+
+    def set_result(self, resources=None, error=None):
+        self.resources = resources
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.resources
+
+
+class StatusPoller(object):
+    """Checks statuses of many resources by shared list calls.
+
+    Instead of getting each waited resource separately, one list call is
+    made per resource manager type and project, results of the call are
+    used by all threads which are waiting for resources of the same type.
+    The call is made by the first thread which needs it, other threads wait
+    for its result. Results are reused during CONF.benchmark
+    .status_poller_max_age seconds.
+
+    Resources which are missing in results of list call (e.g. deleted or
+    not fitting in one page) are got separately. Managers which can not
+    list resources at all are not polled anymore, while on transient errors
+    of list calls resources are got separately until the next list call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+        self._unsupported = set()
+        self._local = threading.local()
+
+    @staticmethod
+    def _get_key(manager):
+        try:
+            project = manager.api.client.get_project_id()
+        except Exception:
+            project = id(manager)
+        return type(manager), project
+
+    @staticmethod
+    def _is_unsupported_error(error):
+        """Whether error means that manager can not list resources at all."""
+        if isinstance(error, (AttributeError, NotImplementedError)):
+            return True
+        code = getattr(error, "code", None) or getattr(error, "http_status",
+                                                       None)
+        return code in (400, 404)
+
+    def _count(self, name):
+        setattr(self._local, name, getattr(self._local, name, 0) + 1)
+
+    def pop_stats(self):
+        """Returns and resets stats of the current thread.
+
+        :returns: dict with number of "list_calls" made by the thread and
+                  number of "get_calls_saved"
+        """
+        list_calls = getattr(self._local, "list_calls", 0)
+        checks = getattr(self._local, "checks", 0)
+        self._local.list_calls = self._local.checks = 0
+        return {"list_calls": list_calls,
+                "get_calls_saved": max(checks - list_calls, 0)}
+
+    def is_supported(self, resource, update_resource):
+        manager = getattr(resource, "manager", None)
+        return (hasattr(update_resource, "check_status")
+                and callable(getattr(manager, "list", None))
+                and type(manager) not in self._unsupported)
+
+    def _list(self, manager, not_before, expire):
+        key = self._get_key(manager)
+        with self._lock:
+            result = self._results.get(key)
+            if result is None or result.started_at < not_before or (
+                    expire and result.is_done() and (
+                        result.error is not None
+                        or time.time() - result.started_at
+                        > CONF.benchmark.status_poller_max_age)):
+                result = self._results[key] = _ListResult()
+                is_owner = True
+            else:
+                is_owner = False
+
+        if is_owner:
+            self._count("list_calls")
+            try:
+                resources = dict((r.id, r) for r in manager.list())
+            except Exception as e:
+                if self._is_unsupported_error(e):
+                    LOG.debug("Resources of %s are not polled by list "
+                              "calls: %s", type(manager).__name__, e)
+                    self._unsupported.add(type(manager))
+                else:
+                    LOG.debug("Failed to list resources of %s, they are got "
+                              "separately: %s", type(manager).__name__, e)
+                result.set_result(error=e)
+            else:
+                result.set_result(resources)
+        return result.wait()
+
+    def poll(self, resource, update_resource, not_before=0, expire=True):
+        """Returns resource from results of list call.
+
+        :param resource: resource which has manager
+        :param update_resource: function returned by get_from_manager(),
+                                used to check status of resource
+        :param not_before: UNIX timestamp, results of list calls started
+                           before it are not used
+        :param expire: whether results of list calls expire after
+                       CONF.benchmark.status_poller_max_age seconds or
+                       failure, if False results of list call started
+                       after not_before are always used
+        :returns: updated resource or None if it is not found in results
+                  of list call
+        """
+        try:
+            resources = self._list(resource.manager, not_before, expire)
+        except Exception:
+            return None
+        res = resources.get(resource.id)
+        if res is None:
+            return None
+        self._count("checks")
+        return update_resource.check_status(res)
+
+
+_status_pollers = {}
+
+
+def get_status_poller():
+    """Returns StatusPoller shared by all threads of the process."""
+    # pollers are not shared with forked processes, since their locks may
+    # be acquired by threads which don't exist in child processes
+    pid = os.getpid()
+    if pid not in _status_pollers:
+        _status_pollers[pid] = StatusPoller()
+    return _status_pollers[pid]
+
+
 def manager_list_size(sizes):
     def _list(mgr):
         return len(mgr.list()) in sizes
@@ -203,6 +395,16 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
             "Can't wait for resource's %s status. No update method."
             % resource_repr)
 
+    poller = None
+    if CONF.benchmark.status_poller_enabled and id_attr == "id":
+        poller = get_status_poller()
+        if not poller.is_supported(resource, update_resource):
+            poller = None
+    final_statuses = ready_statuses | failure_statuses
+    interval = check_interval
+    max_interval = check_interval * max(
+        CONF.benchmark.status_poller_max_backoff, 1)
+
     start = time.time()
 
     latest_status = get_status(resource, status_attr)
@@ -210,7 +412,16 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
 
     while True:
         try:
-            if id_attr == "id":
+            if poller:
+                res = poller.poll(resource, update_resource,
+                                  not_before=start)
+                if res is None or get_status(
+                        res, status_attr) in final_statuses:
+                    # results of list calls may be not as complete as
+                    # result of get call, so final resource is got anyway
+                    res = update_resource(resource)
+                resource = res
+            elif id_attr == "id":
                 resource = update_resource(resource)
             else:
                 resource = update_resource(resource, id_attr=id_attr)
@@ -222,13 +433,12 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
         status = get_status(resource, status_attr)
 
         if status != latest_status:
+            interval = check_interval
             current_time = time.time()
             delta = current_time - latest_status_update
             LOG.debug(
-                "Waiting for resource %(resource)s. Status changed: "
-                "%(latest)s => %(current)s in %(delta)s" %
-                {"resource": resource_repr, "latest": latest_status,
-                 "current": status, "delta": delta})
+                "Waiting for resource %s. Status changed: %s => %s in %s",
+                resource_repr, latest_status, status, delta)
 
             latest_status = status
             latest_status_update = current_time
@@ -241,7 +451,12 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
                 status=status,
                 fault="Status in failure list %s" % str(failure_statuses))
 
-        time.sleep(check_interval)
+        time.sleep(interval)
+        if poller:
+            # checks are backed off only when shared list calls are used,
+            # so waits without the poller are not slowed down
+            interval = min(interval * CONF.benchmark.status_poller_backoff,
+                           max_interval)
         if time.time() - start > timeout:
             raise exceptions.TimeoutException(
                 desired_status="('%s')" % "', '".join(ready_statuses),
@@ -251,6 +466,102 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
                 resource_status=get_status(resource, status_attr))
 
 
+def wait_for_statuses(resources, ready_statuses, update_resource,
+                      failure_statuses=None, status_attr="status",
+                      timeout=60, check_interval=1):
+    """Waits for many resources to come into one of the given statuses.
+
+    Unlike wait_for_status(), all resources are checked in one loop by the
+    shared StatusPoller, even if CONF.benchmark.status_poller_enabled is
+    not set, so each check makes one list call regardless of the number of
+    waited resources. Only resources missing in results of the list call
+    and resources of managers which can't list them are got separately.
+    Intervals between checks are backed off only if the poller is enabled.
+
+    :param resources: List of resources which have "id" attribute
+    :param ready_statuses: List of statuses which mean that the resource is
+                           ready
+    :param update_resource: Function returned by get_from_manager(), used to
+                            get a single resource
+    :param failure_statuses: List of statuses which mean that an error has
+                             occurred while waiting for the resource
+    :param status_attr: The name of the status attribute of the resource
+    :param timeout: Timeout in seconds after which a TimeoutException will be
+                    raised
+    :param check_interval: Interval in seconds between the two consecutive
+                           checks
+
+    :returns: List of tuples (resource, timestamp) in order of resources,
+              where timestamp is time of the check which found the resource
+              in a ready status
+    """
+    ready_statuses = set(s.upper() for s in ready_statuses)
+    failure_statuses = set(s.upper() for s in failure_statuses or [])
+    if ready_statuses & failure_statuses:
+        raise ValueError("Can't wait for resources' statuses. Ready and "
+                         "Failure statuses conflict.")
+
+    poller = None
+    if resources:
+        poller = get_status_poller()
+        if not poller.is_supported(resources[0], update_resource):
+            poller = None
+    backoff = poller is not None and CONF.benchmark.status_poller_enabled
+    pending = collections.OrderedDict(
+        (resource.id, resource) for resource in resources)
+    ready = {}
+    interval = check_interval
+    max_interval = check_interval * max(
+        CONF.benchmark.status_poller_max_backoff, 1)
+
+    start = time.time()
+    while True:
+        changed = False
+        check_started_at = time.time()
+        for resource_id, resource in list(pending.items()):
+            res = None
+            if poller:
+                # results of list calls made before this check are not
+                # used and results of the list call made by this check do
+                # not expire, so all resources are checked by one list call
+                res = poller.poll(resource, update_resource,
+                                  not_before=check_started_at, expire=False)
+            if res is None:
+                res = update_resource(resource)
+            checked_at = time.time()
+            status = get_status(res, status_attr)
+            if status != get_status(resource, status_attr):
+                changed = True
+            if status in ready_statuses:
+                ready[resource_id] = (res, checked_at)
+                del pending[resource_id]
+            elif status in failure_statuses:
+                raise exceptions.GetResourceErrorStatus(
+                    resource=res, status=status,
+                    fault=getattr(res, "fault", "Status in failure list %s"
+                                  % str(failure_statuses)))
+            else:
+                pending[resource_id] = res
+
+        if not pending:
+            return [ready[resource.id] for resource in resources]
+
+        if changed:
+            interval = check_interval
+        time.sleep(interval)
+        if backoff:
+            interval = min(interval * CONF.benchmark.status_poller_backoff,
+                           max_interval)
+        if time.time() - start > timeout:
+            resource = next(iter(pending.values()))
+            raise exceptions.TimeoutException(
+                desired_status="('%s')" % "', '".join(ready_statuses),
+                resource_name=getattr(resource, "name", repr(resource)),
+                resource_type=resource.__class__.__name__,
+                resource_id=resource.id,
+                resource_status=get_status(resource, status_attr))
+
+
 @logging.log_deprecated("Use wait_for_status instead.", "0.1.2", once=True)
 def wait_for_delete(resource, update_resource=None, timeout=60,
                     check_interval=1):
@@ -458,6 +458,11 @@ def required_services(config, clients, deployment, *required_services):
     :param *required_services: list of services names
     """
     available_services = list(clients.services().values())
+    missing = set(required_services) - set(available_services)
+    if missing - set([consts.Service.NOVA_NET]):
+        # services may be taken from the cache of capabilities which is
+        # outdated, so they are discovered again before failing
+        available_services = list(clients.services(refresh=True).values())
 
     if consts.Service.NOVA_NET in required_services:
         creds = deployment.get_credentials_for("openstack")
@@ -489,8 +494,9 @@ def required_neutron_extensions(config, clients, deployment,
 
     :param required_extensions: list of Neutron extensions
     """
-    extensions = clients.neutron().list_extensions().get("extensions", [])
-    aliases = map(lambda x: x["alias"], extensions)
+    aliases = clients.neutron_extensions()
+    if not set(required_extensions).issubset(aliases):
+        aliases = clients.neutron_extensions(refresh=True)
     for extension in required_extensions:
         if extension not in aliases:
             msg = (_("Neutron extension %s is not configured") % extension)
@@ -0,0 +1,97 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of HttpRequests scenarios helpers against a local HTTP server.
+
+Compares requests made over a new connection each time with requests made
+over a keep-alive connection, and measures throughput of batch mode.
+"""
+
+import argparse
+import sys
+import threading
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from rally.plugins.common.scenarios.requests import utils as requests_utils
+from tests.benchmarks import utils
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b"x" * self.server.body_size
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--body-size", dest="body_size", type=int,
+                        default=1024)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.body_size = args.body_size
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = "http://127.0.0.1:%d/" % server.server_address[1]
+
+    def new_connection():
+        with requests_utils.new_session() as session:
+            requests_utils.send_request(session, "GET", url)
+
+    session = requests_utils.new_session()
+
+    def keep_alive():
+        requests_utils.send_request(session, "GET", url)
+
+    scenario = requests_utils.RequestScenario()
+
+    def batch():
+        scenario._check_request_batch(url, "GET", 200, args.iterations,
+                                      args.concurrency)
+
+    results = {
+        "new_connection": utils.measure(new_connection, args.iterations),
+        "keep_alive": utils.measure(keep_alive, args.iterations),
+        "batch": utils.measure(batch, 3)
+    }
+    results["batch"]["requests_per_sec"] = (
+        args.iterations * 3 / results["batch"]["total"])
+    session.close()
+    server.shutdown()
+
+    utils.dump("http_requests", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
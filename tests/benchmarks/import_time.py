@@ -0,0 +1,81 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of Rally CLI startup time.
+
+Each case is executed in a new python interpreter. Cases measure import of
+CLI modules, loading of all plugins and lazy loading of a single plugin
+using plugins manifest.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from tests.benchmarks import utils
+
+CASES = {
+    "python": "pass",
+    "cli_import": "import rally.cli.main",
+    "load_all_plugins": "from rally import plugins; plugins.load()",
+    "load_one_plugin_lazily": (
+        "from rally import plugins; plugins.load(lazy=True); "
+        "from rally.task import scenario; scenario.Scenario.get('%s')")
+}
+
+
+def run(iterations, scenario):
+    """Measure CLI startup and plugins loading time.
+
+    :param iterations: number of runs of each case
+    :param scenario: name of scenario which is loaded lazily
+    :returns: dict with statistics of durations of each case
+    """
+    # NOTE: plugins manifest is stored in the home directory, so use
+    # temporary one to not depend on state of the current user
+    home = tempfile.mkdtemp()
+    env = dict(os.environ, HOME=home)
+
+    def run_code(code):
+        subprocess.check_call([sys.executable, "-c", code], env=env)
+
+    try:
+        # generate plugins manifest
+        run_code(CASES["load_one_plugin_lazily"] % scenario)
+
+        results = {}
+        for name, code in sorted(CASES.items()):
+            if "%s" in code:
+                code = code % scenario
+            results[name] = utils.measure(lambda: run_code(code), iterations)
+    finally:
+        shutil.rmtree(home)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--scenario", default="Dummy.dummy",
+                        help="Scenario which is loaded lazily")
+    args = parser.parse_args(argv)
+
+    utils.dump("import_time", run(args.iterations, args.scenario))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of logging overhead of scenario iterations.
+
+Measures iterations per second of Dummy.dummy scenario run by threads of
+runner with logging off, with synchronous and asynchronous logging to a
+file, and with sampled asynchronous logging.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from six.moves import queue
+
+from rally.common import logging
+from rally.plugins.common.scenarios.dummy import dummy
+from rally.task import runner
+from tests.benchmarks import utils
+
+
+def _run_iterations(iterations, concurrency):
+    event_queue = queue.Queue()
+
+    def worker(offset):
+        for i in range(offset, iterations, concurrency):
+            context = {"iteration": i + 1, "task": {"uuid": "benchmark"}}
+            runner._run_scenario_once(dummy.Dummy, "run", context, {},
+                                      event_queue)
+            event_queue.get()
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(concurrency)]
+    started_at = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.time() - started_at
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--sampling", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    logging.CONF([], project="rally")
+    root = logging.log.getLogger()
+    fd, path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+
+    def run(level, async_mode=False, sampling=1):
+        logging.CONF.set_override("iteration_log_sampling", sampling)
+        handler = logging.log.FileHandler(path)
+        handler.setFormatter(logging.log.Formatter(
+            "%(asctime)s %(process)d %(levelname)s %(name)s %(message)s"))
+        root.handlers = [handler]
+        root.setLevel(level)
+        if async_mode:
+            logging.enable_async(root)
+        duration = _run_iterations(args.iterations, args.concurrency)
+        for h in root.handlers:
+            h.close()
+        root.handlers = []
+        return {"duration": duration,
+                "iterations_per_sec": args.iterations / duration}
+
+    try:
+        results = {
+            "off": run(logging.WARNING),
+            "sync": run(logging.INFO),
+            "async": run(logging.INFO, async_mode=True),
+            "async_sampled": run(logging.INFO, async_mode=True,
+                                 sampling=args.sampling)
+        }
+    finally:
+        os.unlink(path)
+
+    utils.dump("iteration_logging", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of rally.common.sshutils against a local sshd.
+
+Compares commands executed over a new connection each time with commands
+executed over connections from SSHConnectionPool, and measures throughput
+of reading large command output.
+"""
+
+import argparse
+import getpass
+import sys
+
+from rally.common import sshutils
+from tests.benchmarks import utils
+
+
+class _NullStream(object):
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=22)
+    parser.add_argument("--user", default=getpass.getuser())
+    parser.add_argument("--key-filename", dest="key_filename")
+    parser.add_argument("--password")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--command", default="uname")
+    parser.add_argument("--output-size", dest="output_size", type=int,
+                        default=10 * 1024 * 1024,
+                        help="Size of output in bytes for throughput check")
+    args = parser.parse_args(argv)
+
+    def new_ssh(pool=None):
+        return sshutils.SSH(args.user, args.host, port=args.port,
+                            key_filename=args.key_filename,
+                            password=args.password, pool=pool)
+
+    def new_connection():
+        ssh = new_ssh()
+        ssh.execute(args.command)
+        ssh.close()
+
+    pool = sshutils.SSHConnectionPool()
+
+    def pooled_connection():
+        new_ssh(pool).execute(args.command)
+
+    output = _NullStream()
+
+    def large_output():
+        new_ssh(pool).run("head -c %d /dev/zero" % args.output_size,
+                          stdout=output)
+
+    results = {
+        "new_connection": utils.measure(new_connection, args.iterations),
+        "pooled_connection": utils.measure(pooled_connection,
+                                           args.iterations),
+        "large_output": utils.measure(large_output, 3)
+    }
+    results["large_output"]["bytes_per_sec"] = (
+        output.size / results["large_output"]["total"])
+    pool.close()
+
+    utils.dump("sshutils", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
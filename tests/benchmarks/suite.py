@@ -0,0 +1,247 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Self-benchmark suite measuring overhead of Rally itself.
+
+Runs offline against temporary SQLite DB. Each runner executes Dummy.dummy,
+Dummy.dummy_timed_atomic_actions and Dummy.dummy_output without sleeps
+through the same pipeline as `rally task start` does: runner, ResultConsumer
+and DB. The suite measures:
+
+    runners:  per-iteration overhead of each runner and throughput of
+              results through ResultConsumer to DB
+    memory:   peak memory allocated by Rally process per 10^5 iterations
+    reports:  generation time of HTML report and trends of the results
+    startup:  CLI startup and plugins discovery time
+
+Results are printed as JSON and can be saved to file and compared with
+results of another Rally version.
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from oslo_config import cfg
+
+from rally.common import db
+from rally.common import objects
+from rally import plugins
+from rally.task import engine
+from rally.task.processing import plot
+from rally.task import runner
+from tests.benchmarks import import_time
+from tests.benchmarks import utils
+
+try:
+    import tracemalloc
+except ImportError:
+    # NOTE: python 2 has no tracemalloc, only max RSS is measured then
+    tracemalloc = None
+
+
+SCENARIOS = [
+    ("Dummy.dummy", {"sleep": 0}),
+    ("Dummy.dummy_timed_atomic_actions", {"number_of_actions": 5,
+                                          "sleep_factor": 0}),
+    ("Dummy.dummy_output", {"random_range": 25}),
+]
+
+
+def _get_runners(args):
+    return {
+        "serial": {"type": "serial", "times": args.iterations},
+        "constant": {"type": "constant", "times": args.iterations,
+                     "concurrency": args.concurrency},
+        "constant_for_duration": {"type": "constant_for_duration",
+                                  "duration": args.duration,
+                                  "concurrency": args.concurrency},
+        "rps": {"type": "rps", "times": args.iterations, "rps": args.rps},
+    }
+
+
+def _run_workload(task, subtask, pos, name, scenario_args, runner_config):
+    workload = engine.Workload({"name": name, "args": scenario_args,
+                                "runner": runner_config}, pos)
+    key = workload.make_key()
+    workload_obj = subtask.add_workload(key)
+    runner_obj = runner.ScenarioRunner.get(runner_config["type"])(
+        task, runner_config)
+    # NOTE: Dummy scenarios have no arguments preprocessors, so credential
+    # is never used to make any request
+    admin = objects.Credential("http://localhost/identity", "admin", "admin")
+    context_obj = {"task": task, "scenario_name": name, "config": {},
+                   "admin": {"credential": admin}}
+
+    started_at = time.time()
+    with engine.ResultConsumer(key, task, subtask, workload_obj, runner_obj,
+                               False):
+        runner_obj.run(name, context_obj, scenario_args)
+        run_finished_at = time.time()
+    finished_at = time.time()
+
+    return {"run_duration": runner_obj.run_duration,
+            "drain_duration": finished_at - run_finished_at,
+            "full_duration": finished_at - started_at}
+
+
+def _load_results(task_uuid):
+    return [{"key": x["key"],
+             "sla": x["data"]["sla"],
+             "hooks": x["data"].get("hooks", []),
+             "result": x["data"]["raw"],
+             "load_duration": x["data"]["load_duration"],
+             "full_duration": x["data"]["full_duration"],
+             "created_at": x["created_at"]}
+            for x in objects.Task.get(task_uuid).get_results()]
+
+
+def _summarize(runner_config, durations, raw):
+    iterations = len(raw)
+    busy = sum(r["duration"] for r in raw)
+    result = dict(durations, iterations=iterations,
+                  iterations_per_sec=iterations / durations["full_duration"])
+    if iterations:
+        workers = runner_config.get("concurrency", 1)
+        # NOTE: rps runner has no fixed number of workers, so only
+        # throughput is meaningful for it
+        if runner_config["type"] != "rps":
+            result["overhead_per_iteration"] = (
+                durations["run_duration"] * workers - busy) / iterations
+    return result
+
+
+def run_runners(args):
+    deployment = db.deployment_create({})
+    task = objects.Task(deployment_uuid=deployment["uuid"])
+    subtask = task.add_subtask(title="self-benchmark")
+
+    durations = []
+    pos = 0
+    for runner_name, runner_config in sorted(_get_runners(args).items()):
+        for name, scenario_args in SCENARIOS:
+            durations.append((runner_name, runner_config, name,
+                              _run_workload(task, subtask, pos, name,
+                                            scenario_args, runner_config)))
+            pos += 1
+
+    task_results = _load_results(task["uuid"])
+    results = {}
+    for (runner_name, runner_config, name, d), workload in zip(
+            durations, sorted(task_results, key=lambda x: x["key"]["pos"])):
+        results.setdefault(runner_name, {})[name] = _summarize(
+            runner_config, d, workload["result"])
+    return task["uuid"], results
+
+
+def run_memory(args):
+    deployment = db.deployment_create({})
+    task = objects.Task(deployment_uuid=deployment["uuid"])
+    subtask = task.add_subtask(title="self-benchmark memory")
+    runner_config = {"type": "serial", "times": args.memory_iterations}
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if tracemalloc:
+        tracemalloc.start()
+    try:
+        _run_workload(task, subtask, 0, "Dummy.dummy", {"sleep": 0},
+                      runner_config)
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc else None
+    finally:
+        if tracemalloc:
+            tracemalloc.stop()
+
+    scale = 100000.0 / args.memory_iterations
+    result = {"iterations": args.memory_iterations,
+              # NOTE: ru_maxrss is in kilobytes on Linux
+              "max_rss_growth_kb_per_100k_iterations": (
+                  resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                  - maxrss) * scale}
+    if peak is not None:
+        result["peak_allocated_bytes_per_100k_iterations"] = peak * scale
+    return result
+
+
+def run_reports(task_uuid, iterations):
+    results = {}
+
+    def report():
+        plot.plot(_load_results(task_uuid))
+
+    def trends():
+        plot.trends(_load_results(task_uuid))
+
+    results["report"] = utils.measure(report, iterations)
+    results["trends"] = utils.measure(trends, iterations)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10000,
+                        help="Number of iterations of each workload")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10,
+                        help="Duration of constant_for_duration workloads")
+    parser.add_argument("--rps", type=float, default=1000)
+    parser.add_argument("--memory-iterations", dest="memory_iterations",
+                        type=int, default=20000)
+    parser.add_argument("--report-iterations", dest="report_iterations",
+                        type=int, default=3)
+    parser.add_argument("--startup-iterations", dest="startup_iterations",
+                        type=int, default=5)
+    parser.add_argument("--output", help="Save results to file")
+    parser.add_argument("--baseline",
+                        help="File with saved results of another version to "
+                             "compare results with")
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    cfg.CONF([], project="rally")
+    plugins.load()
+    cfg.CONF.set_override("connection", "sqlite:///%s" % path, "database")
+    db.engine_reset()
+    db.schema_create()
+    try:
+        task_uuid, runners = run_runners(args)
+        results = {
+            "runners": runners,
+            "memory": run_memory(args),
+            "reports": run_reports(task_uuid, args.report_iterations),
+            "startup": import_time.run(args.startup_iterations,
+                                       "Dummy.dummy")
+        }
+    finally:
+        db.engine_reset()
+        os.unlink(path)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            utils.dump("suite", results, stream=f)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        results = {"results": results,
+                   "ratios_to_baseline": utils.compare(results, baseline)}
+    utils.dump("suite", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of trends report generation.
+
+Fills temporary SQLite DB with synthetic tasks and measures generation of
+trends report from raw iterations, from persisted statistics of workloads,
+from persisted statistics in parallel processes and from persisted trends
+points.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from oslo_config import cfg
+
+from rally.common import db
+from rally.common import objects
+from rally.task.processing import plot
+from tests.benchmarks import utils
+
+
+def _make_iteration(timestamp):
+    duration = random.uniform(0.5, 2)
+    error = [] if random.random() > 0.05 else ["Error", "msg", "trace"]
+    return {"timestamp": timestamp, "duration": duration,
+            "idle_duration": 0, "error": error,
+            "output": {"additive": [], "complete": []},
+            "atomic_actions": [
+                {"name": "foo", "started_at": timestamp,
+                 "finished_at": timestamp + duration / 2, "children": []},
+                {"name": "bar", "started_at": timestamp + duration / 2,
+                 "finished_at": timestamp + duration, "children": []}]}
+
+
+def _create_tasks(tasks, workloads, iterations, chunk_size=1000):
+    deployment = db.deployment_create({})
+    task_uuids = []
+    for t in range(tasks):
+        task = objects.Task(deployment_uuid=deployment["uuid"])
+        subtask = task.add_subtask(title="benchmark")
+        for w in range(workloads):
+            key = {"name": "Dummy.dummy", "pos": w,
+                   "kw": {"args": {"sleep": w},
+                          "runner": {"type": "constant",
+                                     "times": iterations}}}
+            workload = subtask.add_workload(key)
+            started_at = 1483228800 + t * 86400
+            raw = [_make_iteration(started_at + i)
+                   for i in range(iterations)]
+            for i in range(0, iterations, chunk_size):
+                workload.add_workload_data(i // chunk_size,
+                                           {"raw": raw[i:i + chunk_size]})
+            workload.set_results({"sla": [{"success": True}],
+                                  "load_duration": iterations,
+                                  "full_duration": iterations + 1,
+                                  "hooks": []})
+        task_uuids.append(task["uuid"])
+    return task_uuids
+
+
+def _load(task_uuids, use_statistics):
+    results = []
+    for task_uuid in task_uuids:
+        task = objects.Task.get(task_uuid)
+        if use_statistics:
+            task_results = task.get_statistics()
+        else:
+            task_results = task.get_results()
+        results.extend(
+            {"key": x["key"], "sla": x["data"]["sla"],
+             "hooks": x["data"].get("hooks", []),
+             "result": x["data"]["raw"],
+             "statistics": use_statistics and x["data"]["statistics"],
+             "load_duration": x["data"]["load_duration"],
+             "full_duration": x["data"]["full_duration"]}
+            for x in task_results)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=90)
+    parser.add_argument("--workloads", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    cfg.CONF([], project="rally")
+    cfg.CONF.set_override("connection", "sqlite:///%s" % path, "database")
+    db.engine_reset()
+    db.schema_create()
+
+    def run(use_statistics, processes=1):
+        started_at = time.time()
+        results = _load(task_uuids, use_statistics)
+        loaded_at = time.time()
+        plot.trends(results, processes=processes)
+        finished_at = time.time()
+        return {"load": loaded_at - started_at,
+                "process": finished_at - loaded_at,
+                "total": finished_at - started_at}
+
+    def run_points():
+        started_at = time.time()
+        points = objects.Workload.list_trend_points()
+        loaded_at = time.time()
+        plot.trends([], points=points)
+        finished_at = time.time()
+        return {"load": loaded_at - started_at,
+                "process": finished_at - loaded_at,
+                "total": finished_at - started_at}
+
+    try:
+        random.seed(42)
+        task_uuids = _create_tasks(args.tasks, args.workloads,
+                                   args.iterations)
+        results = {
+            "raw": run(use_statistics=False),
+            "statistics": run(use_statistics=True),
+            "statistics_parallel": run(use_statistics=True,
+                                       processes=args.processes),
+            "raw_parallel": run(use_statistics=False,
+                                processes=args.processes),
+            "trend_points": run_points()
+        }
+    finally:
+        db.engine_reset()
+        os.unlink(path)
+
+    utils.dump("trends", results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Common helpers for benchmarks of Rally itself."""
+
+from __future__ import print_function
+
+import json
+import sys
+import time
+
+from rally.common import streaming_algorithms as streaming
+
+
+def calculate_stats(durations):
+    """Returns min, max, mean and percentiles of durations."""
+    stats = {"min": streaming.MinComputation(),
+             "max": streaming.MaxComputation(),
+             "mean": streaming.MeanComputation(),
+             "median": streaming.PercentileComputation(0.5, len(durations)),
+             "90%ile": streaming.PercentileComputation(0.9, len(durations))}
+    for duration in durations:
+        for stat in stats.values():
+            stat.add(duration)
+    result = dict((k, v.result()) for k, v in stats.items())
+    result["count"] = len(durations)
+    result["total"] = sum(durations)
+    return result
+
+
+def measure(func, iterations):
+    """Call func several times and return statistics of its durations.
+
+    :param func: callable without arguments
+    :param iterations: number of calls
+    """
+    durations = []
+    for i in range(iterations):
+        started_at = time.time()
+        func()
+        durations.append(time.time() - started_at)
+    return calculate_stats(durations)
+
+
+def dump(name, results, stream=None):
+    """Print results of benchmark as JSON.
+
+    :param name: name of benchmark
+    :param results: dict with results
+    :param stream: file object to write to, stdout by default
+    """
+    print(json.dumps({"benchmark": name, "results": results},
+                     indent=2, sort_keys=True), file=stream or sys.stdout)
+
+
+def compare(results, baseline):
+    """Return ratios of numeric results to the same results of baseline.
+
+    Ratio greater than 1 means that value grew, for example duration became
+    longer. Results which are missing in baseline are skipped.
+
+    :param results: dict with results
+    :param baseline: dict with results of the same benchmark to compare with
+    :returns: dict of the same structure as results with ratios as values
+    """
+    if isinstance(results, dict) and isinstance(baseline, dict):
+        ratios = {}
+        for key, value in results.items():
+            ratio = compare(value, baseline.get(key))
+            if ratio not in (None, {}):
+                ratios[key] = ratio
+        return ratios
+    numbers = (int, float)
+    if (isinstance(results, numbers) and isinstance(baseline, numbers)
+            and not isinstance(results, bool) and baseline):
+        return results / float(baseline)
+    return None
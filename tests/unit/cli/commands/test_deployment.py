@@ -379,6 +379,44 @@ class DeploymentCommandsTestCase(test.TestCase):
         headers = ["services", "type", "status"]
         mock_print_list.assert_called_once_with([], headers)
 
+    @mock.patch("rally.cli.commands.deployment.cliutils.print_list")
+    def test_sweep(self, mock_print_list):
+        deployment_id = "e87e4dca-b515-4477-888d-5f6103f13b42"
+        resources = [
+            {"resource": "nova.servers", "id": "s1",
+             "name": "s_rally_abcd1234_abcdefgh", "task_id_part": "abcd1234",
+             "task_uuid": "abcd1234-5678"},
+            {"resource": "neutron.networks", "id": "n1",
+             "name": "c_rally_abcd1234_abcdefgh", "task_id_part": "abcd1234",
+             "task_uuid": "abcd1234-5678"},
+            {"resource": "nova.servers", "id": "s2",
+             "name": "s_rally_deadbeef_abcdefgh", "task_id_part": "deadbeef",
+             "task_uuid": None}]
+        self.fake_api.deployment.sweep.return_value = {
+            "resources": resources,
+            "cleanup": {"duration": 1.5, "api_calls": 10}}
+
+        self.deployment.sweep(self.fake_api, deployment_id,
+                              resources=["nova"], task_ids=["task"],
+                              delete=True)
+
+        self.fake_api.deployment.get.assert_called_once_with(deployment_id)
+        self.fake_api.deployment.sweep.assert_called_once_with(
+            self.fake_api.deployment.get.return_value, resources=["nova"],
+            task_ids=["task"], delete=True)
+        self.assertEqual(2, mock_print_list.call_count)
+        self.assertEqual(
+            [["s1", "n1"], ["s2"]],
+            [[r.id for r in call[0][0]]
+             for call in mock_print_list.call_args_list])
+
+    @mock.patch("rally.cli.commands.deployment.cliutils.print_list")
+    def test_sweep_nothing_found(self, mock_print_list):
+        self.fake_api.deployment.sweep.return_value = {"resources": [],
+                                                       "cleanup": None}
+        self.deployment.sweep(self.fake_api, "uuid")
+        self.assertFalse(mock_print_list.called)
+
     def test_deployment_check_not_exist(self):
         deployment_id = "e87e4dca-b515-4477-888d-5f6103f13b42"
         exc = exceptions.DeploymentNotFound(deployment=deployment_id)
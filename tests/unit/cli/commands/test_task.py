@@ -271,8 +271,135 @@ class TaskCommandsTestCase(test.TestCase):
         test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
         value = {"task_id": "task", "status": "status"}
         self.fake_api.task.get.return_value = value
+        self.fake_api.task.list_progress.return_value = []
         self.task.status(self.fake_api, test_uuid)
         self.fake_api.task.get.assert_called_once_with(test_uuid)
+        self.fake_api.task.list_progress.assert_called_once_with(
+            test_uuid, latest=True)
+
+    @mock.patch("rally.cli.commands.task.sys.stdout")
+    def test_status_with_progress(self, mock_stdout):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        self.fake_api.task.get.return_value = {"status": "running"}
+        self.fake_api.task.list_progress.return_value = [
+            {"id": 3, "data": {"name": "Dummy.dummy", "pos": 0,
+                               "completed": 10, "total": 10, "errors": 0,
+                               "p50": 1.5, "p95": 2, "eta": 0,
+                               "finished": True}},
+            {"id": 4, "data": {"name": "Dummy.foo", "pos": 1,
+                               "completed": 25, "total": None, "errors": 2,
+                               "p50": None, "p95": None, "eta": 130.5,
+                               "finished": False}}]
+
+        self.task.status(self.fake_api, test_uuid)
+
+        mock_stdout.write.assert_has_calls([
+            mock.call("Task %s: running" % test_uuid),
+            mock.call("\n"),
+            mock.call("0. Dummy.dummy: 10/10 iterations, 0 errors, "
+                      "p50 1.5s, p95 2.0s, ETA done"),
+            mock.call("\n"),
+            mock.call("1. Dummy.foo: 25 iterations, 2 errors, p50 n/a, "
+                      "p95 n/a, ETA 0:02:10")])
+
+    @mock.patch("rally.cli.commands.task.time.sleep")
+    @mock.patch("rally.cli.commands.task.sys.stdout")
+    def test_watch(self, mock_stdout, mock_sleep):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        self.fake_api.task.get.side_effect = [
+            {"status": consts.TaskStatus.RUNNING},
+            {"status": consts.TaskStatus.RUNNING},
+            {"status": consts.TaskStatus.FINISHED}]
+        progress = {"name": "Dummy.dummy", "pos": 0, "completed": 5,
+                    "total": 10, "errors": 1, "p50": 1, "p95": 2, "eta": 5,
+                    "finished": False}
+        self.fake_api.task.list_progress.side_effect = [
+            [{"id": 1, "data": progress}],
+            [],
+            [{"id": 2, "data": dict(progress, completed=10, eta=0,
+                                    finished=True)}]]
+
+        self.task.watch(self.fake_api, test_uuid, interval=0.5)
+
+        self.assertEqual(
+            [mock.call(test_uuid, since_id=None),
+             mock.call(test_uuid, since_id=1),
+             mock.call(test_uuid, since_id=1)],
+            self.fake_api.task.list_progress.call_args_list)
+        self.assertEqual([mock.call(0.5)] * 2, mock_sleep.call_args_list)
+        mock_stdout.write.assert_has_calls([
+            mock.call("0. Dummy.dummy: 5/10 iterations, 1 errors, "
+                      "p50 1.0s, p95 2.0s, ETA 0:00:05"),
+            mock.call("\n"),
+            mock.call("0. Dummy.dummy: 10/10 iterations, 1 errors, "
+                      "p50 1.0s, p95 2.0s, ETA done"),
+            mock.call("\n"),
+            mock.call("Task %s: finished" % test_uuid)])
+
+    @mock.patch("rally.cli.commands.task.time.sleep")
+    @mock.patch("rally.cli.commands.task.sys.stderr")
+    @mock.patch("rally.cli.commands.task.sys.stdout")
+    def test_watch_pending_task(self, mock_stdout, mock_stderr, mock_sleep):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        self.fake_api.task.get.side_effect = [
+            {"status": consts.TaskStatus.INIT},
+            {"status": consts.TaskStatus.INIT},
+            {"status": consts.TaskStatus.VALIDATED},
+            {"status": consts.TaskStatus.FINISHED}]
+        self.fake_api.task.list_progress.return_value = []
+
+        self.assertIsNone(self.task.watch(self.fake_api, test_uuid))
+
+        self.assertEqual(3, mock_sleep.call_count)
+        mock_stderr.write.assert_has_calls([
+            mock.call("Task %s is init, progress is shown once it is "
+                      "running." % test_uuid),
+            mock.call("\n"),
+            mock.call("Task %s is validated, progress is shown once it is "
+                      "running." % test_uuid),
+            mock.call("\n")])
+        self.assertEqual(4, mock_stderr.write.call_count)
+        mock_stdout.write.assert_has_calls([
+            mock.call("Task %s: finished" % test_uuid)])
+
+    @mock.patch("rally.cli.commands.task.time.sleep")
+    @mock.patch("rally.cli.commands.task.sys.stderr")
+    def test_watch_paused_task(self, mock_stderr, mock_sleep):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        self.fake_api.task.get.return_value = {
+            "status": consts.TaskStatus.PAUSED}
+        self.fake_api.task.list_progress.return_value = []
+
+        self.assertEqual(1, self.task.watch(self.fake_api, test_uuid))
+
+        self.assertFalse(mock_sleep.called)
+        mock_stderr.write.assert_has_calls([
+            mock.call("ERROR: Task %s is paused, it does not produce "
+                      "progress." % test_uuid)])
+
+    @mock.patch("rally.cli.commands.task.time.time")
+    @mock.patch("rally.cli.commands.task.time.sleep")
+    @mock.patch("rally.cli.commands.task.sys.stderr")
+    def test_watch_timeout(self, mock_stderr, mock_sleep, mock_time):
+        test_uuid = "a3e7cefb-bec2-4802-89f6-410cc31f71af"
+        mock_time.side_effect = [0, 5, 10]
+        self.fake_api.task.get.return_value = {
+            "status": consts.TaskStatus.RUNNING}
+        self.fake_api.task.list_progress.return_value = []
+
+        self.assertEqual(1, self.task.watch(self.fake_api, test_uuid,
+                                            interval=5, timeout=10))
+
+        mock_sleep.assert_called_once_with(5)
+        mock_stderr.write.assert_has_calls([
+            mock.call("ERROR: Task %s is still running after 10 seconds "
+                      "of watching." % test_uuid)])
+
+    @mock.patch("rally.cli.commands.task.envutils.get_global")
+    def test_watch_no_task_id(self, mock_get_global):
+        mock_get_global.side_effect = exceptions.InvalidArgumentsException
+        self.assertRaises(exceptions.InvalidArgumentsException,
+                          self.task.watch, None)
 
     @mock.patch("rally.cli.commands.task.envutils.get_global")
     def test_status_no_task_id(self, mock_get_global):
@@ -465,10 +592,10 @@ class TaskCommandsTestCase(test.TestCase):
         mock_os_path.exists = lambda p: p.startswith("path_to_")
         mock_os_path.expanduser = lambda p: p + "_expanded"
         mock_os_path.realpath.side_effect = lambda p: "realpath_" + p
-        results_iter = iter([self._make_result(["bar"]),
-                             self._make_result(["spam"])])
+        results = [self._make_result(["bar"]), self._make_result(["spam"])]
+        results[1][0]["data"]["statistics"] = "spam_statistics"
         fake_task = self.fake_api.task.get.return_value
-        fake_task.get_results.side_effect = results_iter
+        fake_task.get_statistics.side_effect = iter(results)
         mock_plot.trends.return_value = "rendered_trends_report"
         mock_fd = mock.mock_open(
             read_data="[\"result_1_from_file\", \"result_2_from_file\"]")
@@ -477,16 +604,18 @@ class TaskCommandsTestCase(test.TestCase):
                                tasks=["ab123456-38d8-4c8f-bbcc-fc8f74b004ae",
                                       "cd654321-38d8-4c8f-bbcc-fc8f74b004ae",
                                       "path_to_file"],
-                               out="output.html", out_format="html")
+                               out="output.html", out_format="html",
+                               processes=4)
         expected = [
             {"load_duration": 1.2, "full_duration": 2.3, "sla": "bar_sla",
-             "hooks": "bar_hooks",
+             "hooks": "bar_hooks", "statistics": None,
              "key": {"name": "bar", "pos": 0}, "result": "bar_raw"},
             {"load_duration": 1.2, "full_duration": 2.3, "sla": "spam_sla",
-             "hooks": "spam_hooks",
+             "hooks": "spam_hooks", "statistics": "spam_statistics",
              "key": {"name": "spam", "pos": 0}, "result": "spam_raw"},
             "result_1_from_file", "result_2_from_file"]
-        mock_plot.trends.assert_called_once_with(expected)
+        mock_plot.trends.assert_called_once_with(expected, processes=4,
+                                                 points=None)
         self.assertEqual([mock.call("path_to_file_expanded", "r"),
                           mock.call("output.html_expanded", "w+")],
                          mock_open.mock_calls)
@@ -497,9 +626,9 @@ class TaskCommandsTestCase(test.TestCase):
                                     self.fake_api.task.TASK_RESULT_SCHEMA)],
                          mock_validate.mock_calls)
         self.assertEqual([mock.call("ab123456-38d8-4c8f-bbcc-fc8f74b004ae"),
-                          mock.call().get_results(),
+                          mock.call().get_statistics(),
                           mock.call("cd654321-38d8-4c8f-bbcc-fc8f74b004ae"),
-                          mock.call().get_results()],
+                          mock.call().get_statistics()],
                          self.fake_api.task.get.mock_calls)
         self.assertFalse(mock_webbrowser.open_new_tab.called)
         mock_fd.return_value.write.assert_called_once_with(
@@ -531,7 +660,7 @@ class TaskCommandsTestCase(test.TestCase):
     def test_trends_task_id_is_not_uuid_like(self, mock_plot,
                                              mock_open, mock_os_path):
         mock_os_path.exists.return_value = False
-        self.fake_api.task.get.return_value.get_results.return_value = (
+        self.fake_api.task.get.return_value.get_statistics.return_value = (
             self._make_result(["foo"]))
 
         ret = self.task.trends(self.fake_api,
@@ -566,6 +695,49 @@ class TaskCommandsTestCase(test.TestCase):
                                out="output.html", out_format="html")
         self.assertEqual(1, ret)
 
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_trends_window(self, mock_plot):
+        task_id = "ab123456-38d8-4c8f-bbcc-fc8f74b004ae"
+        self.fake_api.task.get.return_value.get_statistics.return_value = (
+            self._make_result(["foo"]))
+        self.fake_api.task.list_trend_points.return_value = [
+            {"task_uuid": task_id, "name": "foo"},
+            {"task_uuid": "other_task", "name": "bar"}]
+        mock_plot.trends.return_value = "rendered_trends_report"
+
+        ret = self.task.trends(self.fake_api, tasks=[task_id],
+                               since="2017-03-01", until="2017-03-02T12:00",
+                               config_hash="foo_hash")
+
+        self.assertIsNone(ret)
+        self.fake_api.task.list_trend_points.assert_called_once_with(
+            config_hash="foo_hash", since=1488326400, until=1488456000)
+        mock_plot.trends.assert_called_once_with(
+            [mock.ANY], processes=1,
+            points=[{"task_uuid": "other_task", "name": "bar"}])
+
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_trends_window_without_tasks(self, mock_plot):
+        mock_plot.trends.return_value = "rendered_trends_report"
+        self.fake_api.task.list_trend_points.return_value = [
+            {"task_uuid": "foo_task", "name": "foo"}]
+
+        ret = self.task.trends(self.fake_api, since="2017-03-01")
+
+        self.assertIsNone(ret)
+        self.fake_api.task.list_trend_points.assert_called_once_with(
+            config_hash=None, since=1488326400, until=None)
+        self.assertFalse(self.fake_api.task.get.called)
+        mock_plot.trends.assert_called_once_with(
+            [], processes=1,
+            points=self.fake_api.task.list_trend_points.return_value)
+
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_trends_invalid_window(self, mock_plot):
+        ret = self.task.trends(self.fake_api, until="yesterday")
+        self.assertEqual(1, ret)
+        self.assertFalse(mock_plot.trends.called)
+
     @mock.patch("rally.cli.commands.task.jsonschema.validate",
                 return_value=None)
     @mock.patch("rally.cli.commands.task.os.path.realpath",
@@ -611,7 +783,8 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.report(self.fake_api, tasks=task_id,
                          out="/tmp/%s.html" % task_id)
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(results, include_libs=False,
+                                               processes=1)
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
         self.fake_api.task.get.assert_called_once_with(task_id)
@@ -629,14 +802,16 @@ class TaskCommandsTestCase(test.TestCase):
                          open_it=True, out_format="html")
         mock_webbrowser.open_new_tab.assert_called_once_with(
             "file://realpath_output.html")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(results, include_libs=False,
+                                               processes=1)
 
         # HTML with embedded JS/CSS
         reset_mocks()
         self.task.report(self.fake_api, task_id, open_it=False,
                          out="output.html", out_format="html_static")
         self.assertFalse(mock_webbrowser.open_new_tab.called)
-        mock_plot.plot.assert_called_once_with(results, include_libs=True)
+        mock_plot.plot.assert_called_once_with(results, include_libs=True,
+                                               processes=1)
 
     @mock.patch("rally.cli.commands.task.jsonschema.validate",
                 return_value=None)
@@ -687,7 +862,8 @@ class TaskCommandsTestCase(test.TestCase):
                 m.reset_mock()
         self.task.report(self.fake_api, tasks=tasks, out="/tmp/1_test.html")
         mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(results, include_libs=False,
+                                               processes=1)
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
         expected_get_calls = [mock.call(task) for task in tasks]
@@ -739,7 +915,8 @@ class TaskCommandsTestCase(test.TestCase):
         expected_open_calls = [mock.call(task_file, "r"),
                                mock.call("/tmp/1_test.html", "w+")]
         mock_open.assert_has_calls(expected_open_calls, any_order=True)
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(results, include_libs=False,
+                                               processes=1)
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
 
@@ -782,6 +959,33 @@ class TaskCommandsTestCase(test.TestCase):
         expected_out = "Invalid output format: invalid"
         mock_stderr.write.assert_has_calls([mock.call(expected_out)])
 
+    @mock.patch("rally.cli.commands.task.open",
+                side_effect=mock.mock_open(), create=True)
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_report_lazy_load(self, mock_plot, mock_open):
+        task_id = "eb290c30-38d8-4c8f-bbcc-fc8f74b004ae"
+        self.fake_api.task.get.return_value.get_results.return_value = []
+        mock_plot.plot_lazy.return_value = "html_report"
+
+        self.task.report(self.fake_api, tasks=task_id,
+                         out="/tmp/report.html", out_format="html_static",
+                         lazy_load=True, processes=4)
+
+        mock_plot.plot_lazy.assert_called_once_with(
+            [], "/tmp/report_data", include_libs=True, processes=4)
+        self.assertFalse(mock_plot.plot.called)
+        mock_open.assert_called_once_with("/tmp/report.html", "w+")
+        mock_open.side_effect().write.assert_called_once_with("html_report")
+
+    @mock.patch("rally.cli.commands.task.plot")
+    def test_report_lazy_load_without_out(self, mock_plot):
+        for kwargs in ({}, {"out": "/tmp/report.xml", "out_format": "junit"}):
+            self.assertEqual(1, self.task.report(
+                self.fake_api, tasks="eb290c30-38d8-4c8f-bbcc-fc8f74b004ae",
+                lazy_load=True, **kwargs))
+        self.assertFalse(self.fake_api.task.get.called)
+        self.assertFalse(mock_plot.plot_lazy.called)
+
     @mock.patch("rally.cli.commands.task.cliutils.print_list")
     @mock.patch("rally.cli.commands.task.envutils.get_global",
                 return_value="123456789")
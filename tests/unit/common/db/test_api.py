@@ -299,10 +299,34 @@ class TasksTestCase(test.DBTestCase):
             key["kw"]["args"]["task_id"] = task_id
             data["sla"][0] = {"success": True}
             data["raw"] = []
+            data["statistics"] = {}
             self.assertEqual(len(res), 1)
             self.assertEqual(res[0]["key"], key)
             self.assertEqual(res[0]["data"], data)
 
+    def test_task_statistics_get_all_by_uuid(self):
+        task_id = self._create_task()["uuid"]
+        subtask = db.subtask_create(task_id, title="foo")
+        raw = [{"duration": 1, "timestamp": 1}]
+        statistics = {"durations": {"cols": [], "rows": []},
+                      "tstamp_start": 1}
+        for name, data in (("foo", {"statistics": statistics}),
+                           ("bar", {})):
+            workload = db.workload_create(
+                task_id, subtask["uuid"],
+                {"name": name, "pos": 0, "kw": {"runner": {"type": "T"}}})
+            db.workload_data_create(task_id, workload["uuid"], 0,
+                                    {"raw": raw})
+            db.workload_set_results(workload["uuid"], data)
+
+        res = db.task_statistics_get_all_by_uuid(task_id)
+
+        self.assertEqual(["foo", "bar"], [r["key"]["name"] for r in res])
+        self.assertEqual([], res[0]["data"]["raw"])
+        self.assertEqual(statistics, res[0]["data"]["statistics"])
+        self.assertEqual(raw, res[1]["data"]["raw"])
+        self.assertEqual({}, res[1]["data"]["statistics"])
+
     def test_task_get_detailed(self):
         validation_result = {
             "etype": "FooError",
@@ -356,6 +380,7 @@ class TasksTestCase(test.DBTestCase):
             "load_duration": 13,
             "full_duration": 42,
             "hooks": [],
+            "statistics": {},
         }, results[0]["data"])
 
     def test_task_get_detailed_last(self):
@@ -402,6 +427,7 @@ class TasksTestCase(test.DBTestCase):
             "load_duration": 13,
             "full_duration": 42,
             "hooks": [],
+            "statistics": {},
         }, results[0]["data"])
 
     def test_task_result_create(self):
@@ -520,7 +546,8 @@ class TasksTestCase(test.DBTestCase):
             "sla": [{"success": True}],
             "hooks": [],
             "load_duration": 13,
-            "full_duration": 42
+            "full_duration": 42,
+            "statistics": {}
         })
 
         db.task_delete(task_id)
@@ -620,6 +647,17 @@ class WorkloadTestCase(test.DBTestCase):
         self.assertEqual(data["sla"], workload["sla_results"]["sla"])
         self.assertEqual(self.task_uuid, workload["task_uuid"])
         self.assertEqual(self.subtask_uuid, workload["subtask_uuid"])
+        self.assertEqual({}, workload["statistics"])
+
+    def test_workload_set_results_with_statistics(self):
+        key = {"name": "atata", "pos": 0, "kw": {"runner": {"type": "T"}}}
+        statistics = {"durations": {"cols": ["Action"], "rows": []},
+                      "tstamp_start": 1}
+
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid, key)
+        workload = db.workload_set_results(workload["uuid"],
+                                           {"statistics": statistics})
+        self.assertEqual(statistics, workload["statistics"])
 
     def test_workload_set_results_empty_raw_data(self):
         key = {
@@ -714,6 +752,150 @@ class WorkloadDataTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_data_bulk_create(self):
+        chunks = [
+            (1, {"raw": [{"duration": 2, "timestamp": 3},
+                         {"error": "anError", "duration": 1,
+                          "timestamp": 4}]}),
+            (0, {"raw": [{"duration": 1, "timestamp": 1}]})]
+        db.workload_data_bulk_create(self.task_uuid, self.workload_uuid,
+                                     chunks)
+        db.workload_data_bulk_create(self.task_uuid, self.workload_uuid, [])
+
+        workload_data_list = list(
+            db.get_impl()._task_workload_data_get_all(self.workload_uuid))
+        self.assertEqual([0, 1],
+                         [w.chunk_order for w in workload_data_list])
+        self.assertEqual([1, 2],
+                         [w.iteration_count for w in workload_data_list])
+        self.assertEqual([0, 1], [w.failed_iteration_count
+                                  for w in workload_data_list])
+        self.assertEqual([chunks[1][1], chunks[0][1]],
+                         [w.chunk_data for w in workload_data_list])
+        self.assertEqual(dt.datetime.fromtimestamp(3),
+                         workload_data_list[1].started_at)
+        self.assertEqual(dt.datetime.fromtimestamp(5),
+                         workload_data_list[1].finished_at)
+        self.assertEqual(2, len(set(w.uuid for w in workload_data_list)))
+        self.assertTrue(all(w.created_at for w in workload_data_list))
+
+    def test_workload_data_iter(self):
+        chunks = [(1, {"raw": [{"duration": 2, "timestamp": 3}]}),
+                  (0, {"raw": [{"duration": 1, "timestamp": 1}]})]
+        db.workload_data_bulk_create(self.task_uuid, self.workload_uuid,
+                                     chunks)
+
+        self.assertEqual([chunks[1][1], chunks[0][1]],
+                         list(db.workload_data_iter(self.workload_uuid)))
+        self.assertEqual([], list(db.workload_data_iter("other-uuid")))
+
+
+class TrendPointTestCase(test.DBTestCase):
+    def setUp(self):
+        super(TrendPointTestCase, self).setUp()
+        self.deploy = db.deployment_create({})
+        self.task = db.task_create({"deployment_uuid": self.deploy["uuid"]})
+        self.task_uuid = self.task["uuid"]
+        self.subtask = db.subtask_create(self.task_uuid, title="foo")
+        self.key = {"name": "atata", "pos": 0, "kw": {"runner": {"r": "R",
+                                                                 "type": "T"}}}
+
+    def _create_trend_point(self, config_hash, tstamp_start):
+        workload = db.workload_create(self.task_uuid, self.subtask["uuid"],
+                                      self.key)
+        return db.trend_point_create(
+            self.task_uuid, workload["uuid"],
+            {"config_hash": config_hash, "name": "Foo.bar",
+             "config": "{}", "sla_failures": 1,
+             "stat": {"cols": ["Action"], "rows": [["total"]]},
+             "tstamp_start": tstamp_start})
+
+    def test_trend_point_create(self):
+        point = self._create_trend_point("foo_hash", 42.5)
+        self.assertEqual(self.task_uuid, point["task_uuid"])
+        self.assertEqual("foo_hash", point["config_hash"])
+        self.assertEqual("Foo.bar", point["name"])
+        self.assertEqual("{}", point["config"])
+        self.assertEqual(1, point["sla_failures"])
+        self.assertEqual({"cols": ["Action"], "rows": [["total"]]},
+                         point["stat"])
+        self.assertEqual(42.5, point["tstamp_start"])
+
+    def test_trend_point_list(self):
+        for config_hash, tstamp_start in (("foo", 3), ("bar", 2),
+                                          ("foo", 1), ("foo", 2)):
+            self._create_trend_point(config_hash, tstamp_start)
+
+        points = db.trend_point_list()
+        self.assertEqual([1, 2, 2, 3], [p["tstamp_start"] for p in points])
+
+        points = db.trend_point_list(config_hash="foo")
+        self.assertEqual([1, 2, 3], [p["tstamp_start"] for p in points])
+
+        points = db.trend_point_list(config_hash="foo", since=2, until=3)
+        self.assertEqual([2], [p["tstamp_start"] for p in points])
+
+        points = db.trend_point_list(since=2)
+        self.assertEqual([("bar", 2), ("foo", 2), ("foo", 3)],
+                         [(p["config_hash"], p["tstamp_start"])
+                          for p in points])
+
+    def test_trend_point_list_after_task_delete(self):
+        self._create_trend_point("foo", 1)
+        db.task_delete(self.task_uuid)
+        self.assertEqual([], db.trend_point_list())
+
+
+class WorkloadProgressTestCase(test.DBTestCase):
+    def setUp(self):
+        super(WorkloadProgressTestCase, self).setUp()
+        self.deploy = db.deployment_create({})
+        self.task = db.task_create({"deployment_uuid": self.deploy["uuid"]})
+        self.task_uuid = self.task["uuid"]
+        self.subtask = db.subtask_create(self.task_uuid, title="foo")
+        self.key = {"name": "atata", "pos": 0, "kw": {"runner": {"r": "R",
+                                                                 "type": "T"}}}
+        self.workloads = [
+            db.workload_create(self.task_uuid, self.subtask["uuid"],
+                               self.key)["uuid"]
+            for i in range(2)]
+
+    def test_workload_progress_create(self):
+        progress = db.workload_progress_create(
+            self.task_uuid, self.workloads[0], {"completed": 3})
+        self.assertEqual(self.task_uuid, progress["task_uuid"])
+        self.assertEqual(self.workloads[0], progress["workload_uuid"])
+        self.assertEqual({"completed": 3}, progress["data"])
+        self.assertIsInstance(progress["id"], int)
+
+    def test_workload_progress_list(self):
+        for workload, completed in ((0, 1), (1, 1), (0, 2), (1, 2), (0, 3)):
+            db.workload_progress_create(self.task_uuid,
+                                        self.workloads[workload],
+                                        {"completed": completed})
+
+        records = db.workload_progress_list(self.task_uuid)
+        self.assertEqual([1, 1, 2, 2, 3],
+                         [r["data"]["completed"] for r in records])
+
+        records = db.workload_progress_list(self.task_uuid,
+                                            since_id=records[2]["id"])
+        self.assertEqual([(self.workloads[1], 2), (self.workloads[0], 3)],
+                         [(r["workload_uuid"], r["data"]["completed"])
+                          for r in records])
+
+        records = db.workload_progress_list(self.task_uuid, latest=True)
+        self.assertEqual([(self.workloads[1], 2), (self.workloads[0], 3)],
+                         [(r["workload_uuid"], r["data"]["completed"])
+                          for r in records])
+
+        self.assertEqual([], db.workload_progress_list("other_task"))
+
+    def test_workload_progress_list_after_task_delete(self):
+        db.workload_progress_create(self.task_uuid, self.workloads[0], {})
+        db.task_delete(self.task_uuid)
+        self.assertEqual([], db.workload_progress_list(self.task_uuid))
+
 
 class DeploymentTestCase(test.DBTestCase):
     def test_deployment_create(self):
@@ -1417,3 +1417,57 @@ class MigrationWalkTestCase(rtest.DBTestCase,
                 conn.execute(
                     deployment_table.delete().where(
                         deployment_table.c.uuid == deployment))
+
+    def _check_7287df262dbc(self, engine, data):
+        self.assertEqual(
+            "7287df262dbc", api.get_backend().schema_revision(engine=engine))
+
+        trend_points_table = db_utils.get_table(engine, "trend_points")
+        self.assertEqual(
+            {"created_at", "updated_at", "id", "task_uuid", "workload_uuid",
+             "config_hash", "name", "config", "sla_failures",
+             "tstamp_start", "stat"},
+            set(trend_points_table.c.keys()))
+        self.assertEqual(
+            {"trend_point_config_hash_tstamp", "trend_point_tstamp",
+             "trend_point_workload_uuid"},
+            set(index.name for index in trend_points_table.indexes))
+
+    def _pre_upgrade_35fe16d4ab1c(self, engine):
+        deployment_table = db_utils.get_table(engine, "deployments")
+        with engine.connect() as conn:
+            conn.execute(
+                deployment_table.insert(),
+                [{"uuid": "35fe16d4ab1c", "name": "35fe16d4ab1c",
+                  "config": json.dumps({}),
+                  "enum_deployments_status":
+                      consts.DeployStatus.DEPLOY_FINISHED,
+                  "credentials": json.dumps({})}])
+
+    def _check_35fe16d4ab1c(self, engine, data):
+        self.assertEqual(
+            "35fe16d4ab1c", api.get_backend().schema_revision(engine=engine))
+
+        deployment_table = db_utils.get_table(engine, "deployments")
+        with engine.connect() as conn:
+            deployment = conn.execute(
+                deployment_table.select().where(
+                    deployment_table.c.uuid == "35fe16d4ab1c")).fetchone()
+            self.assertEqual({}, json.loads(deployment.capabilities))
+
+            conn.execute(
+                deployment_table.delete().where(
+                    deployment_table.c.uuid == "35fe16d4ab1c"))
+
+    def _check_c5e1f2f8ed1a(self, engine, data):
+        self.assertEqual(
+            "c5e1f2f8ed1a", api.get_backend().schema_revision(engine=engine))
+
+        progress_table = db_utils.get_table(engine, "workload_progress")
+        self.assertEqual(
+            {"created_at", "updated_at", "id", "task_uuid", "workload_uuid",
+             "data"},
+            set(progress_table.c.keys()))
+        self.assertEqual(
+            {"workload_progress_task_uuid_id"},
+            set(index.name for index in progress_table.indexes))
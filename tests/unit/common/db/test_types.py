@@ -14,6 +14,8 @@
 
 """Tests for custom sqlalchemy types"""
 
+import pickle
+
 import mock
 import sqlalchemy as sa
 import testtools
@@ -92,6 +94,13 @@ class MutableDictTest(testtools.TestCase):
         self.assertEqual({"a": 1}, d)
         self.assertEqual(1, mock_mutable_dict_changed.call_count)
 
+    def test_pickle(self):
+        d = types.MutableDict({"a": [1, 2]})
+        d._parents
+        d_copy = pickle.loads(pickle.dumps(d, 2))
+        self.assertIsInstance(d_copy, types.MutableDict)
+        self.assertEqual(d, d_copy)
+
 
 class MutableListTest(testtools.TestCase):
     def test_creation(self):
@@ -139,3 +148,10 @@ class MutableListTest(testtools.TestCase):
         del lst[2]
         self.assertEqual([1, 2], lst)
         self.assertEqual(1, mock_mutable_list_changed.call_count)
+
+    def test_pickle(self):
+        lst = types.MutableList([1, {"a": 2}])
+        lst._parents
+        lst_copy = pickle.loads(pickle.dumps(lst, 2))
+        self.assertIsInstance(lst_copy, types.MutableList)
+        self.assertEqual(lst, lst_copy)
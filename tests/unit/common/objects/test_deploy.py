@@ -107,6 +107,16 @@ class DeploymentTestCase(test.TestCase):
             {"name": "new_name"},
         )
 
+    @mock.patch("rally.common.objects.deploy.db.deployment_update")
+    def test_update_capabilities(self, mock_deployment_update):
+        mock_deployment_update.return_value = self.deployment
+        deploy = objects.Deployment(deployment=self.deployment)
+        deploy.update_capabilities({"services": {}})
+        mock_deployment_update.assert_called_once_with(
+            self.deployment["uuid"],
+            {"capabilities": {"services": {}}},
+        )
+
     @mock.patch("rally.common.objects.deploy.db.deployment_update")
     def test_update_config(self, mock_deployment_update):
         mock_deployment_update.return_value = self.deployment
@@ -15,7 +15,9 @@
 
 """Tests for db.task layer."""
 
+import collections
 import datetime as dt
+import json
 
 import ddt
 import jsonschema
@@ -24,6 +26,7 @@ import mock
 from rally.common import objects
 from rally import consts
 from rally import exceptions
+from rally.task.processing import plot
 from tests.unit import test
 
 
@@ -227,6 +230,31 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
+    def test_extend_results_nested_atomic_actions(self):
+        iterations = [
+            {"timestamp": i + 2, "duration": i + 5, "error": [],
+             "idle_duration": 0,
+             "atomic_actions": [
+                 {"name": "foo", "started_at": 0, "finished_at": i + 3,
+                  "children": [{"name": "bar", "started_at": 0,
+                                "finished_at": 1, "children": []}]},
+                 {"name": "foo", "started_at": i + 3, "finished_at": i + 4,
+                  "children": []}]} for i in range(2)]
+        results = objects.Task.extend_results(
+            [{"task_uuid": "foo_uuid", "created_at": None,
+              "updated_at": None, "id": 11,
+              "key": {"kw": {"foo": 42}, "name": "Foo.bar", "pos": 0},
+              "data": {"raw": iterations, "sla": [], "hooks": [],
+                       "full_duration": 40, "load_duration": 32}}])
+
+        self.assertEqual(
+            collections.OrderedDict([
+                ("foo", {"min_duration": 4, "max_duration": 5}),
+                ("foo > bar", {"min_duration": 1, "max_duration": 1})]),
+            results[0]["info"]["atomic"])
+        self.assertEqual(["foo", "foo > bar", "total"],
+                         [r[0] for r in results[0]["info"]["stat"]["rows"]])
+
     @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
                 return_value="foo_results")
     def test_get_results(self, mock_task_result_get_all_by_uuid):
@@ -236,6 +264,15 @@ class TaskTestCase(test.TestCase):
             self.task["uuid"])
         self.assertEqual(results, "foo_results")
 
+    @mock.patch(
+        "rally.common.objects.task.db.task_statistics_get_all_by_uuid",
+        return_value="foo_statistics")
+    def test_get_statistics(self, mock_task_statistics_get_all_by_uuid):
+        task = objects.Task(task=self.task)
+        self.assertEqual("foo_statistics", task.get_statistics())
+        mock_task_statistics_get_all_by_uuid.assert_called_once_with(
+            self.task["uuid"])
+
     @mock.patch("rally.common.objects.task.db.task_update")
     def test_set_failed(self, mock_task_update):
         mock_task_update.return_value = self.task
@@ -348,6 +385,11 @@ class WorkloadTestCase(test.TestCase):
         self.workload = {
             "task_uuid": "00ef46a2-c5b8-4aea-a5ca-0f54a10cbca1",
             "uuid": "00ef46a2-c5b8-4aea-a5ca-0f54a10cbca3",
+            "name": "Foo.bar",
+            "args": {"a": 1},
+            "runner": {"type": "constant"},
+            "context": {},
+            "sla": {},
         }
 
     @mock.patch("rally.common.objects.task.db.workload_create")
@@ -370,6 +412,25 @@ class WorkloadTestCase(test.TestCase):
             self.workload["task_uuid"], self.workload["uuid"],
             0, {"data": "foo"})
 
+    @mock.patch("rally.common.objects.task.db.workload_data_bulk_create")
+    @mock.patch("rally.common.objects.task.db.workload_create")
+    def test_add_workload_data_chunks(self, mock_workload_create,
+                                      mock_workload_data_bulk_create):
+        mock_workload_create.return_value = self.workload
+        workload = objects.Workload("uuid1", "uuid2", {"bar": "baz"})
+        itr = {"timestamp": 1, "duration": 2, "error": ["e"],
+               "atomic_actions": [{"name": "foo", "started_at": 1,
+                                   "finished_at": 2, "children": []}],
+               "output": {}}
+        chunks = [(0, {"raw": [itr]}),
+                  (1, {"raw": [itr, dict(itr, atomic_actions={"bar": 1})]})]
+
+        workload.add_workload_data_chunks(chunks)
+        mock_workload_data_bulk_create.assert_called_once_with(
+            self.workload["task_uuid"], self.workload["uuid"], chunks)
+        self.assertEqual(3, workload._iterations_count)
+        self.assertEqual(["foo", "bar"], list(workload._atomic))
+
     @mock.patch("rally.common.objects.task.db.workload_set_results")
     @mock.patch("rally.common.objects.task.db.workload_create")
     def test_set_results(self, mock_workload_create,
@@ -377,6 +438,83 @@ class WorkloadTestCase(test.TestCase):
         mock_workload_create.return_value = self.workload
         workload = objects.Workload("uuid1", "uuid2", {"bar": "baz"})
 
-        workload = workload.set_results({"data": "foo"})
+        workload = workload.set_results({"data": "foo",
+                                         "statistics": {}})
         mock_workload_set_results.assert_called_once_with(
-            self.workload["uuid"], {"data": "foo"})
+            self.workload["uuid"], {"data": "foo", "statistics": {}})
+
+    @mock.patch("rally.common.objects.task.db.trend_point_create")
+    @mock.patch("rally.common.objects.task.db.workload_set_results")
+    @mock.patch("rally.common.objects.task.db.workload_data_iter")
+    @mock.patch("rally.common.objects.task.db.workload_data_create")
+    @mock.patch("rally.common.objects.task.db.workload_create")
+    def test_set_results_with_statistics(self, mock_workload_create,
+                                         mock_workload_data_create,
+                                         mock_workload_data_iter,
+                                         mock_workload_set_results,
+                                         mock_trend_point_create):
+        mock_workload_create.return_value = self.workload
+        workload = objects.Workload("uuid1", "uuid2", {"name": "Foo.bar"})
+        chunks = [[(1, 2, None)], [(3, 4, ["e", "m", "t"]), (2, 6, None)]]
+        chunks = [{"raw": [
+            {"timestamp": ts, "duration": duration, "error": error,
+             "idle_duration": 0, "output": {},
+             "atomic_actions": [{"name": "foo", "started_at": ts,
+                                 "finished_at": ts + 1,
+                                 "children": []}]}
+            for ts, duration, error in chunk]} for chunk in chunks]
+        for i, chunk in enumerate(chunks):
+            workload.add_workload_data(i, chunk)
+        mock_workload_data_iter.return_value = iter(chunks)
+
+        workload.set_results({"sla": [], "load_duration": 5,
+                              "full_duration": 6})
+
+        mock_workload_data_iter.assert_called_once_with(
+            self.workload["uuid"])
+        data = mock_workload_set_results.call_args[0][1]
+        self.assertEqual(1, data["statistics"]["tstamp_start"])
+        rows = data["statistics"]["durations"]["rows"]
+        self.assertEqual(["foo", "total"], [row[0] for row in rows])
+        self.assertEqual(["total", 2.0, 4.0, 5.6, 5.8, 6.0, 4.0, "66.7%", 3],
+                         rows[1])
+
+        kw = {"args": {"a": 1}, "runner": {"type": "constant"},
+              "context": {}, "sla": {}, "hooks": []}
+        mock_trend_point_create.assert_called_once_with(
+            self.workload["task_uuid"], self.workload["uuid"],
+            {"config_hash": plot.Trends()._make_hash(kw),
+             "name": "Foo.bar",
+             "config": json.dumps(kw, indent=2),
+             "sla_failures": 0,
+             "stat": data["statistics"]["durations"],
+             "tstamp_start": 1})
+
+    @mock.patch("rally.common.objects.task.db.trend_point_list")
+    def test_list_trend_points(self, mock_trend_point_list):
+        self.assertEqual(
+            mock_trend_point_list.return_value,
+            objects.Workload.list_trend_points(config_hash="foo", since=1,
+                                               until=2))
+        mock_trend_point_list.assert_called_once_with(
+            config_hash="foo", since=1, until=2)
+
+    @mock.patch("rally.common.objects.task.db.workload_progress_create")
+    @mock.patch("rally.common.objects.task.db.workload_create")
+    def test_add_progress(self, mock_workload_create,
+                          mock_workload_progress_create):
+        mock_workload_create.return_value = self.workload
+        workload = objects.Workload("uuid1", "uuid2", {"bar": "baz"})
+        workload.add_progress({"completed": 1})
+        mock_workload_progress_create.assert_called_once_with(
+            self.workload["task_uuid"], self.workload["uuid"],
+            {"completed": 1})
+
+    @mock.patch("rally.common.objects.task.db.workload_progress_list")
+    def test_list_progress(self, mock_workload_progress_list):
+        self.assertEqual(
+            mock_workload_progress_list.return_value,
+            objects.Workload.list_progress("task-uuid", since_id=3,
+                                           latest=True))
+        mock_workload_progress_list.assert_called_once_with(
+            "task-uuid", since_id=3, latest=True)
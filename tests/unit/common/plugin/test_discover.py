@@ -101,3 +101,48 @@ class LoadExtraModulesTestCase(test.TestCase):
         # test no fails if module is broken
         # TODO(olkonami): check exception is handled correct
         discover.load_plugins("/somewhere")
+
+
+class LazyPluginsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LazyPluginsTestCase, self).setUp()
+        for name, value in (("_LAZY_MODULES", set()),
+                            ("_LAZY_PLUGINS", [])):
+            patcher = mock.patch.object(discover, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        discover.register_lazy_plugins(
+            ["foo.a", "foo.b", "foo.c", "sys"],
+            [["foo.Base", "default", "x", "foo.a"],
+             ["foo.Base", "default", "y", "foo.b"],
+             ["foo.Other", "openstack", "x", "foo.c"],
+             [None, "default", "x", "sys"]])
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_lazy_plugins_filtered(self, mock_import_module):
+        discover.import_lazy_plugins(base="foo.Base", name="x")
+        mock_import_module.assert_called_once_with("foo.a")
+
+        mock_import_module.reset_mock()
+        discover.import_lazy_plugins(base="foo.Base", name="x")
+        self.assertFalse(mock_import_module.called)
+
+        discover.import_lazy_plugins(name="x")
+        mock_import_module.assert_called_once_with("foo.c")
+        self.assertEqual({"foo.b"}, discover._LAZY_MODULES)
+
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_lazy_plugins_all(self, mock_import_module):
+        discover.import_lazy_plugins(namespace="openstack")
+        discover.import_lazy_plugins()
+
+        self.assertEqual([mock.call("foo.c"), mock.call("foo.a"),
+                          mock.call("foo.b")],
+                         mock_import_module.call_args_list)
+        self.assertEqual(set(), discover._LAZY_MODULES)
+        self.assertEqual([], discover._LAZY_PLUGINS)
+
+        mock_import_module.reset_mock()
+        discover.import_lazy_plugins()
+        self.assertFalse(mock_import_module.called)
@@ -0,0 +1,80 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+
+from rally.common.plugin import manifest
+from tests.unit import test
+
+PACKAGE = "rally.plugins.common.exporter"
+
+
+class ManifestTestCase(test.TestCase):
+
+    def test_generate(self):
+        result = manifest.generate([PACKAGE])
+
+        self.assertEqual(manifest.VERSION, result["version"])
+        self.assertEqual([PACKAGE], result["packages"])
+        module = PACKAGE + ".file_system"
+        self.assertEqual([module], result["modules"])
+        self.assertEqual(
+            sorted([os.path.join("rally", "plugins", "common", "exporter",
+                                 name)
+                    for name in ("__init__.py", "file_system.py")]),
+            sorted(result["mtimes"]))
+        self.assertEqual(
+            [["rally.task.exporter.Exporter", "default", "file", module],
+             ["rally.task.exporter.Exporter", "default", "file-exporter",
+              module]],
+            result["plugins"])
+
+    def test_is_up_to_date(self):
+        result = manifest.generate([PACKAGE])
+        self.assertTrue(manifest.is_up_to_date(result, [PACKAGE]))
+        self.assertFalse(manifest.is_up_to_date(result, [PACKAGE, "foo"]))
+        self.assertFalse(manifest.is_up_to_date(
+            dict(result, version=manifest.VERSION + 1), [PACKAGE]))
+
+        result["mtimes"][sorted(result["mtimes"])[0]] -= 1
+        self.assertFalse(manifest.is_up_to_date(result, [PACKAGE]))
+
+    def test_save_and_load(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        manifest_path = os.path.join(path, "foo", "manifest.json")
+
+        self.assertIsNone(manifest.load(manifest_path))
+        manifest.save({"foo": [1]}, manifest_path)
+        self.assertEqual({"foo": [1]}, manifest.load(manifest_path))
+        self.assertEqual(["manifest.json"],
+                         os.listdir(os.path.dirname(manifest_path)))
+
+        with open(manifest_path, "w") as f:
+            f.write("{")
+        self.assertIsNone(manifest.load(manifest_path))
+
+    @mock.patch("rally.common.plugin.manifest.json.dump",
+                side_effect=ValueError)
+    def test_save_fails(self, mock_dump):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+
+        self.assertRaises(ValueError, manifest.save, {},
+                          os.path.join(path, "manifest.json"))
+        self.assertEqual([], os.listdir(path))
@@ -13,8 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.common.plugin import plugin
 from rally import exceptions
+from rally.plugins.common.exporter import file_system
+from rally.task import exporter
 from tests.unit import test
 
 
@@ -205,6 +209,20 @@ class PluginTestCase(test.TestCase):
         self.assertRaises(exceptions.PluginWithSuchNameExists,
                           plugin.configure("test_2_plugins_with_same_name"), B)
 
+    @mock.patch("rally.common.plugin.discover.import_lazy_plugins")
+    def test_get_imports_lazy_plugins(self, mock_import_lazy_plugins):
+        self.assertEqual(file_system.FileExporter,
+                         exporter.Exporter.get("file", namespace="default"))
+        mock_import_lazy_plugins.assert_called_once_with(
+            base="rally.task.exporter.Exporter", namespace="default",
+            name="file")
+
+        mock_import_lazy_plugins.reset_mock()
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "test_some_plugin_foo")
+        mock_import_lazy_plugins.assert_called_once_with(
+            base=None, namespace=None, name="test_some_plugin_foo")
+
     def test_get_name(self):
         self.assertEqual("test_some_plugin", SomePlugin.get_name())
 
@@ -213,6 +231,13 @@ class PluginTestCase(test.TestCase):
                          set(BasePlugin.get_all()))
         self.assertEqual([], SomePlugin.get_all())
 
+    @mock.patch("rally.common.plugin.discover.import_lazy_plugins")
+    def test_get_all_imports_lazy_plugins(self, mock_import_lazy_plugins):
+        self.assertEqual(set([SomePlugin, DeprecatedPlugin]),
+                         set(BasePlugin.get_all(namespace="default")))
+        mock_import_lazy_plugins.assert_called_once_with(
+            base=None, namespace="default")
+
     def test_get_all_hidden(self):
         self.assertEqual(set([SomePlugin, DeprecatedPlugin, HiddenPlugin]),
                          set(BasePlugin.get_all(allow_hidden=True)))
@@ -84,3 +84,28 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_concurrently(self):
+        outcomes = broker.run_concurrently(lambda x: x * 2, [1, 2, 3],
+                                           workers=2)
+        self.assertEqual([2, 4, 6], [o[0] for o in outcomes])
+        self.assertEqual([None] * 3, [o[1] for o in outcomes])
+        for outcome in outcomes:
+            self.assertGreaterEqual(outcome[2], 0)
+
+    def test_run_concurrently_without_items(self):
+        self.assertEqual([], broker.run_concurrently(mock.Mock(), []))
+
+    @mock.patch("rally.common.broker.LOG")
+    def test_run_concurrently_fails(self, mock_log):
+        error = Exception("Failed")
+        func = mock.Mock(side_effect=["r1", error, "r3"])
+
+        outcomes = broker.run_concurrently(func, [1, 2, 3, 4])
+
+        self.assertEqual(("r1", None), outcomes[0][:2])
+        self.assertEqual((None, error), outcomes[1][:2])
+        # items are skipped after failure
+        self.assertEqual([None, None], outcomes[2:])
+        self.assertEqual([mock.call(1), mock.call(2)], func.mock_calls)
+        self.assertTrue(mock_log.warning.called)
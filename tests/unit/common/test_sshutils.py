@@ -113,12 +113,48 @@ class SSHTestCase(test.TestCase):
         ]
         self.assertEqual(client_calls, client.mock_calls)
 
+    @mock.patch("rally.common.sshutils.SSH._connect")
+    def test__get_client_cached(self, mock_ssh__connect):
+        self.assertEqual(mock_ssh__connect.return_value,
+                         self.ssh._get_client())
+        self.assertEqual(mock_ssh__connect.return_value,
+                         self.ssh._get_client())
+        mock_ssh__connect.assert_called_once_with()
+
+    def test__get_client_from_pool(self):
+        pool = mock.Mock()
+        ssh = sshutils.SSH("root", "example.net", pool=pool)
+
+        self.assertEqual(pool.get.return_value, ssh._get_client())
+        pool.get.assert_called_once_with(ssh)
+
+    @mock.patch("rally.common.sshutils.paramiko")
+    def test__connect_failed(self, mock_paramiko):
+        mock_paramiko.SSHClient.return_value.connect.side_effect = (
+            socket.error)
+        self.assertRaises(exceptions.SSHError, self.ssh._connect)
+
     def test_close(self):
         with mock.patch.object(self.ssh, "_client") as m_client:
             self.ssh.close()
         m_client.close.assert_called_once_with()
         self.assertFalse(self.ssh._client)
 
+    def test_close_pooled(self):
+        pool = mock.Mock()
+        ssh = sshutils.SSH("root", "example.net", pool=pool)
+        ssh._get_client()
+        ssh.close()
+        self.assertFalse(pool.get.return_value.close.called)
+
+    def test__release_client(self):
+        self.ssh._release_client()
+
+        pool = mock.Mock()
+        ssh = sshutils.SSH("root", "example.net", pool=pool)
+        ssh._release_client()
+        pool.release.assert_called_once_with(ssh)
+
     @mock.patch("rally.common.sshutils.six.moves.StringIO")
     def test_execute(self, mock_string_io):
         mock_string_io.side_effect = stdio = [mock.Mock(), mock.Mock()]
@@ -152,6 +188,131 @@ class SSHTestCase(test.TestCase):
                                                   0])
         self.ssh.wait()
         self.assertEqual([mock.call("uname")] * 3, self.ssh.execute.mock_calls)
+        self.assertEqual([mock.call(1), mock.call(1)],
+                         mock_time.sleep.mock_calls)
+
+    @mock.patch("rally.common.sshutils.time")
+    def test_wait_backoff(self, mock_time):
+        mock_time.time.side_effect = [1, 2, 3, 4, 5]
+        self.ssh.execute = mock.Mock(side_effect=[exceptions.SSHError] * 4
+                                     + [0])
+        self.ssh.wait(interval=1, max_interval=5)
+        self.assertEqual([mock.call(1), mock.call(2), mock.call(4),
+                          mock.call(5)],
+                         mock_time.sleep.mock_calls)
+
+
+class SSHConnectionPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SSHConnectionPoolTestCase, self).setUp()
+        self.pool = sshutils.SSHConnectionPool()
+        self.ssh = sshutils.SSH("root", "example.net", pool=self.pool)
+        self.ssh._connect = mock.Mock(
+            side_effect=lambda: mock.Mock(name="client"))
+
+    def test_get(self):
+        client = self.pool.get(self.ssh)
+        self.ssh._connect.assert_called_once_with()
+
+        other = sshutils.SSH("root", "example.net", pool=self.pool)
+        self.assertEqual(client, self.pool.get(other))
+        self.assertEqual(client, self.pool.get(self.ssh))
+        self.ssh._connect.assert_called_once_with()
+
+    def test_get_different_credentials(self):
+        other = sshutils.SSH("root", "example.net", password="secret",
+                             pool=self.pool)
+        other._connect = mock.Mock()
+
+        self.assertNotEqual(self.pool.get(self.ssh), self.pool.get(other))
+        self.ssh._connect.assert_called_once_with()
+        other._connect.assert_called_once_with()
+
+    def test_get_reconnect(self):
+        client = self.pool.get(self.ssh)
+        client.get_transport.return_value.is_active.return_value = False
+
+        new_client = self.pool.get(self.ssh)
+
+        self.assertNotEqual(client, new_client)
+        client.close.assert_called_once_with()
+        self.assertEqual(2, self.ssh._connect.call_count)
+
+    def test_get_connect_failed(self):
+        self.ssh._connect.side_effect = exceptions.SSHError
+
+        self.assertRaises(exceptions.SSHError, self.pool.get, self.ssh)
+        self.assertEqual({}, self.pool._users)
+        self.assertEqual({}, self.pool._locks)
+
+    @mock.patch("rally.common.sshutils.time")
+    def test_get_close_idle(self, mock_time):
+        pool = sshutils.SSHConnectionPool(max_idle=10)
+        mock_time.time.side_effect = [0, 0, 0, 100, 100]
+        client = pool.get(self.ssh)
+        pool.release(self.ssh)
+
+        other = sshutils.SSH("root", "example.com")
+        other._connect = mock.Mock()
+        pool.get(other)
+
+        client.close.assert_called_once_with()
+        self.assertEqual([pool._key(other)], list(pool._clients))
+        self.assertEqual([pool._key(other)], list(pool._locks))
+
+    @mock.patch("rally.common.sshutils.time")
+    def test_get_skips_idle_client_in_use(self, mock_time):
+        pool = sshutils.SSHConnectionPool(max_idle=10)
+        mock_time.time.side_effect = [0, 0, 100, 100, 100, 200, 200]
+        client = pool.get(self.ssh)
+
+        other = sshutils.SSH("root", "example.com")
+        other._connect = mock.Mock()
+        pool.get(other)
+        self.assertFalse(client.close.called)
+        self.assertEqual(2, len(pool._clients))
+
+        pool.release(self.ssh)
+        pool.get(other)
+        client.close.assert_called_once_with()
+
+    def test_release(self):
+        key = self.pool._key(self.ssh)
+        self.pool.get(self.ssh)
+        self.pool.get(self.ssh)
+        self.assertEqual({key: 2}, self.pool._users)
+
+        self.pool.release(self.ssh)
+        self.assertEqual({key: 1}, self.pool._users)
+        self.pool.release(self.ssh)
+        self.assertEqual({}, self.pool._users)
+        self.assertIn(key, self.pool._clients)
+
+    def test_discard(self):
+        client = self.pool.get(self.ssh)
+        other = sshutils.SSH("root", "example.com", pool=self.pool)
+        other._connect = mock.Mock()
+        other_client = self.pool.get(other)
+        self.pool.release(self.ssh)
+        key = self.pool._key(self.ssh)
+        lock = mock.MagicMock()
+        self.pool._locks[key] = lock
+
+        self.pool.discard("example.net")
+
+        client.close.assert_called_once_with()
+        lock.__enter__.assert_called_once_with()
+        self.assertFalse(other_client.close.called)
+        self.assertNotIn(key, self.pool._locks)
+        self.assertNotEqual(client, self.pool.get(self.ssh))
+
+    def test_close(self):
+        client = self.pool.get(self.ssh)
+        self.pool.close()
+        client.close.assert_called_once_with()
+        self.assertEqual({}, self.pool._clients)
+        self.assertEqual({}, self.pool._users)
 
 
 @ddt.ddt
@@ -210,7 +371,9 @@ class SSHRunTestCase(test.TestCase):
     @mock.patch("rally.common.sshutils.select")
     def test_run(self, mock_select):
         mock_select.select.return_value = ([], [], [])
+        self.ssh._release_client = mock.Mock()
         self.assertEqual(0, self.ssh.run("cmd"))
+        self.ssh._release_client.assert_called_once_with()
 
     @mock.patch("rally.common.sshutils.select")
     def test_run_nonzero_status(self, mock_select):
@@ -265,7 +428,10 @@ class SSHRunTestCase(test.TestCase):
     def test_run_select_error(self, mock_select):
         self.fake_session.exit_status_ready.return_value = False
         mock_select.select.return_value = ([], [], [True])
+        self.ssh._release_client = mock.Mock()
         self.assertRaises(exceptions.SSHError, self.ssh.run, "cmd")
+        # client is released even if the command failed
+        self.ssh._release_client.assert_called_once_with()
 
     @mock.patch("rally.common.sshutils.time")
     @mock.patch("rally.common.sshutils.select")
@@ -291,11 +457,13 @@ class SSHRunTestCase(test.TestCase):
 
         mock_stat.return_value = os.stat_result([0o753] + [0] * 9)
 
+        self.ssh._release_client = mock.Mock()
         self.ssh._put_file_sftp("localfile", "remotefile")
 
         sftp.put.assert_called_once_with("localfile", "remotefile")
         mock_stat.assert_called_once_with("localfile")
         sftp.chmod.assert_called_once_with("remotefile", 0o753)
+        self.ssh._release_client.assert_called_once_with()
         sftp.__exit__.assert_called_once_with(None, None, None)
 
     def test__put_file_sftp_mode(self):
@@ -316,3 +484,71 @@ class SSHRunTestCase(test.TestCase):
         self.ssh.put_file("foo", "bar", 42)
         self.ssh._put_file_sftp.assert_called_once_with("foo", "bar", mode=42)
         self.ssh._put_file_shell.assert_called_once_with("foo", "bar", mode=42)
+
+
+class SSHFanOutTestCase(test.TestCase):
+
+    def _ssh(self, host, **kwargs):
+        ssh = mock.Mock(host=host)
+        ssh.execute.return_value = (0, "%s_out" % host, "")
+        for attr, value in kwargs.items():
+            setattr(getattr(ssh, attr), "side_effect", value)
+        return ssh
+
+    def test_execute(self):
+        clients = [self._ssh("foo"),
+                   self._ssh("bar", execute=exceptions.SSHError("err")),
+                   self._ssh("baz")]
+        fan_out = sshutils.SSHFanOut(clients, workers=2)
+
+        results = fan_out.execute("cmd", stdin="data", timeout=10)
+
+        self.assertEqual(["foo", "bar", "baz"], [r["host"] for r in results])
+        self.assertEqual({"host": "foo", "error": None, "exit_status": 0,
+                          "stdout": "foo_out", "stderr": "",
+                          "duration": mock.ANY}, results[0])
+        self.assertEqual({"host": "bar", "error": "SSHError: err",
+                          "duration": mock.ANY}, results[1])
+        self.assertIsNone(results[2]["error"])
+        for ssh in clients:
+            ssh.execute.assert_called_once_with("cmd", stdin="data",
+                                                timeout=10)
+
+    def test_execute_stdin_file(self):
+        clients = [self._ssh("foo"), self._ssh("bar")]
+        stdin = mock.Mock()
+        stdin.read.return_value = b"data"
+
+        sshutils.SSHFanOut(clients).execute("cmd", stdin=stdin)
+
+        stdin.read.assert_called_once_with()
+        for ssh in clients:
+            sent = ssh.execute.call_args[1]["stdin"]
+            self.assertEqual(b"data", sent.read())
+        self.assertIsNot(clients[0].execute.call_args[1]["stdin"],
+                         clients[1].execute.call_args[1]["stdin"])
+
+    def test_execute_no_hosts(self):
+        self.assertEqual([], sshutils.SSHFanOut([]).execute("cmd"))
+
+    def test_put_file(self):
+        clients = [self._ssh("foo"),
+                   self._ssh("bar", put_file=exceptions.SSHError("err"))]
+        results = sshutils.SSHFanOut(clients).put_file("foo", "bar", 0o755)
+
+        self.assertEqual([{"host": "foo", "error": None,
+                           "duration": mock.ANY},
+                          {"host": "bar", "error": "SSHError: err",
+                           "duration": mock.ANY}], results)
+        for ssh in clients:
+            ssh.put_file.assert_called_once_with("foo", "bar", mode=0o755)
+
+    def test_wait(self):
+        clients = [self._ssh("foo"),
+                   self._ssh("bar", wait=exceptions.SSHTimeout("timeout"))]
+        results = sshutils.SSHFanOut(clients).wait(10, 2, max_interval=4)
+
+        self.assertEqual([None, "SSHTimeout: timeout"],
+                         [r["error"] for r in results])
+        for ssh in clients:
+            ssh.wait.assert_called_once_with(10, 2, max_interval=4)
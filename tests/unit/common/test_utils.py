@@ -14,6 +14,7 @@
 
 from __future__ import print_function
 import collections
+import random
 import string
 import sys
 import threading
@@ -225,9 +226,9 @@ class RandomNameTestCase(test.TestCase):
     @ddt.data(
         {},
         {"task_id": "fake-task"},
-        {"task_id": "2short", "expected": "s_rally_blargles_dweebled"},
+        {"task_id": "2short", "expected": "s_rally_%s_blargles"},
         {"task_id": "fake!task",
-         "expected": "s_rally_blargles_dweebled"},
+         "expected": "s_rally_%s_blargles"},
         {"fmt": "XXXX-test-XXX-test",
          "expected": "fake-test-bla-test"})
     @ddt.unpack
@@ -235,6 +236,14 @@ class RandomNameTestCase(test.TestCase):
     def test_generate_random_name(self, mock_choice, task_id="faketask",
                                   expected="s_rally_faketask_blargles",
                                   fmt="s_rally_XXXXXXXX_XXXXXXXX"):
+        if "%s" in expected:
+            # task ID part is generated by pRNG seeded with task ID
+            rng = random.Random(task_id)
+            expected %= "".join(
+                rng.choice(utils.RandomNameGeneratorMixin
+                           .RESOURCE_NAME_ALLOWED_CHARACTERS)
+                for i in range(8))
+
         class FakeNameGenerator(utils.RandomNameGeneratorMixin):
             RESOURCE_NAME_FORMAT = fmt
             task = {"uuid": task_id}
@@ -315,56 +324,112 @@ class RandomNameTestCase(test.TestCase):
                 {"name": name, "fmt": fmt, "exact": exact})
 
     def test_name_matches_object(self):
-        name = "foo"
-        obj = mock.Mock()
-        self.assertTrue(utils.name_matches_object(name, obj))
-        obj.name_matches_object.assert_called_once_with(name)
-
-    def test_name_matches_object_kwargs(self):
-        name = "foo"
-        obj = mock.Mock()
-        self.assertTrue(utils.name_matches_object(name, obj, task_id="taskid",
-                                                  exact=False))
-        obj.name_matches_object.assert_called_once_with(name, task_id="taskid",
-                                                        exact=False)
-
-    def test_name_matches_object_identical_list(self):
         class One(utils.RandomNameGeneratorMixin):
-            name_matches_object = mock.Mock(return_value=False)
+            pass
 
         class Two(utils.RandomNameGeneratorMixin):
-            name_matches_object = mock.Mock(return_value=False)
+            RESOURCE_NAME_FORMAT = "foo_XXX_XXX"
 
-        name = "foo"
-        self.assertFalse(utils.name_matches_object(name, One, Two))
-        # ensure that exactly one of the two objects is checked
-        self.assertItemsEqual(
-            One.name_matches_object.call_args_list +
-            Two.name_matches_object.call_args_list,
-            [mock.call(name)])
+        class Three(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "bar_XXX_XXX"
+            RESOURCE_NAME_ALLOWED_CHARACTERS = "abcdef"
 
-    def test_name_matches_object_differing_list(self):
+        self.assertTrue(utils.name_matches_object("foo_abc_123", One, Two))
+        self.assertTrue(utils.name_matches_object("bar_abc_fed", Three))
+        self.assertTrue(utils.name_matches_object(
+            "rally_abcd1234_abcdefgh", One(), Two))
+        self.assertFalse(utils.name_matches_object("bar_abc_123", One, Three))
+        self.assertFalse(utils.name_matches_object("foo_abc_123"))
+
+    def test_name_matches_object_kwargs(self):
+        class One(utils.RandomNameGeneratorMixin):
+            pass
+
+        self.assertTrue(utils.name_matches_object(
+            "rally_abcd1234_abcdefgh-1", One, task_id="abcd-1234",
+            exact=False))
+        self.assertFalse(utils.name_matches_object(
+            "rally_abcd1234_abcdefgh-1", One, task_id="abcd-1234"))
+        self.assertFalse(utils.name_matches_object(
+            "rally_abcd1235_abcdefgh-1", One, task_id="abcd-1234",
+            exact=False))
+
+    @mock.patch.dict("rally.common.utils._name_matchers", clear=True)
+    @mock.patch("rally.common.utils.NameMatcher")
+    def test_name_matches_object_caches_matcher(self, mock_name_matcher):
         class One(utils.RandomNameGeneratorMixin):
-            name_matches_object = mock.Mock(return_value=False)
+            RESOURCE_NAME_FORMAT = "cached_XXX_XXX"
 
         class Two(utils.RandomNameGeneratorMixin):
-            RESOURCE_NAME_FORMAT = "foo_XXX_XXX"
-            name_matches_object = mock.Mock(return_value=False)
+            RESOURCE_NAME_FORMAT = "cached_XXX_XXX"
+
+        for name in ("foo", "bar"):
+            utils.name_matches_object(name, One)
+            One.name_matches_object(name)
+        utils.name_matches_object("foo", Two)
+        utils.name_matches_object("foo", One, task_id="abc")
+        utils.name_matches_object("foo", One, exact=False)
+
+        self.assertEqual([mock.call((One,), exact=True),
+                          mock.call((One,), exact=False)],
+                         mock_name_matcher.call_args_list)
+        match = mock_name_matcher.return_value.match
+        self.assertEqual(7, match.call_count)
+        self.assertEqual(mock.call("foo", task_id="abc"),
+                         match.call_args_list[5])
+
+    def test_name_matcher_match_task_id(self):
+        class One(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "rally_XXXX_XXXXXXXX"
 
-        class Three(utils.RandomNameGeneratorMixin):
-            RESOURCE_NAME_ALLOWED_CHARACTERS = "12345"
-            name_matches_object = mock.Mock(return_value=False)
+        class Two(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "rally_XXXXXXXX_XXXX"
+
+        matcher = utils.NameMatcher([One, Two], exact=False)
+
+        self.assertTrue(matcher.match("rally_abcd_1234efgh"))
+        self.assertTrue(matcher.match("rally_abcd_1234efgh",
+                                      task_id="abcd-0000"))
+        self.assertFalse(matcher.match("rally_abcd_1234efgh",
+                                       task_id="dcba-0000"))
+        # the name matches the second format only
+        self.assertTrue(matcher.match("rally_abcd1234_efgh",
+                                      task_id="abcd-1234"))
+        self.assertFalse(matcher.match("foo_abcd_1234efgh",
+                                       task_id="abcd-0000"))
+
+    def test_name_matcher(self):
+        class One(utils.RandomNameGeneratorMixin):
+            pass
 
-        class Four(utils.RandomNameGeneratorMixin):
-            RESOURCE_NAME_FORMAT = "bar_XXX_XXX"
-            RESOURCE_NAME_ALLOWED_CHARACTERS = "abcdef"
-            name_matches_object = mock.Mock(return_value=False)
+        class Two(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "s_rally_XXXXXXXX_XXXXXXXX"
 
-        classes = (One, Two, Three, Four)
-        name = "foo"
-        self.assertFalse(utils.name_matches_object(name, *classes))
-        for cls in classes:
-            cls.name_matches_object.assert_called_once_with(name)
+        class Three(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "foo-XXXX-XXX"
+            RESOURCE_NAME_ALLOWED_CHARACTERS = "abcdef0123456789"
+
+        matcher = utils.NameMatcher([One, Two, One(), Three])
+
+        self.assertEqual([One, Two, Three], matcher.objects)
+        self.assertTrue(matcher.match("rally_abcd1234_abcdefgh"))
+        self.assertEqual("abcd1234",
+                         matcher.get_task_id_part("rally_abcd1234_abcdefgh"))
+        self.assertEqual("abcd1234", matcher.get_task_id_part(
+            "s_rally_abcd1234_abcdefgh"))
+        self.assertEqual("ab12", matcher.get_task_id_part("foo-ab12-fed"))
+        self.assertFalse(matcher.match("foo-AB12-fed"))
+        self.assertIsNone(matcher.get_task_id_part("foo-AB12-fed"))
+        self.assertIsNone(matcher.get_task_id_part("rally_abcd1234_"))
+
+        self.assertEqual(set(["abcd1234", "abcd"]),
+                         matcher.get_task_id_parts("abcd-1234-5678"))
+
+    def test_name_matcher_without_objects(self):
+        matcher = utils.NameMatcher([])
+        self.assertFalse(matcher.match("rally_abcd1234_abcdefgh"))
+        self.assertIsNone(
+            matcher.get_task_id_part("rally_abcd1234_abcdefgh"))
 
     def test_cls_name_matches_object_identity(self):
         generator = utils.RandomNameGeneratorMixin()
@@ -401,6 +466,19 @@ class RandomNameTestCase(test.TestCase):
         task_id_parts = set([n.split("_")[0] for n in names])
         self.assertEqual(len(task_id_parts), 1)
 
+    @mock.patch("random.seed")
+    def test_task_id_part_does_not_reseed_random(self, mock_seed):
+        class FakeNameGenerator(utils.RandomNameGeneratorMixin):
+            RESOURCE_NAME_FORMAT = "XXXXXXXX_XXXXXXXX"
+
+        generator = FakeNameGenerator()
+        generator.task = {"uuid": "bogus! task! id!"}
+
+        name = generator.generate_random_name()
+        self.assertTrue(generator.name_matches_object(
+            name, task_id="bogus! task! id!"))
+        self.assertFalse(mock_seed.called)
+
 
 @ddt.ddt
 class MergeTestCase(test.TestCase):
@@ -363,6 +363,32 @@ class LxcProviderTestCase(test.TestCase):
         self.assertEqual(host1_calls, fake_hosts[0].mock_calls)
         self.assertEqual(host2_calls, fake_hosts[1].mock_calls)
 
+    @mock.patch(MOD_NAME + "LxcProvider.destroy_servers")
+    @mock.patch(MOD_NAME + "LxcHost")
+    @mock.patch(MOD_NAME + "provider.ProviderFactory.get_provider")
+    def test_create_servers_host_fails(self,
+                                       mock_provider_factory_get_provider,
+                                       mock_lxc_host,
+                                       mock_lxc_provider_destroy_servers):
+        self.config["workers"] = 1
+        mock_provider_factory_get_provider.return_value.create_servers.\
+            return_value = ["server1", "server2"]
+        fake_hosts = mock_lxc_host.side_effect = [mock.Mock(), mock.Mock()]
+        for host in fake_hosts:
+            host._port_cache = {1: 2}
+            host.get_server_objects.return_value = []
+        fake_hosts[1].create_container.side_effect = RuntimeError("Failed")
+        self.provider.resources = mock.Mock()
+
+        e = self.assertRaises(RuntimeError, self.provider.create_servers)
+
+        self.assertEqual("Failed", str(e))
+        self.assertEqual(1, self.provider.resources.create.call_count)
+        fake_hosts[1].destroy_containers.assert_called_once_with()
+        fake_hosts[1].delete_tunnels.assert_called_once_with()
+        self.assertFalse(fake_hosts[1].start_containers.called)
+        mock_lxc_provider_destroy_servers.assert_called_once_with()
+
     @mock.patch(MOD_NAME + "LxcHost")
     @mock.patch(MOD_NAME + "provider.Server.from_credentials")
     def test_destroy_servers(self, mock_server_from_credentials,
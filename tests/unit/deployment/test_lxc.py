@@ -188,6 +188,62 @@ class LxcEngineTestCase(test.TestCase):
                 self.assertEqual([mock.call.ssh.run("/bin/sh -e", stdin="fs")],
                                  container.mock_calls)
 
+    @mock.patch(MOD + "LxcEngine.cleanup")
+    @mock.patch(MOD + "lxc.LxcHost")
+    @mock.patch(MOD + "LxcEngine._deploy_first")
+    @mock.patch(MOD + "LxcEngine._get_provider")
+    def test_deploy_host_fails(self, mock__get_provider, mock__deploy_first,
+                               mock_lxc_host, mock_lxc_engine_cleanup):
+        self.config["workers"] = 1
+        fake_servers = [mock.Mock(), mock.Mock()]
+        mock__get_provider.return_value.create_servers.return_value = (
+            fake_servers)
+        fake_hosts = mock_lxc_host.side_effect = [mock.Mock(), mock.Mock()]
+        for host in fake_hosts:
+            host._port_cache = {1: 2}
+        fake_hosts[1].start_containers.side_effect = RuntimeError("Failed")
+        fake_deployment = mock.MagicMock()
+
+        with mock.patch.object(self.engine, "deployment", fake_deployment):
+            self.assertRaises(RuntimeError, self.engine.deploy)
+
+        # only succeeded host is stored, containers of failed one are
+        # destroyed immediately
+        fake_deployment.add_resource.assert_called_once_with(
+            provider_name="LxcEngine",
+            info={"host": fake_servers[0].get_credentials.return_value,
+                  "containers": fake_hosts[0].containers,
+                  "forwarded_ports": mock.ANY,
+                  "config": {"network": "10.128.128.0/28",
+                             "tunnel_to": ["1.1.1.1", "2.2.2.2"]}})
+        fake_hosts[1].destroy_containers.assert_called_once_with()
+        fake_hosts[1].delete_tunnels.assert_called_once_with()
+        self.assertFalse(fake_hosts[0].destroy_containers.called)
+        mock_lxc_engine_cleanup.assert_called_once_with()
+        self.assertFalse(fake_hosts[0].get_server_objects.called)
+
+    @mock.patch(MOD + "open", create=True)
+    @mock.patch(MOD + "LxcEngine.cleanup")
+    @mock.patch(MOD + "lxc.LxcHost")
+    @mock.patch(MOD + "LxcEngine._deploy_first")
+    @mock.patch(MOD + "LxcEngine._get_provider")
+    def test_deploy_start_script_fails(
+            self, mock__get_provider, mock__deploy_first, mock_lxc_host,
+            mock_lxc_engine_cleanup, mock_open):
+        mock__get_provider.return_value.create_servers.return_value = [
+            mock.Mock()]
+        fake_host = mock_lxc_host.return_value
+        fake_host._port_cache = {}
+        fake_containers = [mock.Mock(), mock.Mock()]
+        fake_containers[1].ssh.run.side_effect = RuntimeError("Failed")
+        fake_host.get_server_objects.return_value = fake_containers
+
+        with mock.patch.object(self.engine, "deployment"):
+            e = self.assertRaises(RuntimeError, self.engine.deploy)
+
+        self.assertEqual("Failed", str(e))
+        mock_lxc_engine_cleanup.assert_called_once_with()
+
     @mock.patch(MOD + "LxcEngine._get_provider")
     @mock.patch(MOD + "lxc.LxcHost")
     @mock.patch(MOD + "provider.Server.from_credentials")
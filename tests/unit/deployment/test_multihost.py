@@ -98,9 +98,43 @@ class MultihostEngineTestCase(test.TestCase):
             mock.call(self.config["nodes"][1]),
         ]
         self.assertEqual(expected, mock__update_controller_ip.mock_calls)
+        # controller goes first, nodes are deployed concurrently
+        self.assertEqual(mock.call(self.config["controller"]),
+                         mock__deploy_node.mock_calls[0])
+        self.assertEqual(3, mock__deploy_node.call_count)
+        for call in expected:
+            self.assertIn(call, mock__deploy_node.mock_calls[1:])
+        self.assertEqual([mock__deploy_node.return_value[0]] * 2,
+                         self.engine.nodes)
         self.deployment.update_status.assert_called_once_with(
             consts._DeployStatus.DEPLOY_SUBDEPLOY)
 
+    @mock.patch(MOD + "MultihostEngine.cleanup")
+    @mock.patch(MOD + "MultihostEngine._deploy_node")
+    def test_deploy_node_fails(self, mock__deploy_node,
+                               mock_multihost_engine_cleanup):
+        fake_credentials = [mock.Mock(auth_url="http://h1.net")]
+        error = RuntimeError("Node failed")
+        mock__deploy_node.side_effect = [(mock.Mock(), fake_credentials),
+                                         ("node1", None), error]
+        self.config["workers"] = 1
+
+        self.assertRaises(RuntimeError, self.engine.deploy)
+        self.assertEqual(3, mock__deploy_node.call_count)
+        mock_multihost_engine_cleanup.assert_called_once_with()
+
+    @mock.patch(MOD + "MultihostEngine.cleanup")
+    @mock.patch(MOD + "MultihostEngine._deploy_node")
+    def test_deploy_controller_fails(self, mock__deploy_node,
+                                     mock_multihost_engine_cleanup):
+        mock__deploy_node.side_effect = RuntimeError("Controller failed")
+        mock_multihost_engine_cleanup.side_effect = RuntimeError("Failed")
+
+        e = self.assertRaises(RuntimeError, self.engine.deploy)
+        self.assertEqual("Controller failed", str(e))
+        mock__deploy_node.assert_called_once_with(self.config["controller"])
+        mock_multihost_engine_cleanup.assert_called_once_with()
+
     @mock.patch("rally.api")
     @mock.patch(MOD + "db")
     def test_cleanup(self, mock_db, mock_api):
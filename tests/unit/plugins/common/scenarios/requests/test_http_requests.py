@@ -26,7 +26,8 @@ class RequestScenarioTestCase(test.TestCase):
         Requests = http_requests.HttpRequestsCheckRequest(
             test.get_test_context())
         Requests.run("sample_url", "GET", 200)
-        mock__check_request.assert_called_once_with("sample_url", "GET", 200)
+        mock__check_request.assert_called_once_with("sample_url", "GET", 200,
+                                                    keep_alive=False)
 
     @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
     @mock.patch("%s.requests.http_requests.random.choice" % SCN)
@@ -38,4 +39,57 @@ class RequestScenarioTestCase(test.TestCase):
                      requests=[{"url": "sample_url"}])
         mock_choice.assert_called_once_with([{"url": "sample_url"}])
         mock__check_request.assert_called_once_with(
-            status_code=200, url="sample_url")
+            status_code=200, url="sample_url", keep_alive=False)
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_request" % SCN)
+    @mock.patch("%s.requests.http_requests.random.choice" % SCN)
+    def test_check_random_request_keep_alive(self, mock_choice,
+                                             mock__check_request):
+        requests = [{"url": "sample_url", "status_code": 201}]
+        mock_choice.return_value = requests[0]
+        Requests = http_requests.HttpRequestsCheckRandomRequest(
+            test.get_test_context())
+        Requests.run(status_code=200, requests=requests, keep_alive=True)
+        mock__check_request.assert_called_once_with(
+            status_code=201, url="sample_url", keep_alive=True)
+        self.assertEqual([{"url": "sample_url", "status_code": 201}],
+                         requests)
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_request_batch"
+                % SCN)
+    def test_check_request_batch(self, mock__check_request_batch):
+        timings = {"connect": 0.1, "ttfb": 0.2, "transfer": 0.3}
+        mock__check_request_batch.return_value = [dict(timings, error=None),
+                                                  dict(timings, error=None)]
+        scenario = http_requests.HttpRequestsCheckRequestBatch(
+            test.get_test_context())
+
+        scenario.run("sample_url", "GET", 200, requests_count=2,
+                     concurrency=2, timeout=3)
+
+        mock__check_request_batch.assert_called_once_with(
+            "sample_url", "GET", 200, 2, 2, timeout=3)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "requests.check_request_batch")
+        output = scenario._output["additive"]
+        self.assertEqual(["Requests", "Request phases",
+                          "Requests per second"],
+                         [o["title"] for o in output])
+        self.assertEqual([["succeeded", 2], ["failed", 0]],
+                         output[0]["data"])
+        self.assertEqual(["connect", "ttfb", "transfer"],
+                         [p[0] for p in output[1]["data"]])
+
+    @mock.patch("%s.requests.utils.RequestScenario._check_request_batch"
+                % SCN)
+    def test_check_request_batch_fails(self, mock__check_request_batch):
+        mock__check_request_batch.return_value = [{"error": "foo"},
+                                                  {"error": "bar"}]
+        scenario = http_requests.HttpRequestsCheckRequestBatch(
+            test.get_test_context())
+
+        self.assertRaises(ValueError, scenario.run, "sample_url", "GET", 200)
+        output = scenario._output["additive"]
+        self.assertEqual([["succeeded", 0], ["failed", 2]],
+                         output[0]["data"])
+        self.assertNotIn("Request phases", [o["title"] for o in output])
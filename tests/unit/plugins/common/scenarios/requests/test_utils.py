@@ -12,27 +12,141 @@
 
 
 import mock
+import requests
 
 from rally.plugins.common.scenarios.requests import utils
+from rally.task import atomic
 from tests.unit import test
 
 
+UTILS = "rally.plugins.common.scenarios.requests.utils"
+
+
+class SessionTestCase(test.TestCase):
+
+    def test_new_session(self):
+        session = utils.new_session(pool_size=3)
+        for prefix in ("http://", "https://"):
+            adapter = session.get_adapter(prefix + "example.com")
+            self.assertIsInstance(adapter, utils.TimedHTTPAdapter)
+            self.assertEqual(3, adapter._pool_maxsize)
+
+    def test_timed_adapter_get_connection(self):
+        adapter = utils.TimedHTTPAdapter()
+        self.assertEqual(
+            utils._TimedHTTPConnection,
+            adapter.get_connection("http://example.com").ConnectionCls)
+        self.assertEqual(
+            utils._TimedHTTPSConnection,
+            adapter.get_connection("https://example.com").ConnectionCls)
+
+    def test_timed_connection(self):
+        class Connection(object):
+            connect = mock.Mock()
+
+        class TimedConnection(utils._TimedConnectionMixin, Connection):
+            pass
+
+        utils._local.connect_duration = 0
+        TimedConnection().connect()
+
+        Connection.connect.assert_called_once_with()
+        self.assertGreaterEqual(utils._local.connect_duration, 0)
+
+    def test_get_session(self):
+        session = utils.get_session()
+        self.assertIsInstance(session, requests.Session)
+        self.assertIs(session, utils.get_session())
+
+    @mock.patch("%s.time.time" % UTILS, side_effect=[1, 4, 10])
+    def test_send_request(self, mock_time):
+        session = mock.Mock()
+
+        def request(*args, **kwargs):
+            utils._local.connect_duration = 1
+            return session.response
+
+        session.request.side_effect = request
+
+        resp, timings = utils.send_request(session, "GET", "http://foo",
+                                           timeout=3)
+
+        self.assertEqual(session.response, resp)
+        self.assertEqual({"connect": 1, "ttfb": 2, "transfer": 6}, timings)
+        session.request.assert_called_once_with("GET", "http://foo",
+                                                stream=True, timeout=3)
+
+
 class RequestsTestCase(test.TestCase):
 
-    @mock.patch("requests.request")
-    def test__check_request(self, mock_request):
-        mock_request.return_value = mock.MagicMock(status_code=200)
+    @mock.patch("%s.send_request" % UTILS)
+    @mock.patch("%s.new_session" % UTILS)
+    def test__check_request(self, mock_new_session, mock_send_request):
+        mock_send_request.return_value = (
+            mock.Mock(status_code=200),
+            {"connect": 0.1, "ttfb": 0.2, "transfer": 0.3})
         scenario = utils.RequestScenario(test.get_test_context())
         scenario._check_request(status_code=200, url="sample", method="GET")
 
+        session = mock_new_session.return_value.__enter__.return_value
+        mock_send_request.assert_called_once_with(session, "GET", "sample")
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "requests.check_request")
-        mock_request.assert_called_once_with("GET", "sample")
+        durations = atomic.flatten_atomic_actions(scenario.atomic_actions(),
+                                                  nested=True)
+        self.assertEqual(
+            ["requests.check_request", "requests.check_request > "
+             "requests.connect", "requests.check_request > requests.ttfb",
+             "requests.check_request > requests.transfer"], list(durations))
+        self.assertAlmostEqual(
+            0.2, durations["requests.check_request > requests.ttfb"])
 
-    @mock.patch("requests.request")
-    def test_check_wrong_request(self, mock_request):
-        mock_request.return_value = mock.MagicMock(status_code=200)
+    @mock.patch("%s.send_request" % UTILS)
+    @mock.patch("%s.get_session" % UTILS)
+    def test__check_request_keep_alive(self, mock_get_session,
+                                       mock_send_request):
+        mock_send_request.return_value = (
+            mock.Mock(status_code=200),
+            {"connect": 0, "ttfb": 0.2, "transfer": 0.3})
+        scenario = utils.RequestScenario(test.get_test_context())
+        scenario._check_request(status_code=200, url="sample", method="GET",
+                                keep_alive=True, timeout=3)
+
+        mock_send_request.assert_called_once_with(
+            mock_get_session.return_value, "GET", "sample", timeout=3)
+
+    @mock.patch("%s.send_request" % UTILS)
+    @mock.patch("%s.new_session" % UTILS)
+    def test_check_wrong_request(self, mock_new_session, mock_send_request):
+        mock_send_request.return_value = (
+            mock.Mock(status_code=200),
+            {"connect": 0.1, "ttfb": 0.2, "transfer": 0.3})
         scenario = utils.RequestScenario(test.get_test_context())
 
         self.assertRaises(ValueError, scenario._check_request,
                           status_code=201, url="sample", method="GET")
+
+    @mock.patch("%s.send_request" % UTILS)
+    @mock.patch("%s.new_session" % UTILS)
+    def test__check_request_batch(self, mock_new_session, mock_send_request):
+        timings = {"connect": 0.1, "ttfb": 0.2, "transfer": 0.3}
+        mock_send_request.side_effect = [
+            (mock.Mock(status_code=200), timings),
+            (mock.Mock(status_code=500), timings),
+            requests.ConnectionError("refused")]
+        scenario = utils.RequestScenario(test.get_test_context())
+
+        results = scenario._check_request_batch("sample", "GET", 200,
+                                                requests_count=3,
+                                                concurrency=1, timeout=3)
+
+        expected_ok = dict(timings, error=None)
+        self.assertEqual(3, len(results))
+        self.assertEqual(expected_ok, results[0])
+        self.assertIn("`500`", results[1]["error"])
+        self.assertEqual({"error": "ConnectionError: refused"}, results[2])
+        mock_new_session.assert_called_once_with(pool_size=1)
+        mock_new_session.return_value.close.assert_called_once_with()
+        mock_send_request.assert_has_calls(
+            [mock.call(mock_new_session.return_value, "GET", "sample",
+                       timeout=3)] * 3)
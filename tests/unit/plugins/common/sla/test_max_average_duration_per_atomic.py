@@ -64,6 +64,21 @@ class MaxAverageDurationPerAtomicTestCase(test.TestCase):
         # bring it back
         self.assertTrue(add({"atomic_actions": {"a1": 1.0, "a2": 2.0}}))
 
+    def test_add_iteration_nested(self):
+        sla = madpa.MaxAverageDurationPerAtomic({"a1": 5, "a1 > a2": 2})
+        iteration = {"atomic_actions": [
+            {"name": "a1", "started_at": 0, "finished_at": 2, "children": [
+                {"name": "a2", "started_at": 0, "finished_at": 1.5,
+                 "children": []}]},
+            {"name": "a1", "started_at": 2, "finished_at": 3, "children": [
+                {"name": "a2", "started_at": 2, "finished_at": 2.5,
+                 "children": []}]}]}
+        self.assertTrue(sla.add_iteration(iteration))
+        self.assertEqual({"a1": 3, "a1 > a2": 2}, sla.avg_by_action)
+
+        iteration["atomic_actions"][0]["children"][0]["finished_at"] = 2
+        self.assertFalse(sla.add_iteration(iteration))
+
     @ddt.data([[1.0, 2.0, 1.5, 4.3],
                [2.1, 3.4, 1.2, 6.3, 7.2, 7.0, 1.],
                [1.1, 1.1, 2.2, 2.2, 3.3, 4.3]])
@@ -32,6 +32,16 @@ class ResourceDecoratorTestCase(test.TestCase):
 
         self.assertEqual(Fake._service, "service")
         self.assertEqual(Fake._resource, "res")
+        self.assertEqual((), Fake._depends_on)
+        self.assertFalse(Fake._bulk_deletion_check)
+
+    def test_resource_depends_on(self):
+
+        @base.resource("service", "res", depends_on=["nova", "heat.stacks"])
+        class Fake(object):
+            pass
+
+        self.assertEqual(("nova", "heat.stacks"), Fake._depends_on)
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -15,8 +15,10 @@
 
 import mock
 
+from rally.common import utils
 from rally.plugins.openstack.cleanup import base
 from rally.plugins.openstack.cleanup import manager
+from rally.plugins.openstack.cleanup import resources
 from tests.unit import test
 
 
@@ -161,6 +163,77 @@ class SeekAndDestroyTestCase(test.TestCase):
         self.assertEqual(5, mock_log.warning.call_count)
         self.assertEqual(4, mock_log.exception.call_count)
 
+    @mock.patch("%s.LOG" % BASE)
+    def test__delete_single_resource_bulk_deletion_check(self, mock_log):
+        mock_mgr = mock.MagicMock(_bulk_deletion_check=True)
+        mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
+                                       _interval=0.01, tenant_uuid="t1")
+        mock_resource.id.return_value = "r1"
+        destroyer = manager.SeekAndDestroy(mock_mgr, None, None)
+
+        destroyer._delete_single_resource(mock_resource)
+
+        mock_resource.delete.assert_called_once_with()
+        self.assertFalse(mock_resource.is_deleted.called)
+        self.assertEqual({"t1": {"r1": (mock_resource, mock.ANY)}},
+                         destroyer._pending)
+        self.assertEqual(1, destroyer.api_calls)
+        self.assertFalse(mock_log.warning.called)
+
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    @mock.patch("%s.LOG" % BASE)
+    def test__confirm_deletions(self, mock_log, mock_interruptable_sleep):
+        mock_mgr = mock.MagicMock(_interval=1)
+        mock_mgr.return_value.list.side_effect = [["r1", "r2", "r3"],
+                                                  ["r2", "r3"], ["r3"]]
+        mock_mgr.return_value.id.side_effect = lambda: (
+            mock_mgr.call_args[1]["resource"])
+        destroyer = manager.SeekAndDestroy(mock_mgr, None, None)
+        res = [mock.Mock(_timeout=100, tenant_uuid="t1") for i in range(3)]
+        now = manager.time.time()
+        destroyer._pending = {"t1": {"r1": (res[0], now),
+                                     "r2": (res[1], now)},
+                              "t2": {"r3": (res[2], now - 1000)}}
+        mock_mgr.reset_mock()
+
+        destroyer._confirm_deletions()
+
+        self.assertEqual({}, destroyer._pending)
+        self.assertEqual(3, destroyer.api_calls)
+        self.assertEqual(3, mock_mgr.return_value.list.call_count)
+        self.assertEqual(2, mock_interruptable_sleep.call_count)
+        # r3 was not deleted before timeout
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    @mock.patch("%s.SeekAndDestroy._wait_for_deletion" % BASE)
+    @mock.patch("%s.LOG" % BASE)
+    def test__confirm_deletions_list_failed(self, mock_log,
+                                            mock__wait_for_deletion,
+                                            mock_interruptable_sleep):
+        mock_mgr = mock.MagicMock(_interval=1, __name__="Test")
+        mock_mgr.return_value.list.side_effect = Exception
+        destroyer = manager.SeekAndDestroy(mock_mgr, None, None)
+        res = [mock.Mock(_timeout=100), mock.Mock(_timeout=100)]
+        destroyer._pending = {"t1": {"r1": (res[0], 0), "r2": (res[1], 0)}}
+
+        destroyer._confirm_deletions()
+
+        self.assertEqual({}, destroyer._pending)
+        mock__wait_for_deletion.assert_has_calls(
+            [mock.call(res[0]), mock.call(res[1])], any_order=True)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @mock.patch("%s.SeekAndDestroy._confirm_deletions" % BASE)
+    @mock.patch("%s.broker.run" % BASE)
+    def test_exterminate_confirms_deletions(self, mock_broker_run,
+                                            mock__confirm_deletions):
+        manager_cls = mock.MagicMock(_threads=5)
+        manager.SeekAndDestroy(manager_cls, None, None).exterminate()
+
+        self.assertTrue(mock_broker_run.called)
+        mock__confirm_deletions.assert_called_once_with()
+
     def _manager(self, list_side_effect, **kw):
         mock_mgr = mock.MagicMock()
         mock_mgr().list.side_effect = list_side_effect
@@ -336,6 +409,34 @@ class SeekAndDestroyTestCase(test.TestCase):
             mock__gen_consumer.return_value,
             consumers_count=5)
 
+        mock_broker_run.reset_mock()
+        manager.SeekAndDestroy(manager_cls, None, None).exterminate(3)
+        mock_broker_run.assert_called_once_with(
+            mock__gen_publisher.return_value,
+            mock__gen_consumer.return_value,
+            consumers_count=3)
+
+    @mock.patch("%s.SeekAndDestroy._gen_consumer" % BASE)
+    @mock.patch("%s.SeekAndDestroy._gen_publisher" % BASE)
+    @mock.patch("%s.broker.run" % BASE)
+    def test_exterminate_resources(self, mock_broker_run, mock__gen_publisher,
+                                   mock__gen_consumer):
+        manager_cls = mock.MagicMock(_threads=5)
+        manager.SeekAndDestroy(manager_cls, None, None).exterminate(
+            resources=["job1", "job2"])
+
+        self.assertFalse(mock__gen_publisher.called)
+        publisher = mock_broker_run.call_args[0][0]
+        queue = []
+        publisher(queue)
+        self.assertEqual(["job1", "job2"], queue)
+
+    @mock.patch("%s.SeekAndDestroy._gen_publisher" % BASE)
+    def test_list_resources(self, mock__gen_publisher):
+        mock__gen_publisher.return_value = lambda queue: queue.extend("ab")
+        destroyer = manager.SeekAndDestroy(mock.MagicMock(), None, None)
+        self.assertEqual(["a", "b"], destroyer.list_resources())
+
 
 class ResourceManagerTestCase(test.TestCase):
 
@@ -402,34 +503,32 @@ class ResourceManagerTestCase(test.TestCase):
                          manager.find_resource_managers(names=["fake"],
                                                         admin_required=False))
 
-    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.CleanupScheduler" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
-    def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy):
-        manager.cleanup(names=["a", "b"], admin_required=True,
-                        admin="admin", users=["user"])
+    def test_cleanup(self, mock_find_resource_managers,
+                     mock_cleanup_scheduler):
+        mock_cleanup_scheduler.return_value.run.return_value = {
+            "duration": 3, "api_calls": 5,
+            "resources": {"a.a": {"duration": 1, "api_calls": 2},
+                          "b.b": {"duration": 2, "api_calls": 3}}}
+        result = manager.cleanup(names=["a", "b"], admin_required=True,
+                                 admin="admin", users=["user"])
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
-
-        mock_seek_and_destroy.assert_has_calls([
-            mock.call(
-                mock_find_resource_managers.return_value[0], "admin",
-                ["user"], None
-            ),
-            mock.call().exterminate(),
-            mock.call(
-                mock_find_resource_managers.return_value[1], "admin",
-                ["user"], None
-            ),
-            mock.call().exterminate()
-        ])
-
-    @mock.patch("%s.SeekAndDestroy" % BASE)
+        mock_cleanup_scheduler.assert_called_once_with(
+            mock_find_resource_managers.return_value, "admin", ["user"],
+            None)
+        mock_cleanup_scheduler.return_value.run.assert_called_once_with()
+        self.assertEqual(mock_cleanup_scheduler.return_value.run.return_value,
+                         result)
+
+    @mock.patch("%s.CleanupScheduler" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     def test_cleanup_with_api_versions(self,
                                        mock_find_resource_managers,
-                                       mock_seek_and_destroy):
+                                       mock_cleanup_scheduler):
         manager.cleanup(names=["a", "b"], admin_required=True,
                         admin="admin", users=["user"],
                         api_versions={"cinder": {
@@ -437,18 +536,339 @@ class ResourceManagerTestCase(test.TestCase):
                         }})
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
+        mock_cleanup_scheduler.assert_called_once_with(
+            mock_find_resource_managers.return_value, "admin", ["user"],
+            {"cinder": {"service_type": "volume", "version": "1"}})
 
-        mock_seek_and_destroy.assert_has_calls([
-            mock.call(
-                mock_find_resource_managers.return_value[0], "admin",
-                ["user"],
-                {"cinder": {"service_type": "volume", "version": "1"}}
-            ),
-            mock.call().exterminate(),
-            mock.call(
-                mock_find_resource_managers.return_value[1], "admin",
-                ["user"],
-                {"cinder": {"service_type": "volume", "version": "1"}}
-            ),
-            mock.call().exterminate()
-        ])
+
+def _res_mgr(service, resource, order, depends_on=(), threads=5):
+    return type("%s_%s" % (service, resource), (object,),
+                {"_service": service, "_resource": resource,
+                 "_order": order, "_depends_on": tuple(depends_on),
+                 "_threads": threads})
+
+
+class GetDependenciesTestCase(test.TestCase):
+
+    def setUp(self):
+        super(GetDependenciesTestCase, self).setUp()
+        self.heat = _res_mgr("heat", "stacks", 100)
+        self.server = _res_mgr("nova", "servers", 200, ["heat"])
+        self.keypair = _res_mgr("nova", "keypairs", 201)
+        self.port = _res_mgr("neutron", "port", 300, ["nova.servers"])
+        self.network = _res_mgr("neutron", "network", 301)
+        self.swift = _res_mgr("swift", "object", 1000)
+        self.user = _res_mgr("keystone", "user", 9000, ["*"])
+        self.all = [self.heat, self.server, self.keypair, self.port,
+                    self.network, self.swift, self.user]
+
+    def test_get_dependencies(self):
+        deps = manager.get_dependencies(self.all, all_managers=self.all)
+
+        self.assertEqual(set(), deps[self.heat])
+        self.assertEqual({self.heat}, deps[self.server])
+        self.assertEqual({self.heat, self.server}, deps[self.keypair])
+        self.assertEqual({self.heat, self.server}, deps[self.port])
+        self.assertEqual({self.heat, self.server, self.port},
+                         deps[self.network])
+        self.assertEqual(set(), deps[self.swift])
+        self.assertEqual(set(self.all) - {self.user}, deps[self.user])
+
+    def test_get_dependencies_transitive(self):
+        selected = [self.heat, self.network, self.swift]
+        deps = manager.get_dependencies(selected, all_managers=self.all)
+
+        self.assertEqual({self.heat: set(), self.network: {self.heat},
+                          self.swift: set()}, deps)
+
+    def test_get_dependencies_of_resources(self):
+        mgrs = manager.find_resource_managers(
+            ["nova.servers", "nova.keypairs", "neutron", "cinder.volumes",
+             "swift", "glance", "keystone.user"])
+        deps = manager.get_dependencies(mgrs)
+
+        self.assertIn(resources.NovaServer, deps[resources.NeutronPort])
+        self.assertIn(resources.NeutronPort, deps[resources.NeutronRouter])
+        self.assertIn(resources.NeutronRouter, deps[resources.NeutronSubnet])
+        self.assertIn(resources.NeutronSubnet, deps[resources.NeutronNetwork])
+        self.assertIn(resources.NovaServer, deps[resources.CinderVolume])
+        self.assertIn(resources.NovaServer, deps[resources.GlanceImage])
+        self.assertEqual(set(), deps[resources.SwiftObject])
+        self.assertEqual(set(mgrs) - {resources.KeystoneUser},
+                         deps[resources.KeystoneUser])
+
+    def test_get_dependencies_on_servers(self):
+        mgrs = manager.find_resource_managers(
+            ["nova.servers", "manila", "sahara", "murano", "ironic"])
+        deps = manager.get_dependencies(mgrs)
+
+        for mgr in mgrs:
+            if mgr is not resources.NovaServer:
+                self.assertIn(resources.NovaServer, deps[mgr])
+
+    @mock.patch("%s.discover.itersubclasses" % BASE)
+    def test_get_dependencies_all_managers(self, mock_itersubclasses):
+        mixin = _res_mgr(None, None, 0)
+        mock_itersubclasses.return_value = self.all + [mixin]
+
+        deps = manager.get_dependencies([self.port])
+
+        mock_itersubclasses.assert_called_once_with(base.ResourceManager)
+        self.assertEqual({self.port: set()}, deps)
+
+
+class CleanupSchedulerTestCase(test.TestCase):
+
+    @mock.patch("%s.get_dependencies" % BASE)
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    def test_run(self, mock_seek_and_destroy, mock_get_dependencies):
+        first = _res_mgr("a", "first", 1, threads=30)
+        second = _res_mgr("a", "second", 2, threads=30)
+        independent = _res_mgr("b", "independent", 3, threads=30)
+        mock_get_dependencies.return_value = {first: set(),
+                                              second: {first},
+                                              independent: set()}
+
+        finished = []
+
+        def seek_and_destroy(manager_cls, admin, users, api_versions):
+            destroyer = mock.Mock(api_calls=2)
+            destroyer.exterminate.side_effect = (
+                lambda threads: finished.append(manager_cls))
+            return destroyer
+
+        mock_seek_and_destroy.side_effect = seek_and_destroy
+
+        scheduler = manager.CleanupScheduler(
+            [first, second, independent], "admin", ["user"],
+            api_versions="api_versions", threads=50)
+        result = scheduler.run()
+
+        mock_get_dependencies.assert_called_once_with(
+            [first, second, independent])
+        self.assertEqual(3, mock_seek_and_destroy.call_count)
+        mock_seek_and_destroy.assert_has_calls(
+            [mock.call(first, "admin", ["user"], "api_versions"),
+             mock.call(independent, "admin", ["user"], "api_versions"),
+             mock.call(second, "admin", ["user"], "api_versions")],
+            any_order=True)
+        self.assertLess(finished.index(first), finished.index(second))
+        self.assertEqual({"a.first", "a.second", "b.independent"},
+                         set(result["resources"]))
+        self.assertIn("duration", result)
+        self.assertEqual(6, result["api_calls"])
+        self.assertEqual(2, result["resources"]["a.first"]["api_calls"])
+        self.assertEqual(0, scheduler._busy_threads)
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    def test_run_threads_budget(self, mock_seek_and_destroy):
+        managers = [_res_mgr("s%s" % i, "r", i, threads=20)
+                    for i in range(3)]
+        running = []
+        max_running = []
+
+        def exterminate(threads):
+            self.assertEqual(10, threads)
+            running.append(threads)
+            max_running.append(len(running))
+            running.pop()
+
+        mock_seek_and_destroy.return_value.exterminate.side_effect = (
+            exterminate)
+        mock_seek_and_destroy.return_value.api_calls = 1
+
+        scheduler = manager.CleanupScheduler(managers, None, None, threads=10)
+        scheduler.dependencies = {mgr: set() for mgr in managers}
+        scheduler.run()
+
+        self.assertEqual([1, 1, 1], max_running)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    def test_run_failed(self, mock_seek_and_destroy, mock_log):
+        first = _res_mgr("a", "first", 1)
+        second = _res_mgr("a", "second", 2)
+        mock_seek_and_destroy.return_value.exterminate.side_effect = [
+            Exception("Oops"), None]
+        mock_seek_and_destroy.return_value.api_calls = 0
+
+        scheduler = manager.CleanupScheduler([first, second], None, None,
+                                             threads=10)
+        scheduler.dependencies = {first: set(), second: {first}}
+        result = scheduler.run()
+
+        self.assertEqual(2, mock_seek_and_destroy.call_count)
+        self.assertEqual(1, mock_log.warning.call_count)
+        self.assertEqual({"a.first", "a.second"}, set(result["resources"]))
+
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    def test_run_resources(self, mock_seek_and_destroy):
+        first = _res_mgr("a", "first", 1)
+        second = _res_mgr("a", "second", 2)
+        mock_seek_and_destroy.return_value.api_calls = 0
+
+        scheduler = manager.CleanupScheduler(
+            [first, second], None, None, threads=10,
+            resources={first: ["job"]})
+        scheduler.dependencies = {first: set(), second: {first}}
+        scheduler.run()
+
+        self.assertEqual(
+            [mock.call(5, resources=["job"]), mock.call(5, resources=[])],
+            mock_seek_and_destroy.return_value.exterminate.call_args_list)
+
+
+class FakeNameGenerator(utils.RandomNameGeneratorMixin):
+    RESOURCE_NAME_FORMAT = "s_rally_XXXXXXXX_XXXXXXXX"
+
+
+class SweeperTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SweeperTestCase, self).setUp()
+        self.servers = _res_mgr("nova", "servers", 1)
+        self.servers.__init__ = self._init_resource
+        self.servers.id = lambda self: self.raw_resource["id"]
+        self.servers.name = lambda self: self.raw_resource["name"]
+        self.networks = _res_mgr("neutron", "networks", 2)
+        self.networks.__init__ = self._init_resource
+        self.networks.id = lambda self: self.raw_resource["id"]
+        self.networks.name = lambda self: self.raw_resource["name"]
+        self.itersubclasses = self.mock_class(
+            "%s.discover.itersubclasses" % BASE)
+        self.itersubclasses.return_value = [FakeNameGenerator]
+        self.mock_class("%s.SeekAndDestroy._get_cached_client" % BASE)
+
+    @staticmethod
+    def _init_resource(self, resource=None, admin=None, user=None,
+                       tenant_uuid=None):
+        self.raw_resource = resource
+
+    def mock_class(self, target):
+        patcher = mock.patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def _list_resources(self, resources):
+        def list_resources(destroyer):
+            if isinstance(resources[destroyer.manager_cls], Exception):
+                raise resources[destroyer.manager_cls]
+            return [("admin", {"tenant_id": "t"}, r)
+                    for r in resources[destroyer.manager_cls]]
+
+        patcher = mock.patch("%s.SeekAndDestroy.list_resources" % BASE,
+                             autospec=True, side_effect=list_resources)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_find(self):
+        server = {"id": "s1", "name": "s_rally_abcd1234_abcdefgh"}
+        network = {"id": "n1", "name": "rally_12345678_abcdefgh"}
+        self._list_resources({
+            self.servers: [server, {"id": "s2", "name": "foo"},
+                           {"id": "s3", "name": None}],
+            self.networks: [network,
+                            {"id": "n2", "name": "rally_ab_cd"}]})
+
+        sweeper = manager.Sweeper([self.servers, self.networks], "admin",
+                                  ["user"], threads=2)
+
+        self.assertEqual(
+            [{"resource": "neutron.networks", "id": "n1",
+              "name": "rally_12345678_abcdefgh",
+              "task_id_part": "12345678"},
+             {"resource": "nova.servers", "id": "s1",
+              "name": "s_rally_abcd1234_abcdefgh",
+              "task_id_part": "abcd1234"}],
+            sweeper.find())
+        self.assertEqual(
+            {self.servers: [("admin", {"tenant_id": "t"}, server)],
+             self.networks: [("admin", {"tenant_id": "t"}, network)]},
+            sweeper._found)
+
+        self.assertEqual(["s1"],
+                         [r["id"] for r in sweeper.find(["abcd-1234-5678"])])
+        self.assertEqual({self.servers: [("admin", {"tenant_id": "t"},
+                                          server)]},
+                         sweeper._found)
+
+    def test_find_exclude_task_ids(self):
+        self._list_resources({
+            self.servers: [{"id": "s1", "name": "s_rally_abcd1234_abcdefgh"}],
+            self.networks: [{"id": "n1", "name": "rally_12345678_abcdefgh"}]})
+
+        sweeper = manager.Sweeper([self.servers, self.networks], "admin",
+                                  ["user"])
+
+        self.assertEqual(
+            ["n1"], [r["id"] for r in sweeper.find(
+                exclude_task_ids=["abcd-1234-5678"])])
+        self.assertEqual({self.networks: [
+            ("admin", {"tenant_id": "t"},
+             {"id": "n1", "name": "rally_12345678_abcdefgh"})]},
+            sweeper._found)
+        self.assertEqual(
+            [], sweeper.find(["abcd-1234-5678"],
+                             exclude_task_ids=["abcd-1234-5678"]))
+        self.assertEqual({}, sweeper._found)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test_find_list_failed(self, mock_log):
+        self._list_resources({
+            self.servers: RuntimeError("Oops"),
+            self.networks: [{"id": "n1", "name": "rally_12345678_abcdefgh"}]})
+
+        sweeper = manager.Sweeper([self.servers, self.networks], "admin",
+                                  ["user"])
+
+        self.assertEqual(["n1"], [r["id"] for r in sweeper.find()])
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @mock.patch("%s.CleanupScheduler" % BASE)
+    def test_delete(self, mock_cleanup_scheduler):
+        sweeper = manager.Sweeper([self.servers, self.networks], "admin",
+                                  ["user"], api_versions="api_versions",
+                                  threads=2)
+        sweeper._found = {self.networks: ["job"]}
+
+        self.assertEqual(mock_cleanup_scheduler.return_value.run.return_value,
+                         sweeper.delete())
+        mock_cleanup_scheduler.assert_called_once_with(
+            [self.networks], "admin", ["user"], "api_versions", threads=2,
+            resources={self.networks: ["job"]})
+
+    @mock.patch("%s.find_resource_managers" % BASE)
+    @mock.patch("%s.Sweeper" % BASE)
+    def test_sweep(self, mock_sweeper, mock_find_resource_managers):
+        sweeper = mock_sweeper.return_value
+
+        self.assertEqual(
+            (sweeper, sweeper.find.return_value, sweeper.delete.return_value),
+            manager.sweep(names=["nova"], admin="admin", users=["user"],
+                          task_ids=["task"], exclude_task_ids=["running"],
+                          delete=True))
+
+        mock_find_resource_managers.assert_called_once_with(["nova"])
+        mock_sweeper.assert_called_once_with(
+            mock_find_resource_managers.return_value, "admin", ["user"],
+            None)
+        sweeper.find.assert_called_once_with(["task"],
+                                             exclude_task_ids=["running"])
+        sweeper.delete.assert_called_once_with()
+
+    @mock.patch("%s.discover.import_lazy_plugins" % BASE)
+    @mock.patch("%s.Sweeper" % BASE)
+    def test_sweep_dry_run(self, mock_sweeper,
+                           mock_import_lazy_plugins):
+        self.itersubclasses.return_value = [
+            self.networks, self.servers, _res_mgr(None, None, 0)]
+        sweeper = mock_sweeper.return_value
+
+        self.assertEqual((sweeper, sweeper.find.return_value, None),
+                         manager.sweep(admin="admin"))
+
+        mock_import_lazy_plugins.assert_called_once_with()
+        mock_sweeper.assert_called_once_with(
+            [self.servers, self.networks], "admin", None, None)
+        sweeper.find.assert_called_once_with(None, exclude_task_ids=None)
+        self.assertFalse(sweeper.delete.called)
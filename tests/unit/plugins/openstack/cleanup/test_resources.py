@@ -354,12 +354,10 @@ class NeutronMixinTestCase(test.TestCase):
         neut.user = mock.MagicMock()
         self.assertEqual(neut.user.neutron.return_value, neut._manager())
 
-    @mock.patch("%s.NeutronMixin._manager" % BASE)
-    def test_supports_extension(self, mock__manager):
-        mock__manager().list_extensions.return_value = {
-            "extensions": [{"alias": "foo"}, {"alias": "bar"}]
-        }
+    def test_supports_extension(self):
         neut = self.get_neutron_mixin()
+        neut.user = mock.Mock()
+        neut.user.neutron_extensions.return_value = ["foo", "bar"]
         self.assertTrue(neut.supports_extension("foo"))
         self.assertTrue(neut.supports_extension("bar"))
         self.assertFalse(neut.supports_extension("foobar"))
@@ -409,9 +407,8 @@ class NeutronLbaasV1MixinTestCase(test.TestCase):
         neut._service = "neutron"
         neut._resource = "some_resource"
         neut._manager = mock.Mock()
-        neut._manager().list_extensions.return_value = {
-            "extensions": [{"alias": ext} for ext in extensions]
-        }
+        neut.user = mock.Mock()
+        neut.user.neutron_extensions.return_value = extensions
         return neut
 
     def test_list_lbaas_available(self):
@@ -443,9 +440,8 @@ class NeutronLbaasV2MixinTestCase(test.TestCase):
         neut._service = "neutron"
         neut._resource = "some_resource"
         neut._manager = mock.Mock()
-        neut._manager().list_extensions.return_value = {
-            "extensions": [{"alias": ext} for ext in extensions]
-        }
+        neut.user = mock.Mock()
+        neut.user.neutron_extensions.return_value = extensions
         return neut
 
     def test_list_lbaasv2_available(self):
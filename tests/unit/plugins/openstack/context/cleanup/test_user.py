@@ -47,8 +47,9 @@ class UserCleanupTestCase(test.TestCase):
 
     @mock.patch("%s.manager.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
-    @mock.patch("%s.manager.SeekAndDestroy" % BASE)
-    def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers):
+    @mock.patch("%s.manager.CleanupScheduler" % BASE)
+    def test_cleanup(self, mock_cleanup_scheduler,
+                     mock_find_resource_managers):
 
         ctx = {
             "config": {"cleanup": ["a", "b"]},
@@ -62,23 +63,17 @@ class UserCleanupTestCase(test.TestCase):
 
         mock_find_resource_managers.assert_called_once_with(("a", "b"), False)
 
-        mock_seek_and_destroy.assert_has_calls([
-            mock.call(
-                mock_find_resource_managers.return_value[0],
-                None, ctx["users"], None),
-            mock.call().exterminate(),
-            mock.call(
-                mock_find_resource_managers.return_value[1],
-                None, ctx["users"], None),
-            mock.call().exterminate()
-        ])
+        mock_cleanup_scheduler.assert_called_once_with(
+            mock_find_resource_managers.return_value,
+            None, ctx["users"], None)
+        mock_cleanup_scheduler.return_value.run.assert_called_once_with()
 
     @mock.patch("%s.manager.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
-    @mock.patch("%s.manager.SeekAndDestroy" % BASE)
+    @mock.patch("%s.manager.CleanupScheduler" % BASE)
     def test_cleanup_user_with_api_versions(
             self,
-            mock_seek_and_destroy,
+            mock_cleanup_scheduler,
             mock_find_resource_managers):
 
         ctx = {
@@ -101,17 +96,7 @@ class UserCleanupTestCase(test.TestCase):
         user_cleanup.cleanup()
 
         mock_find_resource_managers.assert_called_once_with({}, False)
-        mock_seek_and_destroy.assert_has_calls([
-            mock.call(
-                mock_find_resource_managers.return_value[0],
-                None,
-                ctx["users"],
-                ctx["config"]["api_versions"]),
-            mock.call().exterminate(),
-            mock.call(
-                mock_find_resource_managers.return_value[1],
-                None,
-                ctx["users"],
-                ctx["config"]["api_versions"]),
-            mock.call().exterminate()
-        ])
+        mock_cleanup_scheduler.assert_called_once_with(
+            mock_find_resource_managers.return_value,
+            None, ctx["users"], ctx["config"]["api_versions"])
+        mock_cleanup_scheduler.return_value.run.assert_called_once_with()
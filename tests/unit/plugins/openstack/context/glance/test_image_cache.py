@@ -0,0 +1,112 @@
+# All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import ddt
+import mock
+
+from rally import exceptions
+from rally.plugins.openstack.context.glance import image_cache
+from tests.unit import test
+
+CACHE = "rally.plugins.openstack.context.glance.image_cache"
+DATA = b"foo_image_data"
+MD5 = hashlib.md5(DATA).hexdigest()
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+@ddt.ddt
+class ImageCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ImageCacheTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path, ignore_errors=True)
+        patcher = mock.patch("%s.requests.get" % CACHE)
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get.return_value.iter_content.return_value = [DATA[:3],
+                                                                DATA[3:]]
+
+    @ddt.data(("http://example.com/image", True),
+              ("https://example.com/image", True),
+              ("/tmp/image", False),
+              ("file:///tmp/image", False))
+    @ddt.unpack
+    def test_is_remote(self, url, expected):
+        self.assertEqual(expected, image_cache.is_remote(url))
+
+    def test_get(self):
+        cache = image_cache.ImageCache(self.path)
+
+        path = cache.get("http://foo/image", checksum=MD5)
+
+        self.assertEqual(os.path.join(self.path, SHA256), path)
+        with open(path, "rb") as f:
+            self.assertEqual(DATA, f.read())
+        self.mock_get.assert_called_once_with("http://foo/image",
+                                              stream=True)
+        self.mock_get.return_value.raise_for_status.assert_called_once_with()
+        self.mock_get.return_value.close.assert_called_once_with()
+
+        # the same url is not downloaded again
+        self.assertEqual(path, cache.get("http://foo/image"))
+        self.assertEqual(1, self.mock_get.call_count)
+
+        # the same content by different url is stored once
+        self.assertEqual(path, cache.get("http://bar/image"))
+        self.assertEqual(2, self.mock_get.call_count)
+        self.assertEqual(sorted([SHA256, "index.json"]),
+                         sorted(os.listdir(self.path)))
+
+    def test_get_persistent(self):
+        path = image_cache.ImageCache(self.path).get("http://foo/image")
+        cache = image_cache.ImageCache(self.path)
+
+        self.assertEqual(path, cache.get("http://foo/image"))
+        self.assertEqual(1, self.mock_get.call_count)
+        self.assertRaises(exceptions.ChecksumMismatch,
+                          cache.get, "http://foo/image", checksum="bar")
+        cache.cleanup()
+        self.assertTrue(os.path.isfile(path))
+
+    def test_get_checksum_mismatch(self):
+        cache = image_cache.ImageCache(self.path)
+
+        self.assertRaises(exceptions.ChecksumMismatch,
+                          cache.get, "http://foo/image", checksum="bar")
+        self.assertEqual([], os.listdir(self.path))
+
+    def test_get_download_fails(self):
+        self.mock_get.return_value.raise_for_status.side_effect = (
+            image_cache.requests.HTTPError("404"))
+        cache = image_cache.ImageCache(self.path)
+
+        self.assertRaises(image_cache.requests.HTTPError,
+                          cache.get, "http://foo/image")
+        self.assertEqual([], os.listdir(self.path))
+        self.mock_get.return_value.close.assert_called_once_with()
+
+    def test_temporary(self):
+        cache = image_cache.ImageCache()
+        self.assertTrue(cache.temporary)
+        path = cache.get("http://foo/image")
+        self.assertTrue(os.path.isfile(path))
+
+        cache.cleanup()
+        self.assertFalse(os.path.exists(cache.path))
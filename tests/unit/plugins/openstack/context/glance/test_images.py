@@ -19,6 +19,7 @@ import ddt
 import jsonschema
 import mock
 
+from rally import exceptions
 from rally.plugins.openstack.context.glance import images
 from tests.unit import test
 
@@ -53,9 +54,10 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
         {"image_args": {"min_disk": 1, "min_ram": 2, "visibility": "public"}},
         {"api_versions": {"glance": {"version": 2, "service_type": "image"}}})
     @ddt.unpack
+    @mock.patch("%s.image_cache.ImageCache" % CTX)
     @mock.patch("rally.plugins.openstack.wrappers.glance.wrap")
     @mock.patch("rally.osclients.Clients")
-    def test_setup(self, mock_clients, mock_wrap,
+    def test_setup(self, mock_clients, mock_wrap, mock_image_cache,
                    image_container="bare", image_type="qcow2",
                    image_url="http://example.com/fake/url",
                    tenants=1, users_per_tenant=1, images_per_tenant=1,
@@ -105,8 +107,10 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
             expected_image_args["min_disk"] = min_disk
 
         wrapper = mock_wrap.return_value
+        mock_image_cache.return_value.get.return_value = "/foo/image.img"
 
         new_context = copy.deepcopy(self.context)
+        new_context["config"]["images"]["upload_workers"] = 5
         for tenant_id in new_context["tenants"].keys():
             new_context["tenants"][tenant_id]["images"] = [
                 wrapper.create_image.return_value.id
@@ -121,10 +125,14 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
                                         images_ctx)] * tenants)
         wrapper_calls.extend(
             [mock.call().create_image(
-                image_container, image_url, image_type,
+                image_container, "/foo/image.img", image_type,
                 name=mock.ANY, **expected_image_args)] *
             tenants * images_per_tenant)
         mock_wrap.assert_has_calls(wrapper_calls, any_order=True)
+        mock_image_cache.assert_called_once_with(None)
+        mock_image_cache.return_value.get.assert_called_once_with(
+            image_url, checksum=None)
+        mock_image_cache.return_value.cleanup.assert_called_once_with()
 
         if image_name:
             for args in wrapper.create_image.call_args_list:
@@ -132,6 +140,117 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
         mock_clients.assert_has_calls(
             [mock.call(mock.ANY, api_info=api_versions)] * tenants)
 
+    def _get_setup_context(self, tenants_count=2, images_per_tenant=2,
+                           **config):
+        tenants = self._gen_tenants(tenants_count)
+        images_config = {"image_url": "/foo/image.img",
+                         "image_type": "qcow2",
+                         "image_container": "bare",
+                         "images_per_tenant": images_per_tenant}
+        images_config.update(config)
+        self.context.update({
+            "config": {"images": images_config},
+            "users": [{"id": "user_%s" % t, "tenant_id": t,
+                       "credential": mock.MagicMock()} for t in tenants],
+            "tenants": tenants
+        })
+        return self.context
+
+    @mock.patch("%s.image_cache.ImageCache" % CTX)
+    @mock.patch("rally.plugins.openstack.wrappers.glance.wrap")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_local_image(self, mock_clients, mock_wrap,
+                               mock_image_cache):
+        self._get_setup_context(image_name="foo", upload_workers=3)
+        mock_wrap.return_value.create_image.side_effect = [
+            mock.Mock(id="image_%d" % i) for i in range(4)]
+
+        images.ImageGenerator(self.context).setup()
+
+        self.assertFalse(mock_image_cache.return_value.get.called)
+        mock_image_cache.return_value.cleanup.assert_called_once_with()
+        created = []
+        for tenant in self.context["tenants"].values():
+            self.assertEqual(2, len(tenant["images"]))
+            created.extend(tenant["images"])
+        self.assertEqual(["image_%d" % i for i in range(4)], sorted(created))
+        self.assertEqual(
+            ["foo", "foo", "foo1", "foo1"],
+            sorted(c[1]["name"] for c in
+                   mock_wrap.return_value.create_image.call_args_list))
+        for call in mock_wrap.return_value.create_image.call_args_list:
+            self.assertEqual(("bare", "/foo/image.img", "qcow2"), call[0])
+
+    @mock.patch("%s.image_cache.ImageCache" % CTX)
+    @mock.patch("rally.plugins.openstack.wrappers.glance.wrap")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_fails(self, mock_clients, mock_wrap, mock_image_cache):
+        self._get_setup_context(tenants_count=1)
+        mock_wrap.return_value.create_image.side_effect = [
+            mock.Mock(id="image_0"), Exception("foo")]
+
+        images_ctx = images.ImageGenerator(self.context)
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              images_ctx.setup)
+        self.assertIn("Failed to create 1 image(s): foo", "%s" % e)
+        self.assertEqual(["image_0"],
+                         self.context["tenants"]["0"]["images"])
+        mock_image_cache.return_value.cleanup.assert_called_once_with()
+
+    @mock.patch("%s.image_cache.ImageCache" % CTX)
+    @mock.patch("rally.plugins.openstack.wrappers.glance.wrap")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_download_fails(self, mock_clients, mock_wrap,
+                                  mock_image_cache):
+        self._get_setup_context(image_url="http://foo/image.img",
+                                image_checksum="foo_md5")
+        mock_image_cache.return_value.get.side_effect = (
+            exceptions.ChecksumMismatch(url="http://foo/image.img"))
+
+        self.assertRaises(exceptions.ChecksumMismatch,
+                          images.ImageGenerator(self.context).setup)
+        mock_image_cache.return_value.get.assert_called_once_with(
+            "http://foo/image.img", checksum="foo_md5")
+        mock_image_cache.return_value.cleanup.assert_called_once_with()
+        self.assertFalse(mock_wrap.return_value.create_image.called)
+
+    @ddt.data(
+        {"version": "1", "expected": False},
+        {"version": "2", "expected": True},
+        {"version": "1", "config": {"cache_image": True}, "expected": True},
+        {"version": "2", "config": {"cache_image": False},
+         "expected": False},
+        {"version": "1", "config": {"image_checksum": "foo_md5"},
+         "expected": True},
+        {"version": "2", "config": {"image_url": "/foo/image.img"},
+         "expected": False})
+    @ddt.unpack
+    @mock.patch("rally.osclients.Clients")
+    def test__is_cache_needed(self, mock_clients, version, expected,
+                              config=None):
+        config = dict({"image_url": "http://foo/image.img"}, **(config or {}))
+        self._get_setup_context(**config)
+        mock_clients.return_value.glance.choose_version.return_value = version
+
+        images_ctx = images.ImageGenerator(self.context)
+        self.assertEqual(expected,
+                         images_ctx._is_cache_needed(config["image_url"]))
+
+    @mock.patch("%s.image_cache.ImageCache" % CTX)
+    @mock.patch("rally.plugins.openstack.wrappers.glance.wrap")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_glance_v1_copy_from(self, mock_clients, mock_wrap,
+                                       mock_image_cache):
+        self._get_setup_context(tenants_count=1, images_per_tenant=1,
+                                image_url="http://foo/image.img")
+        mock_clients.return_value.glance.choose_version.return_value = "1"
+
+        images.ImageGenerator(self.context).setup()
+
+        self.assertFalse(mock_image_cache.return_value.get.called)
+        mock_wrap.return_value.create_image.assert_called_once_with(
+            "bare", "http://foo/image.img", "qcow2", name=mock.ANY)
+
     @ddt.data(
         {},
         {"api_versions": {"glance": {"version": 2, "service_type": "image"}}})
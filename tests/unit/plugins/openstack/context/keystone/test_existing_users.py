@@ -13,7 +13,9 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 
+from rally import exceptions
 from rally.plugins.openstack.context.keystone import existing_users
 from tests.unit import test
 
@@ -78,6 +80,44 @@ class ExistingUserTestCase(test.TestCase):
         self.assertEqual({"id": "2", "name": user3.tenant_name},
                          context["tenants"]["2"])
 
+    @mock.patch("%s.keystone.users.TokenRefresher" % CTX)
+    @mock.patch("%s.keystone.existing_users.osclients.Clients" % CTX)
+    @mock.patch("%s.keystone.existing_users.objects.Credential" % CTX)
+    def test_setup_and_cleanup_with_prewarm_tokens(
+            self, mock_credential, mock_clients, mock_token_refresher):
+        cfg.CONF.set_override("prewarm_tokens", True, "users_context")
+        self.addCleanup(cfg.CONF.clear_override, "prewarm_tokens",
+                        "users_context")
+        auth_ref = mock_clients.return_value.keystone.auth_ref
+        context = {"task": mock.MagicMock(),
+                   "config": {"existing_users": [{}, {}]}}
+
+        ctx = existing_users.ExistingUsers(context)
+        ctx.setup()
+
+        self.assertEqual(2, len(context["users"]))
+        for user in context["users"]:
+            self.assertEqual(auth_ref, user["token"].auth_ref)
+        self.assertIn("tokens_prewarm_duration", context)
+        mock_token_refresher.assert_called_once_with(context["users"])
+        mock_token_refresher.return_value.start.assert_called_once_with()
+
+        ctx.cleanup()
+        mock_token_refresher.return_value.stop.assert_called_once_with()
+
+    @mock.patch("rally.common.broker.LOG")
+    @mock.patch("%s.keystone.existing_users.osclients.Clients" % CTX)
+    @mock.patch("%s.keystone.existing_users.objects.Credential" % CTX)
+    def test_setup_failed_authentication(self, mock_credential,
+                                         mock_clients, mock_log):
+        type(mock_clients.return_value.keystone).auth_ref = (
+            mock.PropertyMock(side_effect=Exception("Unauthorized")))
+        context = {"task": mock.MagicMock(),
+                   "config": {"existing_users": [{}]}}
+
+        self.assertRaises(exceptions.ContextSetupFailure,
+                          existing_users.ExistingUsers(context).setup)
+
     def test_cleanup(self):
         # NOTE(boris-42): Test that cleanup is not abstract
         existing_users.ExistingUsers({"task": mock.MagicMock()}).cleanup()
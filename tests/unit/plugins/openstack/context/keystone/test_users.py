@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+
 import mock
 
 from rally.common import objects
@@ -256,6 +258,34 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
         self.assertEqual(len(ctx.context["users"]), 0)
         self.assertEqual(len(ctx.context["tenants"]), 0)
 
+    @mock.patch("%s.identity" % CTX)
+    def test_setup_with_tenant_weights(self, mock_identity):
+        self.context["config"]["users"].update(
+            {"user_choice_method": "weighted", "tenant_weights": [3, 1]})
+        with users.UserGenerator(self.context) as ctx:
+            ctx.setup()
+
+            self.assertEqual("weighted", ctx.context["user_choice_method"])
+            self.assertEqual([3, 1], ctx.context["tenant_weights"])
+
+    @mock.patch("%s.TokenRefresher" % CTX)
+    @mock.patch("%s.identity" % CTX)
+    def test_setup_and_cleanup_with_prewarm_tokens(self, mock_identity,
+                                                   mock_token_refresher):
+        self.context["config"]["users"]["prewarm_tokens"] = True
+        auth_ref = self.osclients.Clients.return_value.keystone.auth_ref
+        with users.UserGenerator(self.context) as ctx:
+            ctx.setup()
+
+            for user in ctx.context["users"]:
+                self.assertEqual(auth_ref, user["token"].auth_ref)
+            self.assertIn("tokens_prewarm_duration", ctx.context)
+            mock_token_refresher.assert_called_once_with(
+                ctx.context["users"])
+            mock_token_refresher.return_value.start.assert_called_once_with()
+
+        mock_token_refresher.return_value.stop.assert_called_once_with()
+
     @mock.patch("rally.common.broker.LOG.warning")
     @mock.patch("%s.identity" % CTX)
     def test_setup_and_cleanup_with_error_during_create_user(
@@ -364,3 +394,74 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
 
         for user in users_:
             self.assertEqual("public", user["credential"].endpoint_type)
+
+
+class UserTokenTestCase(test.TestCase):
+
+    def test_deepcopy(self):
+        token = users.UserToken("auth_ref")
+        user = {"id": "foo", "token": token}
+        self.assertIs(token, copy.deepcopy(user)["token"])
+
+
+class PrewarmTokensTestCase(test.TestCase):
+
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_prewarm_tokens(self, mock_clients):
+        users_list = [{"credential": "c1"}, {"credential": "c2"}]
+
+        duration = users.prewarm_tokens(users_list, 2)
+
+        self.assertGreaterEqual(duration, 0)
+        mock_clients.assert_has_calls([mock.call("c1"), mock.call("c2")],
+                                      any_order=True)
+        for user in users_list:
+            self.assertEqual(mock_clients.return_value.keystone.auth_ref,
+                             user["token"].auth_ref)
+
+
+class TokenRefresherTestCase(test.TestCase):
+
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_refresh(self, mock_clients):
+        stale = mock.Mock()
+        stale.will_expire_soon.return_value = True
+        fresh = mock.Mock()
+        fresh.will_expire_soon.return_value = False
+        users_list = [{"id": "u1", "credential": "c1",
+                       "token": users.UserToken(stale)},
+                      {"id": "u2", "credential": "c2",
+                       "token": users.UserToken(fresh)},
+                      {"id": "u3", "credential": "c3"}]
+
+        users.TokenRefresher(users_list, interval=1,
+                             stale_duration=30).refresh()
+
+        mock_clients.assert_called_once_with("c1")
+        self.assertEqual(mock_clients.return_value.keystone.auth_ref,
+                         users_list[0]["token"].auth_ref)
+        self.assertEqual(fresh, users_list[1]["token"].auth_ref)
+        stale.will_expire_soon.assert_called_once_with(30)
+
+    @mock.patch("%s.LOG" % CTX)
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_refresh_failed(self, mock_clients, mock_log):
+        stale = mock.Mock()
+        stale.will_expire_soon.return_value = True
+        type(mock_clients.return_value.keystone).auth_ref = (
+            mock.PropertyMock(side_effect=Exception("Unauthorized")))
+        users_list = [{"id": "u1", "credential": "c1",
+                       "token": users.UserToken(stale)}]
+
+        users.TokenRefresher(users_list, interval=1).refresh()
+
+        self.assertEqual(stale, users_list[0]["token"].auth_ref)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    def test_start_and_stop(self):
+        refresher = users.TokenRefresher([], interval=1)
+        refresher.refresh = mock.Mock()
+        refresher.start()
+        refresher.stop()
+
+        self.assertFalse(refresher._thread.is_alive())
@@ -15,6 +15,7 @@
 
 import copy
 
+import ddt
 import mock
 
 from rally.plugins.openstack.context.nova import servers
@@ -26,6 +27,7 @@ SCN = "rally.plugins.openstack.scenarios"
 TYP = "rally.plugins.openstack.types"
 
 
+@ddt.ddt
 class ServerGeneratorTestCase(test.ScenarioTestCase):
 
     def _gen_tenants(self, count):
@@ -46,9 +48,13 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
             "tenants": self._gen_tenants(tenants_count)})
 
         inst = servers.ServerGenerator(self.context)
-        self.assertEqual({"auto_assign_nic": False, "servers_per_tenant": 5},
+        self.assertEqual({"auto_assign_nic": False, "bulk_boot": False,
+                          "servers_per_tenant": 5},
                          inst.config)
 
+    @ddt.data({"bulk_boot": False, "requests": 5, "instances_amount": 1},
+              {"bulk_boot": True, "requests": 1, "instances_amount": 5})
+    @ddt.unpack
     @mock.patch("%s.nova.utils.NovaScenario._boot_servers" % SCN,
                 return_value=[
                     fakes.FakeServer(id="uuid"),
@@ -63,7 +69,8 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
     @mock.patch("%s.servers.osclients" % CTX, return_value=fakes.FakeClients())
     def test_setup(self, mock_osclients, mock_flavor_transform,
                    mock_glance_image_transform,
-                   mock_nova_scenario__boot_servers):
+                   mock_nova_scenario__boot_servers, bulk_boot, requests,
+                   instances_amount):
 
         tenants_count = 2
         users_per_tenant = 5
@@ -85,6 +92,7 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
                 },
                 "servers": {
                     "auto_assign_nic": True,
+                    "bulk_boot": bulk_boot,
                     "servers_per_tenant": 5,
                     "image": {
                         "name": "cirros-0.3.4-x86_64-uec",
@@ -115,12 +123,12 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
         servers_ctx_config = self.context["config"]["servers"]
         expected_auto_nic = servers_ctx_config.get("auto_assign_nic", False)
         expected_nics = servers_ctx_config.get("nics", [])
-        expected_requests = servers_ctx_config.get("servers_per_tenant", False)
         called_times = len(tenants)
         mock_calls = [mock.call(image_id, flavor_id,
                                 auto_assign_nic=expected_auto_nic,
                                 nics=expected_nics,
-                                requests=expected_requests)
+                                requests=requests,
+                                instances_amount=instances_amount)
                       for i in range(called_times)]
         mock_nova_scenario__boot_servers.assert_has_calls(mock_calls)
 
@@ -242,6 +242,40 @@ class NovaServersTestCase(test.ScenarioTestCase):
         scenario._delete_servers.assert_called_once_with(
             scenario._boot_servers.return_value, force=False)
 
+    def test_boot_servers_in_bulk(self):
+        scenario = servers.BootServersInBulk(self.context)
+        scenario._boot_servers_in_bulk = mock.Mock(
+            return_value=[("server1", 10), ("server2", 12)])
+        scenario._add_boot_times_output = mock.Mock()
+
+        scenario.run("img", "flavor", requests=2, instances_per_request=5,
+                     fakearg="fakearg")
+
+        scenario._boot_servers_in_bulk.assert_called_once_with(
+            "img", "flavor", 2, instances_amount=5, auto_assign_nic=False,
+            fakearg="fakearg")
+        scenario._add_boot_times_output.assert_called_once_with([10, 12])
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "nova.boot_servers")
+
+    def test_boot_and_delete_servers_in_bulk(self):
+        scenario = servers.BootAndDeleteServersInBulk(self.context)
+        scenario._boot_servers_in_bulk = mock.Mock(
+            return_value=[("server1", 10), ("server2", 12)])
+        scenario._add_boot_times_output = mock.Mock()
+        scenario._delete_servers = mock.Mock()
+        scenario.sleep_between = mock.Mock()
+
+        scenario.run("img", "flavor", auto_assign_nic=True, min_sleep=10,
+                     max_sleep=20, force_delete=True)
+
+        scenario._boot_servers_in_bulk.assert_called_once_with(
+            "img", "flavor", 1, instances_amount=10, auto_assign_nic=True)
+        scenario._add_boot_times_output.assert_called_once_with([10, 12])
+        scenario.sleep_between.assert_called_once_with(10, 20)
+        scenario._delete_servers.assert_called_once_with(
+            ["server1", "server2"], force=True)
+
     def test_boot_and_list_server(self):
         scenario = servers.BootAndListServer(self.context)
 #        scenario.generate_random_name = mock.MagicMock(return_value="name")
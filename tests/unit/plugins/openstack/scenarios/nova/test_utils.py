@@ -434,19 +434,24 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         {"auto_assign_nic": True, "nics": [{"net-id": "foo"}]},
         {"auto_assign_nic": False, "nics": [{"net-id": "foo"}]})
     @ddt.unpack
-    def test__boot_servers(self, image_id="image", flavor_id="flavor",
-                           requests=1, instances_amount=1,
+    @mock.patch("%s.wait_for_statuses" % BM_UTILS)
+    def test__boot_servers(self, mock_wait_for_statuses, image_id="image",
+                           flavor_id="flavor", requests=1, instances_amount=1,
                            auto_assign_nic=False, **kwargs):
         servers = [mock.Mock() for i in range(instances_amount)]
         self.clients("nova").servers.list.return_value = servers
+        mock_wait_for_statuses.return_value = [(server, 0)
+                                               for server in servers]
         scenario = utils.NovaScenario(context=self.context)
         scenario.generate_random_name = mock.Mock()
         scenario._pick_random_nic = mock.Mock()
 
-        scenario._boot_servers(image_id, flavor_id, requests,
-                               instances_amount=instances_amount,
-                               auto_assign_nic=auto_assign_nic,
-                               **kwargs)
+        self.assertEqual(
+            servers,
+            scenario._boot_servers(image_id, flavor_id, requests,
+                                   instances_amount=instances_amount,
+                                   auto_assign_nic=auto_assign_nic,
+                                   **kwargs))
 
         expected_kwargs = dict(kwargs)
         if auto_assign_nic and "nics" not in kwargs:
@@ -461,21 +466,61 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
             for i in range(requests)]
         self.clients("nova").servers.create.assert_has_calls(create_calls)
 
-        wait_for_status_calls = [
-            mock.call(
-                servers[i],
-                ready_statuses=["ACTIVE"],
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=CONF.benchmark.nova_server_boot_poll_interval,
-                timeout=CONF.benchmark.nova_server_boot_timeout)
-            for i in range(instances_amount)]
-        self.mock_wait_for_status.mock.assert_has_calls(wait_for_status_calls)
-
-        self.mock_get_from_manager.mock.assert_has_calls(
-            [mock.call() for i in range(instances_amount)])
+        mock_wait_for_statuses.assert_called_once_with(
+            servers,
+            ready_statuses=["ACTIVE"],
+            update_resource=self.mock_get_from_manager.mock.return_value,
+            failure_statuses=["ERROR"],
+            check_interval=CONF.benchmark.nova_server_boot_poll_interval,
+            timeout=CONF.benchmark.nova_server_boot_timeout)
+        self.mock_get_from_manager.mock.assert_called_once_with()
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "nova.boot_servers")
 
+    @mock.patch("%s.time.time" % NOVA_UTILS)
+    @mock.patch("%s.wait_for_statuses" % BM_UTILS)
+    def test__boot_servers_in_bulk(self, mock_wait_for_statuses, mock_time):
+        mock_time.side_effect = [10, 12]
+        servers = [fakes.FakeServer(name=name)
+                   for name in ("foo_0-1", "foo_0-2", "foo_1",
+                                "foo_1-d9d2b6d2-0fe1", "foo_10")]
+        self.clients("nova").servers.list.return_value = servers
+        mock_wait_for_statuses.return_value = [
+            (server, 20 + i) for i, server in enumerate(servers)]
+        scenario = utils.NovaScenario(context=self.context)
+        scenario.generate_random_name = mock.Mock(return_value="foo")
+
+        self.assertEqual(
+            [(servers[0], 10), (servers[1], 11), (servers[2], 10),
+             (servers[3], 11), (servers[4], 14)],
+            scenario._boot_servers_in_bulk("image", "flavor", 2,
+                                           instances_amount=2))
+        self.assertEqual(
+            [mock.call("foo_0", "image", "flavor", min_count=2, max_count=2),
+             mock.call("foo_1", "image", "flavor", min_count=2, max_count=2)],
+            self.clients("nova").servers.create.call_args_list)
+        self.assertEqual([], scenario.atomic_actions())
+
+    def test__add_boot_times_output(self):
+        scenario = utils.NovaScenario(context=self.context)
+        scenario.add_output = mock.Mock()
+
+        scenario._add_boot_times_output([])
+        self.assertFalse(scenario.add_output.called)
+
+        scenario._add_boot_times_output([5, 1, 3, 4, 2])
+        additive = scenario.add_output.call_args[1]["additive"]
+        complete = scenario.add_output.call_args[1]["complete"]
+        self.assertEqual("StatsTable", additive["chart_plugin"])
+        self.assertEqual(
+            [["min", 1], ["median", 3], ["90%ile", 4.6], ["95%ile", 4.8],
+             ["max", 5], ["avg", 3]],
+            [[name, round(value, 2)] for name, value in additive["data"]])
+        self.assertEqual("Lines", complete["chart_plugin"])
+        self.assertEqual(
+            [["time to ACTIVE", [[1, 1], [2, 2], [3, 3], [4, 4], [5, 5]]]],
+            complete["data"])
+
     def test__show_server(self):
         nova_scenario = utils.NovaScenario(context=self.context)
         nova_scenario._show_server(self.server)
@@ -68,7 +68,8 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario._create_container = mock.MagicMock(return_value="CC")
         scenario._upload_object = mock.MagicMock(
             side_effect=[("etaaaag", "obbbj_%i" % i) for i in range(2)])
-        scenario._download_object = mock.MagicMock()
+        scenario._download_object = mock.MagicMock(
+            return_value=("headers", b"x" * 50))
 
         scenario.run(objects_per_container=2, object_size=50)
 
@@ -77,12 +78,34 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario._download_object.assert_has_calls(
             [mock.call("CC", "obbbj_%i" % i,
                        atomic_action=False) for i in range(2)])
+        output = scenario._output["additive"][0]
+        self.assertEqual(["upload", "download"],
+                         [name for name, value in output["data"]])
 
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.create_2_objects")
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.download_2_objects")
 
+    def test_create_container_and_object_then_download_object_streamed(self):
+        scenario = objects.CreateContainerAndObjectThenDownloadObject(
+            self.context)
+        scenario._create_container = mock.MagicMock(return_value="CC")
+        scenario._upload_objects = mock.MagicMock(return_value=["o1", "o2"])
+        scenario._download_objects = mock.MagicMock(return_value=100)
+        scenario._add_throughput_output = mock.MagicMock()
+
+        scenario.run(objects_per_container=2, object_size=50, concurrency=2,
+                     download_chunk_size=10)
+
+        scenario._upload_objects.assert_called_once_with(
+            "CC", 2, 50, concurrency=2)
+        scenario._download_objects.assert_called_once_with(
+            [("CC", "o1"), ("CC", "o2")], chunk_size=10, concurrency=2)
+        transfers = scenario._add_throughput_output.call_args[0][0]
+        self.assertEqual([("upload", 100), ("download", 100)],
+                         [transfer[:2] for transfer in transfers])
+
     @ddt.data(1, 5)
     def test_list_objects_in_containers(self, num_cons):
         con_list = [{"name": "cooon_%s" % i} for i in range(num_cons)]
@@ -181,7 +204,8 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario = objects.CreateContainerAndObjectThenDownloadObject(
             self.context)
         scenario.generate_random_name = mock.MagicMock(side_effect=names_list)
-        scenario._download_object = mock.MagicMock()
+        scenario._download_object = mock.MagicMock(
+            return_value=("headers", b"x" * 750))
 
         scenario.run(objects_per_container=5, object_size=750)
 
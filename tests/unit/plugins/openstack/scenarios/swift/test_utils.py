@@ -16,6 +16,7 @@
 import ddt
 import mock
 
+from rally import exceptions
 from rally.plugins.openstack.scenarios.swift import utils
 from tests.unit import test
 
@@ -152,3 +153,149 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
             **kw)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.delete_object")
+
+    def test__download_object_streamed(self):
+        body = [b"foo", b"bar"]
+        headers = {"etag": "\"3858f62230ac3c915f300c664312c63f\""}
+        self.clients("swift").get_object.return_value = (headers, iter(body))
+        scenario = utils.SwiftScenario(context=self.context)
+
+        self.assertEqual((headers, 6),
+                         scenario._download_object("c", "o", chunk_size=3))
+        self.clients("swift").get_object.assert_called_once_with(
+            "c", "o", resp_chunk_size=3)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "swift.download_object")
+
+    @ddt.data({"headers": {"etag": "wrong"}, "raises": True},
+              {"headers": {"etag": "wrong", "x-static-large-object": "True"}},
+              {"headers": {"etag": "wrong", "x-object-manifest": "c/o"}},
+              {"headers": {}})
+    @ddt.unpack
+    def test__download_object_streamed_checksum(self, headers, raises=False):
+        self.clients("swift").get_object.return_value = (headers,
+                                                         iter([b"foo"]))
+        scenario = utils.SwiftScenario(context=self.context)
+
+        if raises:
+            self.assertRaises(exceptions.RallyException,
+                              scenario._download_object, "c", "o",
+                              chunk_size=3)
+        else:
+            self.assertEqual((headers, 3),
+                             scenario._download_object("c", "o",
+                                                       chunk_size=3))
+
+    def test__run_concurrently_sequential(self):
+        scenario = utils.SwiftScenario(context=self.context)
+        func = mock.Mock(side_effect=lambda x: x * 2)
+
+        self.assertEqual([2, 4], scenario._run_concurrently(
+            func, [(1,), (2,)], concurrency=1))
+        self.assertIs(self.clients("swift"), scenario._swift())
+
+    def test__run_concurrently(self):
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario._clients = mock.Mock()
+        thread_clients = []
+
+        def func(x):
+            thread_clients.append(scenario._swift())
+            return x * 2
+
+        self.assertEqual(list(range(0, 20, 2)), scenario._run_concurrently(
+            func, [(i,) for i in range(10)], concurrency=3))
+        self.assertEqual(
+            3, scenario._clients.swift.create_client.call_count)
+        self.assertEqual(
+            {scenario._clients.swift.create_client.return_value},
+            set(thread_clients))
+        self.assertIs(self.clients("swift"), scenario._swift())
+
+    def test__run_concurrently_fails(self):
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario._clients = mock.Mock()
+        func = mock.Mock(side_effect=[1, ValueError("foo"), 3, 4])
+
+        self.assertRaises(ValueError, scenario._run_concurrently,
+                          func, [()] * 4, concurrency=2)
+
+    def test__upload_objects(self):
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario._upload_object = mock.Mock(
+            side_effect=[("etag", "o%d" % i) for i in range(3)])
+
+        self.assertEqual(["o0", "o1", "o2"],
+                         scenario._upload_objects("c", 3, 10))
+        for call in scenario._upload_object.call_args_list:
+            self.assertEqual("c", call[0][0])
+            self.assertIsInstance(call[0][1], utils.Payload)
+            self.assertEqual(10, len(call[0][1]))
+            self.assertEqual({"content_length": 10, "atomic_action": False},
+                             call[1])
+
+    @ddt.data({"chunk_size": None, "kwargs": {},
+               "results": [("h", b"foo"), ("h", b"ba")]},
+              {"chunk_size": 2, "kwargs": {"chunk_size": 2},
+               "results": [("h", 3), ("h", 2)]})
+    @ddt.unpack
+    def test__download_objects(self, chunk_size, kwargs, results):
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario._download_object = mock.Mock(side_effect=results)
+
+        self.assertEqual(5, scenario._download_objects(
+            [("c", "o1"), ("c", "o2")], chunk_size=chunk_size))
+        scenario._download_object.assert_has_calls(
+            [mock.call("c", "o1", atomic_action=False, **kwargs),
+             mock.call("c", "o2", atomic_action=False, **kwargs)])
+
+    def test__add_throughput_output(self):
+        scenario = utils.SwiftScenario(context=self.context)
+        scenario._add_throughput_output([("upload", 100, 4.0),
+                                         ("download", 100, 0)])
+
+        self.assertEqual(
+            {"additive": [{"title": "Swift throughput",
+                           "description": "Bytes per second transferred by "
+                                          "Swift objects operations",
+                           "chart_plugin": "Lines",
+                           "data": [["upload", 25.0], ["download", 0]],
+                           "label": "bytes/s"}],
+             "complete": []},
+            scenario._output)
+
+
+class PayloadTestCase(test.TestCase):
+
+    def test_read(self):
+        payload = utils.Payload(10)
+
+        self.assertEqual(10, len(payload))
+        self.assertEqual(b"\0" * 4, payload.read(4))
+        self.assertEqual(4, payload.tell())
+        self.assertEqual(b"\0" * 6, payload.read())
+        self.assertEqual(b"", payload.read(4))
+        self.assertEqual(10, payload.tell())
+
+    def test_seek(self):
+        payload = utils.Payload(10)
+
+        payload.seek(3)
+        self.assertEqual(3, payload.tell())
+        payload.seek(2, 1)
+        self.assertEqual(5, payload.tell())
+        payload.seek(-1, 2)
+        self.assertEqual(9, payload.tell())
+        payload.seek(20)
+        self.assertEqual(10, payload.tell())
+        payload.reset()
+        self.assertEqual(0, payload.tell())
+
+    def test_shared_buffer(self):
+        small = utils.Payload(10)
+        large = utils.Payload(1024)
+        another = utils.Payload(100)
+
+        self.assertIs(large._buffer, another._buffer)
+        self.assertGreaterEqual(len(small._buffer), 10)
+        self.assertEqual(b"", utils.Payload(0).read())
@@ -96,11 +96,72 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             ["foo", "bar", "arg1", "arg2"],
             stdin=None)
 
+    @mock.patch("%s.sshutils.SSHFanOut" % VMTASKS_UTILS)
+    def test__run_command_over_ssh_on_hosts(self, mock_ssh_fan_out):
+        mock_ssh_fan_out.return_value.execute.return_value = [
+            {"host": "foo", "error": None}, {"host": "bar", "error": None}]
+        vm_scenario = utils.VMScenario(self.context)
+        results = vm_scenario._run_command_over_ssh_on_hosts(
+            ["ssh_foo", "ssh_bar"],
+            {"script_inline": "foobar", "interpreter": "/bin/sh"},
+            workers=5, timeout=10)
+
+        self.assertEqual(mock_ssh_fan_out.return_value.execute.return_value,
+                         results)
+        mock_ssh_fan_out.assert_called_once_with(["ssh_foo", "ssh_bar"], 5)
+        mock_ssh_fan_out.return_value.execute.assert_called_once_with(
+            ["/bin/sh"], stdin=mock.ANY, timeout=10)
+        self.assertFalse(mock_ssh_fan_out.return_value.put_file.called)
+        self._test_atomic_action_timer(vm_scenario.atomic_actions(),
+                                       "vm.run_command_over_ssh_on_hosts")
+
+    @mock.patch("%s.sshutils.SSHFanOut" % VMTASKS_UTILS)
+    def test__run_command_over_ssh_on_hosts_upload_fails(
+            self, mock_ssh_fan_out):
+        fan_out = mock_ssh_fan_out.return_value
+        fan_out.put_file.return_value = [
+            {"host": "foo", "error": "SSHError: foo"},
+            {"host": "bar", "error": None},
+            {"host": "baz", "error": None}]
+        fan_out.execute.return_value = [
+            {"host": "bar", "error": None, "exit_status": 0},
+            {"host": "baz", "error": None, "exit_status": 1}]
+        vm_scenario = utils.VMScenario(self.context)
+        results = vm_scenario._run_command_over_ssh_on_hosts(
+            ["ssh_foo", "ssh_bar", "ssh_baz"],
+            {"remote_path": "foo", "local_path": "/bin/false"})
+
+        self.assertEqual(["foo", "bar", "baz"],
+                         [r["host"] for r in results])
+        self.assertEqual("SSHError: foo", results[0]["error"])
+        self.assertEqual(
+            [mock.call(["ssh_foo", "ssh_bar", "ssh_baz"], 10),
+             mock.call(["ssh_bar", "ssh_baz"], 10)],
+            mock_ssh_fan_out.call_args_list)
+        fan_out.put_file.assert_called_once_with("/bin/false", "foo",
+                                                 mode=0o755)
+        fan_out.execute.assert_called_once_with(["foo"], stdin=None,
+                                                timeout=3600)
+        self._test_atomic_action_timer(vm_scenario.atomic_actions(),
+                                       "vm.put_file_on_hosts")
+
+    @mock.patch("%s.sshutils.SSHFanOut" % VMTASKS_UTILS)
+    def test__wait_for_ssh_on_hosts(self, mock_ssh_fan_out):
+        vm_scenario = utils.VMScenario(self.context)
+        self.assertEqual(
+            mock_ssh_fan_out.return_value.wait.return_value,
+            vm_scenario._wait_for_ssh_on_hosts(["ssh_foo"], workers=3))
+        mock_ssh_fan_out.assert_called_once_with(["ssh_foo"], 3)
+        mock_ssh_fan_out.return_value.wait.assert_called_once_with(
+            120, 1, max_interval=8.0)
+        self._test_atomic_action_timer(vm_scenario.atomic_actions(),
+                                       "vm.wait_for_ssh_on_hosts")
+
     def test__wait_for_ssh(self):
         ssh = mock.MagicMock()
         vm_scenario = utils.VMScenario(self.context)
         vm_scenario._wait_for_ssh(ssh)
-        ssh.wait.assert_called_once_with(120, 1)
+        ssh.wait.assert_called_once_with(120, 1, max_interval=8.0)
 
     def test__wait_for_ping(self):
         vm_scenario = utils.VMScenario(self.context)
@@ -125,8 +186,9 @@ class VMScenarioTestCase(test.ScenarioTestCase):
 
         mock_sshutils_ssh.assert_called_once_with(
             "username", "1.2.3.4",
-            port=22, pkey="ssh", password="password")
-        mock_sshutils_ssh.return_value.wait.assert_called_once_with(120, 1)
+            port=22, pkey="ssh", password="password", pool=utils.SSH_POOL)
+        mock_sshutils_ssh.return_value.wait.assert_called_once_with(
+            120, 1, max_interval=8.0)
         mock_vm_scenario__run_command_over_ssh.assert_called_once_with(
             mock_sshutils_ssh.return_value,
             {"script_file": "foo", "interpreter": "bar"})
@@ -186,7 +248,15 @@ class VMScenarioTestCase(test.ScenarioTestCase):
         scenario._attach_floating_ip.assert_called_once_with(
             server, "ext_network")
 
-    def test__delete_server_with_fixed_ip(self):
+    @mock.patch(VMTASKS_UTILS + ".multiprocessing.util.Finalize")
+    def test__register_ssh_pool_close(self, mock_finalize):
+        pool = mock.Mock()
+        utils._register_ssh_pool_close(pool)
+        mock_finalize.assert_called_once_with(pool, pool.close,
+                                              exitpriority=10)
+
+    @mock.patch(VMTASKS_UTILS + ".SSH_POOL")
+    def test__delete_server_with_fixed_ip(self, mock_ssh_pool):
         ip = {"ip": "foo_ip", "id": None, "is_floating": False}
         scenario, server = self.get_scenario()
         scenario._delete_floating_ip = mock.Mock()
@@ -194,8 +264,10 @@ class VMScenarioTestCase(test.ScenarioTestCase):
 
         self.assertEqual(scenario._delete_floating_ip.mock_calls, [])
         scenario._delete_server.assert_called_once_with(server, force=True)
+        mock_ssh_pool.discard.assert_called_once_with("foo_ip")
 
-    def test__delete_server_with_fip(self):
+    @mock.patch(VMTASKS_UTILS + ".SSH_POOL")
+    def test__delete_server_with_fip(self, mock_ssh_pool):
         fip = {"ip": "foo_ip", "id": "foo_id", "is_floating": True}
         scenario, server = self.get_scenario()
         scenario._delete_floating_ip = mock.Mock()
@@ -203,6 +275,7 @@ class VMScenarioTestCase(test.ScenarioTestCase):
 
         scenario._delete_floating_ip.assert_called_once_with(server, fip)
         scenario._delete_server.assert_called_once_with(server, force=True)
+        mock_ssh_pool.discard.assert_called_once_with("foo_ip")
 
     @mock.patch(VMTASKS_UTILS + ".network_wrapper.wrap")
     def test__attach_floating_ip(self, mock_wrap):
@@ -224,6 +224,99 @@ class VMTasksTestCase(test.ScenarioTestCase):
             additive={"title": "Command output", "chart_plugin": "Lines",
                       "data": [["foo", 42.0]]})
 
+    def _create_servers_env(self, results):
+        self.context["user"]["keypair"]["private"] = "foo_pkey"
+        scenario = vmtasks.BootServersRuncommandDelete(self.context)
+        scenario._boot_server_with_fip = mock.Mock(side_effect=[
+            ("server_%d" % i, {"ip": "ip_%d" % i}) for i in range(2)])
+        scenario._wait_for_ssh_on_hosts = mock.Mock(
+            return_value=[{"host": "ip_0", "error": None},
+                          {"host": "ip_1", "error": None}])
+        scenario._run_command_over_ssh_on_hosts = mock.Mock(
+            return_value=results)
+        scenario._delete_server_with_fip = mock.Mock()
+        scenario.add_output = mock.Mock()
+        return scenario
+
+    @mock.patch("%s.sshutils.SSH" % BASE)
+    def test_boot_servers_runcommand_delete(self, mock_ssh):
+        scenario = self._create_servers_env([
+            {"host": "ip_0", "error": None, "exit_status": 0,
+             "stdout": "foo_out", "stderr": "", "duration": 1.0},
+            {"host": "ip_1", "error": None, "exit_status": 0,
+             "stdout": "bar_out", "stderr": "", "duration": 3.0}])
+        command = {"script_inline": "foo", "interpreter": "/bin/sh"}
+        scenario.run("foo_flavor", "foo_user", command, image="foo_image",
+                     servers_count=2, workers=4, command_timeout=10,
+                     max_output_length=3, foo_arg="foo_value")
+
+        self.assertEqual(
+            [mock.call("foo_image", "foo_flavor", use_floating_ip=True,
+                       floating_network=None, key_name="keypair_name",
+                       foo_arg="foo_value")] * 2,
+            scenario._boot_server_with_fip.call_args_list)
+        self.assertEqual(
+            [mock.call("foo_user", "ip_%d" % i, port=22, pkey="foo_pkey",
+                       password=None, pool=vmtasks.vm_utils.SSH_POOL)
+             for i in range(2)],
+            mock_ssh.call_args_list)
+        ssh_clients = [mock_ssh.return_value] * 2
+        scenario._wait_for_ssh_on_hosts.assert_called_once_with(
+            ssh_clients, workers=4)
+        scenario._run_command_over_ssh_on_hosts.assert_called_once_with(
+            ssh_clients, command, workers=4, timeout=10)
+        self.assertEqual(
+            [mock.call("server_%d" % i, {"ip": "ip_%d" % i},
+                       force_delete=False) for i in range(2)],
+            scenario._delete_server_with_fip.call_args_list)
+        self.assertEqual(
+            [mock.call(additive={
+                "title": "Servers",
+                "description": "Number of servers where command succeeded "
+                               "and failed",
+                "chart_plugin": "StackedArea",
+                "data": [["succeeded", 2], ["failed", 0]]}),
+             mock.call(additive={
+                 "title": "Command duration on servers",
+                 "chart_plugin": "Lines",
+                 "data": [["min", 1.0], ["avg", 2.0], ["max", 3.0]],
+                 "label": "Seconds"}),
+             mock.call(complete={
+                 "title": "Command results",
+                 "chart_plugin": "Table",
+                 "data": {"cols": ["Server", "Exit status", "Duration",
+                                   "SSH error", "Stdout", "Stderr"],
+                          "rows": [["ip_0", 0, 1.0, "", "out", ""],
+                                   ["ip_1", 0, 3.0, "", "out", ""]]}})],
+            scenario.add_output.call_args_list)
+
+    @mock.patch("%s.sshutils.SSH" % BASE)
+    def test_boot_servers_runcommand_delete_fails(self, mock_ssh):
+        scenario = self._create_servers_env([
+            {"host": "ip_0", "error": "SSHError: foo", "duration": 1.0},
+            {"host": "ip_1", "error": None, "exit_status": 0,
+             "stdout": "", "stderr": "", "duration": 3.0}])
+
+        e = self.assertRaises(exceptions.ScriptError, scenario.run,
+                              "foo_flavor", "foo_user", {}, image="img")
+        self.assertIn("failed on 1 of 2 servers: ip_0", "%s" % e)
+        rows = scenario.add_output.call_args_list[2][1][
+            "complete"]["data"]["rows"]
+        self.assertEqual(["ip_0", None, 1.0, "SSHError: foo", "", ""],
+                         rows[0])
+        self.assertEqual(2, scenario._delete_server_with_fip.call_count)
+
+    @mock.patch("%s.sshutils.SSH" % BASE)
+    def test_boot_servers_runcommand_delete_ssh_timeout(self, mock_ssh):
+        scenario = self._create_servers_env([])
+        scenario._wait_for_ssh_on_hosts.return_value[1]["error"] = "foo"
+
+        self.assertRaises(exceptions.SSHTimeout, scenario.run,
+                          "foo_flavor", "foo_user", {}, image="img")
+        self.assertFalse(scenario._run_command_over_ssh_on_hosts.called)
+        self.assertFalse(scenario.add_output.called)
+        self.assertEqual(2, scenario._delete_server_with_fip.call_count)
+
     @mock.patch("%s.heat" % BASE)
     @mock.patch("%s.sshutils" % BASE)
     def test_runcommand_heat(self, mock_sshutils, mock_heat):
@@ -66,6 +66,19 @@ class OpenStackScenarioTestCase(test.TestCase):
 
         self.osclients.mock.assert_called_once_with(user["credential"], {})
 
+    def test_init_user_context_with_token(self):
+        token = mock.Mock()
+        user = {"credential": mock.Mock(), "tenant_id": "foo",
+                "token": token}
+        self.context["users"] = [user]
+        self.context["tenants"] = {"foo": {"name": "bar"}}
+        self.context["user_choice_method"] = "random"
+
+        base_scenario.OpenStackScenario(self.context)
+
+        self.osclients.mock.assert_called_once_with(
+            user["credential"], {}, auth_ref=token.auth_ref)
+
     def test_init_clients(self):
         scenario = base_scenario.OpenStackScenario(self.context,
                                                    admin_clients="spam",
@@ -97,6 +110,20 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
 
+    def test__choose_user_with_index(self):
+        self.context["users"] = [{"id": "0", "tenant_id": "foo"}]
+        self.context["tenants"] = {"foo": {"name": "foo"}}
+        index = mock.Mock()
+        index.choose.return_value = ("user", "tenant")
+        self.context["user_selection"] = index
+
+        scenario = base_scenario.OpenStackScenario()
+        scenario._choose_user(self.context)
+
+        index.choose.assert_called_once_with(self.context)
+        self.assertEqual("user", self.context["user"])
+        self.assertEqual("tenant", self.context["tenant"])
+
     @ddt.data((1, "0", "bar"),
               (2, "0", "foo"),
               (3, "1", "bar"),
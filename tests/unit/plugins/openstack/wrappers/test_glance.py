@@ -96,7 +96,7 @@ class GlanceV1WrapperTestCase(test.ScenarioTestCase):
         call_args["disk_format"] = "disk_format"
         if location.startswith("/"):
             call_args["data"] = mock_open.return_value
-            mock_open.assert_called_once_with(location)
+            mock_open.assert_called_once_with(location, "rb")
             mock_open.return_value.close.assert_called_once_with()
         else:
             call_args["copy_from"] = location
@@ -225,7 +225,7 @@ class GlanceV2WrapperTestCase(test.ScenarioTestCase):
 
         if location.startswith("/"):
             data = mock_open.return_value
-            mock_open.assert_called_once_with(location)
+            mock_open.assert_called_once_with(location, "rb")
         else:
             data = mock_requests_get.return_value.raw
             mock_requests_get.assert_called_once_with(location, stream=True)
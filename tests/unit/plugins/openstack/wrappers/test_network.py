@@ -18,6 +18,7 @@ import mock
 from rally.common import utils
 from rally import consts
 from rally import exceptions
+from rally import osclients
 from rally.plugins.openstack.wrappers import network
 from tests.unit import test
 
@@ -535,6 +536,15 @@ class NeutronWrapperTestCase(test.TestCase):
         wrap.client.list_extensions.return_value = {}
         self.assertFalse(wrap.supports_extension("extension")[0])
 
+    def test_supports_extension_via_osclients(self):
+        clients = mock.Mock(spec=osclients.Clients)
+        clients.neutron_extensions.return_value = ["extension"]
+        wrap = network.NeutronWrapper(clients, self.owner)
+
+        self.assertTrue(wrap.supports_extension("extension")[0])
+        self.assertFalse(wrap.supports_extension("dummy-group")[0])
+        self.assertFalse(wrap.client.list_extensions.called)
+
 
 class FunctionsTestCase(test.TestCase):
 
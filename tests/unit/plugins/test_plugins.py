@@ -0,0 +1,78 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally import plugins
+from tests.unit import test
+
+PLUGINS = "rally.plugins"
+
+
+@mock.patch("%s.discover" % PLUGINS)
+@mock.patch("%s.manifest" % PLUGINS)
+class LoadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LoadTestCase, self).setUp()
+        patcher = mock.patch("%s.PLUGINS_LOADED" % PLUGINS, False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load(self, mock_manifest, mock_discover):
+        plugins.load()
+
+        self.assertEqual(
+            [mock.call(package) for package in plugins.PACKAGES],
+            mock_discover.import_modules_from_package.call_args_list)
+        self.assertEqual(2, mock_discover.load_plugins.call_count)
+        self.assertFalse(mock_manifest.load.called)
+        self.assertTrue(plugins.PLUGINS_LOADED)
+
+        mock_discover.reset_mock()
+        plugins.load()
+        self.assertFalse(mock_discover.import_modules_from_package.called)
+        mock_discover.import_lazy_plugins.assert_called_once_with()
+
+    def test_load_lazy(self, mock_manifest, mock_discover):
+        mock_manifest.is_up_to_date.return_value = True
+        plugins_manifest = mock_manifest.load.return_value
+
+        plugins.load(lazy=True)
+
+        mock_manifest.load.assert_called_once_with(plugins.MANIFEST_PATH)
+        mock_manifest.is_up_to_date.assert_called_once_with(
+            plugins_manifest, plugins.PACKAGES)
+        mock_discover.register_lazy_plugins.assert_called_once_with(
+            plugins_manifest.__getitem__.return_value,
+            plugins_manifest.__getitem__.return_value)
+        self.assertFalse(mock_manifest.generate.called)
+        self.assertFalse(mock_discover.import_modules_from_package.called)
+        self.assertEqual(2, mock_discover.load_plugins.call_count)
+
+        mock_discover.reset_mock()
+        plugins.load(lazy=True)
+        self.assertFalse(mock_discover.import_lazy_plugins.called)
+
+    def test_load_lazy_outdated_manifest(self, mock_manifest, mock_discover):
+        mock_manifest.is_up_to_date.return_value = False
+        mock_manifest.save.side_effect = IOError
+
+        plugins.load(lazy=True)
+
+        mock_manifest.generate.assert_called_once_with(plugins.PACKAGES)
+        mock_manifest.save.assert_called_once_with(
+            mock_manifest.generate.return_value, plugins.MANIFEST_PATH)
+        self.assertFalse(mock_discover.register_lazy_plugins.called)
+        self.assertEqual(2, mock_discover.load_plugins.call_count)
@@ -69,11 +69,26 @@ class ChartTestCase(test.TestCase):
         self.assertEqual([("foo_a", "a_points"), ("foo_b", "b_points")],
                          chart.render())
 
-    def test__fix_atomic_actions(self):
+    def test__get_atomic_actions(self):
         chart = self.Chart(self.wload_info)
         self.assertEqual(
-            {"atomic_actions": {"a": 5, "b": 6, "c": 0}},
-            chart._fix_atomic_actions({"atomic_actions": {"a": 5, "b": 6}}))
+            {"a": 5, "b": 6, "c": 0},
+            chart._get_atomic_actions({"atomic_actions": {"a": 5, "b": 6}}))
+
+    def test__get_atomic_actions_nested(self):
+        chart = self.Chart({"atomic": collections.OrderedDict(
+            [("a", {}), ("a > b", {}), ("a > c", {})])})
+        iteration = {"atomic_actions": [
+            {"name": "a", "started_at": 1, "finished_at": 5, "children": [
+                {"name": "b", "started_at": 1, "finished_at": 2,
+                 "children": []}]},
+            {"name": "a", "started_at": 5, "finished_at": 7,
+             "children": []}]}
+        self.assertEqual(collections.OrderedDict([("a", 6)]),
+                         chart._get_atomic_actions(iteration))
+        self.assertEqual(
+            collections.OrderedDict([("a", 6), ("a > b", 1), ("a > c", 0)]),
+            chart._get_atomic_actions(iteration, nested=True))
 
 
 class MainStackedAreaChartTestCase(test.TestCase):
@@ -504,6 +519,56 @@ class MainStatsTableTestCase(test.TestCase):
                     "rows": expected_rows}
         self.assertEqual(expected, table.render())
 
+    def test_add_iteration_and_render_nested(self):
+        table = charts.MainStatsTable(
+            {"iterations_count": 1,
+             "atomic": collections.OrderedDict([("foo", {}),
+                                                ("foo > bar", {})])})
+        table.add_iteration({
+            "atomic_actions": [
+                {"name": "foo", "started_at": 0, "finished_at": 3,
+                 "children": [{"name": "bar", "started_at": 0,
+                               "finished_at": 1, "children": []},
+                              {"name": "bar", "started_at": 1,
+                               "finished_at": 2, "children": []}]}],
+            "duration": 4.0,
+            "error": []})
+
+        self.assertEqual(
+            [["foo", 3.0, 3.0, 3.0, 3.0, 3.0, 3.0, "100.0%", 1],
+             ["foo > bar", 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, "100.0%", 1],
+             ["total", 4.0, 4.0, 4.0, 4.0, 4.0, 4.0, "100.0%", 1]],
+            table.render()["rows"])
+
+
+class HttpCallsTableTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        def call(url, count, errors, duration, action="foo"):
+            return {"method": "GET", "service": "compute", "url": url,
+                    "atomic_action": action, "count": count,
+                    "errors": errors, "duration": duration}
+
+        table = charts.HttpCallsTable({"iterations_count": 3})
+        table.add_iteration({"atomic_actions": []})
+        table.add_iteration({"http_calls": [
+            call("/servers", 1, 0, 1.0), call("/servers/{id}", 1, 0, 0.5),
+            call("/servers/{id}", 1, 1, 1.5, action=None)]})
+        table.add_iteration({"http_calls": [call("/servers", 2, 1, 5.0)]})
+
+        self.assertEqual(
+            {"cols": ["Request", "Atomic action", "Min (sec)",
+                      "Median (sec)", "90%ile (sec)", "Max (sec)",
+                      "Avg (sec)", "Errors", "Count"],
+             "rows": [
+                 ["GET compute /servers", "foo", 1.0, 1.75, 2.35, 2.5, 1.75,
+                  1, 3],
+                 ["GET compute /servers/{id}", "foo", 0.5, 0.5, 0.5, 0.5,
+                  0.5, 0, 1],
+                 ["GET compute /servers/{id}", "n/a", 1.5, 1.5, 1.5, 1.5,
+                  1.5, 1, 1]]},
+            table.render())
+
 
 class OutputChartTestCase(test.TestCase):
 
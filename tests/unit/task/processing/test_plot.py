@@ -14,6 +14,9 @@
 #    under the License.
 
 import json
+import os
+import shutil
+import tempfile
 
 import ddt
 import mock
@@ -38,7 +41,8 @@ class PlotTestCase(test.TestCase):
                 (mock_charts.LoadProfileChart, "load_profile"),
                 (mock_charts.MainHistogramChart, "main_histogram"),
                 (mock_charts.AtomicHistogramChart, "atomic_histogram"),
-                (mock_charts.AtomicAvgChart, "atomic_avg")]:
+                (mock_charts.AtomicAvgChart, "atomic_avg"),
+                (mock_charts.HttpCallsTable, "http_calls")]:
             setattr(mock_ins.return_value.render, "return_value", ret)
         iterations = [
             {"timestamp": i + 2, "error": [],
@@ -77,7 +81,8 @@ class PlotTestCase(test.TestCase):
              "complete_output": [[], [], [], [], [], [], [], [], [], []],
              "has_output": False,
              "output_errors": [],
-             "sla": [], "sla_success": True, "table": "main_stats"},
+             "sla": [], "sla_success": True, "table": "main_stats",
+             "http_calls": "http_calls"},
             result)
 
     @ddt.data(
@@ -179,33 +184,134 @@ class PlotTestCase(test.TestCase):
              {"cls": "b_cls", "met": "dummy", "name": "1", "pos": "1"},
              {"cls": "c_cls", "met": "dummy", "name": "0", "pos": "0"}])
 
+    @mock.patch(PLOT + "_map")
+    def test__process_tasks_with_processor(self, mock__map):
+        tasks_results = [{"key": {"name": i, "kw": "kw_" + i}}
+                         for i in ("b", "a", "b")]
+        mock__map.return_value = [
+            {"cls": "b", "met": "m", "pos": "0"},
+            {"cls": "a", "met": "m", "pos": "0"},
+            {"cls": "b", "met": "m", "pos": "1"}]
+
+        source, tasks = plot._process_tasks(tasks_results, processor="foo",
+                                            processes=4)
+
+        mock__map.assert_called_once_with(
+            "foo", [(tasks_results[0], 0), (tasks_results[1], 0),
+                    (tasks_results[2], 1)], 4)
+        self.assertEqual([mock__map.return_value[1],
+                          mock__map.return_value[0],
+                          mock__map.return_value[2]], tasks)
+
+    @ddt.data(1, 2, None)
+    @mock.patch(PLOT + "multiprocessing.Pool")
+    def test__map(self, processes, mock_pool):
+        mock_pool.return_value.map.side_effect = lambda f, items, **kw: [
+            f(item) for item in items]
+        args_list = [(1, 2), (3, 4), (5, 6)]
+
+        self.assertEqual([3, 7, 11],
+                         plot._map(lambda a, b: a + b, args_list, processes))
+        if processes == 1:
+            self.assertFalse(mock_pool.called)
+        else:
+            mock_pool.assert_called_once_with(
+                min(processes or plot.multiprocessing.cpu_count(), 3))
+            mock_pool.return_value.join.assert_called_once_with()
+
+    @mock.patch(PLOT + "_process_scenario")
+    def test__process_scenario_to_file(self, mock__process_scenario):
+        workload = {"cls": "Foo", "met": "bar", "pos": "1", "name": "bar [2]",
+                    "runner": "constant", "load_duration": 1,
+                    "full_duration": 2, "created_at": "2017-01-01",
+                    "sla_success": True, "iterations_count": 3,
+                    "errors": [{"iteration": 1}], "hooks": [],
+                    "table": "big"}
+        mock__process_scenario.return_value = workload
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+
+        summary = plot._process_scenario_to_file(
+            data_dir, {"key": {"name": "Foo.bar/baz"}}, 1)
+
+        mock__process_scenario.assert_called_once_with(
+            {"key": {"name": "Foo.bar/baz"}}, 1)
+        data_file = "%s/Foo.bar_baz-1.js" % os.path.basename(data_dir)
+        self.assertEqual({"cls": "Foo", "met": "bar", "pos": "1",
+                          "name": "bar [2]", "runner": "constant",
+                          "load_duration": 1, "full_duration": 2,
+                          "created_at": "2017-01-01", "sla_success": True,
+                          "iterations_count": 3, "errors_count": 1,
+                          "hooks_count": 0, "data_file": data_file},
+                         summary)
+        with open(os.path.join(data_dir, "Foo.bar_baz-1.js")) as f:
+            content = f.read()
+        prefix = "rallyLoadWorkload(%s, " % json.dumps(data_file)
+        self.assertTrue(content.startswith(prefix))
+        self.assertEqual(workload,
+                         json.loads(content[len(prefix):-len(");\n")]))
+
+    @mock.patch(PLOT + "_extend_results")
+    def test__extend_and_process(self, mock__extend_results):
+        mock__extend_results.return_value = ["extended_result"]
+        processor = mock.Mock(return_value="workload")
+
+        self.assertEqual("workload",
+                         plot._extend_and_process(processor, "result", 2))
+        mock__extend_results.assert_called_once_with(["result"])
+        processor.assert_called_once_with("extended_result", 2)
+
+    @mock.patch(PLOT + "_process_tasks")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    @mock.patch("rally.common.version.version_string", return_value="42.0")
+    def test_plot_lazy(self, mock_version_string, mock_get_template,
+                       mock__process_tasks):
+        mock__process_tasks.return_value = "source", ["summary"]
+        mock_get_template.return_value.render.return_value = "tasks_html"
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        data_dir = os.path.join(tmp_dir, "report_data")
+
+        html = plot.plot_lazy("tasks_results", data_dir, include_libs=True,
+                              processes=2)
+
+        self.assertEqual("tasks_html", html)
+        self.assertTrue(os.path.isdir(data_dir))
+        mock__process_tasks.assert_called_once_with(
+            "tasks_results", processor=mock.ANY, processes=2)
+        processor = mock__process_tasks.call_args[1]["processor"]
+        self.assertEqual(plot._extend_and_process, processor.func)
+        self.assertEqual(plot._process_scenario_to_file,
+                         processor.args[0].func)
+        self.assertEqual((data_dir,), processor.args[0].args)
+        mock_get_template.return_value.render.assert_called_once_with(
+            version="42.0", data="[\"summary\"]", source="\"source\"",
+            include_libs=True)
+
     @ddt.data({},
-              {"include_libs": True},
+              {"include_libs": True, "processes": 4},
               {"include_libs": False})
     @ddt.unpack
     @mock.patch(PLOT + "_process_tasks")
-    @mock.patch(PLOT + "_extend_results")
     @mock.patch(PLOT + "ui_utils.get_template")
     @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_" + s)
     @mock.patch("rally.common.version.version_string", return_value="42.0")
     def test_plot(self, mock_version_string, mock_dumps, mock_get_template,
-                  mock__extend_results, mock__process_tasks, **ddt_kwargs):
+                  mock__process_tasks, **ddt_kwargs):
         mock__process_tasks.return_value = "source", "scenarios"
         mock_get_template.return_value.render.return_value = "tasks_html"
-        mock__extend_results.return_value = ["extended_result"]
         html = plot.plot("tasks_results", **ddt_kwargs)
         self.assertEqual(html, "tasks_html")
-        mock__extend_results.assert_called_once_with("tasks_results")
         mock_get_template.assert_called_once_with("task/report.html")
-        mock__process_tasks.assert_called_once_with(["extended_result"])
-        if "include_libs" in ddt_kwargs:
-            mock_get_template.return_value.render.assert_called_once_with(
-                version="42.0", data="json_scenarios", source="json_source",
-                include_libs=ddt_kwargs["include_libs"])
-        else:
-            mock_get_template.return_value.render.assert_called_once_with(
-                version="42.0", data="json_scenarios", source="json_source",
-                include_libs=False)
+        mock__process_tasks.assert_called_once_with(
+            "tasks_results", processor=mock.ANY,
+            processes=ddt_kwargs.get("processes", 1))
+        processor = mock__process_tasks.call_args[1]["processor"]
+        self.assertEqual(plot._extend_and_process, processor.func)
+        self.assertEqual((plot._process_scenario,), processor.args)
+        mock_get_template.return_value.render.assert_called_once_with(
+            version="42.0", data="json_scenarios", source="json_source",
+            include_libs=ddt_kwargs.get("include_libs", False))
 
     @mock.patch(PLOT + "objects.Task.extend_results")
     def test__extend_results(self, mock_task_extend_results):
@@ -237,26 +343,75 @@ class PlotTestCase(test.TestCase):
         self.assertEqual([], plot._extend_results([]))
 
     @mock.patch(PLOT + "Trends")
-    @mock.patch(PLOT + "ui_utils.get_template")
     @mock.patch(PLOT + "_extend_results")
+    def test__make_trends_point(self, mock__extend_results, mock_trends):
+        result = {"key": "key", "sla": "sla", "result": "raw"}
+
+        point = plot._make_trends_point(result)
+
+        self.assertEqual(mock_trends.return_value.make_point.return_value,
+                         point)
+        mock__extend_results.assert_called_once_with([result])
+        mock_trends.return_value.make_point.assert_called_once_with(
+            mock__extend_results.return_value[0])
+
+    @mock.patch(PLOT + "Trends")
+    @mock.patch(PLOT + "_extend_results")
+    def test__make_trends_point_from_statistics(self, mock__extend_results,
+                                                mock_trends):
+        result = {"key": "key", "sla": "sla", "result": [],
+                  "statistics": {"durations": "stat", "tstamp_start": 42}}
+
+        point = plot._make_trends_point(result)
+
+        self.assertEqual(mock_trends.return_value.make_point.return_value,
+                         point)
+        self.assertFalse(mock__extend_results.called)
+        mock_trends.return_value.make_point.assert_called_once_with(
+            {"key": "key", "sla": "sla",
+             "info": {"stat": "stat", "tstamp_start": 42}})
+
+    @ddt.data(1, None)
+    @mock.patch(PLOT + "Trends")
+    @mock.patch(PLOT + "_map")
+    @mock.patch(PLOT + "ui_utils.get_template")
     @mock.patch("rally.common.version.version_string", return_value="42.0")
-    def test_trends(self, mock_version_string, mock__extend_results,
-                    mock_get_template, mock_trends):
-        mock__extend_results.return_value = ["foo", "bar"]
-        trends = mock.Mock()
+    def test_trends(self, processes, mock_version_string, mock_get_template,
+                    mock__map, mock_trends):
+        mock__map.return_value = ["foo_point", "bar_point"]
+        trends = mock_trends.return_value
         trends.get_data.return_value = ["foo", "bar"]
-        mock_trends.return_value = trends
-        template = mock.Mock()
+        template = mock_get_template.return_value
         template.render.return_value = "trends html"
-        mock_get_template.return_value = template
 
-        self.assertEqual("trends html", plot.trends("tasks_results"))
-        self.assertEqual([mock.call("foo"), mock.call("bar")],
-                         trends.add_result.mock_calls)
+        self.assertEqual("trends html",
+                         plot.trends(["foo", "bar"], processes=processes,
+                                     points=["stored_point"]))
+        mock__map.assert_called_once_with(
+            plot._make_trends_point, [("foo",), ("bar",)], processes)
+        self.assertEqual([mock.call("stored_point"), mock.call("foo_point"),
+                          mock.call("bar_point")],
+                         trends.add_point.mock_calls)
         mock_get_template.assert_called_once_with("task/trends.html")
         template.render.assert_called_once_with(version="42.0",
                                                 data="[\"foo\", \"bar\"]")
 
+    def test_trends_from_statistics(self):
+        stat = {"cols": ["Action", "Min (sec)", "Median (sec)",
+                         "90%ile (sec)", "95%ile (sec)", "Max (sec)",
+                         "Avg (sec)", "Success", "Count"],
+                "rows": [["total", 1, 2, 3, 4, 5, 3, "100.0%", 2]]}
+        results = [{"key": {"name": "Foo.bar", "kw": {"args": {}}},
+                    "sla": [{"success": i == 0}], "result": [],
+                    "load_duration": 1, "full_duration": 2,
+                    "statistics": {"durations": stat, "tstamp_start": i}}
+                   for i in range(3)]
+
+        html = plot.trends(results)
+
+        self.assertIn("\"sla_failures\": 2", html)
+        self.assertIn("\"length\": 3", html)
+
 
 @ddt.ddt
 class TrendsTestCase(test.TestCase):
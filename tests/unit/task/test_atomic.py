@@ -15,6 +15,7 @@
 
 import collections
 
+import ddt
 import mock
 
 from rally.task import atomic
@@ -39,9 +40,29 @@ class AtomicActionTestCase(test.TestCase):
                 with atomic.ActionTimer(inst, "some"):
                     pass
 
-        expected = [("test", 20), ("test (2)", 12), ("some", 4)]
-        self.assertEqual(collections.OrderedDict(expected),
-                         inst.atomic_actions())
+        expected = [{"name": "test", "started_at": 1, "finished_at": 21,
+                     "children": [
+                         {"name": "test", "started_at": 3, "finished_at": 15,
+                          "children": [
+                              {"name": "some", "started_at": 6,
+                               "finished_at": 10, "children": []}]}]}]
+        self.assertEqual(expected, inst.atomic_actions())
+
+    @mock.patch("time.time", side_effect=[1, 3, 6, 10])
+    def test_action_timer_context_sequential(self, mock_time):
+        inst = atomic.ActionTimerMixin()
+
+        with atomic.ActionTimer(inst, "test"):
+            pass
+        with atomic.ActionTimer(inst, "test"):
+            pass
+
+        self.assertEqual(
+            [{"name": "test", "started_at": 1, "finished_at": 3,
+              "children": []},
+             {"name": "test", "started_at": 6, "finished_at": 10,
+              "children": []}],
+            inst.atomic_actions())
 
     @mock.patch("time.time", side_effect=[1, 3])
     def test_action_timer_context_with_exception(self, mock_time):
@@ -56,9 +77,25 @@ class AtomicActionTestCase(test.TestCase):
         except TestException:
             pass
 
-        expected = [("test", 2)]
-        self.assertEqual(collections.OrderedDict(expected),
-                         inst.atomic_actions())
+        expected = [{"name": "test", "started_at": 1, "finished_at": 3,
+                     "children": []}]
+        self.assertEqual(expected, inst.atomic_actions())
+
+    @mock.patch("time.time", side_effect=[1, 2, 2.5, 3])
+    def test_add_atomic_action(self, mock_time):
+        inst = atomic.ActionTimerMixin()
+
+        with atomic.ActionTimer(inst, "test"):
+            atomic.add_atomic_action(inst, "some", 0.5)
+            atomic.add_atomic_action(inst, "some", 0.5)
+
+        expected = [{"name": "test", "started_at": 1, "finished_at": 3,
+                     "children": [
+                         {"name": "some", "started_at": 1.5,
+                          "finished_at": 2, "children": []},
+                         {"name": "some", "started_at": 2,
+                          "finished_at": 2.5, "children": []}]}]
+        self.assertEqual(expected, inst.atomic_actions())
 
     @mock.patch("time.time", side_effect=[1, 3])
     def test_action_timer_decorator(self, mock_time):
@@ -71,7 +108,8 @@ class AtomicActionTestCase(test.TestCase):
 
         inst = Some()
         self.assertEqual(5, inst.some_func(2, 3))
-        self.assertEqual(collections.OrderedDict({"some": 2}),
+        self.assertEqual([{"name": "some", "started_at": 1,
+                           "finished_at": 3, "children": []}],
                          inst.atomic_actions())
 
     @mock.patch("time.time", side_effect=[1, 3])
@@ -88,7 +126,8 @@ class AtomicActionTestCase(test.TestCase):
 
         inst = TestTimer()
         self.assertRaises(TestException, inst.some_func)
-        self.assertEqual(collections.OrderedDict({"test": 2}),
+        self.assertEqual([{"name": "test", "started_at": 1,
+                           "finished_at": 3, "children": []}],
                          inst.atomic_actions())
 
     @mock.patch("time.time", side_effect=[1, 3, 1, 3])
@@ -105,22 +144,92 @@ class AtomicActionTestCase(test.TestCase):
             def other_func(self, a, b):
                 return a + b
 
+        expected = [{"name": "some", "started_at": 1, "finished_at": 3,
+                     "children": []}]
+
         inst = TestAtomicTimer()
         self.assertEqual(5, inst.some_func(2, 3))
-        self.assertEqual(collections.OrderedDict({"some": 2}),
-                         inst.atomic_actions())
+        self.assertEqual(expected, inst.atomic_actions())
 
         inst = TestAtomicTimer()
         self.assertEqual(5, inst.some_func(2, 3, atomic_action=False))
-        self.assertEqual(collections.OrderedDict(),
-                         inst.atomic_actions())
+        self.assertEqual([], inst.atomic_actions())
 
         inst = TestAtomicTimer()
         self.assertEqual(5, inst.other_func(2, 3))
-        self.assertEqual(collections.OrderedDict(),
-                         inst.atomic_actions())
+        self.assertEqual([], inst.atomic_actions())
 
         inst = TestAtomicTimer()
         self.assertEqual(5, inst.other_func(2, 3, foo=True))
-        self.assertEqual(collections.OrderedDict({"some": 2}),
-                         inst.atomic_actions())
+        self.assertEqual(expected, inst.atomic_actions())
+
+
+def _action(name, started_at, finished_at, children=None):
+    return {"name": name, "started_at": started_at,
+            "finished_at": finished_at, "children": children or []}
+
+
+@ddt.ddt
+class AtomicActionsProcessingTestCase(test.TestCase):
+
+    def test_get_duration(self):
+        self.assertEqual(2, atomic.get_duration(_action("foo", 1, 3)))
+        self.assertEqual(0, atomic.get_duration(_action("foo", 1, None)))
+
+    def test_get_running_atomic_action(self):
+        self.assertIsNone(atomic.get_running_atomic_action([]))
+        actions = [_action("foo", 0, 1),
+                   _action("bar", 1, None, [_action("baz", 1, 2),
+                                            _action("qux", 2, None)])]
+        self.assertEqual("bar > qux",
+                         atomic.get_running_atomic_action(actions))
+        actions[1]["finished_at"] = 3
+        self.assertIsNone(atomic.get_running_atomic_action(actions))
+
+    def test_convert_legacy_atomic_actions(self):
+        actions = collections.OrderedDict([("foo", 1), ("bar", None),
+                                           ("foo (2)", 2), ("baz (2)", 3)])
+        self.assertEqual(
+            [_action("foo", 0, 1), _action("bar", 0, 0),
+             _action("foo", 0, 2), _action("baz (2)", 0, 3)],
+            atomic.convert_legacy_atomic_actions(actions))
+
+        actions = [_action("foo", 0, 1)]
+        self.assertIs(actions, atomic.convert_legacy_atomic_actions(actions))
+
+    def test_merge_atomic_actions(self):
+        actions = [_action("foo", 0, 1, [_action("bar", 0, 0.5)]),
+                   _action("baz", 1, 2),
+                   _action("foo", 2, 4, [_action("bar", 2, 3),
+                                         _action("qux", 3, 4)])]
+        expected = collections.OrderedDict([
+            ("foo", {"duration": 3, "count": 2,
+                     "children": collections.OrderedDict([
+                         ("bar", {"duration": 1.5, "count": 2,
+                                  "children": collections.OrderedDict()}),
+                         ("qux", {"duration": 1, "count": 1,
+                                  "children": collections.OrderedDict()})])}),
+            ("baz", {"duration": 1, "count": 1,
+                     "children": collections.OrderedDict()})])
+        self.assertEqual(expected, atomic.merge_atomic_actions(actions))
+
+    @ddt.data(
+        {"nested": False,
+         "expected": [("foo", 3), ("baz", 1)]},
+        {"nested": True,
+         "expected": [("foo", 3), ("foo > bar", 1.5), ("foo > bar > qux", 1),
+                      ("baz", 1)]})
+    @ddt.unpack
+    def test_flatten_atomic_actions(self, nested, expected):
+        actions = [_action("foo", 0, 1, [_action("bar", 0, 0.5)]),
+                   _action("baz", 1, 2),
+                   _action("foo", 2, 4, [_action("bar", 2, 3, [
+                       _action("qux", 2, 3)])])]
+        self.assertEqual(
+            collections.OrderedDict(expected),
+            atomic.flatten_atomic_actions(actions, nested=nested))
+
+    def test_flatten_atomic_actions_legacy(self):
+        actions = collections.OrderedDict([("foo", 1), ("foo (2)", 2)])
+        self.assertEqual(collections.OrderedDict([("foo", 3)]),
+                         atomic.flatten_atomic_actions(actions))
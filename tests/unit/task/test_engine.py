@@ -21,6 +21,7 @@ import threading
 
 import jsonschema
 import mock
+from oslo_config import cfg
 
 from rally.common import objects
 from rally import consts
@@ -29,6 +30,8 @@ from rally.task import engine
 from tests.unit import fakes
 from tests.unit import test
 
+CONF = cfg.CONF
+
 
 class TestException(exceptions.RallyException):
     msg_fmt = "TestException"
@@ -394,6 +397,39 @@ class TaskEngineTestCase(test.TestCase):
 
         self.assertEqual(2, mock_log.exception.call_count)
 
+    @mock.patch("rally.task.engine.metrics.export")
+    @mock.patch("rally.task.engine.objects.Credential")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager.cleanup")
+    @mock.patch("rally.task.engine.context.ContextManager.setup")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run_with_live_metrics(
+            self, mock_scenario_runner, mock_scenario,
+            mock_context_manager_setup, mock_context_manager_cleanup,
+            mock_result_consumer, mock_task_get_status, mock_credential,
+            mock_export):
+        scenario_cls = mock_scenario.get.return_value
+        scenario_cls.get_namespace.return_value = "openstack"
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        live_metrics = mock_export.return_value.__enter__.return_value
+        task = mock.MagicMock()
+        config = {"a.task": [{"runner": {"type": "a", "b": 1}}]}
+        deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", admin={"foo": "admin"})
+        eng = engine.TaskEngine(config, task, deployment)
+
+        eng.run()
+
+        mock_export.assert_called_once_with(task["uuid"])
+        mock_result_consumer.assert_called_once_with(
+            mock.ANY, task, mock.ANY, mock.ANY, mock.ANY, False,
+            live_metrics=live_metrics)
+        self.assertEqual(mock.call(consts.TaskStatus.FINISHED),
+                         task.update_status.mock_calls[-1])
+
     @mock.patch("rally.task.engine.objects.Credential")
     @mock.patch("rally.task.engine.ResultConsumer")
     @mock.patch("rally.task.engine.context.ContextManager.cleanup")
@@ -518,6 +554,78 @@ class TaskEngineTestCase(test.TestCase):
         mock_scenario_get.assert_called_once_with(name)
 
 
+class WorkloadDataWriterTestCase(test.TestCase):
+
+    def test_write_batches(self):
+        workload = mock.Mock(spec=objects.Workload)
+        writer = engine.WorkloadDataWriter(workload, queue_size=10,
+                                           batch_size=2)
+        for i in range(5):
+            writer.put(i, {"raw": [i]})
+        writer.start()
+        writer.close()
+
+        self.assertEqual(
+            [mock.call([(0, {"raw": [0]}), (1, {"raw": [1]})]),
+             mock.call([(2, {"raw": [2]}), (3, {"raw": [3]})]),
+             mock.call([(4, {"raw": [4]})])],
+            workload.add_workload_data_chunks.call_args_list)
+        self.assertFalse(writer.thread.is_alive())
+
+    def test_write_nothing(self):
+        workload = mock.Mock(spec=objects.Workload)
+        writer = engine.WorkloadDataWriter(workload, queue_size=1,
+                                           batch_size=1)
+        writer.start()
+        writer.close()
+
+        self.assertFalse(workload.add_workload_data_chunks.called)
+
+    @mock.patch("rally.task.engine.LOG")
+    def test_write_failed(self, mock_log):
+        workload = mock.MagicMock(spec=objects.Workload)
+        error = TestException()
+        workload.add_workload_data_chunks.side_effect = [error, None]
+        writer = engine.WorkloadDataWriter(workload, queue_size=2,
+                                           batch_size=1)
+        writer.put(0, {"raw": [0]})
+        writer.put(1, {"raw": [1]})
+        writer.start()
+
+        self.assertRaises(TestException, writer.close)
+        self.assertEqual(2, workload.add_workload_data_chunks.call_count)
+        self.assertEqual(1, mock_log.exception.call_count)
+
+    def test_write_progress(self):
+        workload = mock.Mock(spec=objects.Workload)
+        writer = engine.WorkloadDataWriter(workload, queue_size=10,
+                                           batch_size=10)
+        writer.put(0, {"raw": [0]})
+        writer.put_progress({"completed": 1})
+        writer.put(1, {"raw": [1]})
+        writer.start()
+        writer.close()
+
+        # progress is written after chunks scheduled before it
+        self.assertEqual(
+            [mock.call.add_workload_data_chunks([(0, {"raw": [0]})]),
+             mock.call.add_progress({"completed": 1}),
+             mock.call.add_workload_data_chunks([(1, {"raw": [1]})])],
+            workload.mock_calls)
+
+    @mock.patch("rally.task.engine.LOG")
+    def test_write_progress_failed(self, mock_log):
+        workload = mock.MagicMock(spec=objects.Workload)
+        workload.add_progress.side_effect = TestException()
+        writer = engine.WorkloadDataWriter(workload, queue_size=1,
+                                           batch_size=1)
+        writer.put_progress({"completed": 1})
+        writer.start()
+
+        writer.close()
+        self.assertTrue(mock_log.warning.called)
+
+
 class ResultConsumerTestCase(test.TestCase):
 
     @mock.patch("rally.common.objects.Task.get_status")
@@ -564,6 +672,9 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
             mock_task_get_status, mock_time, mock_log, mock_hook_executor):
         mock_time.side_effect = [0, 1]
+        CONF.set_override("progress_interval", 0, "task_metrics")
+        self.addCleanup(CONF.clear_override, "progress_interval",
+                        "task_metrics")
         mock_sla_instance = mock.MagicMock()
         mock_sla_results = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
@@ -589,6 +700,36 @@ class ResultConsumerTestCase(test.TestCase):
             "load_duration": 0
         })
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_writer_failure(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_sla_instance = mock_sla_checker.return_value
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        workload = mock.MagicMock(spec=objects.Workload)
+        error = TestException()
+        workload.add_workload_data_chunks.side_effect = error
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque(
+            [[{"duration": 1, "timestamp": 3}]])
+        runner.event_queue = collections.deque()
+
+        def consume():
+            with engine.ResultConsumer(key, mock.MagicMock(),
+                                       mock.Mock(spec=objects.Subtask),
+                                       workload, runner, False):
+                pass
+
+        self.assertRaises(TestException, consume)
+        mock_sla_instance.set_unexpected_failure.assert_called_once_with(
+            error)
+        workload.set_results.assert_called_once_with({
+            "full_duration": mock.ANY, "load_duration": mock.ANY,
+            "sla": mock_sla_instance.results.return_value})
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
@@ -707,6 +848,8 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
             mock_task_get_status, mock_conf):
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_queue_size = 1
+        mock_conf.raw_result_batch_size = 2
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -744,14 +887,20 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertEqual([{"duration": 7, "timestamp": 1}],
                          consumer_obj.results)
 
-        workload.add_workload_data.assert_has_calls([
-            mock.call(0, {"raw": [{"duration": 2, "timestamp": 2},
-                                  {"duration": 1, "timestamp": 3}]}),
-            mock.call(1, {"raw": [{"duration": 4, "timestamp": 2},
-                                  {"duration": 3, "timestamp": 3}]}),
-            mock.call(2, {"raw": [{"duration": 6, "timestamp": 2},
-                                  {"duration": 5, "timestamp": 3}]}),
-            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]})])
+        chunks = [chunk
+                  for c in workload.add_workload_data_chunks.call_args_list
+                  for chunk in c[0][0]]
+        self.assertEqual(
+            [(0, {"raw": [{"duration": 2, "timestamp": 2},
+                          {"duration": 1, "timestamp": 3}]}),
+             (1, {"raw": [{"duration": 4, "timestamp": 2},
+                          {"duration": 3, "timestamp": 3}]}),
+             (2, {"raw": [{"duration": 6, "timestamp": 2},
+                          {"duration": 5, "timestamp": 3}]}),
+             (3, {"raw": [{"duration": 7, "timestamp": 1}]})],
+            chunks)
+        self.assertFalse(workload.add_workload_data.called)
+        workload.set_results.assert_called_once_with(mock.ANY)
 
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.hook.HookExecutor")
@@ -763,6 +912,9 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
             mock_task_get_status, mock_time, mock_hook_executor, mock_log):
         mock_time.side_effect = [0, 1]
+        CONF.set_override("progress_interval", 0, "task_metrics")
+        self.addCleanup(CONF.clear_override, "progress_interval",
+                        "task_metrics")
         mock_sla_instance = mock_sla_checker.return_value
         mock_sla_results = mock_sla_instance.results.return_value
         mock_hook_executor_instance = mock_hook_executor.return_value
@@ -809,6 +961,95 @@ class ResultConsumerTestCase(test.TestCase):
             "load_duration": 0
         })
 
+    @mock.patch("rally.task.hook.HookExecutor")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_live_metrics(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_hook_executor):
+        mock_sla_checker.return_value.add_iteration.side_effect = [True,
+                                                                   False]
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        live_metrics = mock.Mock()
+        results = [{"duration": 1, "timestamp": 3},
+                   {"duration": 2, "timestamp": 2}]
+        runner.result_queue = collections.deque([results])
+        runner.event_queue = collections.deque([
+            {"type": "iteration", "value": 1},
+            {"type": "iteration", "value": 2},
+            {"type": "foo", "value": None}])
+
+        with engine.ResultConsumer(key, task, subtask, workload, runner,
+                                   False, live_metrics=live_metrics):
+            pass
+
+        live_metrics.start_workload.assert_called_once_with(key, runner)
+        live_metrics.add_results.assert_called_once_with(results, False)
+        self.assertEqual(2, live_metrics.iteration_started.call_count)
+        live_metrics.finish_workload.assert_called_once_with()
+        self.assertFalse(mock_hook_executor.return_value.on_event.called)
+
+    @mock.patch("rally.task.engine.metrics.ProgressRecorder")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_progress(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_progress_recorder):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        results = [{"duration": 1, "timestamp": 3}]
+        runner.result_queue = collections.deque([results])
+        runner.event_queue = collections.deque()
+        progress = mock_progress_recorder.return_value
+
+        with engine.ResultConsumer(key, task, subtask, workload, runner,
+                                   False) as consumer_obj:
+            pass
+
+        # records are written by the thread which writes raw results
+        mock_progress_recorder.assert_called_once_with(
+            key, workload, write=consumer_obj.writer.put_progress)
+        progress.start.assert_called_once_with()
+        progress.add.assert_called_once_with(results)
+        self.assertTrue(progress.record_if_due.called)
+        progress.record.assert_called_once_with(finished=True)
+
+    @mock.patch("rally.task.engine.metrics.ProgressRecorder")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_progress_disabled(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_progress_recorder):
+        CONF.set_override("progress_interval", 0, "task_metrics")
+        self.addCleanup(CONF.clear_override, "progress_interval",
+                        "task_metrics")
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque()
+        runner.event_queue = collections.deque()
+
+        with engine.ResultConsumer(key, mock.MagicMock(),
+                                   mock.Mock(spec=objects.Subtask),
+                                   mock.Mock(spec=objects.Workload), runner,
+                                   False) as consumer_obj:
+            pass
+
+        self.assertIsNone(consumer_obj.progress)
+        self.assertFalse(mock_progress_recorder.called)
+
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
     @mock.patch("rally.common.objects.Task.get_status")
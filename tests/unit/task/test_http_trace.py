@@ -0,0 +1,81 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import ddt
+
+from rally.task import atomic
+from rally.task import http_trace
+from tests.unit import test
+
+
+@ddt.ddt
+class HttpTraceTestCase(test.TestCase):
+
+    def setUp(self):
+        super(HttpTraceTestCase, self).setUp()
+        self.addCleanup(http_trace.stop)
+
+    @ddt.data(
+        ("/servers/detail", "/servers/detail"),
+        ("http://nova:8774/v2.1/servers?limit=1", "/v2.1/servers"),
+        ("/v2.1/0123456789abcdef0123456789abcdef/servers/"
+         "3f3b6a4c-7f5e-4b8e-9a3c-2b1c0d9e8f7a/action",
+         "/v2.1/{id}/servers/{id}/action"),
+        ("/v2/images/42", "/v2/images/{id}"),
+        ("/v2/images/rally_42", "/v2/images/rally_42"),
+        ("http://keystone:5000", "/"))
+    @ddt.unpack
+    def test_get_url_template(self, url, expected):
+        self.assertEqual(expected, http_trace.get_url_template(url))
+
+    def test_record(self):
+        inst = atomic.ActionTimerMixin()
+        self.assertFalse(http_trace.is_recording())
+        http_trace.record("get", "compute", "/servers", 200, 1, 2)
+
+        http_trace.start(inst.atomic_actions())
+        self.assertTrue(http_trace.is_recording())
+        http_trace.record("get", "compute", "/servers/42", 200, 1, 2)
+        with atomic.ActionTimer(inst, "foo"):
+            with atomic.ActionTimer(inst, "bar"):
+                http_trace.record("post", None,
+                                  "http://glance:9292/v2/images", None, 3, 4)
+            http_trace.record("delete", "image", "/v2/images/42", 404, 5, 6)
+            http_trace.record("delete", "image", "/v2/images/43", 204, 7, 10)
+        calls = http_trace.stop()
+
+        self.assertFalse(http_trace.is_recording())
+        self.assertEqual(
+            [{"method": "GET", "service": "compute",
+              "url": "/servers/{id}", "atomic_action": None,
+              "count": 1, "errors": 0, "duration": 1.0},
+             {"method": "POST", "service": "glance:9292",
+              "url": "/v2/images", "atomic_action": "foo > bar",
+              "count": 1, "errors": 1, "duration": 1.0},
+             {"method": "DELETE", "service": "image",
+              "url": "/v2/images/{id}", "atomic_action": "foo",
+              "count": 2, "errors": 1, "duration": 4.0}],
+            calls)
+        self.assertEqual([], http_trace.stop())
+
+    def test_record_other_thread(self):
+        http_trace.start([])
+        thread = threading.Thread(
+            target=http_trace.record,
+            args=("get", "compute", "/servers", 200, 1, 2))
+        thread.start()
+        thread.join()
+        self.assertEqual([], http_trace.stop())
@@ -0,0 +1,298 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+import os
+import socket
+import tempfile
+
+import mock
+from oslo_config import cfg
+from six.moves.urllib import error as urlerror
+from six.moves.urllib import request as urlrequest
+
+from rally.task import metrics
+from tests.unit import test
+
+CONF = cfg.CONF
+
+
+def _make_result(timestamp, duration, error=None, actions=None):
+    return {"timestamp": timestamp, "duration": duration,
+            "error": error or [],
+            "atomic_actions": [{"name": name, "started_at": timestamp,
+                                "finished_at": timestamp + d,
+                                "children": []}
+                               for name, d in (actions or [])]}
+
+
+class LiveMetricsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LiveMetricsTestCase, self).setUp()
+        self.runner = mock.Mock()
+        self.runner.result_queue = collections.deque([[], []])
+        self.key = {"name": "Dummy.dummy", "pos": 1}
+
+    def test_snapshot_without_workload(self):
+        live = metrics.LiveMetrics("task-uuid", window=10)
+        live.iteration_started()
+        live.add_results([_make_result(1, 1)], True)
+
+        self.assertEqual({"timestamp": mock.ANY, "task": "task-uuid"},
+                         live.snapshot())
+        self.assertEqual("", live.render())
+
+    @mock.patch("rally.task.metrics.time.time", return_value=14)
+    def test_snapshot(self, mock_time):
+        live = metrics.LiveMetrics("task-uuid", window=3)
+        live.start_workload(self.key, self.runner)
+        for i in range(6):
+            live.iteration_started()
+        live.add_results([_make_result(10, 1, actions=[("foo", 0.5)]),
+                          _make_result(11, 2, error=["Error"],
+                                       actions=[("foo", 1.5)])], True)
+        live.add_results([_make_result(12, 3), _make_result(13, 4)], False)
+
+        snapshot = live.snapshot()
+
+        self.assertEqual(
+            {"timestamp": 14, "task": "task-uuid",
+             "scenario": "Dummy.dummy", "position": 1,
+             "is_finished": False,
+             "iterations_started": 6, "iterations_finished": 4,
+             "iterations_failed": 1, "rps": 1.0,
+             "runner_queue_depth": 2, "sla_success": False},
+            dict((k, v) for k, v in snapshot.items() if k != "durations"))
+        self.assertEqual(["foo", "total"], list(snapshot["durations"]))
+        foo = snapshot["durations"]["foo"]
+        self.assertEqual(2, foo["count"])
+        self.assertEqual(2.0, foo["sum"])
+        self.assertEqual(["0.5", "0.9", "0.95", "0.99"],
+                         list(foo["percentiles"]))
+        for percent, value in zip(foo["percentiles"].values(),
+                                  (1.0, 1.4, 1.45, 1.49)):
+            self.assertAlmostEqual(value, percent)
+        # only the latest 3 durations are used for percentiles
+        total = snapshot["durations"]["total"]
+        self.assertEqual(3, total["percentiles"]["0.5"])
+        self.assertEqual(4, total["count"])
+        self.assertEqual(10, total["sum"])
+
+        live.finish_workload()
+        self.assertEqual(4 / 7.0, live.snapshot()["rps"])
+
+    def test_start_workload_resets_metrics(self):
+        live = metrics.LiveMetrics("task-uuid", window=3)
+        live.start_workload(self.key, self.runner)
+        live.iteration_started()
+        live.add_results([_make_result(10, 1)], False)
+        live.start_workload({"name": "Dummy.foo", "pos": 2}, self.runner)
+
+        snapshot = live.snapshot()
+        self.assertEqual("Dummy.foo", snapshot["scenario"])
+        self.assertEqual(0, snapshot["iterations_started"])
+        self.assertEqual(0, snapshot["iterations_finished"])
+        self.assertEqual(0, snapshot["rps"])
+        self.assertTrue(snapshot["sla_success"])
+        self.assertEqual({}, snapshot["durations"])
+
+    def test_render(self):
+        live = metrics.LiveMetrics("task-uuid", window=3)
+        live.start_workload({"name": "Dummy.\"foo\"", "pos": 0}, self.runner)
+        live.iteration_started()
+        live.add_results([_make_result(10, 1, actions=[("foo", 0.5)])], True)
+
+        lines = live.render().splitlines()
+
+        labels = ("task=\"task-uuid\",scenario=\"Dummy.\\\"foo\\\"\","
+                  "position=\"0\"")
+        self.assertIn("# TYPE rally_iterations_started_total counter", lines)
+        self.assertIn("rally_iterations_started_total{%s} 1" % labels, lines)
+        self.assertIn("rally_iterations_finished_total{%s} 1" % labels,
+                      lines)
+        self.assertIn("rally_iterations_failed_total{%s} 0" % labels, lines)
+        self.assertIn("rally_runner_queue_depth{%s} 2" % labels, lines)
+        self.assertIn("rally_sla_success{%s} 1" % labels, lines)
+        self.assertIn("# TYPE rally_duration_seconds summary", lines)
+        self.assertIn("rally_duration_seconds{%s,action=\"foo\","
+                      "quantile=\"0.99\"} 0.5" % labels, lines)
+        self.assertIn("rally_duration_seconds_count{%s,action=\"total\"} 1"
+                      % labels, lines)
+        self.assertIn("rally_duration_seconds_sum{%s,action=\"total\"} 1.0"
+                      % labels, lines)
+
+
+class ProgressRecorderTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProgressRecorderTestCase, self).setUp()
+        self.workload = mock.MagicMock()
+        self.key = {"name": "Dummy.dummy", "pos": 1,
+                    "kw": {"runner": {"type": "constant", "times": 10}}}
+
+    @mock.patch("rally.task.metrics.time.time")
+    def test_record(self, mock_time):
+        mock_time.side_effect = [10, 14, 18]
+        recorder = metrics.ProgressRecorder(self.key, self.workload,
+                                            interval=5, window=3)
+        recorder.start()
+        recorder.add([_make_result(10, d, error=["e"] if d == 1 else None)
+                      for d in (1, 2, 3, 4)])
+        recorder.record()
+        recorder.record(finished=True)
+
+        self.assertEqual(
+            [mock.call({"name": "Dummy.dummy", "pos": 1, "timestamp": 14,
+                        "completed": 4, "total": 10, "errors": 1,
+                        "p50": 3, "p95": 3.9, "rps": 1.0, "eta": 6.0,
+                        "finished": False}),
+             mock.call({"name": "Dummy.dummy", "pos": 1, "timestamp": 18,
+                        "completed": 4, "total": 10, "errors": 1,
+                        "p50": 3, "p95": 3.9, "rps": 0.5, "eta": 0,
+                        "finished": True})],
+            self.workload.add_progress.call_args_list)
+
+    @mock.patch("rally.task.metrics.time.time")
+    def test_record_duration_runner(self, mock_time):
+        mock_time.side_effect = [10, 14]
+        self.key["kw"]["runner"] = {"type": "constant_for_duration",
+                                    "duration": 60}
+        recorder = metrics.ProgressRecorder(self.key, self.workload,
+                                            interval=5)
+        recorder.start()
+        recorder.record()
+
+        self.workload.add_progress.assert_called_once_with(
+            {"name": "Dummy.dummy", "pos": 1, "timestamp": 14,
+             "completed": 0, "total": None, "errors": 0, "p50": None,
+             "p95": None, "rps": 0, "eta": 56, "finished": False})
+
+    @mock.patch("rally.task.metrics.time.time", return_value=10)
+    def test_record_write(self, mock_time):
+        write = mock.Mock()
+        recorder = metrics.ProgressRecorder(self.key, self.workload,
+                                            interval=5, write=write)
+        recorder.start()
+        recorder.record(finished=True)
+
+        write.assert_called_once_with(
+            {"name": "Dummy.dummy", "pos": 1, "timestamp": 10,
+             "completed": 0, "total": 10, "errors": 0, "p50": None,
+             "p95": None, "rps": 0, "eta": 0, "finished": True})
+        self.assertFalse(self.workload.add_progress.called)
+
+    @mock.patch("rally.task.metrics.LOG")
+    @mock.patch("rally.task.metrics.time.time", return_value=10)
+    def test_record_failed(self, mock_time, mock_log):
+        self.workload.add_progress.side_effect = Exception("DB is gone")
+        recorder = metrics.ProgressRecorder(self.key, self.workload,
+                                            interval=5)
+        recorder.start()
+        recorder.record()
+        self.assertTrue(mock_log.warning.called)
+
+    @mock.patch("rally.task.metrics.time.time")
+    def test_record_if_due(self, mock_time):
+        recorder = metrics.ProgressRecorder(self.key, self.workload,
+                                            interval=5)
+        mock_time.return_value = 10
+        recorder.start()
+
+        mock_time.return_value = 14
+        recorder.record_if_due()
+        self.assertFalse(self.workload.add_progress.called)
+
+        mock_time.return_value = 15
+        recorder.record_if_due()
+        self.assertEqual(1, self.workload.add_progress.call_count)
+
+        # nothing has finished since the previous record
+        mock_time.return_value = 30
+        recorder.record_if_due()
+        self.assertEqual(1, self.workload.add_progress.call_count)
+
+        recorder.add([_make_result(10, 1)])
+        recorder.record_if_due()
+        self.assertEqual(2, self.workload.add_progress.call_count)
+
+
+class MetricsExporterTestCase(test.TestCase):
+
+    def _get_free_port(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        return port
+
+    def test_http_endpoint(self):
+        live = mock.Mock()
+        live.render.return_value = "rally_sla_success 1\n"
+        exporter = metrics.MetricsExporter(live, host="127.0.0.1",
+                                           port=self._get_free_port())
+        exporter.start()
+        try:
+            url = "http://127.0.0.1:%s" % exporter.server.server_address[1]
+            response = urlrequest.urlopen(url + "/metrics")
+            self.assertEqual(b"rally_sla_success 1\n", response.read())
+            self.assertEqual("text/plain; version=0.0.4",
+                             response.info()["Content-Type"])
+            self.assertRaises(urlerror.HTTPError,
+                              urlrequest.urlopen, url + "/foo")
+        finally:
+            exporter.stop()
+
+    def test_file(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, path)
+        live = mock.Mock()
+        live.snapshot.side_effect = lambda: {
+            "foo": live.snapshot.call_count}
+        exporter = metrics.MetricsExporter(live, port=0, path=path,
+                                           interval=0.01)
+        exporter.start()
+        while live.snapshot.call_count < 1:
+            exporter._stop_event.wait(0.01)
+        exporter.stop()
+
+        # the last snapshot is written on stop
+        self.assertGreaterEqual(live.snapshot.call_count, 2)
+        with open(path) as f:
+            self.assertEqual(
+                [{"foo": i + 1} for i in range(live.snapshot.call_count)],
+                [json.loads(line) for line in f])
+        self.assertIsNone(exporter.server)
+
+    @mock.patch("rally.task.metrics.MetricsExporter")
+    def test_export_disabled(self, mock_metrics_exporter):
+        with metrics.export("task-uuid") as live:
+            self.assertIsNone(live)
+        self.assertFalse(mock_metrics_exporter.called)
+
+    @mock.patch("rally.task.metrics.MetricsExporter")
+    def test_export(self, mock_metrics_exporter):
+        CONF.set_override("file", "/tmp/metrics", "task_metrics")
+        self.addCleanup(CONF.clear_override, "file", "task_metrics")
+        exporter = mock_metrics_exporter.return_value
+
+        with metrics.export("task-uuid") as live:
+            self.assertIsInstance(live, metrics.LiveMetrics)
+            self.assertEqual("task-uuid", live.task_uuid)
+            exporter.start.assert_called_once_with()
+            self.assertFalse(exporter.stop.called)
+        mock_metrics_exporter.assert_called_once_with(live)
+        exporter.stop.assert_called_once_with()
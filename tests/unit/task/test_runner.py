@@ -39,7 +39,7 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
             "duration": 100,
             "idle_duration": 0,
             "output": {"additive": [], "complete": []},
-            "atomic_actions": {},
+            "atomic_actions": [],
             "error": mock_format_exc.return_value
         }
 
@@ -85,7 +85,7 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
             "idle_duration": 0,
             "error": [],
             "output": {"additive": [], "complete": []},
-            "atomic_actions": {}
+            "atomic_actions": []
         }
         self.assertEqual(expected_result, result)
 
@@ -108,10 +108,103 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
                                      "description": "Complete description",
                                      "title": "Complete",
                                      "chart_plugin": "BarPlugin"}]},
-            "atomic_actions": {}
+            "atomic_actions": []
         }
         self.assertEqual(expected_result, result)
 
+    @mock.patch(BASE + "http_trace")
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_with_http_calls(self, mock_timer,
+                                               mock_http_trace):
+        mock_http_trace.stop.return_value = [{"method": "GET"}]
+        result = runner._run_scenario_once(
+            fakes.FakeScenario, "do_it", mock.MagicMock(), {},
+            mock.MagicMock())
+
+        mock_http_trace.start.assert_called_once_with([])
+        mock_http_trace.stop.assert_called_once_with()
+        self.assertEqual([{"method": "GET"}], result["http_calls"])
+
+    @mock.patch(BASE + "LOG")
+    @mock.patch(BASE + "logging.is_iteration_logged")
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_logging(self, mock_timer,
+                                       mock_is_iteration_logged, mock_log):
+        context = {"iteration": 2, "task": {"uuid": "foo"}}
+        mock_is_iteration_logged.return_value = True
+        runner._run_scenario_once(fakes.FakeScenario, "do_it", context, {},
+                                  mock.MagicMock())
+        mock_is_iteration_logged.assert_called_once_with(2)
+        self.assertEqual(
+            [mock.call("Task %s | ITER: %s START", "foo", 2),
+             mock.call("Task %s | ITER: %s END: OK", "foo", 2)],
+            mock_log.info.call_args_list)
+
+        mock_log.reset_mock()
+        mock_is_iteration_logged.return_value = False
+        runner._run_scenario_once(fakes.FakeScenario, "do_it", context, {},
+                                  mock.MagicMock())
+        self.assertFalse(mock_log.info.called)
+
+        # ends of failed iterations are always logged
+        runner._run_scenario_once(fakes.FakeScenario, "something_went_wrong",
+                                  context, {}, mock.MagicMock())
+        mock_log.info.assert_called_once_with(
+            "Task %s | ITER: %s END: Error %s: %s", "foo", 2, "Exception",
+            "Something went wrong")
+
+    @mock.patch(BASE + "utils.get_status_poller")
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_with_status_polling(
+            self, mock_timer, mock_get_status_poller):
+        runner.CONF.set_override("status_poller_enabled", True, "benchmark")
+        self.addCleanup(runner.CONF.clear_override, "status_poller_enabled",
+                        "benchmark")
+        mock_pop_stats = mock_get_status_poller.return_value.pop_stats
+        mock_pop_stats.side_effect = [
+            {"list_calls": 1, "get_calls_saved": 0},
+            {"list_calls": 2, "get_calls_saved": 5}]
+        result = runner._run_scenario_once(
+            fakes.FakeScenario, "do_it", mock.MagicMock(), {},
+            mock.MagicMock())
+
+        self.assertEqual(2, mock_pop_stats.call_count)
+        self.assertEqual(
+            {"additive": [{"title": "Status polling",
+                           "description": "API calls made to check statuses "
+                                          "of resources by shared list calls",
+                           "chart_plugin": "StackedArea",
+                           "data": [["list calls", 2],
+                                    ["get calls saved", 5]]}],
+             "complete": []},
+            result["output"])
+
+    @mock.patch(BASE + "utils.get_status_poller")
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_status_poller_disabled(
+            self, mock_timer, mock_get_status_poller):
+        mock_get_status_poller.return_value.pop_stats.return_value = {
+            "list_calls": 0, "get_calls_saved": 0}
+        result = runner._run_scenario_once(
+            fakes.FakeScenario, "do_it", mock.MagicMock(), {},
+            mock.MagicMock())
+
+        self.assertEqual({"additive": [], "complete": []}, result["output"])
+
+    @mock.patch(BASE + "utils.get_status_poller")
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_status_poller_used_while_disabled(
+            self, mock_timer, mock_get_status_poller):
+        mock_get_status_poller.return_value.pop_stats.side_effect = [
+            {"list_calls": 0, "get_calls_saved": 0},
+            {"list_calls": 3, "get_calls_saved": 27}]
+        result = runner._run_scenario_once(
+            fakes.FakeScenario, "do_it", mock.MagicMock(), {},
+            mock.MagicMock())
+
+        self.assertEqual([["list calls", 3], ["get calls saved", 27]],
+                         result["output"]["additive"][0]["data"])
+
     @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
     def test_run_scenario_once_exception(self, mock_timer):
         result = runner._run_scenario_once(
@@ -123,7 +216,7 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
             "timestamp": fakes.FakeTimer().timestamp(),
             "idle_duration": 0,
             "output": {"additive": [], "complete": []},
-            "atomic_actions": {}
+            "atomic_actions": []
         }
         self.assertEqual(expected_result, result)
         self.assertEqual(expected_error[:2],
@@ -191,6 +284,28 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._run_scenario.assert_called_once_with(
             scenario_class, "run", context_obj, {"foo": 11, "bar": "spam"})
 
+    @mock.patch("rally.task.runner.user_selection.UserSelectionIndex")
+    def test_run_with_users(self, mock_user_selection_index):
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(),
+                                                 {"concurrency": 3})
+        runner_obj._run_scenario = mock.Mock()
+        context_obj = {"task": runner_obj.task,
+                       "scenario_name": "classbased.fooscenario",
+                       "admin": {"credential": "foo_credentials"},
+                       "users": [{"id": "u1", "tenant_id": "t1"}],
+                       "tenants": {"t1": {"id": "t1"}},
+                       "config": {}}
+
+        runner_obj.run("classbased.fooscenario", context_obj, {})
+
+        mock_user_selection_index.assert_called_once_with(context_obj, 3)
+        self.assertNotIn("user_selection", context_obj)
+        expected_context = dict(
+            context_obj,
+            user_selection=mock_user_selection_index.return_value)
+        runner_obj._run_scenario.assert_called_once_with(
+            fakes.FakeClassBasedScenario, "run", expected_context, {})
+
     def test_abort(self):
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -253,67 +368,77 @@ class ScenarioRunnerTestCase(test.TestCase):
     @ddt.data(
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "output": {"additive": [], "complete": []},
-                  "error": ["err1", "err2"], "atomic_actions": {}},
+                  "error": ["err1", "err2"], "atomic_actions": []},
          "expected": True},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {"foo": 4.2}},
+                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                      "finished_at": 4.2, "children": []}]},
          "expected": True},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": ["a1", "a2"],
                                           "complete": ["c1", "c2"]},
-                  "atomic_actions": {"foo": 4.2}},
+                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                      "finished_at": 4.2, "children": []}]},
          "validate_output_calls": [("additive", "a1"), ("additive", "a2"),
                                    ("complete", "c1"), ("complete", "c2")],
          "expected": True},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": ["a1", "a2"],
                                           "complete": ["c1", "c2"]},
-                  "atomic_actions": {"foo": 4.2}},
+                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                      "finished_at": 4.2, "children": []}]},
          "validate_output_return_value": "validation error message"},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [42], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {"foo": 4.2}}},
+                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                      "finished_at": 4.2, "children": []}]}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {"foo": 42}}},
+                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                      "finished_at": 42, "children": []}]}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {"foo": "non-float"}}},
+                  "atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                      "finished_at": 4.2, "children": [
+                                          {"name": "bar",
+                                           "started_at": "non-float",
+                                           "finished_at": 4.2,
+                                           "children": []}]}]}},
         {"data": {"duration": 1, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1,
                   "error": [], "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": "foo", "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "output": {}, "atomic_actions": {}}},
+                  "error": [], "output": {}, "atomic_actions": []}},
         {"data": {"timestamp": 1.0, "idle_duration": 1.0, "error": [],
                   "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "idle_duration": 1.0, "error": [],
                   "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "error": [],
                   "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "output": {"additive": [], "complete": []},
-                  "atomic_actions": {}}},
+                  "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
-                  "error": [], "atomic_actions": {}}},
+                  "error": [], "atomic_actions": []}},
         {"data": {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
                   "error": [], "output": {"additive": [], "complete": []}}},
         {"data": []},
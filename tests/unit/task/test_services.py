@@ -262,10 +262,10 @@ class MethodWrapperTestCase(test.TestCase):
 
         some = Some(mock.MagicMock(version="777"))
         some.foo(no_atomic=True)
-        self.assertNotIn("some", some._atomic_actions)
+        self.assertEqual([], some._atomic_actions)
         # check that we are working with correct variable
         some.foo()
-        self.assertIn("some", some._atomic_actions)
+        self.assertEqual(["some"], [a["name"] for a in some._atomic_actions])
 
 
 class ServiceWithoutAtomicTestCase(test.TestCase):
@@ -275,8 +275,8 @@ class ServiceWithoutAtomicTestCase(test.TestCase):
                 return self
 
         some_cls = Some()
-        # add something to atomic actions dict to simplify comparison
-        # (empty fake dict != not empty _atomic_actions dict)
+        # add something to atomic actions list to simplify comparison
+        # (empty fake list != not empty _atomic_actions list)
         with atomic.ActionTimer(some_cls, "some"):
             pass
         wrapped_service = service._ServiceWithoutAtomic(some_cls)
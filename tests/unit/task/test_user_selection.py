@@ -0,0 +1,111 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+import ddt
+
+from rally.task import user_selection
+from tests.unit import test
+
+
+def _make_context(method, users_per_tenant=(2, 2), **kwargs):
+    context = {"user_choice_method": method, "users": [], "tenants": {}}
+    for t, users_amount in enumerate(users_per_tenant):
+        tenant_id = "t%d" % t
+        users = [{"id": "%s-u%d" % (tenant_id, u), "tenant_id": tenant_id}
+                 for u in range(users_amount)]
+        context["users"].extend(users)
+        context["tenants"][tenant_id] = {"id": tenant_id, "users": users}
+    context.update(kwargs)
+    return context
+
+
+@ddt.ddt
+class UserSelectionIndexTestCase(test.TestCase):
+
+    def _choose(self, context, iterations, concurrency=1):
+        index = user_selection.UserSelectionIndex(context, concurrency)
+        chosen = []
+        for i in range(1, iterations + 1):
+            user, tenant = index.choose(dict(context, iteration=i))
+            self.assertEqual(user["tenant_id"], tenant["id"])
+            chosen.append(user["id"])
+        return chosen
+
+    @ddt.data([3, 1], [1, 2, 3], [5])
+    def test__weighted_schedule(self, weights):
+        schedule = user_selection._weighted_schedule(weights)
+        self.assertEqual(sum(weights), len(schedule))
+        for i, weight in enumerate(weights):
+            self.assertEqual(weight, schedule.count(i))
+
+    def test__weighted_schedule_is_smooth(self):
+        self.assertEqual([0, 0, 1, 0],
+                         user_selection._weighted_schedule([3, 1]))
+
+    def test_choose_random(self):
+        context = _make_context("random")
+        for user_id in self._choose(context, 10):
+            self.assertIn(user_id, [u["id"] for u in context["users"]])
+
+    def test_choose_round_robin(self):
+        self.assertEqual(
+            ["t0-u0", "t1-u0", "t0-u1", "t1-u1", "t0-u0", "t1-u0"],
+            self._choose(_make_context("round_robin"), 6))
+
+    def test_choose_least_recently_used(self):
+        self.assertEqual(
+            ["t0-u0", "t1-u0", "t0-u1", "t0-u2", "t0-u0"],
+            self._choose(_make_context("least_recently_used", (3, 1)), 5))
+
+    def test_choose_sticky(self):
+        self.assertEqual(
+            ["t0-u0", "t1-u0", "t0-u1", "t0-u0", "t1-u0", "t0-u1"],
+            self._choose(_make_context("sticky"), 6, concurrency=3))
+
+    def test_choose_sticky_with_less_users_than_workers(self):
+        self.assertEqual(
+            ["t0-u0", "t1-u0", "t0-u0", "t0-u0"],
+            self._choose(_make_context("sticky", (1, 1)), 4, concurrency=3))
+
+    def test_choose_weighted(self):
+        context = _make_context("weighted", tenant_weights=[3, 1])
+        self.assertEqual(
+            ["t0-u0", "t0-u1", "t1-u0", "t0-u0",
+             "t0-u1", "t0-u0", "t1-u1", "t0-u1"],
+            self._choose(context, 8))
+
+    def test_choose_weighted_without_weights(self):
+        self.assertEqual(
+            self._choose(_make_context("round_robin"), 8),
+            self._choose(_make_context("weighted"), 8))
+
+    @ddt.data("round_robin", "least_recently_used", "sticky", "weighted")
+    def test_choose_is_reproducible(self, method):
+        context = _make_context(method, (3, 2, 1), tenant_weights=[1, 2])
+        self.assertEqual(self._choose(context, 30, concurrency=4),
+                         self._choose(copy.deepcopy(context), 30,
+                                      concurrency=4))
+
+    def test_deepcopy(self):
+        context = _make_context("round_robin")
+        index = user_selection.UserSelectionIndex(context)
+        context["user_selection"] = index
+
+        context_copy = copy.deepcopy(context)
+        self.assertIs(index, context_copy["user_selection"])
+        user, tenant = index.choose(dict(context_copy, iteration=1))
+        self.assertIs(context_copy["users"][0], user)
+        self.assertIs(context_copy["tenants"]["t0"], tenant)
@@ -14,9 +14,13 @@
 #    under the License.
 
 import datetime as dt
+import itertools
+import threading
 
+import ddt
 from jsonschema import exceptions as schema_exceptions
 import mock
+from oslo_config import cfg
 
 from rally import exceptions
 from rally.task import utils
@@ -524,3 +528,364 @@ class WaitForStatusTestCase(test.TestCase):
                           utils.wait_for_status,
                           resource=res, ready_statuses=["ready"],
                           update_resource=upd, timeout=2, id_attr="uuid")
+
+    def _enable_status_poller(self):
+        cfg.CONF.set_override("status_poller_enabled", True, "benchmark")
+        self.addCleanup(cfg.CONF.clear_override, "status_poller_enabled",
+                        "benchmark")
+        patcher = mock.patch("rally.task.utils.get_status_poller")
+        self.addCleanup(patcher.stop)
+        poller = patcher.start().return_value
+        poller.poll.return_value = None
+        return poller
+
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.time.time", return_value=1)
+    def test_wait_backoff(self, mock_time, mock_sleep):
+        self._enable_status_poller()
+        res = {"status": "not_ready"}
+        upd = mock.MagicMock(side_effect=[{"status": "not_ready"},
+                                          {"status": "not_ready"},
+                                          {"status": "not_ready"},
+                                          {"status": "not_ready"},
+                                          {"status": "almost_ready"},
+                                          {"status": "ready"}])
+        utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                              update_resource=upd, check_interval=2)
+        intervals = [c[0][0] for c in mock_sleep.call_args_list]
+        self.assertEqual(5, len(intervals))
+        for expected, actual in zip([2, 2.4, 2.88, 3.456, 2], intervals):
+            self.assertAlmostEqual(expected, actual)
+
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.time.time", return_value=1)
+    def test_wait_max_backoff(self, mock_time, mock_sleep):
+        self._enable_status_poller()
+        res = {"status": "not_ready"}
+        upd = mock.MagicMock(side_effect=[{"status": "not_ready"}] * 10 +
+                                         [{"status": "ready"}])
+        utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                              update_resource=upd, check_interval=1)
+        self.assertEqual(2, max(c[0][0] for c in mock_sleep.call_args_list))
+
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.time.time", return_value=1)
+    def test_wait_no_backoff_without_status_poller(self, mock_time,
+                                                   mock_sleep):
+        res = {"status": "not_ready"}
+        upd = mock.MagicMock(side_effect=[{"status": "not_ready"}] * 5 +
+                                         [{"status": "ready"}])
+        utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                              update_resource=upd, check_interval=2)
+        self.assertEqual([mock.call(2)] * 5, mock_sleep.call_args_list)
+
+    @mock.patch("rally.task.utils.get_status_poller")
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.time.time", return_value=1)
+    def test_wait_with_status_poller(self, mock_time, mock_sleep,
+                                     mock_get_status_poller):
+        cfg.CONF.set_override("status_poller_enabled", True, "benchmark")
+        self.addCleanup(cfg.CONF.clear_override, "status_poller_enabled",
+                        "benchmark")
+        poller = mock_get_status_poller.return_value
+        poller.poll.side_effect = [None,
+                                   {"status": "not_ready"},
+                                   {"status": "ready"}]
+        res = {"status": "not_ready"}
+        upd = mock.MagicMock(side_effect=[{"status": "not_ready"},
+                                          {"status": "ready", "full": 1}])
+
+        ret = utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                                    update_resource=upd)
+
+        self.assertEqual({"status": "ready", "full": 1}, ret)
+        poller.is_supported.assert_called_once_with(res, upd)
+        poller.poll.assert_has_calls(
+            [mock.call(res, upd, not_before=1),
+             mock.call({"status": "not_ready"}, upd, not_before=1),
+             mock.call({"status": "not_ready"}, upd, not_before=1)])
+        # get calls are made for missing and ready resources only
+        upd.assert_has_calls([mock.call(res),
+                              mock.call({"status": "not_ready"})])
+
+    @mock.patch("rally.task.utils.get_status_poller")
+    @mock.patch("rally.task.utils.time.sleep")
+    def test_wait_status_poller_disabled(self, mock_sleep,
+                                         mock_get_status_poller):
+        upd = mock.MagicMock(return_value={"status": "ready"})
+        utils.wait_for_status(resource={"status": "not_ready"},
+                              ready_statuses=["ready"], update_resource=upd)
+        self.assertFalse(mock_get_status_poller.called)
+
+
+@ddt.ddt
+class WaitForStatusesTestCase(test.TestCase):
+
+    def _make_resources(self, *statuses):
+        return [fakes.FakeResource(id=str(i), status=status)
+                for i, status in enumerate(statuses)]
+
+    def test_conflicting_statuses(self):
+        self.assertRaises(ValueError, utils.wait_for_statuses, [],
+                          ready_statuses=["ready"], update_resource=None,
+                          failure_statuses=["READY"])
+
+    @mock.patch("rally.task.utils.get_status_poller")
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.time.time")
+    def test_wait_successful(self, mock_time, mock_sleep,
+                             mock_get_status_poller):
+        mock_time.side_effect = range(10)
+        mock_status_poller = mock_get_status_poller.return_value
+        mock_status_poller.is_supported.return_value = False
+        resources = self._make_resources("building", "building")
+        update_resource = mock.Mock(side_effect=[
+            fakes.FakeResource(id="0", status="building"),
+            fakes.FakeResource(id="1", status="active"),
+            fakes.FakeResource(id="0", status="active")])
+
+        result = utils.wait_for_statuses(
+            resources, ready_statuses=["active"],
+            update_resource=update_resource, failure_statuses=["error"],
+            timeout=100, check_interval=2)
+
+        self.assertEqual(["0", "1"], [r.id for r, _t in result])
+        self.assertEqual(["ACTIVE"] * 2,
+                         [utils.get_status(r) for r, _t in result])
+        self.assertEqual([6, 3], [t for _r, t in result])
+        self.assertEqual(3, update_resource.call_count)
+        mock_sleep.assert_called_once_with(2)
+        mock_status_poller.is_supported.assert_called_once_with(
+            resources[0], update_resource)
+        self.assertFalse(mock_status_poller.poll.called)
+
+    def _wait_with_status_poller(self, resources):
+        update_resource = utils.get_from_manager()
+        poller = utils.StatusPoller()
+        poller.pop_stats()
+
+        def set_active(*args):
+            for resource in resources:
+                resource.status = "ACTIVE"
+
+        with mock.patch("rally.task.utils.time.sleep",
+                        side_effect=set_active) as mock_sleep:
+            with mock.patch("rally.task.utils.get_status_poller",
+                            return_value=poller):
+                result = utils.wait_for_statuses(
+                    resources, ready_statuses=["active"],
+                    update_resource=update_resource)
+
+        self.assertEqual([r.id for r in resources],
+                         [r.id for r, _t in result])
+        mock_sleep.assert_called_once_with(1)
+        return poller.pop_stats()
+
+    @ddt.data(True, False)
+    @mock.patch("rally.task.utils.time.time",
+                side_effect=itertools.count())
+    def test_wait_with_status_poller(self, enabled, mock_time):
+        cfg.CONF.set_override("status_poller_enabled", enabled, "benchmark")
+        self.addCleanup(cfg.CONF.clear_override, "status_poller_enabled",
+                        "benchmark")
+        manager = fakes.FakeManager()
+        manager.list = mock.Mock(side_effect=manager.list)
+        manager.get = mock.Mock(side_effect=manager.get)
+        resources = [manager._cache(fakes.FakeResource(manager=manager,
+                                                       status="BUILD"))
+                     for i in range(3)]
+
+        stats = self._wait_with_status_poller(resources)
+
+        # each check makes one list call, resources are not got separately
+        self.assertEqual([mock.call()] * 2, manager.list.call_args_list)
+        self.assertFalse(manager.get.called)
+        self.assertEqual({"list_calls": 2, "get_calls_saved": 4}, stats)
+
+    @mock.patch("rally.task.utils.time.time",
+                side_effect=itertools.count())
+    def test_wait_with_status_poller_missing_resource(self, mock_time):
+        manager = fakes.FakeManager()
+        manager.get = mock.Mock(side_effect=manager.get)
+        resources = [manager._cache(fakes.FakeResource(manager=manager,
+                                                       status="BUILD"))
+                     for i in range(2)]
+        list_resources = manager.list
+        manager.list = mock.Mock(side_effect=lambda: list_resources()[:1])
+
+        stats = self._wait_with_status_poller(resources)
+
+        self.assertEqual([mock.call()] * 2, manager.list.call_args_list)
+        self.assertEqual([mock.call(resources[1].id)] * 2,
+                         manager.get.call_args_list)
+        self.assertEqual({"list_calls": 2, "get_calls_saved": 0}, stats)
+
+    @mock.patch("rally.task.utils.time.sleep")
+    def test_wait_missing_resource(self, mock_sleep):
+        resources = self._make_resources("building")
+        update_resource = mock.Mock(side_effect=exceptions.GetResourceNotFound(
+            resource=resources[0]))
+
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          utils.wait_for_statuses, resources,
+                          ready_statuses=["active"],
+                          update_resource=update_resource)
+
+    @mock.patch("rally.task.utils.time.sleep")
+    def test_wait_failure_status(self, mock_sleep):
+        resources = self._make_resources("building", "building")
+        update_resource = mock.Mock(side_effect=self._make_resources(
+            "active", "error"))
+
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          utils.wait_for_statuses, resources,
+                          ready_statuses=["active"],
+                          update_resource=update_resource,
+                          failure_statuses=["error"])
+
+    @mock.patch("rally.task.utils.time.sleep")
+    @mock.patch("rally.task.utils.time.time")
+    def test_wait_timeout(self, mock_time, mock_sleep):
+        mock_time.side_effect = [1, 2, 3, 4, 5, 6, 7, 12]
+        resources = self._make_resources("active", "building")
+        update_resource = mock.Mock(spec=[], side_effect=lambda r: r)
+
+        self.assertRaises(exceptions.TimeoutException,
+                          utils.wait_for_statuses, resources,
+                          ready_statuses=["active"],
+                          update_resource=update_resource, timeout=10)
+
+
+class StatusPollerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StatusPollerTestCase, self).setUp()
+        self.poller = utils.StatusPoller()
+        self.manager = fakes.FakeManager()
+        self.manager.list = mock.Mock(side_effect=self.manager.list)
+        self.get = utils.get_from_manager()
+        self.resources = [
+            self.manager._cache(fakes.FakeResource(manager=self.manager,
+                                                   status="BUILD"))
+            for i in range(3)]
+
+    def test_is_supported(self):
+        resource = self.resources[0]
+        self.assertTrue(self.poller.is_supported(resource, self.get))
+        self.assertFalse(self.poller.is_supported(resource, mock.Mock(
+            spec=[])))
+        self.assertFalse(self.poller.is_supported({"status": "foo"},
+                                                  self.get))
+
+    @mock.patch("rally.task.utils.time.time", return_value=10)
+    def test_poll(self, mock_time):
+        for resource in self.resources:
+            self.assertEqual(resource, self.poller.poll(resource, self.get))
+
+        self.manager.list.assert_called_once_with()
+        self.assertEqual({"list_calls": 1, "get_calls_saved": 2},
+                         self.poller.pop_stats())
+        self.assertEqual({"list_calls": 0, "get_calls_saved": 0},
+                         self.poller.pop_stats())
+
+    @mock.patch("rally.task.utils.time.time")
+    def test_poll_results_expired(self, mock_time):
+        cfg.CONF.set_override("status_poller_max_age", 2, "benchmark")
+        self.addCleanup(cfg.CONF.clear_override, "status_poller_max_age",
+                        "benchmark")
+        mock_time.return_value = 10
+        self.poller.poll(self.resources[0], self.get)
+        mock_time.return_value = 11
+        self.poller.poll(self.resources[0], self.get)
+        self.assertEqual(1, self.manager.list.call_count)
+
+        mock_time.return_value = 13
+        self.poller.poll(self.resources[0], self.get)
+        self.assertEqual(2, self.manager.list.call_count)
+
+        # results of list calls started before not_before are not used
+        self.poller.poll(self.resources[0], self.get, not_before=14)
+        self.assertEqual(3, self.manager.list.call_count)
+
+        # results of list calls started after not_before are used even if
+        # they are expired, unless expire is True
+        mock_time.return_value = 20
+        self.poller.poll(self.resources[0], self.get, not_before=13,
+                         expire=False)
+        self.assertEqual(3, self.manager.list.call_count)
+        self.poller.poll(self.resources[0], self.get, not_before=13)
+        self.assertEqual(4, self.manager.list.call_count)
+
+    def test_poll_missing_resource(self):
+        resource = fakes.FakeResource(manager=self.manager)
+        self.assertIsNone(self.poller.poll(resource, self.get))
+
+    def test_poll_error_status(self):
+        self.resources[1].status = "ERROR"
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          self.poller.poll, self.resources[1], self.get)
+
+    @staticmethod
+    def _http_error(**kwargs):
+        error = RuntimeError("Oops")
+        for attr, value in kwargs.items():
+            setattr(error, attr, value)
+        return error
+
+    def test_poll_list_not_supported(self):
+        for error in (NotImplementedError(), AttributeError(),
+                      self._http_error(code=404),
+                      self._http_error(http_status=400)):
+            poller = utils.StatusPoller()
+            self.manager.list.side_effect = error
+            self.assertIsNone(poller.poll(self.resources[0], self.get))
+            self.assertFalse(poller.is_supported(self.resources[0],
+                                                 self.get))
+
+    @mock.patch("rally.task.utils.time.time", return_value=10)
+    def test_poll_list_fails(self, mock_time):
+        for error in (RuntimeError("Oops"), self._http_error(code=503)):
+            poller = utils.StatusPoller()
+            self.manager.list.side_effect = [error, self.resources]
+            self.assertIsNone(poller.poll(self.resources[0], self.get))
+            self.assertTrue(poller.is_supported(self.resources[0],
+                                                self.get))
+            # failed list call is not reused, even if it is not expired
+            self.assertEqual(self.resources[0],
+                             poller.poll(self.resources[0], self.get))
+
+    def test_poll_shares_list_call_between_threads(self):
+        listing = threading.Event()
+        release = threading.Event()
+
+        def list_resources():
+            listing.set()
+            release.wait()
+            return self.resources
+
+        self.manager.list.side_effect = list_resources
+        results = []
+        threads = [threading.Thread(
+            target=lambda r=r: results.append(self.poller.poll(r, self.get)))
+            for r in self.resources]
+        threads[0].start()
+        listing.wait()
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(r.id for r in self.resources),
+                         sorted(r.id for r in results))
+        self.manager.list.assert_called_once_with()
+
+    @mock.patch("rally.task.utils.os.getpid")
+    def test_get_status_poller(self, mock_getpid):
+        mock_getpid.return_value = 42
+        poller = utils.get_status_poller()
+        self.assertIsInstance(poller, utils.StatusPoller)
+        self.assertIs(poller, utils.get_status_poller())
+
+        mock_getpid.return_value = 43
+        self.assertIsNot(poller, utils.get_status_poller())
@@ -588,6 +588,22 @@ class ValidatorsTestCase(test.TestCase):
             self.assertFalse(clients_cls.called)
         self.assertFalse(result.is_valid, result.msg)
 
+    def test_required_service_refresh(self):
+        validator = self._unwrap_validator(validation.required_services,
+                                           consts.Service.KEYSTONE,
+                                           consts.Service.NOVA)
+        clients = mock.Mock()
+        clients.services.side_effect = [
+            {consts.ServiceType.IDENTITY: consts.Service.KEYSTONE},
+            {consts.ServiceType.IDENTITY: consts.Service.KEYSTONE,
+             consts.ServiceType.COMPUTE: consts.Service.NOVA}]
+
+        result = validator({}, clients, None)
+
+        self.assertTrue(result.is_valid, result.msg)
+        self.assertEqual([mock.call(), mock.call(refresh=True)],
+                         clients.services.call_args_list)
+
     def test_required_service_wrong_service(self):
         validator = self._unwrap_validator(validation.required_services,
                                            consts.Service.KEYSTONE,
@@ -800,11 +816,22 @@ class ValidatorsTestCase(test.TestCase):
             validation.required_neutron_extensions,
             ext_validate)
         clients = mock.Mock()
-        clients.neutron.return_value.list_extensions.return_value = (
-            {"extensions": [{"alias": "existing_extension"}]})
+        clients.neutron_extensions.return_value = ["existing_extension"]
         result = validator({}, clients, {})
         self.assertEqual(result.is_valid, validation_result)
 
+    def test_required_neutron_extensions_refresh(self):
+        validator = self._unwrap_validator(
+            validation.required_neutron_extensions, "new_extension")
+        clients = mock.Mock()
+        clients.neutron_extensions.side_effect = [[], ["new_extension"]]
+
+        result = validator({}, clients, {})
+
+        self.assertTrue(result.is_valid, result.msg)
+        self.assertEqual([mock.call(), mock.call(refresh=True)],
+                         clients.neutron_extensions.call_args_list)
+
     def test_required_cinder_services(self):
         validator = self._unwrap_validator(
             validation.required_cinder_services,
@@ -23,6 +23,7 @@ from oslotest import mockpatch
 
 from rally.common import db
 from rally import plugins
+from rally.task import atomic
 from tests.unit import fakes
 
 
@@ -46,9 +47,17 @@ class TestCase(base.BaseTestCase):
         plugins.load()
 
     def _test_atomic_action_timer(self, atomic_actions, name):
-        action_duration = atomic_actions.get(name)
-        self.assertIsNotNone(action_duration)
-        self.assertIsInstance(action_duration, float)
+        actions = list(atomic_actions)
+        found = []
+        while actions:
+            action = actions.pop()
+            if action["name"] == name:
+                found.append(action)
+            actions.extend(action["children"])
+        self.assertTrue(found, "Atomic action %s is not found" % name)
+        for action in found:
+            self.assertIsInstance(action["finished_at"], float)
+            self.assertIsInstance(atomic.get_duration(action), float)
 
     def assertSequenceEqual(self, iterable_1, iterable_2, msg=None):
         self.assertEqual(tuple(iterable_1), tuple(iterable_2), msg)
@@ -28,6 +28,7 @@ from rally import api
 from rally.common import objects
 from rally import consts
 from rally import exceptions
+from rally import osclients
 from tests.unit import fakes
 from tests.unit import test
 
@@ -64,10 +65,14 @@ class TaskAPITestCase(test.TestCase):
                                                   admin="fake_admin",
                                                   users=["fake_user"]))
     @mock.patch("rally.api.engine.TaskEngine")
-    def test_validate(
-            self, mock_task_engine, mock_deployment_get, mock_task):
+    @mock.patch("rally.api.osclients.deployment_capabilities")
+    def test_validate(self, mock_deployment_capabilities, mock_task_engine,
+                      mock_deployment_get, mock_task):
         api._Task.validate(mock_deployment_get.return_value["uuid"], "config")
 
+        mock_deployment_capabilities.assert_called_once_with(
+            mock_deployment_get.return_value)
+
         mock_task_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       mock_deployment_get.return_value),
@@ -178,10 +183,14 @@ class TaskAPITestCase(test.TestCase):
                                                   admin="fake_admin",
                                                   users=["fake_user"]))
     @mock.patch("rally.api.engine.TaskEngine")
-    def test_start(self, mock_task_engine, mock_deployment_get,
-                   mock_task):
+    @mock.patch("rally.api.osclients.deployment_capabilities")
+    def test_start(self, mock_deployment_capabilities, mock_task_engine,
+                   mock_deployment_get, mock_task):
         api._Task.start(mock_deployment_get.return_value["uuid"], "config")
 
+        mock_deployment_capabilities.assert_called_once_with(
+            mock_deployment_get.return_value)
+
         mock_task_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       mock_deployment_get.return_value,
@@ -306,6 +315,22 @@ class TaskAPITestCase(test.TestCase):
             self.task_uuid,
             status=expected_status)
 
+    @mock.patch("rally.api.objects.Workload")
+    def test_list_trend_points(self, mock_workload):
+        self.assertEqual(
+            mock_workload.list_trend_points.return_value,
+            api._Task.list_trend_points(config_hash="foo", since=1, until=2))
+        mock_workload.list_trend_points.assert_called_once_with(
+            config_hash="foo", since=1, until=2)
+
+    @mock.patch("rally.api.objects.Workload")
+    def test_list_progress(self, mock_workload):
+        self.assertEqual(
+            mock_workload.list_progress.return_value,
+            api._Task.list_progress("task-uuid", since_id=3, latest=True))
+        mock_workload.list_progress.assert_called_once_with(
+            "task-uuid", since_id=3, latest=True)
+
     @mock.patch("rally.api.objects.Task")
     def test_get_detailed(self, mock_task):
         mock_task.get_detailed.return_value = "detailed_task_data"
@@ -495,13 +520,40 @@ class DeploymentAPITestCase(BaseDeploymentTestCase):
         sample_credential = objects.Credential("http://192.168.1.1:5000/v2.0/",
                                                "admin",
                                                "adminpass").to_dict()
-        deployment = mock.Mock(spec=objects.Deployment)
+        deployment = mock.MagicMock(spec=objects.Deployment)
         deployment.get_credentials_for.return_value = {
             "admin": sample_credential, "users": [sample_credential]}
         api._Deployment.check(deployment)
         mock_keystone_create_client.assert_called_with()
         mock_clients_services.assert_called_once_with()
 
+    @mock.patch("rally.api.osclients.Clients")
+    def test_deployment_check_refreshes_capabilities(self, mock_clients):
+        sample_credential = objects.Credential("http://192.168.1.1:5000/v2.0/",
+                                               "admin",
+                                               "adminpass").to_dict()
+        deployment = objects.Deployment(deployment={
+            "uuid": "foo_uuid", "capabilities": {},
+            "credentials": {"openstack": [{"admin": sample_credential,
+                                           "users": []}]}})
+        deployment.update_capabilities = mock.Mock()
+        discovered = []
+
+        def services():
+            return osclients.discover_capability(
+                mock_clients.call_args[0][0], "services",
+                lambda: discovered.append(1) or {"network": "neutron"})
+
+        mock_clients.return_value.services.side_effect = services
+
+        self.assertEqual({"network": "neutron"},
+                         api._Deployment.check(deployment))
+        mock_clients.return_value.neutron_extensions.assert_called_once_with()
+        self.assertEqual(1, len(discovered))
+        deployment.update_capabilities.assert_called_once_with(
+            {"services": {"value": {"network": "neutron"},
+                          "discovered_at": mock.ANY}})
+
     def test_deployment_check_raise(self):
         sample_credential = objects.Credential("http://192.168.1.1:5000/v2.0/",
                                                "admin",
@@ -515,7 +567,7 @@ class DeploymentAPITestCase(BaseDeploymentTestCase):
         sample_credential = objects.Credential("http://192.168.1.1:5000/v2.0/",
                                                "admin",
                                                "adminpass").to_dict()
-        deployment = mock.Mock(spec=objects.Deployment)
+        deployment = mock.MagicMock(spec=objects.Deployment)
         deployment.get_credentials_for.return_value = {
             "admin": sample_credential, "users": []}
         refused = keystone_exceptions.ConnectionRefused()
@@ -524,6 +576,69 @@ class DeploymentAPITestCase(BaseDeploymentTestCase):
             keystone_exceptions.ConnectionRefused,
             api._Deployment.check, deployment)
 
+    @mock.patch("rally.api.objects.Task.list")
+    @mock.patch("rally.plugins.openstack.cleanup.manager.sweep")
+    @mock.patch("rally.api.osclients.Clients")
+    def test_deployment_sweep(self, mock_clients, mock_sweep,
+                              mock_task_list):
+        admin = objects.Credential("http://192.168.1.1:5000/v2.0/",
+                                   "admin", "adminpass")
+        user = objects.Credential("http://192.168.1.1:5000/v2.0/",
+                                  "user", "userpass")
+        deployment = mock.MagicMock(spec=objects.Deployment)
+        deployment.get_credentials_for.return_value = {
+            "admin": admin.to_dict(), "users": [user.to_dict()]}
+        auth_ref = mock_clients.return_value.keystone.auth_ref
+        sweeper = mock.Mock()
+        sweeper.matcher.get_task_id_parts.side_effect = lambda uuid: {
+            uuid.replace("-", "")[:8]}
+        leaked = [{"task_id_part": "abcd1234"}, {"task_id_part": "deadbeef"}]
+        mock_sweep.return_value = (sweeper, leaked, "stats")
+        mock_task_list.return_value = [
+            {"uuid": "abcd-1234-5678", "status": consts.TaskStatus.FINISHED},
+            {"uuid": "1234-5678-abcd", "status": consts.TaskStatus.RUNNING},
+            {"uuid": "5678-abcd-1234", "status": consts.TaskStatus.INIT}]
+
+        self.assertEqual(
+            {"resources": [{"task_id_part": "abcd1234",
+                            "task_uuid": "abcd-1234-5678"},
+                           {"task_id_part": "deadbeef",
+                            "task_uuid": None}],
+             "cleanup": "stats"},
+            api._Deployment.sweep(deployment, resources=["nova"],
+                                  task_ids=["task"], delete=True))
+
+        self.assertEqual(2, mock_clients.call_count)
+        users = [{"id": auth_ref.user_id, "tenant_id": auth_ref.project_id,
+                  "credential": mock_clients.call_args_list[0][0][0]},
+                 {"id": auth_ref.user_id, "tenant_id": auth_ref.project_id,
+                  "credential": mock_clients.call_args_list[1][0][0]}]
+        self.assertEqual(admin.to_dict(), users[0]["credential"].to_dict())
+        self.assertEqual(user.to_dict(), users[1]["credential"].to_dict())
+        mock_sweep.assert_called_once_with(
+            names=["nova"], admin={"credential": users[0]["credential"]},
+            users=users, task_ids=["task"],
+            exclude_task_ids=["1234-5678-abcd", "5678-abcd-1234"],
+            delete=True)
+
+    @mock.patch("rally.api.objects.Task.list", return_value=[])
+    @mock.patch("rally.plugins.openstack.cleanup.manager.sweep")
+    @mock.patch("rally.api.osclients.Clients")
+    def test_deployment_sweep_without_admin(self, mock_clients, mock_sweep,
+                                            mock_task_list):
+        user = objects.Credential("http://192.168.1.1:5000/v2.0/",
+                                  "user", "userpass")
+        deployment = mock.MagicMock(spec=objects.Deployment)
+        deployment.get_credentials_for.return_value = {
+            "admin": None, "users": [user.to_dict()]}
+        mock_sweep.return_value = (mock.Mock(), [], None)
+
+        self.assertEqual({"resources": [], "cleanup": None},
+                         api._Deployment.sweep(deployment))
+        self.assertIsNone(mock_sweep.call_args[1]["admin"])
+        self.assertEqual(1, len(mock_sweep.call_args[1]["users"]))
+        self.assertEqual([], mock_sweep.call_args[1]["exclude_task_ids"])
+
 
 class APITestCase(test.TestCase):
 
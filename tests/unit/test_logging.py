@@ -14,6 +14,7 @@
 #    under the License.
 
 import logging
+import threading
 
 import mock
 
@@ -33,6 +34,7 @@ class LogTestCase(test.TestCase):
         mock_handlers.ColorHandler.LEVEL_COLORS = {
             logging.DEBUG: "debug_color"}
         mock_conf.rally_debug = True
+        mock_conf.log_async = False
 
         log.setup(proj, version)
 
@@ -45,6 +47,18 @@ class LogTestCase(test.TestCase):
         mock_oslogging.getLogger(None).logger.setLevel.assert_called_once_with(
             logging.RDEBUG)
 
+    @mock.patch("rally.common.logging.enable_async")
+    @mock.patch("rally.common.logging.CONF")
+    @mock.patch("rally.common.logging.oslogging")
+    def test_setup_async(self, mock_oslogging, mock_conf, mock_enable_async):
+        mock_conf.rally_debug = False
+        mock_conf.log_async = True
+        mock_conf.log_async_queue_size = 42
+
+        log.setup("fakep")
+
+        mock_enable_async.assert_called_once_with(logging.getLogger(), 42)
+
     @mock.patch("rally.common.logging.log")
     @mock.patch("rally.common.logging.RallyContextAdapter")
     @mock.patch("rally.common.logging.oslogging")
@@ -205,3 +219,121 @@ class LogCatcherUnitTestCase(test.TestCase):
         self.assertEqual(
             [r.msg for r in self.catcher_handler.return_value.buffer],
             catcher.fetchLogs())
+
+
+class AsyncHandlerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AsyncHandlerTestCase, self).setUp()
+        self.target = log.CatcherHandler()
+        # flush() of CatcherHandler drops caught records
+        self.target.flush = mock.Mock()
+        self.handler = log.AsyncHandler([self.target], queue_size=2)
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger("rally.tests.async")
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_emit(self):
+        self.logger.warning("foo %s", "bar")
+        self.handler.flush()
+
+        self.assertEqual(["foo bar"],
+                         [r.getMessage() for r in self.target.buffer])
+        self.assertIsNot(threading.current_thread(), self.handler._thread)
+
+    def test_emit_level_of_target(self):
+        self.target.setLevel(logging.ERROR)
+        self.logger.warning("foo")
+        self.logger.error("bar")
+        self.handler.flush()
+
+        self.assertEqual(["bar"], [r.getMessage() for r in self.target.buffer])
+
+    def test_emit_queue_is_full(self):
+        self.handler._start()
+
+        with mock.patch.object(self.handler._queue, "put_nowait",
+                               side_effect=log.queue.Full):
+            self.logger.warning("foo")
+            self.logger.warning("bar")
+
+        self.assertEqual(2, self.handler.dropped)
+
+    def test_report_dropped(self):
+        self.handler._start()
+        self.handler.dropped = 3
+        self.logger.warning("foo")
+        self.handler.flush()
+
+        self.assertEqual(
+            ["foo", "3 log records were dropped since async log queue is "
+                    "full"],
+            [r.getMessage() for r in self.target.buffer])
+
+    def test_close(self):
+        self.target.close = mock.Mock()
+        self.logger.warning("foo")
+        self.handler.close()
+
+        self.assertEqual(["foo"], [r.getMessage() for r in self.target.buffer])
+        self.assertFalse(self.handler._thread.is_alive())
+        self.target.close.assert_called_once_with()
+
+    @mock.patch("rally.common.logging.os.getpid")
+    def test_restart_in_forked_process(self, mock_getpid):
+        mock_getpid.return_value = 1
+        self.logger.warning("foo")
+        self.handler.flush()
+        thread = self.handler._thread
+
+        mock_getpid.return_value = 2
+        self.logger.warning("bar")
+        self.handler.flush()
+
+        self.assertIsNot(thread, self.handler._thread)
+        self.assertEqual(["foo", "bar"],
+                         [r.getMessage() for r in self.target.buffer])
+
+    def test_enable_async(self):
+        logger = logging.getLogger("rally.tests.enable_async")
+        logger.addHandler(self.target)
+
+        log.enable_async(logger, queue_size=5)
+        log.enable_async(logger)
+
+        self.assertEqual(1, len(logger.handlers))
+        handler = logger.handlers[0]
+        self.addCleanup(logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        self.assertIsInstance(handler, log.AsyncHandler)
+        self.assertEqual([self.target], handler.targets)
+        self.assertEqual(5, handler.queue_size)
+
+
+class IterationLoggingTestCase(test.TestCase):
+
+    @mock.patch("rally.common.logging.time.time")
+    def test_rate_limiter(self, mock_time):
+        limiter = log.RateLimiter()
+        mock_time.return_value = 1.1
+        self.assertEqual([True, True, False],
+                         [limiter.allow(2) for i in range(3)])
+        mock_time.return_value = 2.5
+        self.assertTrue(limiter.allow(2))
+        self.assertTrue(all(limiter.allow(0) for i in range(5)))
+
+    @mock.patch("rally.common.logging._iteration_rate_limiter")
+    @mock.patch("rally.common.logging.CONF")
+    def test_is_iteration_logged(self, mock_conf,
+                                 mock__iteration_rate_limiter):
+        mock__iteration_rate_limiter.allow.return_value = True
+        mock_conf.iteration_log_sampling = 3
+        self.assertEqual([True, False, False, True, False],
+                         [log.is_iteration_logged(i) for i in range(1, 6)])
+        mock__iteration_rate_limiter.allow.assert_called_with(
+            mock_conf.iteration_log_rate_limit)
+
+        mock__iteration_rate_limiter.allow.return_value = False
+        self.assertFalse(log.is_iteration_logged(1))
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 import ddt
 from keystoneclient import exceptions as keystone_exceptions
 import mock
@@ -22,6 +24,7 @@ from rally.common import objects
 from rally import consts
 from rally import exceptions
 from rally import osclients
+from rally.task import http_trace
 from tests.unit import fakes
 from tests.unit import test
 
@@ -228,6 +231,49 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
              mock.call(auth=self.ksa_identity_plugin, timeout=180.0,
                        verify=True)])
 
+    @mock.patch("rally.osclients._trace_session")
+    def test_keystone_get_session_traced(self, mock__trace_session):
+        cfg.CONF.set_override("openstack_client_http_trace", True)
+        credential = objects.Credential("http://auth_url/v2.0", "user",
+                                        "pass", "tenant")
+        self.set_up_keystone_mocks()
+        keystone = osclients.Keystone(credential, {}, {})
+
+        sess, plugin = keystone.get_session(version="2")
+
+        mock__trace_session.assert_called_once_with(sess)
+
+    def test_keystone_get_session_discovers_version_once(self):
+        credential = objects.Credential("http://auth_url/v3", "user",
+                                        "pass", "tenant")
+        self.set_up_keystone_mocks()
+        version_data = mock.Mock(return_value=[{"version": (3, 0)}])
+        self.ksa_auth.discover.Discover.return_value = (
+            mock.Mock(version_data=version_data))
+        capabilities = osclients.Capabilities(ttl=60)
+
+        with mock.patch("rally.osclients.get_capabilities",
+                        return_value=capabilities):
+            osclients.Keystone(credential, {}, {}).get_session()
+            osclients.Keystone(credential, {}, {}).get_session()
+
+        version_data.assert_called_once_with()
+        self.assertEqual("3", capabilities.data["keystone_version"]["value"])
+
+    def test_keystone_get_session_with_auth_ref(self):
+        credential = objects.Credential("http://auth_url/v2.0", "user",
+                                        "pass", "tenant")
+        self.set_up_keystone_mocks()
+        auth_ref = mock.Mock()
+        keystone = osclients.Keystone(credential, {},
+                                      {"keystone_auth_ref": auth_ref})
+
+        sess, plugin = keystone.get_session(version="2")
+
+        self.assertEqual(auth_ref, plugin.auth_ref)
+        self.assertEqual(auth_ref, keystone.auth_ref)
+        self.assertFalse(plugin.get_access.called)
+
     def test_keystone_property(self):
         keystone = osclients.Keystone(None, None, None)
         self.assertRaises(exceptions.RallyException, lambda: keystone.keystone)
@@ -250,6 +296,210 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
         mock_keystone_get_session.assert_called_once_with()
 
 
+class TraceSessionTestCase(test.TestCase):
+
+    def setUp(self):
+        super(TraceSessionTestCase, self).setUp()
+        self.addCleanup(http_trace.stop)
+        self.session = mock.Mock()
+        self.request = self.session.request
+        osclients._trace_session(self.session)
+
+    def test_not_recording(self):
+        self.assertEqual(self.request.return_value,
+                         self.session.request("/servers", "GET", foo="bar"))
+        self.request.assert_called_once_with("/servers", "GET", foo="bar")
+
+    @mock.patch("rally.osclients.time.time", side_effect=[1, 3])
+    def test_request(self, mock_time):
+        http_trace.start([])
+        self.request.return_value.status_code = 202
+
+        self.assertEqual(
+            self.request.return_value,
+            self.session.request("/servers/42", "POST",
+                                 endpoint_filter={"service_type": "compute"},
+                                 json={}))
+
+        self.request.assert_called_once_with(
+            "/servers/42", "POST",
+            endpoint_filter={"service_type": "compute"}, json={})
+        self.assertEqual(
+            [{"method": "POST", "service": "compute", "url": "/servers/{id}",
+              "atomic_action": None, "count": 1, "errors": 0,
+              "duration": 2.0}],
+            http_trace.stop())
+
+    @mock.patch("rally.osclients.time.time", side_effect=[1, 3])
+    def test_request_fails(self, mock_time):
+        from keystoneauth1 import exceptions as ks_exceptions
+
+        http_trace.start([])
+        self.request.side_effect = ks_exceptions.NotFound()
+
+        self.assertRaises(ks_exceptions.NotFound, self.session.request,
+                          "http://nova:8774/v2.1/servers/42", "GET")
+        self.assertEqual(
+            [{"method": "GET", "service": "nova:8774",
+              "url": "/v2.1/servers/{id}", "atomic_action": None,
+              "count": 1, "errors": 1, "duration": 2.0}],
+            http_trace.stop())
+
+
+class CapabilitiesTestCase(test.TestCase):
+
+    @mock.patch("rally.osclients.time.time")
+    def test_get(self, mock_time):
+        mock_time.return_value = 100
+        capabilities = osclients.Capabilities(
+            {"foo": {"value": "old_foo", "discovered_at": 50},
+             "bar": {"value": "old_bar", "discovered_at": 10}}, ttl=60)
+
+        self.assertEqual("old_foo", capabilities.get("foo", mock.Mock()))
+        self.assertEqual("new_bar",
+                         capabilities.get("bar", lambda: "new_bar"))
+        self.assertEqual("baz", capabilities.get("baz", lambda: "baz"))
+        self.assertEqual(1, capabilities.hits)
+        self.assertEqual(2, capabilities.discoveries)
+        self.assertEqual({"value": "new_bar", "discovered_at": 100},
+                         capabilities.data["bar"])
+
+    def test_get_disabled(self):
+        capabilities = osclients.Capabilities(ttl=0)
+        discover = mock.Mock(return_value="foo")
+
+        capabilities.get("foo", discover)
+        capabilities.get("foo", discover)
+
+        self.assertEqual(2, discover.call_count)
+        self.assertEqual(0, capabilities.hits)
+
+    def test_discover_capability_without_cache(self):
+        credential = objects.Credential("http://auth_url/v2.0", "user",
+                                        "pass", "tenant")
+        discover = mock.Mock(return_value="foo")
+
+        self.assertEqual("foo", osclients.discover_capability(
+            credential, "foo", discover))
+        self.assertEqual("foo", osclients.discover_capability(
+            credential, "foo", discover))
+        self.assertEqual(2, discover.call_count)
+
+    def test_deployment_capabilities(self):
+        admin = objects.Credential("http://auth_url/v2.0", "user",
+                                   "pass", "tenant")
+        other = objects.Credential("http://other_url/v2.0", "user",
+                                   "pass", "tenant")
+        deployment = objects.Deployment(deployment={
+            "uuid": "foo", "credentials": {"openstack": [
+                {"admin": admin.to_dict(), "users": [admin.to_dict()]}]},
+            "capabilities": {"services": {"value": {"a": "b"},
+                                          "discovered_at": time.time()}}})
+        deployment.update_capabilities = mock.Mock()
+
+        with osclients.deployment_capabilities(deployment) as capabilities:
+            self.assertIs(capabilities, osclients.get_capabilities(admin))
+            self.assertIsNone(osclients.get_capabilities(other))
+            self.assertEqual({"a": "b"}, osclients.discover_capability(
+                admin, "services", mock.Mock()))
+            self.assertEqual("foo", osclients.discover_capability(
+                other, "services", lambda: "foo"))
+
+        self.assertIsNone(osclients.get_capabilities(admin))
+        self.assertFalse(deployment.update_capabilities.called)
+
+    def test_deployment_capabilities_per_user(self):
+        admin = objects.Credential("http://auth_url/v2.0", "admin",
+                                   "pass", "admin_tenant")
+        user = objects.Credential("http://auth_url/v2.0", "user",
+                                  "pass", "tenant")
+        deployment = objects.Deployment(deployment={
+            "uuid": "foo", "credentials": {"openstack": [
+                {"admin": admin.to_dict(), "users": [user.to_dict()]}]},
+            "capabilities": {}})
+        deployment.update_capabilities = mock.Mock()
+
+        with osclients.deployment_capabilities(deployment):
+            self.assertEqual("admin_services", osclients.discover_capability(
+                admin, "services", lambda: "admin_services", per_user=True))
+            self.assertEqual("user_services", osclients.discover_capability(
+                user, "services", lambda: "user_services", per_user=True))
+            self.assertEqual("admin_services", osclients.discover_capability(
+                admin, "services", mock.Mock(), per_user=True))
+            self.assertEqual("3", osclients.discover_capability(
+                admin, "keystone_version", lambda: "3"))
+            self.assertEqual("3", osclients.discover_capability(
+                user, "keystone_version", mock.Mock()))
+
+        deployment.update_capabilities.assert_called_once_with(
+            {"services::admin::admin_tenant": {
+                "value": "admin_services", "discovered_at": mock.ANY,
+                "user": ":admin::admin_tenant"},
+             "services::user::tenant": {
+                 "value": "user_services", "discovered_at": mock.ANY,
+                 "user": ":user::tenant"},
+             "keystone_version": {"value": "3", "discovered_at": mock.ANY}})
+
+    @mock.patch("rally.osclients.time.time")
+    def test_deployment_capabilities_not_persisted(self, mock_time):
+        mock_time.return_value = 100000
+        admin = objects.Credential("http://auth_url/v2.0", "admin",
+                                   "pass", "admin_tenant")
+        temporary = objects.Credential("http://auth_url/v2.0", "temporary",
+                                       "pass", "temporary_tenant")
+        deployment = objects.Deployment(deployment={
+            "uuid": "foo", "credentials": {"openstack": [
+                {"admin": admin.to_dict(), "users": []}]},
+            "capabilities": {"expired": {"value": "foo",
+                                         "discovered_at": 10}}})
+        deployment.update_capabilities = mock.Mock()
+
+        with osclients.deployment_capabilities(deployment):
+            osclients.discover_capability(
+                admin, "services", lambda: "admin_services", per_user=True)
+            osclients.discover_capability(
+                temporary, "services", lambda: "temporary_services",
+                per_user=True)
+
+        # capabilities of users which are not users of the deployment and
+        # expired capabilities are not stored
+        deployment.update_capabilities.assert_called_once_with(
+            {"services::admin::admin_tenant": {
+                "value": "admin_services", "discovered_at": 100000,
+                "user": ":admin::admin_tenant"}})
+
+    def test_discover_capability_refresh(self):
+        credential = objects.Credential("http://auth_url/v2.0", "user",
+                                        "pass", "tenant")
+        capabilities = osclients.Capabilities(ttl=60)
+
+        with mock.patch("rally.osclients.get_capabilities",
+                        return_value=capabilities):
+            osclients.discover_capability(credential, "foo", lambda: "foo")
+            self.assertEqual("bar", osclients.discover_capability(
+                credential, "foo", lambda: "bar", refresh=True))
+
+        self.assertEqual(0, capabilities.hits)
+        self.assertEqual(2, capabilities.discoveries)
+
+    def test_deployment_capabilities_refresh(self):
+        admin = objects.Credential("http://auth_url/v2.0", "user",
+                                   "pass", "tenant")
+        deployment = objects.Deployment(deployment={
+            "uuid": "foo", "credentials": {"openstack": [
+                {"admin": admin.to_dict(), "users": []}]},
+            "capabilities": {"services": {"value": {"a": "b"},
+                                          "discovered_at": time.time()}}})
+        deployment.update_capabilities = mock.Mock()
+
+        with osclients.deployment_capabilities(deployment, refresh=True):
+            self.assertEqual({"c": "d"}, osclients.discover_capability(
+                admin, "services", lambda: {"c": "d"}))
+
+        deployment.update_capabilities.assert_called_once_with(
+            {"services": {"value": {"c": "d"}, "discovered_at": mock.ANY}})
+
+
 @ddt.ddt
 class OSClientsTestCase(test.TestCase):
 
@@ -272,6 +522,10 @@ class OSClientsTestCase(test.TestCase):
         self.service_catalog = self.auth_ref.service_catalog
         self.service_catalog.url_for = mock.MagicMock()
 
+    def test_init_with_auth_ref(self):
+        clients = osclients.Clients(self.credential, auth_ref="auth_ref")
+        self.assertEqual({"keystone_auth_ref": "auth_ref"}, clients.cache)
+
     def test_create_from_env(self):
         with mock.patch.dict("os.environ",
                              {"OS_AUTH_URL": "foo_auth_url",
@@ -730,6 +984,43 @@ class OSClientsTestCase(test.TestCase):
              "some_service": "__unknown__"},
             clients.services())
 
+    @mock.patch("rally.osclients.Keystone.service_catalog")
+    def test_services_from_capabilities(self, mock_keystone_service_catalog):
+        mock_get_endpoints = mock_keystone_service_catalog.get_endpoints
+        mock_get_endpoints.return_value = {consts.ServiceType.COMPUTE: {}}
+        deployment = mock.MagicMock()
+        deployment.__getitem__.side_effect = {
+            "uuid": "foo", "capabilities": {},
+            "credentials": {"openstack": [{
+                "admin": self.credential.to_dict(), "users": []}]}}.get
+
+        with osclients.deployment_capabilities(deployment) as capabilities:
+            for i in range(3):
+                self.assertEqual(
+                    {consts.ServiceType.COMPUTE: consts.Service.NOVA},
+                    osclients.Clients(self.credential).services())
+
+        mock_get_endpoints.assert_called_once_with()
+        self.assertEqual(2, capabilities.hits)
+        deployment.update_capabilities.assert_called_once_with(
+            {"services::%s::%s" % (self.credential.username,
+                                   self.credential.tenant_name): {
+                "value": {consts.ServiceType.COMPUTE: consts.Service.NOVA},
+                "discovered_at": mock.ANY,
+                "user": ":%s::%s" % (self.credential.username,
+                                     self.credential.tenant_name)}})
+        self.assertIsNone(osclients.get_capabilities(self.credential))
+
+    def test_neutron_extensions(self):
+        neutron = mock.Mock()
+        neutron.list_extensions.return_value = {
+            "extensions": [{"alias": "foo"}, {"alias": "bar"}]}
+        self.clients.cache["neutron"] = neutron
+
+        self.assertEqual(["foo", "bar"], self.clients.neutron_extensions())
+        self.assertEqual(["foo", "bar"], self.clients.neutron_extensions())
+        neutron.list_extensions.assert_called_once_with()
+
     def test_murano(self):
         fake_murano = fakes.FakeMuranoClient()
         mock_murano = mock.Mock()